@@ -14,8 +14,12 @@
 """ Block-like object meant for controller models.
 """
 
+from collections import OrderedDict
+import time as _time
+
 import idaes.logger as idaeslog
 from idaes.apps.caprese.util import initialize_by_element_in_range
+from idaes.apps.caprese.sensitivity import AdvancedStepSensitivity
 from idaes.apps.caprese.common.config import (
         ControlPenaltyType,
         )
@@ -52,6 +56,7 @@ from pyomo.dae.set_utils import deactivate_model_at
 from pyomo.dae.flatten import flatten_dae_components
 from pyomo.core.base.indexed_component import UnindexedComponent_set
 
+_log = idaeslog.getLogger(__name__)
 
 def pwc_rule(ctrl, i, t):
     time = ctrl.time
@@ -286,6 +291,106 @@ class _ControllerBlockData(_DynamicBlockData):
         input_set = self.INPUT_SET
         self.pwc_constraint = Constraint(input_set, time, rule=pwc_rule)
 
+    def setup_advanced_step(self):
+        """ Prepares the controller for advanced-step NMPC, in which the
+        problem is solved one sample ahead with the predicted initial
+        conditions and its solution is corrected with NLP sensitivity
+        when the measurements arrive. The sensitivity is taken with
+        respect to the measured variables at t0, which must be fixed.
+        This requires the PyNumero ASL interface.
+        """
+        t0 = self.time.first()
+        if not hasattr(self, 'ipopt_zL_out'):
+            self.add_ipopt_suffixes()
+        self._advanced_step = AdvancedStepSensitivity(
+                self,
+                [var[t0] for var in self.measurement_vars],
+                )
+        self.advanced_step_timing = OrderedDict([
+                ('background_solve', None),
+                ('factorization', None),
+                ('online', None),
+                ])
+
+    def solve_advanced_step(self, solver, **kwargs):
+        """ The background step of advanced-step NMPC. Solves the
+        control problem with the current initial conditions, which should
+        be the states predicted for the next sample, e.g. after calling
+        `advance_one_sample`, and factorizes the KKT matrix at the
+        solution. The time taken by each is recorded in
+        `advanced_step_timing`.
+
+        Parameters:
+            solver: A Pyomo solver object that returns bound multipliers
+                    through the `ipopt_zL_out` and `ipopt_zU_out` suffixes.
+            kwargs: Passed to the solver's `solve` method.
+
+        Returns:
+            The solver results
+        """
+        if getattr(self, '_advanced_step', None) is None:
+            self.setup_advanced_step()
+        sens = self._advanced_step
+        timing = self.advanced_step_timing
+
+        start = _time.perf_counter()
+        results = solver.solve(self, **kwargs)
+        solved = _time.perf_counter()
+        timing['background_solve'] = solved - start
+
+        if results.solver.termination_condition == TerminationCondition.optimal:
+            sens.factorize()
+            timing['factorization'] = _time.perf_counter() - solved
+        else:
+            # The inputs will not be corrected by update_advanced_step
+            sens._lu = None
+            timing['factorization'] = None
+            _log.warning('Background solve of %s terminated with %s, '
+                    'the next inputs will not be corrected.' % (self.name,
+                    results.solver.termination_condition))
+        return results
+
+    def update_advanced_step(self, measured, tolerance=1e-8):
+        """ The online step of advanced-step NMPC. Loads the measurements
+        at t0 and corrects the inputs over the first sample of the
+        horizon with the first-order change in the solution of the
+        background step, which only requires a back-substitution with
+        the factorized KKT matrix. Corrected inputs are clipped to their
+        bounds. The time taken is recorded in `advanced_step_timing`.
+
+        Parameters:
+            measured: Measured values, in the order of `measurement_vars`
+        """
+        start = _time.perf_counter()
+        sens = self._advanced_step
+        self.load_measurements(measured)
+        if sens._lu is None:
+            self.advanced_step_timing['online'] = \
+                    _time.perf_counter() - start
+            return
+
+        time = self.time
+        ts = time.first() + self.sample_time
+        inputs = [var[t] for t in self.generate_time_in_sample(
+                    ts, tolerance=tolerance)
+                for var in self.input_vars]
+        inputs, indices = sens.get_primal_indices(inputs)
+        dx = sens.solve(var.value for var in sens.parameters)
+        for var, i in zip(inputs, indices):
+            val = var.value + dx[i]
+            if var.lb is not None and val < var.lb:
+                val = var.lb
+            if var.ub is not None and val > var.ub:
+                val = var.ub
+            var.set_value(val)
+
+        timing = self.advanced_step_timing
+        timing['online'] = _time.perf_counter() - start
+        _log.info('Advanced-step NMPC latency of %s: background solve '
+                '%.3g s, factorization %.3g s, online update %.3g s' % (
+                self.name, timing['background_solve'],
+                timing['factorization'], timing['online']))
+
 
 class ControllerBlock(DynamicBlock):
     """ This is a user-facing class to be instantiated when one
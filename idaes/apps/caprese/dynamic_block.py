@@ -41,6 +41,7 @@ from idaes.core.util.model_statistics import degrees_of_freedom
 
 from pyomo.environ import (
         Block,
+        Constraint,
         Reference,
         TransformationFactory,
         Var,
@@ -138,6 +139,9 @@ class _DynamicBlockData(_BlockData):
         self.sample_points = [time.first(), time.last()]
         self.sample_point_indices = [1, len(time)]
 
+        # Cache of shift plans, see `get_shift_plan`
+        self._shift_plans = {}
+
     _var_name = 'var'
     _block_suffix = '_BLOCK'
     _set_suffix = '_SET'
@@ -496,6 +500,57 @@ class _DynamicBlockData(_BlockData):
         for var, val in zip(self.measurement_vars, measured):
             var[t0].fix(val)
 
+    def get_shift_plan(self,
+            t_shift,
+            ctype=(DiffVar, DerivVar, AlgVar, InputVar, FixedVar),
+            tolerance=1e-8,
+            ):
+        """ Get the pairs of data objects needed to shift the variables
+        of the specified ctypes (or the time-indexed constraints of the
+        model, if ctype is Constraint) by `t_shift` in time.
+
+        The plan is a tuple of two lists of the same length, the data
+        objects to set and the data objects whose values they take.
+        Plans are computed once and cached by shift, ctypes and tolerance,
+        so the same plan is used at every sample of a simulation.
+        """
+        if type(ctype) is not tuple:
+            ctype = tuple(ctype) if isinstance(ctype, (list, set)) \
+                    else (ctype,)
+        key = (t_shift, ctype, tolerance)
+        plan = self._shift_plans.get(key, None)
+        if plan is not None:
+            return plan
+
+        time = self.time
+        # Find the time point `t_shift` in the future of each point only
+        # once, rather than once per variable.
+        time_pairs = []
+        for t in time:
+            idx = time.find_nearest_index(t + t_shift, tolerance)
+            if idx is None:
+                # t + t_shift is outside the model's "horizon"
+                continue
+            time_pairs.append((t, time[idx]))
+
+        if ctype == (Constraint,):
+            # Constraints are not categorized, so the time-indexed
+            # constraints of the model are found here.
+            _, components = flatten_dae_components(
+                    self.mod, time, ctype=Constraint)
+        else:
+            components = self.component_objects(ctype)
+        targets = []
+        sources = []
+        for comp in components:
+            for t, ts in time_pairs:
+                if t in comp and ts in comp:
+                    targets.append(comp[t])
+                    sources.append(comp[ts])
+        plan = (targets, sources)
+        self._shift_plans[key] = plan
+        return plan
+
     def advance_by_time(self,
             t_shift,
             ctype=(DiffVar, DerivVar, AlgVar, InputVar, FixedVar),
@@ -506,20 +561,12 @@ class _DynamicBlockData(_BlockData):
         """ Set values for the variables of the specified ctypes
         to their values `t_shift` in the future.
         """
-        time = self.time
-        # The outer loop is over time so we don't have to call
-        # `find_nearest_index` for every variable.
-        # I am assuming that `find_nearest_index` is slower than
-        # accessing `component_objects`
-        for t in time:
-            ts = t + t_shift
-            idx = time.find_nearest_index(ts, tolerance)
-            if idx is None:
-                # t + sample_time is outside the model's "horizon"
-                continue
-            ts = time[idx]
-            for var in self.component_objects(ctype):
-                var[t].set_value(var[ts].value)
+        targets, sources = self.get_shift_plan(t_shift, ctype, tolerance)
+        # All values are read before any are set, so a value that is
+        # both a source and a target is shifted only once.
+        values = [var.value for var in sources]
+        for var, val in zip(targets, values):
+            var.set_value(val)
 
     def advance_one_sample(self,
             ctype=(DiffVar, DerivVar, AlgVar, InputVar, FixedVar),
@@ -620,29 +667,26 @@ class _DynamicBlockData(_BlockData):
                 InputVar,
                 ),
             tolerance=1e-8,
+            duals=False,
             ):
         """ Set the values of bound multipliers to the corresponding
-        values a time `t_shift` in the future.
+        values a time `t_shift` in the future. If `duals` is True, the
+        duals of the time-indexed constraints are shifted as well.
         """
-        zL = self.ipopt_zL_in
-        zU = self.ipopt_zU_in
-        time = self.time
-        # The outer loop is over time so we don't have to call
-        # `find_nearest_index` for every variable.
-        # I am assuming that `find_nearest_index` is slower than
-        # accessing `component_objects`
-        for t in time:
-            ts = t + t_shift
-            idx = time.find_nearest_index(ts, tolerance)
-            if idx is None:
-                # t + sample_time is outside the model's "horizon"
-                continue
-            ts = time[idx]
-            for var in self.component_objects(ctype):
-                if var[t] in zL and var[ts] in zL:
-                    zL[var[t]] = zL[var[ts]]
-                if var[t] in zU and var[ts] in zU:
-                    zU[var[t]] = zU[var[ts]]
+        targets, sources = self.get_shift_plan(t_shift, ctype, tolerance)
+        for suffix in (self.ipopt_zL_in, self.ipopt_zU_in):
+            values = [suffix.get(var, None) for var in sources]
+            for var, val in zip(targets, values):
+                if val is not None and var in suffix:
+                    suffix[var] = val
+        if duals:
+            targets, sources = self.get_shift_plan(
+                    t_shift, Constraint, tolerance)
+            dual = self.dual
+            values = [dual.get(con, None) for con in sources]
+            for con, val in zip(targets, values):
+                if val is not None and con in dual:
+                    dual[con] = val
 
     def advance_ipopt_multipliers_one_sample(self,
             ctype=(
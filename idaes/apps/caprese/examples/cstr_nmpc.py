@@ -67,7 +67,12 @@ class PlotData(object):
             self.data_series.plot()
         return fig, ax
 
-def main(plot_switch=False):
+def main(plot_switch=False, advanced_step=False):
+    """ Run the NMPC simulation. If advanced_step is True, the controller
+    problem is solved in the "background" with the predicted initial
+    conditions before each measurement arrives, and only corrected with
+    NLP sensitivity once it does.
+    """
 
     # This tests the same model constructed in the test_nmpc_constructor_1 file
     m_controller = make_model(horizon=3, ntfe=30, ntcp=2, bounds=True)
@@ -204,6 +209,12 @@ def main(plot_switch=False):
 
     for i in range(1,11):
         print('\nENTERING NMPC LOOP ITERATION %s\n' % i)
+        if advanced_step:
+            # While the plant runs through the sample, solve the problem
+            # for the states the controller predicts at its end.
+            nmpc.controller.advance_one_sample()
+            nmpc.controller.solve_advanced_step(solver, tee=True)
+
         measured = nmpc.plant.generate_measurements_at_time(p_ts)
         nmpc.plant.advance_one_sample()
         nmpc.plant.initialize_to_initial_conditions()
@@ -214,10 +225,13 @@ def main(plot_switch=False):
                 measurement_noise_bounds,
                 )
 
-        nmpc.controller.advance_one_sample()
-        nmpc.controller.load_measurements(measured)
-
-        solver.solve(nmpc.controller, tee=True)
+        if advanced_step:
+            nmpc.controller.update_advanced_step(measured)
+            print('Latency: %s' % dict(nmpc.controller.advanced_step_timing))
+        else:
+            nmpc.controller.advance_one_sample()
+            nmpc.controller.load_measurements(measured)
+            solver.solve(nmpc.controller, tee=True)
 
         inputs = controller.generate_inputs_at_time(c_ts)
         inputs = apply_noise_with_bounds(
@@ -0,0 +1,209 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2019, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+""" NLP sensitivity of a controller problem with respect to its initial
+conditions, used for advanced-step NMPC.
+
+The initial conditions are treated as parameters p that enter the problem
+through the equality constraints x0 - p == 0. At a solution of the problem,
+the first-order change in the primal variables for a change dp in the
+parameters is the solution of the linear system
+
+    [ W + Sigma   J^T ] [ dx ]   [  0 ]
+    [ J           0   ] [ dy ] = [ dp ]
+
+where W is the Hessian of the Lagrangian, Sigma the primal-dual barrier
+term of the bounds and J the Jacobian of the equality constraints. The
+matrix is factorized once after the (background) solve, so that every
+correction afterwards only costs a back-substitution.
+"""
+
+import numpy as np
+
+import idaes.logger as idaeslog
+
+from pyomo.environ import (
+        Block,
+        Constraint,
+        Param,
+        )
+from pyomo.common.dependencies import attempt_import
+from pyomo.common.modeling import unique_component_name
+
+scipy_sparse, scipy_available = attempt_import('scipy.sparse')
+sparse_linalg = attempt_import('scipy.sparse.linalg')[0]
+
+__author__ = "Robert Parker"
+
+_log = idaeslog.getLogger(__name__)
+
+
+def pynumero_available():
+    """ Whether the PyNumero ASL interface needed to evaluate the
+    Hessian and Jacobian of a Pyomo model is available.
+    """
+    if not scipy_available:
+        return False
+    try:
+        from pyomo.contrib.pynumero.asl import AmplInterface
+    except ImportError:
+        return False
+    return AmplInterface.available()
+
+
+class AdvancedStepSensitivity(object):
+    """ Factorized KKT matrix of a block's optimization problem, used to
+    compute the first-order correction of its solution for a change in
+    the values of a set of fixed variables.
+
+    Args:
+        block: Block whose active objective and constraints define the
+               problem
+        parameters: List of fixed variable data objects whose values
+                    are the parameters of the problem
+    """
+
+    def __init__(self, block, parameters):
+        if not pynumero_available():
+            raise RuntimeError(
+                    'Advanced-step sensitivity requires scipy and the '
+                    'PyNumero ASL interface, which are not available.')
+        from pyomo.contrib.pynumero.interfaces.pyomo_nlp import PyomoNLP
+
+        self.block = block
+        self.parameters = list(parameters)
+        for var in self.parameters:
+            if not var.fixed:
+                raise ValueError(
+                        'Parameter %s of the sensitivity problem must be '
+                        'fixed.' % var.name)
+
+        # The parameters are unfixed and constrained to mutable params
+        # only while the NL file is written. The constraints are then
+        # deactivated so they do not affect regular solves of the block.
+        name = unique_component_name(block, '_sensitivity_block')
+        sens = Block(concrete=True)
+        block.add_component(name, sens)
+        n_param = len(self.parameters)
+        sens.nominal = Param(range(n_param), mutable=True,
+                initialize={i: var.value
+                    for i, var in enumerate(self.parameters)})
+        sens.param_con = Constraint(range(n_param),
+                rule=lambda b, i: self.parameters[i] == b.nominal[i])
+        for var in self.parameters:
+            var.unfix()
+        try:
+            self.nlp = PyomoNLP(block)
+        finally:
+            for var in self.parameters:
+                var.fix()
+        self.param_con_idx = np.array(self.nlp.get_equality_constraint_indices(
+            [sens.param_con[i] for i in range(n_param)]))
+        sens.deactivate()
+        self.sensitivity_block = sens
+
+        if self.nlp.n_ineq_constraints() > 0:
+            _log.warning(
+                    'Sensitivity problem of %s has inequality constraints. '
+                    'These are assumed to be inactive.' % block.name)
+
+        self.variables = self.nlp.get_pyomo_variables()
+        self.n_primals = self.nlp.n_primals()
+        self.n_eq = self.nlp.n_eq_constraints()
+        self._lu = None
+        self.nominal = None
+
+    def get_primal_indices(self, variables):
+        """ Indices in the primal vector of the sensitivity problem of
+        the variables that are not fixed.
+        """
+        variables = [var for var in variables if not var.fixed]
+        return variables, self.nlp.get_primal_indices(variables)
+
+    def _bound_multipliers(self):
+        block = self.block
+        n = self.n_primals
+        zL = np.zeros(n)
+        zU = np.zeros(n)
+        zL_out = getattr(block, 'ipopt_zL_out', None)
+        zU_out = getattr(block, 'ipopt_zU_out', None)
+        if zL_out is None or zU_out is None:
+            return zL, zU
+        for i, var in enumerate(self.variables):
+            # Ipopt returns the multipliers of upper bounds as negative
+            # numbers. Magnitudes are used for both bounds here.
+            zL[i] = abs(zL_out.get(var, 0.0))
+            zU[i] = abs(zU_out.get(var, 0.0))
+        return zL, zU
+
+    def factorize(self):
+        """ Evaluate and factorize the KKT matrix at the current values
+        of the block's variables, which should be a solution of its
+        optimization problem.
+        """
+        nlp = self.nlp
+        n = self.n_primals
+        m = self.n_eq
+        x = np.array([var.value for var in self.variables], dtype=float)
+        nlp.set_primals(x)
+        self.nominal = np.array([var.value for var in self.parameters],
+                dtype=float)
+
+        zL, zU = self._bound_multipliers()
+        lb = nlp.primals_lb()
+        ub = nlp.primals_ub()
+        sigma = np.zeros(n)
+        has_lb = np.isfinite(lb)
+        has_ub = np.isfinite(ub)
+        # Slacks are bounded away from zero like Ipopt's bound_relax_factor
+        slack_lb = np.maximum(x[has_lb] - lb[has_lb], 1e-10)
+        slack_ub = np.maximum(ub[has_ub] - x[has_ub], 1e-10)
+        sigma[has_lb] += zL[has_lb]/slack_lb
+        sigma[has_ub] += zU[has_ub]/slack_ub
+
+        # Equality multipliers as the least-squares solution of the
+        # stationarity condition grad_f - zL + zU + J^T*y = 0. This does
+        # not depend on the sign convention a solver uses for duals.
+        jac = nlp.evaluate_jacobian_eq().tocsc()
+        grad = nlp.evaluate_grad_objective() - zL + zU
+        eye = scipy_sparse.identity(n, format='csc')
+        aug = scipy_sparse.bmat([[eye, jac.T], [jac, None]], format='csc')
+        rhs = np.concatenate((-grad, np.zeros(m)))
+        y = sparse_linalg.splu(aug).solve(rhs)[n:]
+        if nlp.n_ineq_constraints() > 0:
+            nlp.set_duals_ineq(np.zeros(nlp.n_ineq_constraints()))
+        nlp.set_duals_eq(y)
+
+        hess = nlp.evaluate_hessian_lag().tocsc()
+        kkt = scipy_sparse.bmat([
+                [hess + scipy_sparse.diags(sigma), jac.T],
+                [jac, None],
+                ], format='csc')
+        self._lu = sparse_linalg.splu(kkt)
+
+    def solve(self, values):
+        """ Compute the first-order change in the primal variables for a
+        change in the parameters from their values at factorization to
+        `values`.
+
+        Returns:
+            Numpy array of primal variable changes, in the order of
+            self.variables
+        """
+        if self._lu is None:
+            raise RuntimeError(
+                    'KKT matrix must be factorized before computing a '
+                    'sensitivity correction.')
+        dp = np.array(list(values), dtype=float) - self.nominal
+        rhs = np.zeros(self.n_primals + self.n_eq)
+        rhs[self.n_primals + self.param_con_idx] = dp
+        return self._lu.solve(rhs)[:self.n_primals]
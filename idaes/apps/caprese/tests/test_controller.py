@@ -38,6 +38,7 @@ from idaes.apps.caprese.nmpc_var import (
 from idaes.apps.caprese.common.config import (
         ControlPenaltyType,
         )
+from idaes.apps.caprese.sensitivity import pynumero_available
 from idaes.core.util.model_statistics import degrees_of_freedom
 
 solver_available = pyo.SolverFactory('ipopt').available()
@@ -327,3 +328,58 @@ class TestControllerBlock(object):
             inputs = controller.vectors.input
             pred_expr = (inputs[i, tn] - inputs[i, t] == 0.)
             assert pwc_expr.to_string() == pred_expr.to_string()
+
+    @pytest.mark.component
+    @pytest.mark.skipif(not solver_available, reason='IPOPT is not available')
+    @pytest.mark.skipif(not pynumero_available(),
+            reason='PyNumero ASL interface is not available')
+    def test_advanced_step(self):
+        controller = self.make_controller(horizon=2., nfe=4)
+        time = controller.time
+        t0 = time.first()
+        ts = t0 + controller.sample_time
+        setpoint = [
+                (controller.mod.flow_in[t0], 3.0),
+                ]
+        weights = [
+                (controller.mod.flow_in[t0], 1.0),
+                ]
+        controller.mod.flow_in[:].set_value(3.0)
+        initialize_t0(controller.mod)
+        copy_values_forward(controller.mod)
+        controller.add_setpoint_objective(setpoint, weights)
+        controller.solve_setpoint(solver)
+        controller.mod.flow_in[:].set_value(2.5)
+
+        weights = [
+                (controller.mod.conc[t0,'A'], 1),
+                (controller.mod.conc[t0,'B'], 1),
+                (controller.mod.flow_in[t0], 1),
+                ]
+        controller.add_tracking_objective(weights)
+        controller.constrain_control_inputs_piecewise_constant()
+        controller.vectors.input[...].unfix()
+        controller.vectors.input[:,t0].fix()
+        initial = [5.0, 0.5]
+        controller.load_measurements(initial)
+
+        controller.solve_advanced_step(solver)
+        timing = controller.advanced_step_timing
+        assert timing['background_solve'] > 0
+        assert timing['factorization'] > 0
+        nominal = list(controller.generate_inputs_at_time(ts))
+        assert degrees_of_freedom(controller) == 4
+
+        measured = [5.1, 0.45]
+        controller.update_advanced_step(measured)
+        assert timing['online'] > 0
+        assert controller.measurement_vars[0][t0].value == 5.1
+        corrected = list(controller.generate_inputs_at_time(ts))
+
+        # The first-order correction should be much closer to the solution
+        # of the problem with the measured initial conditions than the
+        # solution with the predicted initial conditions.
+        solver.solve(controller)
+        exact = list(controller.generate_inputs_at_time(ts))
+        for u_nom, u_cor, u_ex in zip(nominal, corrected, exact):
+            assert abs(u_cor - u_ex) < 0.1*abs(u_nom - u_ex)
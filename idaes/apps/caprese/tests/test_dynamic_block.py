@@ -917,6 +917,70 @@ class TestDynamicBlock(object):
                 for v in blk.component_objects(ctypes_to_not_shift):
                     assert v[t].value == t
 
+    @pytest.mark.unit
+    def test_shift_plan(self):
+        blk = self.make_block()
+        time = blk.time
+        shift = blk.sample_time
+
+        plan = blk.get_shift_plan(shift, ctype=(DiffVar, InputVar))
+        # Plans are cached, whichever form ctype is given in
+        assert blk.get_shift_plan(shift, ctype=[DiffVar, InputVar]) is plan
+        assert blk.get_shift_plan(shift, ctype=DiffVar) is not plan
+
+        targets, sources = plan
+        n_pairs = len([t for t in time if t + shift <= time.last() + 1e-8])
+        n_vars = len(list(blk.component_objects((DiffVar, InputVar))))
+        assert len(targets) == len(sources) == n_pairs*n_vars
+        for var in blk.component_objects((DiffVar, InputVar)):
+            assert var[time.first()] in ComponentSet(targets)
+            assert var[time.last()] in ComponentSet(sources)
+
+        # Only time-indexed constraints of the model appear in the plan
+        # for constraints
+        targets, sources = blk.get_shift_plan(shift, ctype=pyo.Constraint)
+        assert targets
+        for con in targets + sources:
+            assert con.ctype is pyo.Constraint
+            assert con.model() is blk.mod.model()
+
+    @pytest.mark.unit
+    def test_advance_ipopt_multipliers(self):
+        blk = self.make_block()
+        blk.add_ipopt_suffixes()
+        time = blk.time
+        t0 = time.first()
+        tl = time.last()
+        shift = blk.sample_time
+        ctypes = (DiffVar, AlgVar, InputVar)
+
+        for var in blk.component_objects(ctypes):
+            for t in time:
+                blk.ipopt_zL_in[var[t]] = t
+                if t != t0:
+                    blk.ipopt_zU_in[var[t]] = -t
+        _, cons = blk.get_shift_plan(shift, ctype=pyo.Constraint)
+        for con in cons:
+            blk.dual[con] = 1.0
+        blk.dual[cons[0]] = 2.0
+
+        blk.advance_ipopt_multipliers(shift, duals=True)
+        for var in blk.component_objects(ctypes):
+            for t in time:
+                ts = t + shift
+                if ts <= tl + 1e-8:
+                    ts = time[time.find_nearest_index(ts)]
+                    assert blk.ipopt_zL_in[var[t]] == ts
+                else:
+                    assert blk.ipopt_zL_in[var[t]] == t
+                # No zU multiplier at t0 to shift into
+                assert var[t0] not in blk.ipopt_zU_in
+        # Duals are only set for constraints that had a dual
+        targets, sources = blk.get_shift_plan(shift, ctype=pyo.Constraint)
+        for con, src in zip(targets, sources):
+            if con in blk.dual:
+                assert blk.dual[con] == (2.0 if src is cons[0] else 1.0)
+
     @pytest.mark.unit
     def test_generate_time_in_sample(self):
         blk = self.make_block()
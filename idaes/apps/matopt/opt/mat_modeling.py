@@ -12,13 +12,34 @@
 ##############################################################################
 from abc import abstractmethod
 from itertools import product
+import time
 
 from pyomo.core.base.param import SimpleParam
 from pyomo.opt.results import SolutionStatus
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
 
 from .pyomo_modeling import *
+from .symmetry import BASIC_SITE_POSITIONS, addConsSymmetryBreaking
 from ..materials.design import Design
 
+# NOTE: Options that make each MILP solver prove optimality exactly (so that
+#       populate returns the nSolns-best designs) followed by the names of
+#       the time limit and tree memory limit options, if the solver has them.
+#       Persistent and direct interfaces share the options of their solver.
+MILP_SOLVER_OPTIONS = {
+    'cplex': ({'mip_tolerances_absmipgap': 0.0,
+               'mip_tolerances_mipgap': 0.0},
+              'timelimit', 'mip_limits_treememory'),
+    'gurobi': ({'MIPGapAbs': 0.0,
+                'MIPGap': 0.0},
+               'TimeLimit', None),
+    'cbc': ({'allowableGap': 0.0,
+             'ratioGap': 0.0},
+            'sec', None),
+    'glpk': ({'mipgap': 0.0},
+             'tmlim', None),
+}
+
 
 class IndexedElem(object):
     """Base class for indexed MatOpt objects.
@@ -2560,7 +2581,7 @@ class MatOptModel(object):
     def optimize(self, func, sense, nSolns=1,
                  tee=True, disp=1, keepfiles=False,
                  tilim=3600, trelim=None,
-                 solver='cplex'):
+                 solver='cplex', symmetry=False):
         """Method to create and optimize the materials design problem.
     
         This method automatically creates a new optimization model every 
@@ -2588,28 +2609,39 @@ class MatOptModel(object):
                 Default: 3600
             trelim (float): Optional, solver tree memeory limit (in MB).
                 Default: None (i.e., Pyomo/CPLEX default)
-            solver (str): Solver choice. Currently only cplex or neos-cplex are supported
+            solver (str): Solver choice. One of cplex, gurobi, cbc, glpk, the
+                persistent interfaces cplex_persistent or gurobi_persistent,
+                or neos-cplex.
                 Default: cplex
+            symmetry (bool): Optional, flag to detect the lattice symmetries
+                of the model and add symmetry-breaking constraints (see
+                ``addConsSymmetryBreaking``). Only one of each set of
+                equivalent designs can then be found.
+                Default: False
 
         Returns:
             (``Design``/list<``Design``>) Optimal design or designs, depending on the number of solutions requested by argument ``nSolns``.
 
         Raises:
-            ``pyutilib.ApplicationError`` if MatOpt can not find usable solver (CPLEX or NEOS-CPLEX)
+            ``pyutilib.ApplicationError`` if MatOpt can not find the requested solver
         """
         if nSolns > 1:
             return self.populate(func, sense=sense, nSolns=nSolns,
                                  tee=tee, disp=disp, keepfiles=keepfiles,
-                                 tilim=tilim, trelim=trelim, solver=solver)
+                                 tilim=tilim, trelim=trelim, solver=solver,
+                                 symmetry=symmetry)
         elif nSolns == 1:
-            self._pyomo_m = self._make_pyomo_model(func, sense)
-            return self.__solve_pyomo_model(tee, disp, keepfiles, tilim, trelim,
-                                            solver)
+            self._pyomo_m = self._make_pyomo_model(func, sense, symmetry)
+            start = time.time()
+            D = self.__solve_pyomo_model(tee, disp, keepfiles, tilim, trelim,
+                                         solver)
+            self.solve_times = [time.time() - start]
+            return D
 
     def populate(self, func, sense, nSolns,
                  tee=True, disp=1, keepfiles=False,
                  tilim=3600, trelim=None,
-                 solver='cplex'):
+                 solver='cplex', symmetry=False):
         """Method to a pool of solutions that optimize the material model.
 
         This method automatically creates a new optimization model every 
@@ -2622,6 +2654,13 @@ class MatOptModel(object):
         of Designs that are gauranteed to be the nSolns-best solutions in the
         material design space. 
 
+        With a persistent solver interface (e.g., cplex_persistent) the model
+        is passed to the solver once and each new cut is added to the
+        solver's copy of the model. Otherwise, the model is rewritten for
+        every solve. The solves are not warm-started, as the previous design
+        violates the cut added to disallow it. The time spent finding each
+        design is stored in the solve_times attribute.
+
         Args:
             func (``MaterialDescriptor``/``Expr``): Material functionality to optimize.
             sense (int): flag to indicate the choice to minimize or maximize the functionality of interest.
@@ -2639,18 +2678,32 @@ class MatOptModel(object):
                 Default: 3600
             trelim (float): Optional, solver tree memeory limit (in MB).
                 Default: None (i.e., Pyomo/CPLEX default)
-            solver (str): Solver choice. Currently only cplex or neos-cplex are supported
+            solver (str): Solver choice. One of cplex, gurobi, cbc, glpk, the
+                persistent interfaces cplex_persistent or gurobi_persistent,
+                or neos-cplex.
                 Default: cplex
+            symmetry (bool): Optional, flag to detect the lattice symmetries
+                of the model and add symmetry-breaking constraints (see
+                ``addConsSymmetryBreaking``). Only one of each set of
+                equivalent designs can then be found.
+                Default: False
 
         Returns:
             (list<``Design``>) A list of optimal Designs in order of decreasing optimality.
 
         Raises:
-            ``pyutilib.ApplicationError`` if MatOpt can not find usable solver (CPLEX or NEOS-CPLEX)
+            ``pyutilib.ApplicationError`` if MatOpt can not find the requested solver
         """
-        self._pyomo_m = self._make_pyomo_model(func, sense)
+        self._pyomo_m = self._make_pyomo_model(func, sense, symmetry)
         self._pyomo_m.iSolns = Set(initialize=list(range(nSolns)))
         self._pyomo_m.IntCuts = Constraint(self._pyomo_m.iSolns)
+        if len(self._pyomo_m.Yik) > 0:
+            Y = self.Yik
+        elif len(self._pyomo_m.Yi) > 0:
+            Y = self.Yi
+        else:
+            raise NotImplementedError('Decide what to do '
+                                      'in this case...')
 
         def dispPrint(*args):
             if disp > 0:
@@ -2658,32 +2711,38 @@ class MatOptModel(object):
             else:
                 pass
 
+        opt = None
+        if solver != 'neos-cplex':
+            opt = self.__make_solver(solver, tilim, trelim)
+            if isinstance(opt, PersistentSolver):
+                opt.set_instance(self._pyomo_m,
+                                 symbolic_solver_labels=keepfiles)
+        self.solve_times = []
         Ds = []
         for iSoln in range(nSolns):
             dispPrint('Starting populate for solution #{}... '.format(iSoln))
-            D = self.__solve_pyomo_model(tee, disp - 1, keepfiles, tilim, trelim, solver)
+            start = time.time()
+            D = self.__solve_pyomo_model(tee, disp - 1, keepfiles, tilim,
+                                         trelim, solver, opt=opt)
+            self.solve_times.append(time.time() - start)
             if D is not None:
-                dispPrint('Found solution with objective: {}'.
-                          format(value(self._pyomo_m.obj)))
+                dispPrint('Found solution with objective: {} in {:.2f} s'.
+                          format(value(self._pyomo_m.obj),
+                                 self.solve_times[-1]))
                 Ds.append(D)
-                if len(self._pyomo_m.Yik) > 0:
-                    self._pyomo_m.IntCuts.add(
-                        index=iSoln,
-                        expr=(Disallow(D)._pyomo_expr(self.Yik) >= 1))
-                elif len(self._pyomo_m.Yi) > 0:
-                    self._pyomo_m.IntCuts.add(
-                        index=iSoln,
-                        expr=(Disallow(D)._pyomo_expr(self.Yi) >= 1))
-                else:
-                    raise NotImplementedError('Decide what to do '
-                                              'in this case...')
+                self._pyomo_m.IntCuts.add(
+                    index=iSoln,
+                    expr=(Disallow(D)._pyomo_expr(Y) >= 1))
+                if isinstance(opt, PersistentSolver):
+                    opt.add_constraint(self._pyomo_m.IntCuts[iSoln])
             else:
                 dispPrint('No solution found. Terminating populate.')
                 break
-        dispPrint('Identified {} solutions via populate.'.format(len(Ds)))
+        dispPrint('Identified {} solutions via populate in {:.2f} s.'.
+                  format(len(Ds), sum(self.solve_times)))
         return Ds
 
-    def _make_pyomo_model(self, obj_expr, sense):
+    def _make_pyomo_model(self, obj_expr, sense, symmetry=False):
         """Method to create a Pyomo concrete model object.
 
         This method creates a Pyomo model and also modifies several objects
@@ -2697,6 +2756,7 @@ class MatOptModel(object):
         sense (int): flag to indicate the choice to minimize or maximize the
             functionality of interest. 
             Choices: minimize/maximize (Pyomo constants 1,-1 respectively)
+        symmetry (bool): Optional, flag to add symmetry-breaking constraints.
 
         Returns:
         (ConcreteModel) Pyomo model object. 
@@ -2737,9 +2797,49 @@ class MatOptModel(object):
             for r in desc.rules:
                 if isinstance(r, FixedTo):
                     desc._fix_pyomo_var_by_rule(r, m)
+        if symmetry:
+            SitePositions = dict(BASIC_SITE_POSITIONS)
+            for desc in self._descriptors:
+                if desc.name not in SitePositions:
+                    # NOTE: Bond and bond type indices are pairs
+                    isSites, isBonds, isSiteTypes, isBondTypes, isConfs = \
+                        desc.dims
+                    SitePositions[desc.name] = (
+                        (True,) * isSites + (True, True) * isBonds +
+                        (False,) * isSiteTypes + (False, False) * isBondTypes +
+                        (False,) * isConfs)
+            addConsSymmetryBreaking(m, SitePositions)
         return m
 
-    def __solve_pyomo_model(self, tee, disp, keepfiles, tilim, trelim, solver):
+    def __make_solver(self, solver, tilim, trelim):
+        """Method to create a MILP solver with MatOpt's default options.
+
+        Args:
+        solver (str): Solver choice, see MatOptModel.optimize.
+        tilim (float): Solver time limit (in seconds).
+        trelim (float): Solver tree memeory limit (in MB).
+
+        Returns:
+        (OptSolver) Pyomo solver object.
+        """
+        name = solver.replace('_persistent', '').replace('_direct', '')
+        if name not in MILP_SOLVER_OPTIONS:
+            raise NotImplementedError('MatOpt does not support solver {}, '
+                                      'please contact MatOpt developer for '
+                                      'additional solver support'
+                                      .format(solver))
+        options, tilim_name, trelim_name = MILP_SOLVER_OPTIONS[name]
+        opt = SolverFactory(solver)
+        opt.options.update(options)
+        if tilim is not None:
+            # NOTE: GLPK only accepts whole seconds
+            opt.options[tilim_name] = int(tilim) if name == 'glpk' else tilim
+        if trelim is not None and trelim_name is not None:
+            opt.options[trelim_name] = trelim
+        return opt
+
+    def __solve_pyomo_model(self, tee, disp, keepfiles, tilim, trelim, solver,
+                            opt=None):
         """Method to solve the formulated Pyomo optimization model.
 
         This function is intended to standardize the printout and 
@@ -2752,8 +2852,11 @@ class MatOptModel(object):
         keepfiles (bool): Flag to save temporary pyomo files. 
         tilim (float): Solver time limit (in seconds). 
         trelim (float): Solver tree memeory limit (in MB).
-        solver (str): Solver choice. Currently only cplex or 
-            neos-cplex are supported 
+        solver (str): Solver choice, see MatOptModel.optimize.
+        opt (OptSolver): Optional, solver object to reuse. Persistent
+            solvers must already have the model set as their instance.
+            If not given, a new solver is created and, if persistent,
+            given the model as its instance.
 
         Returns:
         (Design) The best design identified by the solver, if any. 
@@ -2762,17 +2865,7 @@ class MatOptModel(object):
             In the case that the model was infeasible or no solution
             could be identified, the method returns 'None'.
         """
-        if solver == 'cplex':
-            opt = SolverFactory('cplex')
-            opt.options['mip_tolerances_absmipgap'] = 0.0
-            opt.options['mip_tolerances_mipgap'] = 0.0
-            if tilim is not None:
-                opt.options['timelimit'] = tilim
-            if trelim is not None:
-                opt.options['mip_limits_treememory'] = trelim
-            res = opt.solve(self._pyomo_m, tee=tee,
-                            symbolic_solver_labels=True, keepfiles=keepfiles)
-        elif solver == 'neos-cplex':
+        if solver == 'neos-cplex':
             with SolverManagerFactory('neos') as manager:
                 opt = SolverFactory('cplex')
                 opt.options['absmipgap'] = 0.0  # NOTE: different option names
@@ -2783,8 +2876,19 @@ class MatOptModel(object):
                     opt.options['treememory'] = trelim
                 res = manager.solve(self._pyomo_m, opt=opt)
         else:
-            raise NotImplementedError('MatOpt is tailored to perform best with CPLEX (locally or through NEOS), '
-                                      'please contact MatOpt developer for additional solver support ')
+            if opt is None:
+                opt = self.__make_solver(solver, tilim, trelim)
+                if isinstance(opt, PersistentSolver):
+                    opt.set_instance(self._pyomo_m,
+                                     symbolic_solver_labels=keepfiles)
+            kwds = {'tee': tee, 'keepfiles': keepfiles}
+            if isinstance(opt, PersistentSolver):
+                res = opt.solve(**kwds)
+            else:
+                # NOTE: Symbolic labels are only useful to read kept files,
+                #       and slow down writing large models
+                res = opt.solve(self._pyomo_m,
+                                symbolic_solver_labels=keepfiles, **kwds)
         solver_status = res.solver.status
         solver_term = res.solver.termination_condition
         soln_status = res.solution.status
@@ -14,7 +14,10 @@ from idaes.logger import getModelLogger
 
 logging = getModelLogger('MatOptModel')
 
+import numpy as np
+
 from pyomo.environ import *
+from pyomo.core.base.matrix_constraint import MatrixConstraint
 from pyomo.core.base.var import _GeneralVarData
 from pyomo.core.expr.numeric_expr import MonomialTermExpression, SumExpression, NegationExpression
 from ..util.util import isZero, areEqual
@@ -215,75 +218,271 @@ def makeMyPyomoBaseModel(C, Atoms=None, Confs=None):
     return m
 
 
+def _neighborArray(m):
+    """Array of the neighbors of each site, padded with -1 for None."""
+    nL = max((len(Ns) for Ns in m.Ni), default=0)
+    Nbrs = np.full((m.nI, nL), -1, dtype=np.int64)
+    for i, Ns in enumerate(m.Ni):
+        for l, j in enumerate(Ns):
+            if j is not None:
+                Nbrs[i, l] = j
+    return Nbrs
+
+
+def _typeList(m):
+    return [k for k in m.K if k is not None]
+
+
+def _keyArrays(keys, Lookups):
+    """Integer arrays for each position of a list of index tuples.
+
+    Args:
+        keys (list<tuple>): Index tuples.
+        Lookups (list<dict/None>): For each position, a dictionary from
+            index values to integers, or None for site indices.
+
+    Returns:
+        (list<numpy.ndarray>) One integer array per position.
+    """
+    keys = [k if isinstance(k, tuple) else (k,) for k in keys]
+    return [np.array([k[p] if L is None else L[k[p]] for k in keys],
+                     dtype=np.int64).reshape(len(keys))
+            for p, L in enumerate(Lookups)]
+
+
+def _bondKeyArrays(m, var, Types=None):
+    """Integer arrays for the keys of a sparse bond-indexed variable.
+
+    Iterating over the keys of a sparse variable tests every index in
+    the dense index set, which is quadratic in the number of sites. Since
+    bonds are between neighbors, the candidate keys are built from m.Ni
+    instead, falling back on the keys of the variable if some are not
+    between neighbors. Keys are in the same order as var.keys().
+
+    Args:
+        m (ConcreteModel): MatOpt Pyomo model.
+        var (IndexedVar): Variable indexed by (i, j) or (i, j, k, l).
+        Types (list<Atom>): Optional, building blocks for the k and l
+            positions. (Default value = None, i.e. var is indexed by (i, j))
+
+    Returns:
+        (list<numpy.ndarray>) One integer array per position.
+    """
+    Nbrs = _neighborArray(m)
+    I, Slots = np.nonzero(Nbrs >= 0)
+    Keys = [I, Nbrs[I, Slots]]
+    if Types is not None:
+        nT = len(Types)
+        Ks, Ls = np.divmod(np.arange(nT * nT), nT)
+        Keys = [np.repeat(Keys[0], nT * nT), np.repeat(Keys[1], nT * nT),
+                np.tile(Ks, len(I)), np.tile(Ls, len(I))]
+    Keys = np.unique(np.stack(Keys, axis=1), axis=0)
+    Values = [range(m.nI), range(m.nI)] + ([] if Types is None
+                                            else [Types, Types])
+    Present = np.array([tuple(V[c] for V, c in zip(Values, key)) in var
+                        for key in Keys.tolist()], dtype=bool)
+    if Present.sum() != len(var):
+        Lookups = [None, None]
+        if Types is not None:
+            TypeIdx = {k: n for n, k in enumerate(Types)}
+            Lookups += [TypeIdx, TypeIdx]
+        return _keyArrays(list(var.keys()), Lookups)
+    return list(Keys[Present].T) if len(Keys) else [
+        np.zeros(0, dtype=np.int64) for _ in Values]
+
+
+def _varColumns(x, var, Codes, Values, Mask=None):
+    """Get the columns of var[Codes] in the variables of a linear block.
+
+    Each distinct variable is appended to x once. Sparse variables
+    that were not referenced before are created, as they would be by
+    building an expression.
+
+    Args:
+        x (list<_GeneralVarData>): Variables of the linear block, extended
+            in place.
+        var (IndexedVar): Variable to look up.
+        Codes (list<numpy.ndarray>): Integer arrays of the same shape, one
+            for each position of the index of var.
+        Values (list<sequence>): For each position, the index values
+            that the integers stand for.
+        Mask (numpy.ndarray): Optional, boolean array of entries to look
+            up. (Default value = None, i.e. all entries)
+
+    Returns:
+        (numpy.ndarray) Columns with the shape of Codes, -1 where masked.
+    """
+    Shape = tuple(len(V) for V in Values)
+    if Mask is None:
+        Mask = np.ones(Codes[0].shape, dtype=bool)
+    Cols = np.full(Codes[0].shape, -1, dtype=np.int64)
+    Flat = np.ravel_multi_index(tuple(C[Mask] for C in Codes), Shape)
+    Unique, Inverse = np.unique(Flat, return_inverse=True)
+    Cols[Mask] = len(x) + Inverse
+    for u in zip(*(c.tolist() for c in np.unravel_index(Unique, Shape))):
+        key = tuple(V[c] for V, c in zip(Values, u))
+        x.append(var[key if len(key) > 1 else key[0]])
+    return Cols
+
+
+def _makeLinearBlock(x, Cols, Coefs, lb, ub):
+    """Create the constraints lb <= sum_p Coefs[r, p]*x[Cols[r, p]] <= ub.
+
+    Args:
+        x (list<_GeneralVarData>): Variables of the linear block.
+        Cols (numpy.ndarray): Columns of the terms of each row, -1 for no
+            term.
+        Coefs (numpy.ndarray): Coefficients of the terms, broadcastable to
+            the shape of Cols.
+        lb (float/numpy.ndarray/None): Lower bound of each row.
+        ub (float/numpy.ndarray/None): Upper bound of each row.
+
+    Returns:
+        (MatrixConstraint) Constraints in compressed sparse row form.
+    """
+    nRows = Cols.shape[0]
+    Mask = Cols >= 0
+    Coefs = np.broadcast_to(Coefs, Cols.shape)
+    indptr = np.concatenate(([0], np.cumsum(Mask.sum(axis=1)))).tolist()
+
+    def bounds(b):
+        if b is None or np.isscalar(b):
+            return [b] * nRows
+        return np.asarray(b, dtype=float).tolist()
+
+    return MatrixConstraint(Coefs[Mask].astype(float).tolist(),
+                            Cols[Mask].tolist(), indptr,
+                            bounds(lb), bounds(ub), x)
+
+
 def _addConsCiFromCikl(m):
-    m.AssignCiFromCikl = Constraint(m.I)
-    for i in m.Ci.keys():
-        m.AssignCiFromCikl.add(index=i,
-                               expr=(m.Ci[i] == sum(m.Cikl[i, k, l]
-                                                    for k in m.K for l in m.K
-                                                    if k is not None and l is not None)))
+    Types = _typeList(m)
+    (I,) = _keyArrays(list(m.Ci.keys()), [None])
+    nT = len(Types)
+    x = []
+    CiCols = _varColumns(x, m.Ci, [I], [range(m.nI)])
+    Ks, Ls = np.divmod(np.arange(nT * nT), nT)
+    CiklCols = _varColumns(x, m.Cikl,
+                           [np.repeat(I[:, None], nT * nT, axis=1),
+                            np.broadcast_to(Ks, (len(I), nT * nT)),
+                            np.broadcast_to(Ls, (len(I), nT * nT))],
+                           [range(m.nI), Types, Types])
+    Cols = np.hstack((CiCols[:, None], CiklCols))
+    Coefs = np.hstack(([1.0], -np.ones(nT * nT)))
+    m.AssignCiFromCikl = _makeLinearBlock(x, Cols, Coefs, 0, 0)
 
 
 def _addConsCiFromXij(m):
-    m.AssignCiFromXij = Constraint(m.I)
-    for i in m.Ci.keys():
-        m.AssignCiFromXij.add(index=i, expr=(m.Ci[i] == sum(m.Xij[i, j]
-                                                            for j in m.Ni[i]
-                                                            if j is not None)))
+    Nbrs = _neighborArray(m)
+    (I,) = _keyArrays(list(m.Ci.keys()), [None])
+    J = Nbrs[I]
+    x = []
+    CiCols = _varColumns(x, m.Ci, [I], [range(m.nI)])
+    XijCols = _varColumns(x, m.Xij,
+                          [np.broadcast_to(I[:, None], J.shape), J],
+                          [range(m.nI), range(m.nI)], Mask=(J >= 0))
+    Cols = np.hstack((CiCols[:, None], XijCols))
+    Coefs = np.hstack(([1.0], -np.ones(J.shape[1])))
+    m.AssignCiFromXij = _makeLinearBlock(x, Cols, Coefs, 0, 0)
 
 
 def _addConsCiklFromXijkl(m):
-    m.AssignCiklFromXijkl = Constraint(m.I, m.K, m.K)
-    for i, k, l in m.Cikl.keys():
-        m.AssignCiklFromXijkl.add(index=(i, k, l),
-                                  expr=(m.Cikl[i, k, l] == sum(m.Xijkl[i, j, k, l]
-                                                               for j in m.Ni[i]
-                                                               if j is not None)))
+    Types = _typeList(m)
+    TypeIdx = {k: n for n, k in enumerate(Types)}
+    Nbrs = _neighborArray(m)
+    I, K, L = _keyArrays(list(m.Cikl.keys()), [None, TypeIdx, TypeIdx])
+    J = Nbrs[I]
+    x = []
+    CiklCols = _varColumns(x, m.Cikl, [I, K, L],
+                           [range(m.nI), Types, Types])
+    XijklCols = _varColumns(x, m.Xijkl,
+                            [np.broadcast_to(I[:, None], J.shape), J,
+                             np.broadcast_to(K[:, None], J.shape),
+                             np.broadcast_to(L[:, None], J.shape)],
+                            [range(m.nI), range(m.nI), Types, Types],
+                            Mask=(J >= 0))
+    Cols = np.hstack((CiklCols[:, None], XijklCols))
+    Coefs = np.hstack(([1.0], -np.ones(J.shape[1])))
+    m.AssignCiklFromXijkl = _makeLinearBlock(x, Cols, Coefs, 0, 0)
 
 
 def _addConsXijFromXijkl(m):
-    m.AssignXijFromXijkl = Constraint(m.I, m.I)
-    for i, j in m.Xij.keys():
-        m.AssignXijFromXijkl.add(index=(i, j),
-                                 expr=(m.Xij[i, j] == sum(m.Xijkl[i, j, k, l]
-                                                          for k in m.K for l in m.K
-                                                          if k is not None and l is not None)))
+    Types = _typeList(m)
+    nT = len(Types)
+    I, J = _bondKeyArrays(m, m.Xij)
+    Ks, Ls = np.divmod(np.arange(nT * nT), nT)
+    Shape = (len(I), nT * nT)
+    x = []
+    XijCols = _varColumns(x, m.Xij, [I, J], [range(m.nI), range(m.nI)])
+    XijklCols = _varColumns(x, m.Xijkl,
+                            [np.broadcast_to(I[:, None], Shape),
+                             np.broadcast_to(J[:, None], Shape),
+                             np.broadcast_to(Ks, Shape),
+                             np.broadcast_to(Ls, Shape)],
+                            [range(m.nI), range(m.nI), Types, Types])
+    Cols = np.hstack((XijCols[:, None], XijklCols))
+    Coefs = np.hstack(([1.0], -np.ones(nT * nT)))
+    m.AssignXijFromXijkl = _makeLinearBlock(x, Cols, Coefs, 0, 0)
 
 
 def _addConsXijFromYi(m):
-    m.AssignXijFromYi1 = Constraint(m.I, m.I)
-    m.AssignXijFromYi2 = Constraint(m.I, m.I)
-    m.AssignXijFromYi3 = Constraint(m.I, m.I)
-    for i, j in m.Xij.keys():
-        m.AssignXijFromYi1.add(index=(i, j), expr=(m.Xij[i, j] <= m.Yi[i]))
-        m.AssignXijFromYi2.add(index=(i, j), expr=(m.Xij[i, j] <= m.Yi[j]))
-        m.AssignXijFromYi3.add(index=(i, j), expr=(m.Xij[i, j] >= m.Yi[i] + m.Yi[j] - 1))
+    I, J = _bondKeyArrays(m, m.Xij)
+    x = []
+    XijCols = _varColumns(x, m.Xij, [I, J], [range(m.nI), range(m.nI)])
+    YiCols = _varColumns(x, m.Yi, [np.stack((I, J), axis=1)],
+                         [range(m.nI)])
+    m.AssignXijFromYi1 = _makeLinearBlock(
+        x, np.stack((XijCols, YiCols[:, 0]), axis=1), [1.0, -1.0], None, 0)
+    m.AssignXijFromYi2 = _makeLinearBlock(
+        x, np.stack((XijCols, YiCols[:, 1]), axis=1), [1.0, -1.0], None, 0)
+    m.AssignXijFromYi3 = _makeLinearBlock(
+        x, np.hstack((XijCols[:, None], YiCols)), [-1.0, 1.0, 1.0], None, 1)
 
 
 def _addConsXijklFromYik(m):
-    m.AssignXijklFromYik1 = Constraint(m.I, m.I, m.K, m.K)
-    m.AssignXijklFromYik2 = Constraint(m.I, m.I, m.K, m.K)
-    m.AssignXijklFromYik3 = Constraint(m.I, m.I, m.K, m.K)
-    for i, j, k, l in m.Xijkl.keys():
-        m.AssignXijklFromYik1.add(index=(i, j, k, l), expr=(m.Xijkl[i, j, k, l] <= m.Yik[i, k]))
-        m.AssignXijklFromYik2.add(index=(i, j, k, l), expr=(m.Xijkl[i, j, k, l] <= m.Yik[j, l]))
-        m.AssignXijklFromYik3.add(index=(i, j, k, l), expr=(m.Xijkl[i, j, k, l] >= m.Yik[i, k] + m.Yik[j, l] - 1))
+    Types = _typeList(m)
+    I, J, K, L = _bondKeyArrays(m, m.Xijkl, Types)
+    x = []
+    XijklCols = _varColumns(x, m.Xijkl, [I, J, K, L],
+                            [range(m.nI), range(m.nI), Types, Types])
+    YikCols = _varColumns(x, m.Yik,
+                          [np.stack((I, J), axis=1), np.stack((K, L), axis=1)],
+                          [range(m.nI), Types])
+    m.AssignXijklFromYik1 = _makeLinearBlock(
+        x, np.stack((XijklCols, YikCols[:, 0]), axis=1), [1.0, -1.0], None, 0)
+    m.AssignXijklFromYik2 = _makeLinearBlock(
+        x, np.stack((XijklCols, YikCols[:, 1]), axis=1), [1.0, -1.0], None, 0)
+    m.AssignXijklFromYik3 = _makeLinearBlock(
+        x, np.hstack((XijklCols[:, None], YikCols)), [-1.0, 1.0, 1.0],
+        None, 1)
 
 
 def _addConsYiFromYik(m):
-    m.AssignYiFromYik = Constraint(m.I)
-    for i in m.Yi.keys():
-        m.AssignYiFromYik.add(index=i,
-                              expr=(m.Yi[i] == sum(m.Yik[i, k]
-                                                   for k in m.K
-                                                   if k is not None)))
+    Types = _typeList(m)
+    nT = len(Types)
+    (I,) = _keyArrays(list(m.Yi.keys()), [None])
+    Shape = (len(I), nT)
+    x = []
+    YiCols = _varColumns(x, m.Yi, [I], [range(m.nI)])
+    YikCols = _varColumns(x, m.Yik,
+                          [np.broadcast_to(I[:, None], Shape),
+                           np.broadcast_to(np.arange(nT), Shape)],
+                          [range(m.nI), Types])
+    Cols = np.hstack((YiCols[:, None], YikCols))
+    Coefs = np.hstack(([1.0], -np.ones(nT)))
+    m.AssignYiFromYik = _makeLinearBlock(x, Cols, Coefs, 0, 0)
 
 
 def _addConsYikSOS1(m):
-    m.AssignYikSOS1 = Constraint(m.I)
-    for i in m.Yik.index_set().set_tuple[0]:
-        m.AssignYikSOS1.add(index=i,
-                            expr=(sum(m.Yik[i, k] for k in m.K) <= 1))
+    Types = list(m.K)
+    nT = len(Types)
+    Shape = (m.nI, nT)
+    x = []
+    YikCols = _varColumns(x, m.Yik,
+                          [np.broadcast_to(np.arange(m.nI)[:, None], Shape),
+                           np.broadcast_to(np.arange(nT), Shape)],
+                          [range(m.nI), Types])
+    m.AssignYikSOS1 = _makeLinearBlock(x, YikCols, 1.0, None, 1)
 
 
 def addConsForGeneralVars(m):
@@ -1291,23 +1490,32 @@ def addConsZicFromYi(m,
         None.
 
     """
-    m.AssignZicFromYi1 = Constraint(m.I, m.C, m.I)
-    m.AssignZicFromYi2 = Constraint(m.I, m.C)
-    for i, c in m.Zic.keys():
+    Nbrs = _neighborArray(m)
+    I, C = _keyArrays(list(m.Zic.keys()), [None, None])
+    for i, c in zip(I.tolist(), C.tolist()):
         assert (len(m.Ni[i]) == len(m.Confs[c]))
-        RelaxExpr = 0
-        for l, j in enumerate(m.Ni[i]):
-            if j is not None:
-                if m.Confs[c][l] is not None:
-                    RelaxExpr += m.Yi[j] - 1
-                    m.AssignZicFromYi1.add(index=(i, c, j),
-                                           expr=(m.Zic[i, c] <= m.Yi[j]))
-                else:
-                    assert (m.Confs[c][l] is None)
-                    RelaxExpr += -m.Yi[j]
-                    m.AssignZicFromYi1.add(index=(i, c, j),
-                                           expr=(m.Zic[i, c] <= 1 - m.Yi[j]))
-        m.AssignZicFromYi2.add(index=(i, c), expr=(m.Zic[i, c] >= 1 + RelaxExpr))
+    # NOTE: InConf flags the neighbors that are part of the conformation
+    InConf = np.zeros((m.nC, Nbrs.shape[1]), dtype=bool)
+    for c, Conf in enumerate(m.Confs or []):
+        InConf[c, :len(Conf)] = [k is not None for k in Conf]
+    J = Nbrs[I]
+    Mask = (J >= 0)
+    Signs = np.where(InConf[C], -1.0, 1.0)
+    x = []
+    ZicCols = _varColumns(x, m.Zic, [I, C], [range(m.nI), range(m.nC)])
+    YiCols = _varColumns(x, m.Yi, [J], [range(m.nI)], Mask=Mask)
+    # Zic <= Yi[j] if j is in the conformation, else Zic <= 1 - Yi[j]
+    m.AssignZicFromYi1 = _makeLinearBlock(
+        x, np.stack((np.broadcast_to(ZicCols[:, None], J.shape)[Mask],
+                     YiCols[Mask]), axis=1),
+        np.stack((np.ones(Mask.sum()), Signs[Mask]), axis=1),
+        None, (Signs[Mask] > 0).astype(float))
+    # Zic >= 1 - sum(1 - Yi[j] in conformation) - sum(Yi[j] not in it)
+    Signs[~Mask] = 0
+    m.AssignZicFromYi2 = _makeLinearBlock(
+        x, np.hstack((ZicCols[:, None], YiCols)),
+        -np.hstack((np.ones((len(I), 1)), Signs)),
+        None, ((Signs < 0) & Mask).sum(axis=1) - 1)
     if blnConfsAreMutExc and blnConfsAreColExh:
         addConsZicMutExcColExh(m)
     elif blnConfsAreMutExc:
@@ -0,0 +1,467 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""Detection and breaking of lattice symmetries in MatOpt models.
+
+Periodic and highly regular canvases have many site permutations that map
+the neighbor graph onto itself. When the optimization model is also
+invariant under such a permutation, every design has equivalent copies
+that a branch-and-bound solver explores separately. The functions in this
+module find those permutations and add symmetry-breaking constraints.
+
+The permutations are searched for on the neighbor graph of the canvas (which
+includes the periodic connections made by a tiling) by individualization
+and color refinement, and every candidate is verified against the linear
+constraints, objective and variable bounds of the Pyomo model. For a base
+of sites b1, b2, ..., the sites that the symmetries fixing b1..b(t-1) can
+map b(t) to form an orbit O(t), and the constraints
+
+    Yi[b(t)] >= Yi[j] for all j in O(t)
+
+are satisfied by the lexicographically largest design of each set of
+equivalent designs, so no optimal design is lost.
+"""
+import numpy as np
+
+from pyomo.environ import Constraint, ConstraintList, Objective, Var, value
+from pyomo.repn import generate_standard_repn
+
+from idaes.logger import getModelLogger
+
+logging = getModelLogger('MatOptModel')
+
+# Positions of the site indices in the basic MatOpt variables
+BASIC_SITE_POSITIONS = {'Yi': (True,),
+                        'Xij': (True, True),
+                        'Ci': (True,),
+                        'Zi': (True,),
+                        'Yik': (True, False),
+                        'Xijkl': (True, True, False, False),
+                        'Cikl': (True, False, False),
+                        'Zic': (True, False)}
+
+_HASH_DIGITS = 10
+
+
+def _refine(Adj, ColorsA, ColorsB=None):
+    """Refine two colorings of a graph to equitable colorings.
+
+    The colorings are refined together, so that color c means the same
+    thing in both. Vertices are split by their current color and the
+    colors of their neighbors until the number of colors stops growing.
+
+    Args:
+        Adj (list<list<int>>): Out-neighbors of each vertex.
+        ColorsA (list<int>): First coloring of the vertices.
+        ColorsB (list<int>): Optional, second coloring of the vertices.
+
+    Returns:
+        (tuple) The refined colorings, or None if they were found to be
+            incompatible (different numbers of vertices in some color).
+    """
+    n = len(Adj)
+    InAdj = [[] for _ in range(n)]
+    for i, Ns in enumerate(Adj):
+        for j in Ns:
+            InAdj[j].append(i)
+    Colorings = [ColorsA] if ColorsB is None else [ColorsA, ColorsB]
+    nColors = len(set(ColorsA))
+    while True:
+        Sigs = [[(C[i],
+                  tuple(sorted(C[j] for j in Adj[i])),
+                  tuple(sorted(C[j] for j in InAdj[i]))) for i in range(n)]
+                for C in Colorings]
+        Labels = {s: c for c, s in enumerate(sorted(set().union(*Sigs)))}
+        Colorings = [[Labels[s] for s in S] for S in Sigs]
+        if len(Colorings) == 2 and (sorted(Colorings[0]) !=
+                                    sorted(Colorings[1])):
+            return None
+        if len(Labels) == nColors:
+            return tuple(Colorings)
+        nColors = len(Labels)
+
+
+def _isGraphAutomorphism(Adj, Perm):
+    for i, Ns in enumerate(Adj):
+        if sorted(Perm[j] for j in Ns) != sorted(Adj[Perm[i]]):
+            return False
+    return True
+
+
+def findAutomorphism(Adj, Colors, Base, Images, accept=None, maxLeaves=100):
+    """Search for a neighbor graph automorphism that maps Base to Images.
+
+    Args:
+        Adj (list<list<int>>): Out-neighbors of each site.
+        Colors (list<int>): Sites can only be mapped to sites of the same
+            color.
+        Base (list<int>): Sites to map.
+        Images (list<int>): Sites that Base is mapped to.
+        accept (function): Optional, function that takes a permutation (as a
+            list) and returns True if it is acceptable. Used to check that
+            the permutation is also a symmetry of an optimization model.
+        maxLeaves (int): Optional, limit on the number of complete
+            permutations tried before the search gives up.
+            (Default value = 100)
+
+    Returns:
+        (list<int>) The permutation, or None if none was found.
+    """
+    n = len(Adj)
+    Leaves = [0]
+
+    def individualize(C, v, c):
+        C = list(C)
+        C[v] = c
+        return C
+
+    def search(ColorsA, ColorsB):
+        Refined = _refine(Adj, ColorsA, ColorsB)
+        if Refined is None:
+            return None
+        ColorsA, ColorsB = Refined
+        Cells = {}
+        for i, c in enumerate(ColorsA):
+            Cells.setdefault(c, []).append(i)
+        Split = [c for c, Cell in Cells.items() if len(Cell) > 1]
+        if not Split:
+            Leaves[0] += 1
+            Where = {c: i for i, c in enumerate(ColorsB)}
+            Perm = [Where[c] for c in ColorsA]
+            if (_isGraphAutomorphism(Adj, Perm) and
+                    (accept is None or accept(Perm))):
+                return Perm
+            return None
+        c = min(Split, key=lambda c: (len(Cells[c]), c))
+        v = Cells[c][0]
+        for w in (i for i, ci in enumerate(ColorsB) if ci == c):
+            if Leaves[0] >= maxLeaves:
+                return None
+            Perm = search(individualize(ColorsA, v, n),
+                          individualize(ColorsB, w, n))
+            if Perm is not None:
+                return Perm
+        return None
+
+    ColorsA = list(Colors)
+    ColorsB = list(Colors)
+    offset = max(Colors) + 1 if Colors else 0
+    for t, (b, w) in enumerate(zip(Base, Images)):
+        if Colors[b] != Colors[w]:
+            return None
+        ColorsA[b] = offset + t
+        ColorsB[w] = offset + t
+    return search(ColorsA, ColorsB)
+
+
+def _orbit(v, Generators):
+    Orbit = [v]
+    Seen = {v}
+    for u in Orbit:
+        for g in Generators:
+            if g[u] not in Seen:
+                Seen.add(g[u])
+                Orbit.append(g[u])
+    return Orbit
+
+
+def getSymmetryOrbits(Adj, Colors=None, accept=None, maxDepth=None,
+                      maxLeaves=100):
+    """Find a base of sites and their orbits under the symmetry group.
+
+    For each base site b(t), the orbit is the set of sites that the
+    symmetries fixing b(1)..b(t-1) map b(t) to. Symmetries are neighbor graph
+    automorphisms that respect Colors and are accepted by accept.
+
+    Args:
+        Adj (list<list<int>>): Out-neighbors of each site.
+        Colors (list<int>): Optional, initial coloring of the sites.
+        accept (function): Optional, see findAutomorphism.
+        maxDepth (int): Optional, limit on the length of the base.
+            (Default value = None, i.e. no limit)
+        maxLeaves (int): Optional, see findAutomorphism.
+
+    Returns:
+        (list<tuple<int, list<int>>>) Base sites and their orbits.
+    """
+    n = len(Adj)
+    Colors = [0] * n if Colors is None else list(Colors)
+    Base = []
+    Result = []
+    while maxDepth is None or len(Base) < maxDepth:
+        C = list(Colors)
+        offset = max(C) + 1
+        for t, b in enumerate(Base):
+            C[b] = offset + t
+        C = _refine(Adj, C)[0]
+        Cells = {}
+        for i, c in enumerate(C):
+            Cells.setdefault(c, []).append(i)
+        Candidates = sorted((Cell for Cell in Cells.values() if len(Cell) > 1),
+                            key=lambda Cell: (-len(Cell), Cell[0]))
+        for Cell in Candidates:
+            b = Cell[0]
+            Generators = []
+            Orbit = [b]
+            for w in Cell[1:]:
+                if w in Orbit:
+                    continue
+                g = findAutomorphism(Adj, Colors, Base + [b], Base + [w],
+                                     accept=accept, maxLeaves=maxLeaves)
+                if g is not None:
+                    Generators.append(g)
+                    Orbit = _orbit(b, Generators)
+            if len(Orbit) > 1:
+                Base.append(b)
+                Result.append((b, sorted(Orbit)))
+                break
+        else:
+            break
+    return Result
+
+
+class ModelSymmetryChecker(object):
+    """Checks if site permutations are symmetries of a MatOpt Pyomo model.
+
+    The active linear constraints and the objective of the model are hashed
+    once. A site permutation is a symmetry if it maps every variable to a
+    variable with the same domain and bounds, the constraints onto the same
+    set of constraints and the objective onto itself.
+    """
+
+    def __init__(self, m, SitePositions=None):
+        """Standard constructor.
+
+        Args:
+            m (ConcreteModel): MatOpt Pyomo model.
+            SitePositions (dict<string:tuple<bool>>): Optional, flags for the
+                positions of site indices in the keys of each variable on m.
+                Variables that are not in the dictionary are mapped to
+                themselves. (Default value = BASIC_SITE_POSITIONS)
+
+        Raises:
+            ValueError: If the model has nonlinear constraints.
+        """
+        self._SitePositions = (BASIC_SITE_POSITIONS if SitePositions is None
+                               else SitePositions)
+        self._Vars = []
+        self._VarIndex = {}
+        self._CoefCodes = {}
+        self._Rng = np.random.RandomState(0)
+        TermCon, TermVar, TermCoef, BoundCodes = [], [], [], []
+        for c in m.component_data_objects(Constraint, active=True,
+                                          descend_into=True):
+            repn = generate_standard_repn(c.body)
+            if not repn.is_linear():
+                raise ValueError('Constraint {} is not linear'.format(c.name))
+            Terms = [(self._index(v), self._code(a))
+                     for v, a in zip(repn.linear_vars, repn.linear_coefs)
+                     if a != 0]
+            if not Terms:
+                continue
+            const = repn.constant
+            Bounds = (None if c.lower is None else value(c.lower) - const,
+                      None if c.upper is None else value(c.upper) - const)
+            BoundCodes.append(self._code(('bounds',) + Bounds))
+            for v, a in Terms:
+                TermCon.append(len(BoundCodes) - 1)
+                TermVar.append(v)
+                TermCoef.append(a)
+        ObjVar, ObjCoef = [], []
+        for o in m.component_data_objects(Objective, active=True,
+                                          descend_into=True):
+            repn = generate_standard_repn(o.expr)
+            if not repn.is_linear():
+                raise ValueError('Objective {} is not linear'.format(o.name))
+            for v, a in zip(repn.linear_vars, repn.linear_coefs):
+                if a != 0:
+                    ObjVar.append(self._index(v))
+                    ObjCoef.append(self._code(a * o.sense))
+        self._TermCon = np.array(TermCon, dtype=np.int64)
+        self._TermVar = np.array(TermVar, dtype=np.int64)
+        self._TermCoef = np.array(TermCoef, dtype=np.uint64)
+        self._Starts = np.searchsorted(self._TermCon,
+                                       np.arange(len(BoundCodes)))
+        self._BoundCodes = np.array(BoundCodes, dtype=np.uint64)
+        self._ObjVar = np.array(ObjVar, dtype=np.int64)
+        self._ObjCoef = np.array(ObjCoef, dtype=np.uint64)
+        self._VarCodes = self._Rng.randint(1, 2 ** 62, size=len(self._Vars),
+                                           dtype=np.int64).astype(np.uint64)
+        self._VarAttrs = np.array(
+            [self._code((v.domain.name, v.lb, v.ub)) for v in self._Vars],
+            dtype=np.uint64)
+        # NOTE: Keys are looked up once, _VarData.index() is a linear search
+        self._SiteVars = []
+        for Comp in m.component_objects(Var, descend_into=False):
+            Positions = self._SitePositions.get(Comp.local_name)
+            if not Positions or not any(Positions):
+                continue
+            for Key, v in Comp.items():
+                if id(v) in self._VarIndex:
+                    Key = Key if isinstance(Key, tuple) else (Key,)
+                    self._SiteVars.append((self._VarIndex[id(v)], Comp, Key,
+                                           Positions))
+        # NOTE: Variables of the same component and bounds hash the same, so
+        #       that the constraints generated by one rule for different
+        #       sites have the same shape
+        self._VarShapes = np.array(
+            [self._code((v.parent_component().local_name, v.domain.name, v.lb,
+                         v.ub)) for v in self._Vars], dtype=np.uint64)
+        Identity = np.arange(len(self._Vars), dtype=np.int64)
+        self._ConShapes = self._conHashes(Identity, self._VarShapes)
+        self._ConHashes = np.sort(self._conHashes(Identity))
+        self._ObjHash = self._objHash(Identity)
+
+    def _index(self, v):
+        if id(v) not in self._VarIndex:
+            self._VarIndex[id(v)] = len(self._Vars)
+            self._Vars.append(v)
+        return self._VarIndex[id(v)]
+
+    def _code(self, x):
+        if isinstance(x, float):
+            x = round(x, _HASH_DIGITS)
+        elif isinstance(x, tuple):
+            x = tuple(round(xi, _HASH_DIGITS) if isinstance(xi, float) else xi
+                      for xi in x)
+        if x not in self._CoefCodes:
+            self._CoefCodes[x] = self._Rng.randint(1, 2 ** 62)
+        return self._CoefCodes[x]
+
+    def _conHashes(self, VarPerm, VarCodes=None):
+        if len(self._TermVar) == 0:
+            return self._BoundCodes
+        VarCodes = self._VarCodes if VarCodes is None else VarCodes
+        Terms = VarCodes[VarPerm[self._TermVar]] * self._TermCoef
+        return self._BoundCodes + np.add.reduceat(Terms, self._Starts)
+
+    def _objHash(self, VarPerm):
+        return int(np.sum(self._VarCodes[VarPerm[self._ObjVar]] *
+                          self._ObjCoef, dtype=np.uint64))
+
+    def _varPerm(self, Perm):
+        VarPerm = np.arange(len(self._Vars), dtype=np.int64)
+        for n, Comp, Key, Positions in self._SiteVars:
+            Key = tuple(Perm[k] if p else k for k, p in zip(Key, Positions))
+            Key = Key[0] if len(Key) == 1 else Key
+            if Key not in Comp or id(Comp[Key]) not in self._VarIndex:
+                return None
+            VarPerm[n] = self._VarIndex[id(Comp[Key])]
+        return VarPerm
+
+    def siteColors(self, nSites):
+        """Color sites by the shapes of the constraints they appear in.
+
+        Sites that a symmetry of the model maps to each other have the same
+        color, so the colors can be used to prune the search for symmetries.
+
+        Args:
+            nSites (int): Number of sites.
+
+        Returns:
+            (list<int>) Color of each site.
+        """
+        VarSites = {}
+        for n, Comp, Key, Positions in self._SiteVars:
+            VarSites[n] = [(k, p) for p, (k, isSite) in
+                           enumerate(zip(Key, Positions)) if isSite]
+        Sigs = [[] for _ in range(nSites)]
+        Terms = zip(self._ConShapes[self._TermCon].tolist(),
+                    self._TermVar.tolist(), self._TermCoef.tolist())
+        Terms = list(Terms) + [(0, v, a) for v, a in zip(
+            self._ObjVar.tolist(), self._ObjCoef.tolist())]
+        for Shape, v, a in Terms:
+            for i, p in VarSites.get(v, ()):
+                Sigs[i].append((Shape, int(self._VarShapes[v]), a, p))
+        Sigs = [tuple(sorted(Sig)) for Sig in Sigs]
+        Labels = {Sig: c for c, Sig in enumerate(sorted(set(Sigs)))}
+        return [Labels[Sig] for Sig in Sigs]
+
+    def __call__(self, Perm):
+        """Check if a site permutation is a symmetry of the model.
+
+        Args:
+            Perm (list<int>): Image of each site.
+
+        Returns:
+            (bool) True if the permutation is a symmetry.
+        """
+        VarPerm = self._varPerm(Perm)
+        if VarPerm is None:
+            return False
+        if not np.array_equal(self._VarAttrs[VarPerm], self._VarAttrs):
+            return False
+        if self._objHash(VarPerm) != self._ObjHash:
+            return False
+        return np.array_equal(np.sort(self._conHashes(VarPerm)),
+                              self._ConHashes)
+
+
+def addConsSymmetryBreaking(m, SitePositions=None, maxDepth=None,
+                            maxLeaves=100):
+    """Add lexicographic symmetry-breaking constraints to a MatOpt model.
+
+    Finds the site permutations that are automorphisms of the neighbor graph
+    of the canvas and symmetries of the model (see getSymmetryOrbits and
+    ModelSymmetryChecker), and adds the constraints Yi[b] >= Yi[j] for each
+    base site b and site j in its orbit to m.SymmetryBreaking. If Yi is not
+    in the model, the sum of Yik over building blocks is used instead.
+
+    This should be called after all other constraints are added and
+    variables are fixed, because constraints added later may not have the
+    same symmetry.
+
+    Args:
+        m (ConcreteModel): MatOpt Pyomo model with all constraints.
+        SitePositions (dict<string:tuple<bool>>): Optional, see
+            ModelSymmetryChecker.
+        maxDepth (int): Optional, see getSymmetryOrbits.
+        maxLeaves (int): Optional, see findAutomorphism.
+
+    Returns:
+        (list<tuple<int, list<int>>>) Base sites and their orbits.
+    """
+    try:
+        accept = ModelSymmetryChecker(m, SitePositions)
+    except ValueError as err:
+        logging.warning('Symmetry breaking skipped: {}'.format(err))
+        return []
+    Adj = [sorted(set(j for j in Ns if j is not None)) for Ns in m.Ni]
+    Colors = list(zip((len(Ns) for Ns in Adj), accept.siteColors(len(Adj))))
+    Labels = {c: n for n, c in enumerate(sorted(set(Colors)))}
+    Colors = [Labels[c] for c in Colors]
+    Orbits = getSymmetryOrbits(Adj, Colors, accept=accept,
+                               maxDepth=maxDepth, maxLeaves=maxLeaves)
+
+    if len(m.Yi) > 0:
+        def occupancy(i):
+            return m.Yi[i] if i in m.Yi else None
+    else:
+        def occupancy(i):
+            Ys = [m.Yik[i, k] for k in m.K if (i, k) in m.Yik]
+            return sum(Ys) if Ys else None
+
+    m.SymmetryBreaking = ConstraintList()
+    nCons = 0
+    for b, Orbit in Orbits:
+        Yb = occupancy(b)
+        if Yb is None:
+            continue
+        for j in Orbit:
+            Yj = occupancy(j)
+            if j != b and Yj is not None:
+                m.SymmetryBreaking.add(Yb >= Yj)
+                nCons += 1
+    logging.info('Added {} symmetry-breaking constraints for {} base sites '
+                 'with orbits of sizes {}'.format(
+                  nCons, len(Orbits), [len(O) for b, O in Orbits]))
+    return Orbits
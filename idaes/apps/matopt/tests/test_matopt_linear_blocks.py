@@ -0,0 +1,133 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+import time
+import numpy as np
+from math import sqrt
+from pyomo.environ import ConcreteModel, Var, Binary, maximize
+from pyomo.repn import generate_standard_repn
+from idaes.apps.matopt.materials import Atom, Canvas
+from idaes.apps.matopt.materials.lattices import FCCLattice
+from idaes.apps.matopt.opt import (MatOptModel, SumBonds, SumBondsAndTypes,
+                                   SumSites, EqualTo)
+from idaes.apps.matopt.opt.pyomo_modeling import (_bondKeyArrays,
+                                                  addConsZicFromYi)
+import pytest
+
+
+def _canvas(nShells):
+    lattice = FCCLattice(sqrt(2) / 2)
+    canvas = Canvas()
+    canvas.addLocation(np.array([0, 0, 0], dtype=float))
+    canvas.addShells(nShells, lattice.getNeighbors)
+    canvas.setNeighborsFromFunc(lattice.getNeighbors)
+    return canvas
+
+
+def _rows(blk):
+    Rows = set()
+    for c in blk.values():
+        repn = generate_standard_repn(c.body)
+        Terms = frozenset((v.name, coef) for v, coef in
+                          zip(repn.linear_vars, repn.linear_coefs))
+        Rows.add((Terms, c.lower, c.upper))
+    return Rows
+
+
+@pytest.mark.unit
+def test_bond_rows():
+    canvas = _canvas(1)
+    m = MatOptModel(canvas, [Atom('Cu')])
+    m.addGlobalDescriptor('Bonds', rules=EqualTo(SumBonds(desc=m.Xij)))
+    m.addGlobalDescriptor('CN', rules=EqualTo(SumSites(desc=m.Ci)))
+    pm = m._make_pyomo_model(m.Bonds, maximize)
+    Bonds = [(i, j) for i in range(len(canvas))
+             for j in canvas.NeighborhoodIndexes[i] if j is not None]
+    assert len(pm.AssignXijFromYi1) == len(Bonds)
+    assert _rows(pm.AssignXijFromYi1) == {
+        (frozenset({('Xij[%d,%d]' % (i, j), 1), ('Yi[%d]' % i, -1)}),
+         None, 0) for i, j in Bonds}
+    assert _rows(pm.AssignXijFromYi3) == {
+        (frozenset({('Xij[%d,%d]' % (i, j), -1), ('Yi[%d]' % i, 1),
+                    ('Yi[%d]' % j, 1)}), None, 1) for i, j in Bonds}
+    # Ci = sum_j Xij over the neighbors of i
+    for c in pm.AssignCiFromXij.values():
+        repn = generate_standard_repn(c.body)
+        Coefs = dict(zip((v.name for v in repn.linear_vars),
+                         repn.linear_coefs))
+        i = next(int(n[3:-1]) for n in Coefs if n.startswith('Ci['))
+        assert sorted(n for n in Coefs if n.startswith('Xij')) == sorted(
+            'Xij[%d,%d]' % (i, j) for j in canvas.NeighborhoodIndexes[i]
+            if j is not None)
+        assert c.lower == c.upper == 0
+
+
+@pytest.mark.unit
+def test_bond_keys_fallback():
+    canvas = _canvas(1)
+    m = ConcreteModel()
+    m.nI = len(canvas)
+    m.Ni = canvas.NeighborhoodIndexes
+    # Site i is a neighbor of the center site 0 but not of site 1
+    i = next(i for i in range(2, m.nI) if 1 not in m.Ni[i])
+    Keys = [(0, 1), (1, 0), (i, 0)]
+    m.Xij = Var(Keys, domain=Binary)
+    assert [tuple(k) for k in np.stack(_bondKeyArrays(m, m.Xij), axis=1)
+            ] == list(m.Xij.keys())
+    # The keys include a pair of sites that are not neighbors
+    m.del_component(m.Xij)
+    m.del_component(m.Xij_index)
+    m.Xij = Var(Keys + [(1, i)], domain=Binary)
+    assert [tuple(k) for k in np.stack(_bondKeyArrays(m, m.Xij), axis=1)
+            ] == list(m.Xij.keys())
+
+
+@pytest.mark.unit
+def test_zic_rows():
+    canvas = _canvas(1)
+    m = ConcreteModel()
+    m.nI = len(canvas)
+    m.Ni = canvas.NeighborhoodIndexes
+    m.I = range(m.nI)
+    m.Yi = Var(m.I, domain=Binary)
+    m.Confs = [[None] * len(m.Ni[0]), [0] * len(m.Ni[0])]
+    m.nC = len(m.Confs)
+    m.Zic = Var([0], range(m.nC), domain=Binary)
+    addConsZicFromYi(m, blnConfsAreMutExc=False)
+    Rows = _rows(m.AssignZicFromYi1)
+    assert len(Rows) == 2 * 12
+    for j in m.Ni[0]:
+        # Zic <= 1 - Yj for sites outside the conformation
+        assert (frozenset({('Zic[0,0]', 1), ('Yi[%d]' % j, 1)}),
+                None, 1) in Rows
+        # Zic <= Yj for sites in the conformation
+        assert (frozenset({('Zic[0,1]', 1), ('Yi[%d]' % j, -1)}),
+                None, 0) in Rows
+    Rows = _rows(m.AssignZicFromYi2)
+    assert (frozenset({('Zic[0,1]', -1)} |
+                      {('Yi[%d]' % j, 1) for j in m.Ni[0]}), None, 11) in Rows
+
+
+@pytest.mark.benchmark
+def test_build_time():
+    canvas = _canvas(5)
+    Atoms = [Atom('Cu'), Atom('Ag'), Atom('Au')]
+    m = MatOptModel(canvas, Atoms)
+    m.addGlobalDescriptor('E', rules=EqualTo(SumBondsAndTypes(desc=m.Xijkl)))
+    m.addGlobalDescriptor('Size', bounds=(10, 10),
+                          rules=EqualTo(SumSites(desc=m.Yi)))
+    Start = time.time()
+    pm = m._make_pyomo_model(m.E, maximize)
+    assert time.time() - Start < 30
+    assert len(pm.AssignXijklFromYik1) == 9 * sum(
+        1 for i in range(len(canvas))
+        for j in canvas.NeighborhoodIndexes[i] if j is not None)
@@ -0,0 +1,134 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+import numpy as np
+from math import sqrt
+from pyomo.environ import SolverFactory, Var, maximize
+from pyomo.opt import (SolverResults, SolverStatus, TerminationCondition,
+                       Solution, SolutionStatus)
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+from idaes.apps.matopt.materials import Atom, Canvas
+from idaes.apps.matopt.materials.lattices import FCCLattice
+from idaes.apps.matopt.opt import MatOptModel, SumNeighborSites, SumSites, EqualTo
+from idaes.apps.matopt.opt import mat_modeling
+import pytest
+
+
+def _cluster_model():
+    lattice = FCCLattice(sqrt(2) / 2)
+    canvas = Canvas()
+    canvas.addLocation(np.array([0, 0, 0], dtype=float))
+    canvas.addShells(1, lattice.getNeighbors)
+    canvas.setNeighborsFromFunc(lattice.getNeighbors)
+    m = MatOptModel(canvas, [Atom('Cu')])
+    m.addSitesDescriptor('CNi', bounds=(0, 12), integer=True,
+                         rules=EqualTo(SumNeighborSites(desc=m.Yi)))
+    m.addGlobalDescriptor('Ecoh',
+                          rules=EqualTo(SumSites(desc=m.CNi, coefs=1 / 6)))
+    m.addGlobalDescriptor('Size', bounds=(4, 4),
+                          rules=EqualTo(SumSites(desc=m.Yi)))
+    return m
+
+
+@pytest.mark.unit
+def test_unsupported_solver():
+    m = _cluster_model()
+    with pytest.raises(NotImplementedError):
+        m.optimize(m.Ecoh, maximize, solver='foo', disp=0)
+    with pytest.raises(NotImplementedError):
+        m.optimize(m.Ecoh, maximize, nSolns=2, solver='foo', disp=0)
+
+
+class _StubPersistentSolver(PersistentSolver):
+    """Persistent solver that records its instance and the solve keywords.
+    The first nFeasible solves set every variable to its lower bound (or
+    zero) as the solution, later solves find no solution."""
+    def __init__(self, nFeasible=0):
+        self.options = {}
+        self.instance = None
+        self.solved = []
+        self.kwds = []
+        self.nFeasible = nFeasible
+
+    def set_instance(self, model, **kwds):
+        self.instance = model
+
+    def add_constraint(self, con):
+        pass
+
+    def warm_start_capable(self):
+        return True
+
+    def solve(self, *args, **kwds):
+        assert not args
+        self.solved.append(self.instance)
+        self.kwds.append(kwds)
+        res = SolverResults()
+        res.solver.status = SolverStatus.ok
+        soln = Solution()
+        if len(self.solved) <= self.nFeasible:
+            for v in self.instance.component_data_objects(Var):
+                v.set_value(0 if v.lb is None else v.lb)
+            res.solver.termination_condition = TerminationCondition.optimal
+            soln.status = SolutionStatus.optimal
+        else:
+            res.solver.termination_condition = TerminationCondition.infeasible
+            soln.status = SolutionStatus.infeasible
+        res.solution.insert(soln)
+        return res
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('nSolns', [1, 2])
+def test_persistent_solver_instance(monkeypatch, nSolns):
+    m = _cluster_model()
+    opts = []
+
+    def factory(name):
+        assert name == 'cplex_persistent'
+        opts.append(_StubPersistentSolver())
+        return opts[-1]
+
+    monkeypatch.setattr(mat_modeling, 'SolverFactory', factory)
+    D = m.maximize(m.Ecoh, nSolns=nSolns, tee=False, disp=0,
+                   solver='cplex_persistent')
+    assert not D
+    assert len(opts) == 1
+    assert opts[0].solved == [m._pyomo_m]
+
+
+@pytest.mark.unit
+def test_populate_no_warmstart(monkeypatch):
+    # the previous design violates the cut disallowing it, so it is not a
+    # useful start for the next solve
+    m = _cluster_model()
+    opt = _StubPersistentSolver(nFeasible=2)
+    monkeypatch.setattr(mat_modeling, 'SolverFactory', lambda name: opt)
+    Ds = m.maximize(m.Ecoh, nSolns=3, tee=False, disp=0,
+                    solver='cplex_persistent')
+    assert len(Ds) == 2
+    assert len(opt.kwds) == 3
+    assert all('warmstart' not in kwds for kwds in opt.kwds)
+
+
+@pytest.mark.skipif(not SolverFactory('cbc').available(False),
+                    reason="CBC not available")
+@pytest.mark.component
+def test_populate_cbc():
+    m = _cluster_model()
+    D = m.maximize(m.Ecoh, tee=False, disp=0, solver='cbc')
+    assert len(m.solve_times) == 1
+    Ds = m.maximize(m.Ecoh, nSolns=3, tee=False, disp=0, solver='cbc')
+    assert len(Ds) == len(m.solve_times) == 3
+    contents = set(tuple(d is not None for d in Di.Contents) for Di in Ds)
+    assert len(contents) == 3
+    assert tuple(d is not None for d in D.Contents) in contents
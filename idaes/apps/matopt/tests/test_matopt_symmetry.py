@@ -0,0 +1,82 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+import numpy as np
+from math import sqrt
+from pyomo.environ import SolverFactory, maximize
+from idaes.apps.matopt.materials import Atom, Canvas
+from idaes.apps.matopt.materials.lattices import FCCLattice
+from idaes.apps.matopt.opt import MatOptModel, SumBonds, SumSites, EqualTo, FixedTo
+from idaes.apps.matopt.opt.symmetry import findAutomorphism, getSymmetryOrbits, ModelSymmetryChecker
+import pytest
+
+
+def _cluster_model():
+    lattice = FCCLattice(sqrt(2) / 2)
+    canvas = Canvas()
+    canvas.addLocation(np.array([0, 0, 0], dtype=float))
+    canvas.addShells(1, lattice.getNeighbors)
+    canvas.setNeighborsFromFunc(lattice.getNeighbors)
+    m = MatOptModel(canvas, [Atom('Cu')])
+    m.addGlobalDescriptor('Bonds', rules=EqualTo(SumBonds(desc=m.Xij)))
+    m.addGlobalDescriptor('Size', bounds=(5, 5),
+                          rules=EqualTo(SumSites(desc=m.Yi)))
+    return m
+
+
+@pytest.mark.unit
+def test_findAutomorphism():
+    # A path 0 - 1 - 2 can only be reflected
+    Adj = [[1], [0, 2], [1]]
+    assert findAutomorphism(Adj, [0, 0, 0], [0], [2]) == [2, 1, 0]
+    assert findAutomorphism(Adj, [0, 0, 0], [0], [1]) is None
+    assert findAutomorphism(Adj, [0, 0, 0], [0], [2],
+                            accept=lambda p: False) is None
+    # A 4-cycle has 8 symmetries
+    Adj = [[1, 3], [0, 2], [1, 3], [2, 0]]
+    assert getSymmetryOrbits(Adj) == [(0, [0, 1, 2, 3]), (1, [1, 3])]
+
+
+@pytest.mark.unit
+def test_cluster_orbits():
+    m = _cluster_model()
+    pm = m._make_pyomo_model(m.Bonds, maximize, symmetry=True)
+    # The 48 symmetries of the cuboctahedron fix the center site
+    assert len(pm.SymmetryBreaking) == 11 + 3
+    for c in pm.SymmetryBreaking.values():
+        assert c.body.polynomial_degree() == 1
+
+
+@pytest.mark.unit
+def test_checker_rejects_fixed_site():
+    m = _cluster_model()
+    m.Yi.rules.append(FixedTo(1, sites=[1]))
+    pm = m._make_pyomo_model(m.Bonds, maximize, symmetry=True)
+    # Only the symmetries that fix site 1 are left
+    checker = ModelSymmetryChecker(pm)
+    Adj = [sorted(set(j for j in Ns if j is not None)) for Ns in pm.Ni]
+    assert checker(list(range(len(Adj))))
+    g = findAutomorphism(Adj, [len(a) for a in Adj], [1], [2])
+    assert g is not None
+    assert not checker(g)
+    assert 0 < len(pm.SymmetryBreaking) < 14
+
+
+@pytest.mark.skipif(not SolverFactory('cbc').available(False),
+                    reason="CBC not available")
+@pytest.mark.component
+def test_symmetry_breaking_cbc():
+    m = _cluster_model()
+    m.maximize(m.Bonds, tee=False, disp=0, solver='cbc')
+    obj = m.Bonds.values[None]
+    m.maximize(m.Bonds, tee=False, disp=0, solver='cbc', symmetry=True)
+    assert m.Bonds.values[None] == pytest.approx(obj)
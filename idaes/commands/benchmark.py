@@ -0,0 +1,83 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""Commandline interface for model performance benchmarks"""
+
+import sys
+import click
+import logging
+from pyomo.common.dependencies import attempt_import
+from idaes.commands import cb
+
+bmb = attempt_import('idaes.core.util.benchmark.benchmark_base')[0]
+bms = attempt_import('idaes.core.util.benchmark.benchmarks')[0]
+
+_log = logging.getLogger("idaes.commands.benchmark")
+
+
+@cb.command(name="benchmark", help="Run model performance benchmarks.")
+@click.option('-b', '--benchmark', 'names', multiple=True, type=str,
+    help="Benchmark name or full Benchmark class path, may be repeated. "
+         "Runs the default benchmarks if not given.")
+@click.option('-o', '--output', default=None, type=str,
+    help="Write results to this json file")
+@click.option('--baseline', default=None, type=str,
+    help="Compare results to the results in this json file")
+@click.option('--time-rtol', default=0.25, type=float, show_default=True,
+    help="Relative tolerance on stage times")
+@click.option('--memory-rtol', default=0.25, type=float, show_default=True,
+    help="Relative tolerance on stage peak memory")
+@click.option('--count-rtol', default=0.0, type=float, show_default=True,
+    help="Relative tolerance on component counts")
+@click.option('--stage', 'stages', multiple=True,
+    type=click.Choice(["build", "calculate_scaling_factors", "initialize",
+                       "solve"]),
+    help="Stages to run, may be repeated. Runs all stages if not given.")
+@click.option('--repeat', default=1, type=int, show_default=True,
+    help="Number of runs, the fastest run is reported")
+@click.option('--no-memory', is_flag=True,
+    help="Do not track memory, which makes times more accurate")
+@click.option('--list', 'list_only', is_flag=True,
+    help="List the default benchmarks and exit")
+def benchmark(names, output, baseline, time_rtol, memory_rtol, count_rtol,
+              stages, repeat, no_memory, list_only):
+    defaults = bms.default_benchmarks()
+    if list_only:
+        for b in defaults:
+            click.echo(b.name)
+        return
+    if names:
+        by_name = {b.name: b for b in defaults}
+        benchmarks = [by_name.get(n, n) for n in names]
+    else:
+        benchmarks = defaults
+    results = bmb.run_benchmarks(
+        benchmarks,
+        stages=stages if stages else bmb.STAGES,
+        repeat=repeat,
+        track_memory=not no_memory,
+    )
+    bmb.print_results(results)
+    if output is not None:
+        bmb.write_results(results, output)
+    if baseline is not None:
+        msgs = bmb.compare_results(
+            results,
+            bmb.read_results(baseline),
+            time_rtol=time_rtol,
+            memory_rtol=memory_rtol,
+            count_rtol=count_rtol,
+        )
+        for msg in msgs:
+            click.echo("REGRESSION {}".format(msg))
+        if msgs:
+            sys.exit(1)
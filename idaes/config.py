@@ -201,6 +201,58 @@ def _new_idaes_config_block():
         ),
     )
 
+    cfg.declare(
+        "initialization_solver",
+        pyomo.common.config.ConfigBlock(
+            implicit=False,
+            description="Config for the initialization solver service",
+            doc="Config for the solver service used by initialization "
+            "routines, see idaes.core.util.solver_service",
+        ),
+    )
+
+    cfg["initialization_solver"].declare(
+        "in_process",
+        pyomo.common.config.ConfigValue(
+            default=False,
+            domain=bool,
+            description="Solve small square problems in-process",
+            doc="If True, square systems of equations with no more than "
+            "max_in_process_size variables are solved in-process with "
+            "Newton's method, falling back on the solver executable if the "
+            "Newton iterations fail. In-process solves use the tolerance "
+            "below on the unscaled residuals and ignore the options of the "
+            "solver executable, so this is off by default.",
+        ),
+    )
+
+    cfg["initialization_solver"].declare(
+        "max_in_process_size",
+        pyomo.common.config.ConfigValue(
+            default=40,
+            domain=int,
+            description="Largest problem solved in-process",
+        ),
+    )
+
+    cfg["initialization_solver"].declare(
+        "tolerance",
+        pyomo.common.config.ConfigValue(
+            default=1e-8,
+            domain=float,
+            description="Residual tolerance of in-process solves",
+        ),
+    )
+
+    cfg["initialization_solver"].declare(
+        "max_iter",
+        pyomo.common.config.ConfigValue(
+            default=50,
+            domain=int,
+            description="Iteration limit of in-process solves",
+        ),
+    )
+
     cfg.declare(
         "valid_logger_tags",
         pyomo.common.config.ConfigValue(
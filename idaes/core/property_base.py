@@ -14,17 +14,23 @@
 This module contains classes for property blocks and property parameter blocks.
 """
 
+import copy
 import sys
+import types
 
 # Import Pyomo libraries
-from pyomo.environ import Set, value, Var, Expression, Constraint
+from pyomo.environ import Set, value, Var, Param, Expression, Constraint
 from pyomo.core.base.var import _VarData
 from pyomo.core.base.expression import _ExpressionData
 from pyomo.common.config import ConfigBlock, ConfigValue, In
+from pyomo.core.expr.numvalue import native_types
+from pyomo.core.expr.numeric_expr import ExternalFunctionExpression
+from pyomo.core.expr.visitor import (identify_variables,
+                                     identify_mutable_parameters)
 from pyomo.core.base.misc import tabular_writer
 
 # Import IDAES cores
-from idaes.core.process_block import ProcessBlock
+from idaes.core.process_block import ProcessBlock, _rule_default
 from idaes.core import ProcessBlockData
 from idaes.core import property_meta
 from idaes.core import MaterialFlowBasis
@@ -64,6 +70,177 @@ class _lock_attribute_creation_context(object):
         self.block._lock_attribute_creation = False
 
 
+def _is_template(blk, params):
+    """
+    Check whether a built state block element can be used as a template,
+    i.e. none of its expressions or components refer to components outside
+    of the element and the parameter block.
+    """
+    scope = (blk, params)
+
+    def inside(obj):
+        if not hasattr(obj, "parent_block"):
+            return True  # constants
+        b = obj.parent_block()
+        while b is not None:
+            if b in scope:
+                return True
+            b = b.parent_block()
+        return False
+
+    for c in blk.component_data_objects(
+            (Var, Param, Expression, Constraint), descend_into=True):
+        if not inside(c):
+            return False
+        if c.ctype in (Expression, Constraint):
+            expr = c.expr
+            if expr is None:
+                continue
+            if not all(inside(v) for v in
+                       identify_variables(expr, include_fixed=True)):
+                return False
+            if not all(inside(p) for p in identify_mutable_parameters(expr)):
+                return False
+    return True
+
+
+def _make_cell(value):
+    return (lambda: value).__closure__[0]
+
+
+def _copy_function(f, memo):
+    """
+    Copy a function defined in build() so that its closure refers to the
+    copies of the objects it captured.
+    """
+    if not f.__closure__:
+        return f
+    cells = tuple(_make_cell(copy.deepcopy(c.cell_contents, memo))
+                  for c in f.__closure__)
+    g = types.FunctionType(f.__code__, f.__globals__, f.__name__,
+                           f.__defaults__, cells)
+    g.__dict__.update(f.__dict__)
+    return g
+
+
+def _copy_expression(expr, memo, cache):
+    """
+    Copy an expression tree, replacing the leaves and named expressions
+    found in memo. This is much cheaper than a deepcopy of the tree.
+    """
+    if expr.__class__ in native_types:
+        return expr
+    new = memo.get(id(expr))
+    if new is not None:
+        return new
+    if not expr.is_expression_type() or expr.is_named_expression_type():
+        return expr
+    new = cache.get(id(expr))
+    if new is None:
+        args = tuple(_copy_expression(a, memo, cache) for a in expr.args)
+        if isinstance(expr, ExternalFunctionExpression):
+            new = expr.__class__(args, memo.get(id(expr._fcn), expr._fcn))
+        else:
+            new = expr.create_node_with_local_data(args)
+        cache[id(expr)] = new
+    return new
+
+
+def _copy_block_data(src, target=None):
+    """
+    Copy the components and attributes of a state block element onto
+    another element. Components outside of the element, such as parameters,
+    are referenced, not copied, and so are the config and parameter block.
+    Functions and methods referring to the source element are rebound to the
+    target element.
+
+    Args:
+        src: element to copy
+        target: empty element receiving the copy. If None, the copy of src
+            is returned.
+
+    Returns:
+        target, or the copy of src
+    """
+    params = src.config.parameters
+    memo = {"__block_scope__": {id(src): True, id(None): False},
+            "__paranoid__": False,
+            id(src.config): src.config,
+            id(params): params}
+    # Expressions of constraints and named expressions are shared with the
+    # copy by deepcopy and copied separately once all components exist
+    exprs = []
+    for c in src.component_data_objects((Constraint, Expression),
+                                        descend_into=True):
+        for k in (("_body", "_lower", "_upper") if c.ctype is Constraint
+                  else ("_expr",)):
+            e = getattr(c, k)
+            if e is not None and e.__class__ not in native_types:
+                memo[id(e)] = e
+                exprs.append(e)
+    clone = copy.deepcopy(src, memo)
+    for e in exprs:
+        memo.pop(id(e), None)
+    cache = {}
+    for c in src.component_data_objects((Constraint, Expression),
+                                        descend_into=True):
+        new = memo[id(c)]
+        for k in (("_body", "_lower", "_upper") if c.ctype is Constraint
+                  else ("_expr",)):
+            e = getattr(c, k)
+            if e is not None:
+                setattr(new, k, _copy_expression(e, memo, cache))
+    if target is None:
+        target = clone
+    else:
+        for name, comp in list(clone.component_map().items()):
+            clone.del_component(comp)
+            target.add_component(name, comp)
+    memo[id(src)] = target
+    for k, v in src.__dict__.items():
+        if k in target.__dict__ and target is not clone:
+            continue
+        if isinstance(v, types.FunctionType):
+            v = _copy_function(v, memo)
+        elif isinstance(v, types.MethodType) and v.__self__ is src:
+            v = types.MethodType(v.__func__, target)
+        elif k in clone.__dict__:
+            v = clone.__dict__[k]
+        else:
+            continue
+        object.__setattr__(target, k, v)
+    return target
+
+
+def _templated_state_block_rule(b, *args):
+    """
+    Rule used for state blocks when templated construction is enabled in the
+    parameter block. The first element with a given configuration is built
+    and a copy of it is kept in the parameter block as a template. Later
+    elements with the same configuration, in any state block of the parameter
+    block, are stamped out from the template instead of being built.
+    """
+    b._get_config_args()
+    params = b.config.parameters
+    templates = params.__dict__.setdefault("_state_block_templates", [])
+    config = b.config.value()
+    for cls, tconfig, template in templates:
+        if cls is b.__class__ and tconfig == config:
+            if template is None:
+                _rule_default(b, *args)
+            else:
+                _copy_block_data(template, b)
+            return
+    _rule_default(b, *args)
+    if _is_template(b, params):
+        template = _copy_block_data(b)
+    else:
+        _log.debug("{} refers to components outside of the state block and "
+                   "cannot be used as a template.".format(b.name))
+        template = None
+    templates.append((b.__class__, config, template))
+
+
 class PhysicalParameterBlock(ProcessBlockData,
                              property_meta.HasPropertyClassMetadata):
     """
@@ -77,6 +254,20 @@ class PhysicalParameterBlock(ProcessBlockData,
     CONFIG.declare("default_arguments", ConfigBlock(
             implicit=True,
             description="Default arguments to use with Property Package"))
+    CONFIG.declare("templated_construction", ConfigValue(
+            default=False,
+            domain=In([True, False]),
+            description="Build state blocks from templates",
+            doc="""Flag indicating whether the elements of state blocks should
+be built from templates. The first element built with a given configuration is
+cloned for all later elements with the same configuration, instead of
+re-running build() for each of them. This requires that build() does not depend
+on the index of the element, and elements which refer to components outside of
+the state block and parameter block are always built normally,
+**default** - False.
+**Valid values:** {
+**True** - clone state block elements from templates,
+**False** - build every state block element.}"""))
 
     def build(self):
         """
@@ -192,6 +383,10 @@ class PhysicalParameterBlock(ProcessBlockData,
         default = kwargs.pop("default", {})
         initialize = kwargs.pop("initialize", {})
 
+        if ("templated_construction" in self.config and
+                self.config.templated_construction):
+            kwargs.setdefault("rule", _templated_state_block_rule)
+
         if initialize == {}:
             default["parameters"] = self
         else:
@@ -18,7 +18,9 @@ Author: Andrew Lee
 import pytest
 import types
 
-from pyomo.environ import ConcreteModel, Constraint, Set, Var
+from pyomo.environ import (ConcreteModel, Constraint, Expression, Param,
+                           Set, value, Var)
+from pyomo.core.expr.visitor import identify_variables
 from pyomo.common.config import ConfigBlock
 
 from idaes.core import (declare_process_block_class, PhysicalParameterBlock,
@@ -43,7 +45,8 @@ def test_config_block():
     m = ConcreteModel()
     m.p = ParameterBlock()
 
-    assert len(m.p.config) == 1
+    assert len(m.p.config) == 2
+    assert not m.p.config.templated_construction
     assert isinstance(m.p.config.default_arguments, ConfigBlock)
     assert len(m.p.config.default_arguments) == 0
 
@@ -571,3 +574,109 @@ def test_getattr_raise_exception(m):
 #def test_getattr_does_not_create_component(m):
 #    with pytest.raises(PropertyPackageError):
 #        m.p.cons = Constraint(expr=m.p.does_not_create_component == 1)
+
+
+# -----------------------------------------------------------------------------
+# Test templated construction of state blocks
+@declare_process_block_class("TemplateParameters")
+class _TemplateParameters(PhysicalParameterBlock):
+    def build(self):
+        super(_TemplateParameters, self).build()
+
+        self.phase_list = ["p1"]
+        self.component_list = ["c1", "c2"]
+        self.k = Param(self.component_list, initialize=2, mutable=True)
+        self._state_block_class = TemplateState
+
+    @classmethod
+    def define_metadata(cls, obj):
+        obj.add_properties({'x': {'method': None},
+                            'z': {'method': '_z'}})
+
+
+@declare_process_block_class("TemplateState", block_class=StateBlock)
+class _TemplateState(StateBlockData):
+    builds = 0
+
+    def build(self):
+        super(_TemplateState, self).build()
+        _TemplateState.builds += 1
+
+        b = self
+        self.x = Var(self.params.component_list, initialize=1)
+        self.y = Var(initialize=1)
+        self.e = Expression(expr=sum(self.params.k[j]*self.x[j]
+                                     for j in self.params.component_list))
+        self.c = Constraint(expr=self.y == self.e)
+        if self.config.defined_state:
+            self.sum_x = Constraint(expr=sum(self.x.values()) == 1)
+        if self.model().component("w") is not None:
+            self.outside = Constraint(expr=self.y == self.model().w)
+
+        def get_flow_terms(p, j):
+            return b.x[j]
+        self.get_material_flow_terms = get_flow_terms
+
+    def _z(self):
+        self.z = Var(initialize=3)
+
+
+def _templated_model(templated, outside=False):
+    m = ConcreteModel()
+    if outside:
+        m.w = Var()
+    m.pb = TemplateParameters(
+        default={"templated_construction": templated})
+    m.s1 = m.pb.build_state_block([1, 2, 3], default={"defined_state": True})
+    m.s2 = m.pb.build_state_block([1, 2], default={"defined_state": False})
+    return m
+
+
+def _expressions(m):
+    return {c.name: str(c.expr) for c in m.component_data_objects(
+        (Constraint, Expression), descend_into=True)}
+
+
+@pytest.mark.unit
+def test_templated_construction():
+    _TemplateState.builds = 0
+    m0 = _templated_model(False)
+    assert _TemplateState.builds == 5
+
+    _TemplateState.builds = 0
+    m = _templated_model(True)
+    # One element is built for each configuration
+    assert _TemplateState.builds == 2
+    assert len(m.pb._state_block_templates) == 2
+    assert _expressions(m) == _expressions(m0)
+
+    for i in m.s1:
+        b = m.s1[i]
+        assert b.params is m.pb
+        assert b.config.defined_state
+        assert b.e.parent_block() is b
+        for v in identify_variables(b.c.body):
+            assert v.parent_block() is b
+        assert b.get_material_flow_terms("p1", "c1") is b.x["c1"]
+    assert not hasattr(m.s2[1], "sum_x")
+    assert m.s2[2].get_material_flow_terms("p1", "c2") is m.s2[2].x["c2"]
+
+    # Properties built on demand are not part of the templates
+    assert m.s1[2].z.value == 3
+    assert not m.s1[3].is_property_constructed("z")
+
+    m.pb.k["c1"] = 4
+    m.s1[3].x["c1"].value = 2
+    assert value(m.s1[3].e) == 10
+    assert value(m.s1[2].e) == 6
+
+
+@pytest.mark.unit
+def test_templated_construction_outside_reference():
+    _TemplateState.builds = 0
+    m = _templated_model(True, outside=True)
+    # Elements referring to m.w are not used as templates
+    assert _TemplateState.builds == 5
+    assert [t[2] for t in m.pb._state_block_templates] == [None, None]
+    for i in m.s1:
+        assert any(v is m.w for v in identify_variables(m.s1[i].outside.body))
@@ -14,7 +14,7 @@
 Base class for unit models
 """
 
-from pyomo.environ import Reference, SolverFactory
+from pyomo.environ import Reference
 from pyomo.network import Port
 from pyomo.common.config import ConfigValue, In
 
@@ -32,7 +32,7 @@ from idaes.core.util.exceptions import (BurntToast,
 from idaes.core.util.tables import create_stream_table_dataframe
 import idaes.core.util.unit_costing
 import idaes.logger as idaeslog
-from idaes.core.util import get_default_solver
+from idaes.core.util.solver_service import get_initialization_solver
 
 __author__ = "John Eslick, Qi Chen, Andrew Lee"
 
@@ -639,9 +639,9 @@ Must be True if dynamic = True,
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
         if solver is None:
-            opt = get_default_solver()
+            opt = get_initialization_solver()
         else:
-            opt = SolverFactory(solver)
+            opt = get_initialization_solver(solver)
             opt.options = optarg
 
         # ---------------------------------------------------------------------
@@ -0,0 +1,361 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+This module provides the base class and methods for running performance
+benchmarks on IDAES models. A benchmark times the stages a model goes through
+in a typical workflow:
+
+- build: construct the model and fix its inputs
+- calculate_scaling_factors: calculate scaling factors
+- initialize: run the model initialization routine
+- solve: solve the initialized model
+
+For each stage the wall clock time and the peak memory allocated by Python
+(measured with tracemalloc) are recorded. The number of blocks, variables,
+constraints and expressions in the model is recorded after the last stage.
+
+In order to write a benchmark for your model, inherit a class from Benchmark
+and implement the build method, and the initialize method if the model needs
+to be initialized. The default calculate_scaling_factors and solve methods
+use the IDAES scaling tools and the default solver.
+
+Results are stored in json files, and a set of results can be compared to a
+baseline set of results to detect performance regressions. Benchmarks can be
+run with the 'idaes benchmark' command, or through pytest using the benchmark
+marker.
+"""
+# stdlib
+from collections import OrderedDict
+import datetime
+import gc
+import importlib as il
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+# pyomo
+import pyomo.environ as pyo
+# idaes
+import idaes
+import idaes.core.util.scaling as iscale
+import idaes.core.util.model_statistics as mstat
+from idaes.core.util.misc import get_default_solver
+
+_log = logging.getLogger(__name__)
+
+# Stages of a benchmark, in the order they are run
+STAGES = ("build", "calculate_scaling_factors", "initialize", "solve")
+
+
+class Benchmark(object):
+    """
+    Base class for model benchmarks. Derived classes must implement build,
+    and should implement initialize if the model needs initialization.
+
+    Attributes:
+        name: name used to identify the benchmark in results, defaults to
+            the class name
+        requires_solver: stages that are skipped if the default solver is
+            not available
+    """
+    name = None
+    requires_solver = ("initialize", "solve")
+
+    def __init__(self):
+        if self.name is None:
+            self.name = self.__class__.__name__
+
+    def available(self):
+        """
+        Check whether everything needed to run the benchmark is available,
+        i.e. compiled property packages.
+
+        Returns:
+            (bool, str): availability and the reason it is not available
+        """
+        return True, None
+
+    def build(self):
+        """
+        Create the model and fix its inputs so that it has no degrees of
+        freedom.
+
+        Returns:
+            Pyomo model
+        """
+        raise NotImplementedError('Not implemented in the base class. This'
+                                  ' should be overridden in the derived class')
+
+    def calculate_scaling_factors(self, m):
+        iscale.calculate_scaling_factors(m)
+
+    def initialize(self, m):
+        pass
+
+    def solve(self, m):
+        """
+        Solve the initialized model with the default solver.
+
+        Returns:
+            Pyomo solver results
+        """
+        return get_default_solver().solve(m)
+
+
+def _class_import(class_path):
+    # everything in front of the last dot is a module, followed by one class
+    module, cls = class_path.rsplit(".", 1)
+    return getattr(il.import_module(module), cls)
+
+
+def component_counts(m):
+    """
+    Count the components of a model.
+
+    Args:
+        m: Pyomo model or block
+
+    Returns:
+        OrderedDict: component counts
+    """
+    counts = OrderedDict()
+    counts["blocks"] = mstat.number_total_blocks(m)
+    counts["variables"] = mstat.number_variables(m)
+    counts["fixed_variables"] = mstat.number_fixed_variables(m)
+    counts["constraints"] = mstat.number_total_constraints(m)
+    counts["activated_constraints"] = mstat.number_activated_constraints(m)
+    counts["expressions"] = mstat.number_expressions(m)
+    return counts
+
+
+def _run_stage(func, track_memory):
+    # Run one stage returning its return value, time and peak memory
+    gc.collect()
+    trace = track_memory and not tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        ret = func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+    finally:
+        if trace:
+            tracemalloc.stop()
+    return ret, elapsed, peak
+
+
+def run_benchmark(benchmark, stages=STAGES, repeat=1, track_memory=True):
+    """
+    Run a benchmark, timing each stage.
+
+    Args:
+        benchmark: Benchmark instance, Benchmark class or the full class path
+            of a Benchmark as a string
+        stages: stages to run, later stages are only run if the stages before
+            them are run. build is always run.
+        repeat: number of times to run the benchmark, the minimum time and
+            memory for each stage is reported
+        track_memory: if True record the peak memory allocated in each stage.
+            Tracking memory slows down the model, so times are not comparable
+            to times measured without it.
+
+    Returns:
+        OrderedDict: benchmark results with keys 'name', 'status', 'stages',
+        'components' and 'error'. status is 'ok', 'unavailable' or 'error'.
+    """
+    if isinstance(benchmark, str):
+        benchmark = _class_import(benchmark)
+    if isinstance(benchmark, type):
+        benchmark = benchmark()
+
+    res = OrderedDict()
+    res["name"] = benchmark.name
+    res["status"] = "ok"
+    res["stages"] = OrderedDict()
+    res["components"] = None
+    res["error"] = None
+
+    ok, reason = benchmark.available()
+    if not ok:
+        res["status"] = "unavailable"
+        res["error"] = reason
+        return res
+    solver_ok = pyo.SolverFactory("ipopt").available(exception_flag=False)
+
+    for i in range(repeat):
+        m = None
+        for stage in STAGES:
+            if stage != "build" and stage not in stages:
+                break
+            if stage in benchmark.requires_solver and not solver_ok:
+                res["stages"][stage] = OrderedDict(status="skipped")
+                continue
+            if stage == "build":
+                func = benchmark.build
+            else:
+                func = (lambda f=getattr(benchmark, stage), m=m: f(m))
+            try:
+                ret, elapsed, peak = _run_stage(func, track_memory)
+            except Exception as err:  # record any failure and stop
+                _log.exception("Benchmark {} failed in stage {}".format(
+                    benchmark.name, stage))
+                res["status"] = "error"
+                res["error"] = "{}: {}".format(stage, err)
+                res["stages"][stage] = OrderedDict(status="error")
+                return res
+            if stage == "build":
+                m = ret
+            sres = res["stages"].get(stage, None)
+            if sres is None:
+                sres = res["stages"][stage] = OrderedDict(
+                    status="ok", time=elapsed, peak_memory=peak)
+            else:
+                sres["time"] = min(sres["time"], elapsed)
+                if peak is not None:
+                    sres["peak_memory"] = min(sres["peak_memory"], peak)
+            if stage == "solve" and ret is not None:
+                try:
+                    sres["termination_condition"] = \
+                        str(ret.solver.termination_condition)
+                except AttributeError:
+                    pass
+        if i == repeat - 1:
+            res["components"] = component_counts(m)
+        del m
+    return res
+
+
+def run_benchmarks(benchmarks, **kwargs):
+    """
+    Run a list of benchmarks.
+
+    Args:
+        benchmarks: list of Benchmark instances, classes or class paths
+        kwargs: keyword arguments passed to run_benchmark
+
+    Returns:
+        OrderedDict: results keyed by benchmark name
+    """
+    results = OrderedDict()
+    for b in benchmarks:
+        res = run_benchmark(b, **kwargs)
+        results[res["name"]] = res
+    return results
+
+
+def write_results(results, filename):
+    """
+    Write benchmark results to a json file, along with information about the
+    environment they were run in.
+
+    Args:
+        results: dict of results from run_benchmarks
+        filename: json file name
+    """
+    data = OrderedDict()
+    data["metadata"] = OrderedDict(
+        date=datetime.datetime.now().isoformat(),
+        idaes_version=idaes.__version__,
+        python_version=sys.version.split()[0],
+        platform=platform.platform(),
+    )
+    data["benchmarks"] = results
+    with open(filename, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def read_results(filename):
+    """
+    Read benchmark results written by write_results
+
+    Returns:
+        dict: results keyed by benchmark name
+    """
+    with open(filename, "r") as f:
+        return json.load(f)["benchmarks"]
+
+
+def compare_results(results, baseline, time_rtol=0.25, memory_rtol=0.25,
+                    count_rtol=0.0, time_atol=0.05):
+    """
+    Compare benchmark results to baseline results. A stage time or peak memory
+    regresses if it exceeds the baseline by more than the relative tolerance.
+    Component counts are compared both ways, since a change in model size
+    usually indicates a change in model structure.
+
+    Args:
+        results: dict of results from run_benchmarks
+        baseline: dict of baseline results, i.e. from read_results
+        time_rtol: relative tolerance on stage times
+        memory_rtol: relative tolerance on stage peak memory
+        count_rtol: relative tolerance on component counts
+        time_atol: time differences smaller than this (s) are ignored, to
+            avoid reporting noise on very quick stages
+
+    Returns:
+        list: strings describing each regression, empty if there are none
+    """
+    msgs = []
+    for name, res in results.items():
+        base = baseline.get(name, None)
+        if base is None or base["status"] != "ok":
+            continue
+        if res["status"] != "ok":
+            msgs.append("{}: status {} ({}), baseline ok".format(
+                name, res["status"], res["error"]))
+            continue
+        for stage, bstage in base["stages"].items():
+            rstage = res["stages"].get(stage, None)
+            if bstage.get("status") != "ok" or rstage is None or \
+                    rstage.get("status") != "ok":
+                continue
+            t, bt = rstage["time"], bstage["time"]
+            if t > bt*(1 + time_rtol) and t - bt > time_atol:
+                msgs.append("{}: {} time {:.3g} s exceeds baseline {:.3g} s"
+                            .format(name, stage, t, bt))
+            mem, bmem = rstage.get("peak_memory"), bstage.get("peak_memory")
+            if mem is not None and bmem is not None and \
+                    mem > bmem*(1 + memory_rtol):
+                msgs.append("{}: {} peak memory {} B exceeds baseline {} B"
+                            .format(name, stage, mem, bmem))
+        if res["components"] and base["components"]:
+            for key, bval in base["components"].items():
+                val = res["components"].get(key, None)
+                if val is not None and abs(val - bval) > count_rtol*bval:
+                    msgs.append("{}: number of {} {} differs from baseline {}"
+                                .format(name, key, val, bval))
+    return msgs
+
+
+def print_results(results, stream=None):
+    """
+    Print a table of stage times and peak memory.
+    """
+    if stream is None:
+        stream = sys.stdout
+    fmt = "{:<36} {:<26} {:>10} {:>12}\n"
+    stream.write(fmt.format("Benchmark", "Stage", "Time (s)", "Memory (MB)"))
+    for name, res in results.items():
+        if res["status"] != "ok":
+            stream.write(fmt.format(name, res["status"], "-", "-"))
+        for stage, sres in res["stages"].items():
+            if sres.get("status") != "ok":
+                stream.write(fmt.format(name, stage, sres.get("status"), "-"))
+                continue
+            mem = sres.get("peak_memory")
+            stream.write(fmt.format(
+                name, stage, "{:.3f}".format(sres["time"]),
+                "-" if mem is None else "{:.1f}".format(mem/2**20)))
@@ -0,0 +1,275 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Benchmarks for a representative set of IDAES models. Model modules are
+imported when a benchmark is built, so that listing the benchmarks does not
+import every model library.
+"""
+import pyomo.environ as pyo
+
+from idaes.core.util.benchmark.benchmark_base import Benchmark
+import idaes.logger as idaeslog
+
+
+def _iapws_available():
+    from idaes.generic_models.properties import iapws95
+    if iapws95.iapws95_available():
+        return True, None
+    return False, "IAPWS not available"
+
+
+class DemoFlowsheetBenchmark(Benchmark):
+    """Mixer, heater and flash flowsheet with the BTX property package"""
+    name = "demo_flowsheet"
+
+    def build(self):
+        from idaes.generic_models.flowsheets import demo_flowsheet
+        m = demo_flowsheet.build_flowsheet()
+        demo_flowsheet.set_dof(m)
+        return m
+
+    def initialize(self, m):
+        from idaes.generic_models.flowsheets import demo_flowsheet
+        demo_flowsheet.initialize_flowsheet(m)
+
+
+class SupercriticalSteamCycleBenchmark(Benchmark):
+    """Supercritical steam cycle flowsheet"""
+    name = "supercritical_steam_cycle"
+
+    def available(self):
+        return _iapws_available()
+
+    def build(self):
+        from idaes.power_generation.flowsheets.supercritical_steam_cycle \
+            import supercritical_steam_cycle as scsc
+        m = scsc.create_model()
+        scsc.set_model_input(m)
+        return m
+
+    def initialize(self, m):
+        from idaes.power_generation.flowsheets.supercritical_steam_cycle \
+            import supercritical_steam_cycle as scsc
+        self._solver = scsc.initialize(m)
+
+    def solve(self, m):
+        return self._solver.solve(m)
+
+
+class SubcriticalBoilerBenchmark(Benchmark):
+    """Subcritical boiler drum, downcomer and waterwall flowsheet"""
+    name = "subcritical_boiler"
+
+    def available(self):
+        return _iapws_available()
+
+    def build(self):
+        from idaes.core import FlowsheetBlock
+        from idaes.generic_models.properties import iapws95
+        from idaes.power_generation.properties.flue_gas_ideal import \
+            FlueGasParameterBlock
+        from idaes.power_generation.flowsheets.subcritical_power_plant \
+            import subcritical_boiler
+        m = pyo.ConcreteModel()
+        m.fs = FlowsheetBlock(default={"dynamic": False})
+        m.fs.prop_water = iapws95.Iapws95ParameterBlock()
+        m.fs.prop_gas = FlueGasParameterBlock()
+        subcritical_boiler.create_model(m)
+        subcritical_boiler.set_inputs(m)
+        return m
+
+    def initialize(self, m):
+        from idaes.power_generation.flowsheets.subcritical_power_plant \
+            import subcritical_boiler
+        subcritical_boiler.initialize(m)
+
+
+class BFBContactorBenchmark(Benchmark):
+    """Bubbling fluidized bed for methane combustion with iron oxide"""
+    name = "bfb_contactor"
+
+    def build(self):
+        from idaes.gas_solid_contactors.flowsheets import \
+            ss_BFB_methane_combustion as bfb
+        return bfb.build_model()
+
+    def initialize(self, m):
+        from idaes.gas_solid_contactors.flowsheets import \
+            ss_BFB_methane_combustion as bfb
+        bfb.initialize_model(m, outlvl=idaeslog.WARNING)
+
+
+class HeatExchanger1DBenchmark(Benchmark):
+    """
+    Co-current HeatExchanger1D with the BTX property package, the number of
+    finite elements is used to measure how the model scales with
+    discretization.
+
+    Args:
+        finite_elements: number of finite elements along the exchanger
+    """
+    def __init__(self, finite_elements=20):
+        self.finite_elements = finite_elements
+        self.name = "heat_exchanger_1D[nfe={}]".format(finite_elements)
+        super(HeatExchanger1DBenchmark, self).__init__()
+
+    def build(self):
+        from idaes.core import FlowsheetBlock
+        from idaes.generic_models.unit_models.heat_exchanger_1D import \
+            HeatExchanger1D
+        from idaes.generic_models.unit_models.heat_exchanger import \
+            HeatExchangerFlowPattern
+        from idaes.generic_models.properties.activity_coeff_models.\
+            BTX_activity_coeff_VLE import BTXParameterBlock
+        m = pyo.ConcreteModel()
+        m.fs = FlowsheetBlock(default={"dynamic": False})
+        m.fs.properties = BTXParameterBlock(default={"valid_phase": 'Liq'})
+        m.fs.unit = HeatExchanger1D(default={
+            "shell_side": {"property_package": m.fs.properties},
+            "tube_side": {"property_package": m.fs.properties},
+            "flow_type": HeatExchangerFlowPattern.cocurrent,
+            "finite_elements": self.finite_elements})
+
+        m.fs.unit.d_shell.fix(1.04)
+        m.fs.unit.d_tube_outer.fix(0.01167)
+        m.fs.unit.d_tube_inner.fix(0.01067)
+        m.fs.unit.N_tubes.fix(10)
+        m.fs.unit.shell_length.fix(4.85)
+        m.fs.unit.tube_length.fix(4.85)
+        m.fs.unit.shell_heat_transfer_coefficient.fix(2000)
+        m.fs.unit.tube_heat_transfer_coefficient.fix(51000)
+
+        m.fs.unit.shell_inlet.flow_mol[0].fix(5)  # mol/s
+        m.fs.unit.shell_inlet.temperature[0].fix(365)  # K
+        m.fs.unit.shell_inlet.pressure[0].fix(101325)  # Pa
+        m.fs.unit.shell_inlet.mole_frac_comp[0, "benzene"].fix(0.5)
+        m.fs.unit.shell_inlet.mole_frac_comp[0, "toluene"].fix(0.5)
+
+        m.fs.unit.tube_inlet.flow_mol[0].fix(1)  # mol/s
+        m.fs.unit.tube_inlet.temperature[0].fix(300)  # K
+        m.fs.unit.tube_inlet.pressure[0].fix(101325)  # Pa
+        m.fs.unit.tube_inlet.mole_frac_comp[0, "benzene"].fix(0.5)
+        m.fs.unit.tube_inlet.mole_frac_comp[0, "toluene"].fix(0.5)
+        return m
+
+    def initialize(self, m):
+        m.fs.unit.initialize(outlvl=idaeslog.WARNING)
+
+
+class GenericHeatExchanger1DBenchmark(Benchmark):
+    """
+    Dynamic co-current HeatExchanger1D with the generic benzene-toluene
+    Peng-Robinson property package. This is used to measure the cost of
+    building the state blocks, optionally using templated construction.
+
+    Args:
+        finite_elements: number of finite elements along the exchanger
+        time_elements: number of finite elements in time
+        templated: if True, state blocks are built from templates
+    """
+    def __init__(self, finite_elements=10, time_elements=2, templated=False):
+        self.finite_elements = finite_elements
+        self.time_elements = time_elements
+        self.templated = templated
+        self.name = "generic_heat_exchanger_1D[nfe={},templated={}]".format(
+            finite_elements, templated)
+        super(GenericHeatExchanger1DBenchmark, self).__init__()
+
+    def build(self):
+        from idaes.core import FlowsheetBlock
+        from idaes.generic_models.unit_models.heat_exchanger_1D import \
+            HeatExchanger1D
+        from idaes.generic_models.unit_models.heat_exchanger import \
+            HeatExchangerFlowPattern
+        from idaes.generic_models.properties.core.generic.generic_property \
+            import GenericParameterBlock
+        from idaes.generic_models.properties.core.examples.BT_PR import \
+            configuration
+        m = pyo.ConcreteModel()
+        m.fs = FlowsheetBlock(default={"dynamic": True,
+                                       "time_set": [0, 10],
+                                       "time_units": pyo.units.s})
+        m.fs.properties = GenericParameterBlock(default=dict(
+            configuration, templated_construction=self.templated))
+        m.fs.unit = HeatExchanger1D(default={
+            "shell_side": {"property_package": m.fs.properties},
+            "tube_side": {"property_package": m.fs.properties},
+            "flow_type": HeatExchangerFlowPattern.cocurrent,
+            "finite_elements": self.finite_elements})
+        pyo.TransformationFactory("dae.finite_difference").apply_to(
+            m.fs, nfe=self.time_elements, wrt=m.fs.time, scheme="BACKWARD")
+
+        m.fs.unit.d_shell.fix(1.04)
+        m.fs.unit.d_tube_outer.fix(0.01167)
+        m.fs.unit.d_tube_inner.fix(0.01067)
+        m.fs.unit.N_tubes.fix(10)
+        m.fs.unit.shell_length.fix(4.85)
+        m.fs.unit.tube_length.fix(4.85)
+        m.fs.unit.shell_heat_transfer_coefficient.fix(2000)
+        m.fs.unit.tube_heat_transfer_coefficient.fix(51000)
+
+        for port, flow, temp in ((m.fs.unit.shell_inlet, 5, 365),
+                                 (m.fs.unit.tube_inlet, 1, 300)):
+            port.flow_mol.fix(flow)  # mol/s
+            port.temperature.fix(temp)  # K
+            port.pressure.fix(101325)  # Pa
+            port.mole_frac_comp[:, "benzene"].fix(0.5)
+            port.mole_frac_comp[:, "toluene"].fix(0.5)
+        m.fs.fix_initial_conditions()
+        return m
+
+    def initialize(self, m):
+        m.fs.unit.initialize(outlvl=idaeslog.WARNING)
+
+
+class DynamicCSTRBenchmark(Benchmark):
+    """
+    Dynamic CSTR with enzyme reactions, initialized by time element.
+
+    Args:
+        ntfe: number of finite elements in time
+    """
+    def __init__(self, ntfe=60):
+        self.ntfe = ntfe
+        self.name = "dynamic_cstr[ntfe={}]".format(ntfe)
+        super(DynamicCSTRBenchmark, self).__init__()
+
+    def build(self):
+        from idaes.apps.caprese.examples.cstr_model import make_model
+        return make_model(horizon=6, ntfe=self.ntfe, ntcp=2)
+
+    def initialize(self, m):
+        from idaes.core.util.initialization import initialize_by_time_element
+        from idaes.core.util import get_default_solver
+        initialize_by_time_element(m.fs, m.fs.time,
+                                   solver=get_default_solver(),
+                                   outlvl=idaeslog.WARNING)
+
+
+def default_benchmarks():
+    """
+    Return the list of benchmarks run by default.
+    """
+    return [
+        DemoFlowsheetBenchmark(),
+        SupercriticalSteamCycleBenchmark(),
+        SubcriticalBoilerBenchmark(),
+        BFBContactorBenchmark(),
+        HeatExchanger1DBenchmark(finite_elements=10),
+        HeatExchanger1DBenchmark(finite_elements=20),
+        HeatExchanger1DBenchmark(finite_elements=40),
+        HeatExchanger1DBenchmark(finite_elements=80),
+        GenericHeatExchanger1DBenchmark(finite_elements=10),
+        GenericHeatExchanger1DBenchmark(finite_elements=10, templated=True),
+        DynamicCSTRBenchmark(),
+    ]
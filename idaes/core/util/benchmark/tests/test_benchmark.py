@@ -0,0 +1,155 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for model performance benchmarks.
+
+The benchmarks of the representative models are marked 'benchmark' and can
+be run with 'pytest -m benchmark'. Set IDAES_BENCHMARK_OUTPUT to write the
+results to a json file and IDAES_BENCHMARK_BASELINE to compare them with a
+stored baseline.
+"""
+import copy
+import os
+
+from click.testing import CliRunner
+import pytest
+import pyomo.environ as pyo
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+
+from idaes.commands.benchmark import benchmark as benchmark_cmd
+import idaes.core.util.benchmark.benchmark_base as bmb
+from idaes.core.util.benchmark.benchmarks import default_benchmarks
+
+
+class ToyBenchmark(bmb.Benchmark):
+    name = "toy"
+    requires_solver = ()
+
+    def build(self):
+        m = pyo.ConcreteModel()
+        m.s = pyo.RangeSet(100)
+        m.x = pyo.Var(m.s, initialize=1)
+        m.y = pyo.Var(m.s, initialize=1)
+        m.x.fix(2)
+        m.c = pyo.Constraint(m.s, rule=lambda m, i: m.y[i] == m.x[i]**2)
+        return m
+
+    def solve(self, m):
+        for i in m.s:
+            calculate_variable_from_constraint(m.y[i], m.c[i])
+
+
+class FailingBenchmark(ToyBenchmark):
+    name = "failing"
+
+    def initialize(self, m):
+        raise RuntimeError("initialization failed")
+
+
+@pytest.mark.unit
+def test_run_benchmark():
+    res = bmb.run_benchmark(ToyBenchmark, repeat=2)
+    assert res["status"] == "ok"
+    assert list(res["stages"].keys()) == list(bmb.STAGES)
+    for stage in res["stages"].values():
+        assert stage["status"] == "ok"
+        assert stage["time"] >= 0
+        assert stage["peak_memory"] > 0
+    assert res["components"]["variables"] == 200
+    assert res["components"]["fixed_variables"] == 100
+    assert res["components"]["constraints"] == 100
+
+
+@pytest.mark.unit
+def test_run_benchmark_stages():
+    res = bmb.run_benchmark(
+        ToyBenchmark(), stages=("build",), track_memory=False)
+    assert list(res["stages"].keys()) == ["build"]
+    assert res["stages"]["build"]["peak_memory"] is None
+
+
+@pytest.mark.unit
+def test_run_benchmark_error():
+    res = bmb.run_benchmark(FailingBenchmark())
+    assert res["status"] == "error"
+    assert "initialization failed" in res["error"]
+    assert res["stages"]["initialize"]["status"] == "error"
+    assert "solve" not in res["stages"]
+
+
+@pytest.mark.unit
+def test_compare_results(tmpdir):
+    fname = os.path.join(str(tmpdir), "results.json")
+    results = bmb.run_benchmarks([ToyBenchmark()])
+    bmb.write_results(results, fname)
+    baseline = bmb.read_results(fname)
+    assert bmb.compare_results(results, baseline) == []
+
+    slow = copy.deepcopy(baseline)
+    slow["toy"]["stages"]["build"]["time"] += 10
+    slow["toy"]["stages"]["solve"]["peak_memory"] *= 10
+    slow["toy"]["components"]["variables"] += 1
+    msgs = bmb.compare_results(slow, baseline)
+    assert len(msgs) == 3
+    assert msgs[0].startswith("toy: build time")
+    # differences within tolerance are not regressions
+    assert bmb.compare_results(slow, baseline, time_rtol=1e6,
+                               memory_rtol=100, count_rtol=0.01) == []
+
+
+@pytest.mark.unit
+def test_benchmark_cli(tmpdir):
+    runner = CliRunner()
+    fname = os.path.join(str(tmpdir), "results.json")
+    path = "idaes.core.util.benchmark.tests.test_benchmark.ToyBenchmark"
+    result = runner.invoke(benchmark_cmd, ["-b", path, "-o", fname])
+    assert result.exit_code == 0
+    assert "toy" in bmb.read_results(fname)
+
+    baseline = bmb.read_results(fname)
+    baseline["toy"]["components"]["constraints"] = 50
+    bmb.write_results(baseline, fname)
+    result = runner.invoke(benchmark_cmd, ["-b", path, "--baseline", fname])
+    assert result.exit_code == 1
+    assert "REGRESSION toy: number of constraints" in result.output
+
+
+@pytest.mark.unit
+def test_benchmark_cli_list():
+    result = CliRunner().invoke(benchmark_cmd, ["--list"])
+    assert result.exit_code == 0
+    assert "demo_flowsheet" in result.output
+
+
+@pytest.fixture(scope="module")
+def benchmark_results():
+    results = {}
+    yield results
+    fname = os.environ.get("IDAES_BENCHMARK_OUTPUT", None)
+    if fname is not None and results:
+        bmb.write_results(results, fname)
+
+
+@pytest.mark.benchmark
+@pytest.mark.integration
+@pytest.mark.parametrize("bench", default_benchmarks(), ids=lambda b: b.name)
+def test_benchmark(bench, benchmark_results):
+    res = bmb.run_benchmark(bench)
+    benchmark_results[res["name"]] = res
+    if res["status"] == "unavailable":
+        pytest.skip(res["error"])
+    assert res["status"] == "ok", res["error"]
+    fname = os.environ.get("IDAES_BENCHMARK_BASELINE", None)
+    if fname is not None:
+        msgs = bmb.compare_results({res["name"]: res}, bmb.read_results(fname))
+        assert not msgs, "\n".join(msgs)
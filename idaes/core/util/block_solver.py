@@ -0,0 +1,496 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Block triangular decomposition and Newton solver for square systems of
+equations.
+
+The equations of a square system are matched to the variables, and the
+strongly connected components of the resulting dependency graph (found with
+Tarjan's algorithm) are the smallest subsystems that have to be solved
+simultaneously. In the order returned by ``block_triangularize`` each
+subsystem only depends on variables of the subsystems before it, so the
+system can be solved one subsystem at a time with a damped Newton method.
+Most subsystems of an initialization problem have one or a few variables.
+"""
+import numpy as np
+
+from pyomo.environ import (ConcreteModel,
+                           Constraint,
+                           ConstraintList,
+                           Objective,
+                           SolverFactory,
+                           TerminationCondition,
+                           value)
+from pyomo.common.collections import ComponentSet
+from pyomo.common.modeling import unique_component_name
+from pyomo.core.expr.calculus.derivatives import differentiate, Modes
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.opt import SolverResults, SolverStatus
+
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+# Newton iteration log, written when tee is True
+_solve_log = idaeslog.getSolveLogger(__name__)
+
+# Errors raised when an expression is evaluated outside its domain
+_EVAL_ERRORS = (ValueError, ZeroDivisionError, OverflowError)
+
+# Smallest system for which PyNumero is used to evaluate Jacobians when
+# jacobian='auto', as creating the PyNumero model writes an NL file. The
+# in-process solves of the initialization solver service always use Pyomo's
+# differentiation.
+PYNUMERO_MIN_SIZE = 200
+
+
+def pynumero_available():
+    """Whether the PyNumero ASL interface is available."""
+    try:
+        from pyomo.contrib.pynumero.asl import AmplInterface
+    except ImportError:
+        return False
+    return AmplInterface.available()
+
+
+class SquareSystem(object):
+    """
+    A system of equality constraints and variables. Only the unfixed
+    variables in the constraints are considered variables of the system.
+
+    Args:
+        constraints: list of equality constraint data objects
+        variables: list of variable data objects, all unfixed variables in
+            the constraints must be in the list
+        evaluator: optional object with a ``jacobian(system)`` method used
+            to evaluate the Jacobian, e.g. a PyNumeroEvaluator
+    """
+
+    def __init__(self, constraints, variables, evaluator=None):
+        self.constraints = list(constraints)
+        self.variables = list(variables)
+        self.evaluator = evaluator
+        index = {id(v): i for i, v in enumerate(self.variables)}
+        # All unfixed variables in each constraint, and those that are
+        # variables of the system with their indices
+        self.con_vars = [
+            list(ComponentSet(identify_variables(c.body, include_fixed=False)))
+            for c in self.constraints]
+        self._jac_vars = [[v for v in cv if id(v) in index]
+                          for cv in self.con_vars]
+        self.con_idx = [[index[id(v)] for v in jv] for jv in self._jac_vars]
+        self.lb = np.array([-np.inf if v.lb is None else v.lb
+                            for v in self.variables], dtype=float)
+        self.ub = np.array([np.inf if v.ub is None else v.ub
+                            for v in self.variables], dtype=float)
+
+    @classmethod
+    def from_block(cls, blk, max_size=None):
+        """
+        Return the system of the active constraints of a block, or None if
+        the block has an inequality constraint, is not square or has more
+        than max_size variables.
+        """
+        constraints = []
+        variables = ComponentSet()
+        for c in blk.component_data_objects(
+                Constraint, active=True, descend_into=True):
+            if not c.equality:
+                return None
+            constraints.append(c)
+            if max_size is not None and len(constraints) > max_size:
+                return None
+            for v in identify_variables(c.body, include_fixed=False):
+                variables.add(v)
+        if len(constraints) == 0 or len(variables) != len(constraints):
+            return None
+        return cls(constraints, variables)
+
+    def subsystem(self, con_idx, var_idx):
+        """Return the subsystem of some of the constraints and variables."""
+        return SquareSystem([self.constraints[i] for i in con_idx],
+                            [self.variables[j] for j in var_idx],
+                            evaluator=self.evaluator)
+
+    def get_values(self):
+        return np.array([v.value for v in self.variables], dtype=float)
+
+    def set_values(self, x):
+        for v, xi in zip(self.variables, x):
+            v.set_value(float(xi))
+
+    def residuals(self):
+        return np.array([value(c.body) - value(c.upper)
+                         for c in self.constraints], dtype=float)
+
+    def jacobian(self):
+        """Return the Jacobian of the residuals as a dense array."""
+        if self.evaluator is not None:
+            return self.evaluator.jacobian(self)
+        jac = np.zeros((len(self.constraints), len(self.variables)))
+        for i, c in enumerate(self.constraints):
+            if self._jac_vars[i]:
+                jac[i, self.con_idx[i]] = differentiate(
+                    c.body, wrt_list=self._jac_vars[i],
+                    mode=Modes.reverse_numeric)
+        return jac
+
+
+class PyNumeroEvaluator(object):
+    """
+    Evaluates the Jacobian of the constraints of a block with PyNumero. The
+    NL file of the block is written once, when the evaluator is created.
+
+    Args:
+        blk: block with the constraints of the systems to evaluate
+    """
+
+    def __init__(self, blk):
+        from pyomo.contrib.pynumero.interfaces.pyomo_nlp import PyomoNLP
+        # PyomoNLP needs an objective, which does not affect the Jacobian
+        name = None
+        if next(blk.component_data_objects(
+                Objective, active=True, descend_into=True), None) is None:
+            name = unique_component_name(blk, '_block_solver_objective')
+            blk.add_component(name, Objective(expr=0))
+        try:
+            self.nlp = PyomoNLP(blk)
+        finally:
+            if name is not None:
+                blk.del_component(name)
+        self._variables = self.nlp.get_pyomo_variables()
+
+    def jacobian(self, system):
+        nlp = self.nlp
+        nlp.set_primals(np.array([v.value for v in self._variables],
+                                 dtype=float))
+        rows = nlp.get_equality_constraint_indices(system.constraints)
+        cols = nlp.get_primal_indices(system.variables)
+        jac = nlp.evaluate_jacobian_eq().tocsr()
+        return jac[rows, :][:, cols].toarray()
+
+
+def _max_step(x, dx, lb, ub, tau=0.995):
+    # Largest step length in (0, 1] that keeps x inside its bounds
+    alpha = 1.0
+    neg = (dx < 0) & np.isfinite(lb)
+    if np.any(neg):
+        alpha = min(alpha, np.min(tau*(lb[neg] - x[neg])/dx[neg]))
+    pos = (dx > 0) & np.isfinite(ub)
+    if np.any(pos):
+        alpha = min(alpha, np.min(tau*(ub[pos] - x[pos])/dx[pos]))
+    return max(alpha, 0.0)
+
+
+def newton_solve(system, tol=1e-8, max_iter=50, min_step=1e-6, tee=False):
+    """
+    Solve a square system of equations with a damped Newton method. Steps
+    are cut back to keep the variables within their bounds and then
+    backtracked until the norm of the residuals decreases.
+
+    Args:
+        system: SquareSystem to solve, starting from the current values of
+            its variables
+        tol: tolerance on the largest absolute residual
+        max_iter: iteration limit
+        min_step: smallest step length of the backtracking line search
+        tee: if True, log the iterations to the idaes.solve logger
+
+    Returns:
+        (converged, number of iterations). If not converged, the variables
+        are returned to their initial values.
+    """
+    x0 = system.get_values()
+    if np.any(np.isnan(x0)):
+        return False, 0
+    x = x0
+    try:
+        f = system.residuals()
+    except _EVAL_ERRORS:
+        return False, 0
+    for it in range(max_iter + 1):
+        fnorm = np.max(np.abs(f))
+        if tee:
+            _solve_log.info('{:4d}  {:.4e}'.format(it, fnorm))
+        if fnorm <= tol:
+            return True, it
+        if it == max_iter or not np.isfinite(fnorm):
+            break
+        try:
+            dx = np.linalg.solve(system.jacobian(), -f)
+        except (np.linalg.LinAlgError,) + _EVAL_ERRORS:
+            break
+        alpha = _max_step(x, dx, system.lb, system.ub)
+        merit = np.dot(f, f)
+        while alpha >= min_step:
+            x_trial = x + alpha*dx
+            system.set_values(x_trial)
+            try:
+                f_trial = system.residuals()
+            except _EVAL_ERRORS:
+                f_trial = None
+            if f_trial is not None and np.all(np.isfinite(f_trial)) and \
+                    np.dot(f_trial, f_trial) <= (1 - 1e-4*alpha)*merit:
+                break
+            alpha *= 0.5
+        else:
+            break
+        x, f = x_trial, f_trial
+    system.set_values(x0)
+    return False, it
+
+
+def maximum_matching(con_idx, n_vars):
+    """
+    Return a maximum matching of constraints to variables, as a list of the
+    matched variable of each constraint (None if unmatched).
+
+    Args:
+        con_idx: list of the indices of the variables in each constraint
+        n_vars: number of variables
+    """
+    con_match = [None]*len(con_idx)
+    var_match = [None]*n_vars
+    # Cheap greedy matching first, then augmenting paths for the rest
+    for i, idx in enumerate(con_idx):
+        for j in idx:
+            if var_match[j] is None:
+                con_match[i] = j
+                var_match[j] = i
+                break
+    for root in range(len(con_idx)):
+        if con_match[root] is not None:
+            continue
+        # Depth first search for an augmenting path. Each entry of the stack
+        # is a constraint on the path, its remaining variables and the
+        # variable through which it was reached.
+        visited = set()
+        stack = [(root, iter(con_idx[root]), None)]
+        found = None
+        while stack and found is None:
+            i, it, _ = stack[-1]
+            for j in it:
+                if j in visited:
+                    continue
+                visited.add(j)
+                if var_match[j] is None:
+                    found = j
+                else:
+                    k = var_match[j]
+                    stack.append((k, iter(con_idx[k]), j))
+                break
+            else:
+                stack.pop()
+        if found is None:
+            continue
+        j = found
+        for i, _, j_in in reversed(stack):
+            con_match[i] = j
+            var_match[j] = i
+            j = j_in
+    return con_match
+
+
+def tarjan_scc(adjacency):
+    """
+    Return the strongly connected components of a directed graph with
+    Tarjan's algorithm. Every component is returned after the components
+    reachable from it.
+
+    Args:
+        adjacency: list of the successors of each node
+    """
+    n = len(adjacency)
+    index = [None]*n
+    lowlink = [0]*n
+    on_stack = [False]*n
+    stack = []
+    components = []
+    counter = 0
+    for root in range(n):
+        if index[root] is not None:
+            continue
+        work = [(root, iter(adjacency[root]))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if index[w] is None:
+                    index[w] = lowlink[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, iter(adjacency[w])))
+                    break
+                elif on_stack[w]:
+                    lowlink[v] = min(lowlink[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    lowlink[u] = min(lowlink[u], lowlink[v])
+                if lowlink[v] == index[v]:
+                    comp = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp.append(w)
+                        if w == v:
+                            break
+                    components.append(comp)
+    return components
+
+
+def block_triangularize(system):
+    """
+    Return the block triangular decomposition of a square system.
+
+    Args:
+        system: SquareSystem
+
+    Returns:
+        list of (constraint indices, variable indices) of each block, in the
+        order the blocks can be solved
+
+    Raises:
+        ValueError if the system is structurally singular
+    """
+    n = len(system.variables)
+    con_match = maximum_matching(system.con_idx, n)
+    if any(j is None for j in con_match):
+        raise ValueError('System of equations is structurally singular.')
+    var_match = [None]*n
+    for i, j in enumerate(con_match):
+        var_match[j] = i
+    # Constraint i depends on the constraint matched to each of its other
+    # variables, which has to be solved first.
+    adjacency = [[var_match[j] for j in idx if j != con_match[i]]
+                 for i, idx in enumerate(system.con_idx)]
+    return [(sorted(comp), [con_match[i] for i in sorted(comp)])
+            for comp in tarjan_scc(adjacency)]
+
+
+def _solve_with_solver(system, solver):
+    # Solve a subsystem with a solver executable. The other variables in
+    # its constraints are fixed while it is solved.
+    m = ConcreteModel()
+    m.eqs = ConstraintList()
+    for c in system.constraints:
+        m.eqs.add(c.body == c.upper)
+    own = ComponentSet(system.variables)
+    fixed = []
+    for cv in system.con_vars:
+        for v in cv:
+            if v not in own and not v.fixed:
+                v.fix()
+                fixed.append(v)
+    try:
+        res = solver.solve(m)
+    finally:
+        for v in fixed:
+            v.unfix()
+    return res.solver.termination_condition == TerminationCondition.optimal
+
+
+def solve_system(system, solver=None, tol=1e-8, max_iter=50, tee=False):
+    """
+    Solve a square system one block of its block triangular decomposition at
+    a time, see solve_strongly_connected_components.
+
+    Returns:
+        (blocks, total Newton iterations, number of blocks solved with the
+        solver, SquareSystem of the block that failed or None)
+    """
+    blocks = block_triangularize(system)
+    n_iter = 0
+    n_fallback = 0
+    for con_idx, var_idx in blocks:
+        sub = system.subsystem(con_idx, var_idx)
+        if tee:
+            _solve_log.info('Block of {} variables'.format(len(var_idx)))
+        converged, iters = newton_solve(
+            sub, tol=tol, max_iter=max_iter, tee=tee)
+        n_iter += iters
+        if not converged and solver is not None:
+            _log.debug('Newton iterations failed on a block of {} variables, '
+                       'using solver'.format(len(var_idx)))
+            n_fallback += 1
+            converged = _solve_with_solver(sub, solver)
+        if not converged:
+            return blocks, n_iter, n_fallback, sub
+    return blocks, n_iter, n_fallback, None
+
+
+def solve_strongly_connected_components(
+        blk, solver=None, tol=1e-8, max_iter=50, jacobian='auto', tee=False):
+    """
+    Solve the square system of the active constraints of a block one block
+    of its block triangular decomposition at a time, with Newton's method.
+
+    Args:
+        blk: block with a square system of active equality constraints
+        solver: solver (name or solver object) used for blocks the Newton
+            iterations fail on. If None, the solve stops at the first
+            failed block.
+        tol: tolerance on the largest absolute residual
+        max_iter: Newton iteration limit of each block
+        jacobian: 'pyomo' to evaluate Jacobians with Pyomo's reverse-mode
+            differentiation, 'pynumero' to use PyNumero, or 'auto' to use
+            PyNumero for systems with at least PYNUMERO_MIN_SIZE variables
+            if it is available
+        tee: if True, log the Newton iterations to the idaes.solve logger
+
+    Returns:
+        SolverResults. The termination condition is optimal if all blocks
+        were solved. If a block could not be solved, the values of its
+        variables are not changed.
+
+    Raises:
+        ValueError if the block is not a square system of equality
+        constraints or is structurally singular
+    """
+    if jacobian not in ('auto', 'pyomo', 'pynumero'):
+        raise ValueError('Unrecognised jacobian option {}.'.format(jacobian))
+    system = SquareSystem.from_block(blk)
+    if system is None:
+        raise ValueError('{} is not a square system of equality constraints.'
+                         .format(blk.name))
+    if jacobian == 'pynumero' or (
+            jacobian == 'auto' and len(system.variables) >= PYNUMERO_MIN_SIZE
+            and pynumero_available()):
+        system.evaluator = PyNumeroEvaluator(blk)
+    if isinstance(solver, str):
+        solver = SolverFactory(solver)
+
+    blocks, n_iter, n_fallback, failed = solve_system(
+        system, solver=solver, tol=tol, max_iter=max_iter, tee=tee)
+
+    results = SolverResults()
+    results.problem.number_of_variables = len(system.variables)
+    results.problem.number_of_constraints = len(system.constraints)
+    if failed is None:
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.optimal
+        results.solver.message = (
+            'Solved {} blocks (largest {}) in {} Newton iterations, {} with '
+            'solver'.format(len(blocks), max(len(b[1]) for b in blocks),
+                            n_iter, n_fallback))
+    else:
+        results.solver.status = SolverStatus.warning
+        results.solver.termination_condition = TerminationCondition.other
+        results.solver.message = 'Failed to solve block of {} ({})'.format(
+            len(failed.variables),
+            ', '.join(v.name for v in failed.variables[:5]))
+    return results
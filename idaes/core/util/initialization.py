@@ -14,6 +14,7 @@
 """
 This module contains utility functions for initialization of IDAES models.
 """
+import math
 
 from pyomo.environ import (Block, Var, TerminationCondition, SolverFactory,
         Constraint)
@@ -216,6 +217,43 @@ def solve_indexed_blocks(solver, blocks, **kwds):
     return results
 
 
+def set_indexed_block_values(blk, values):
+    """
+    Method for setting the values of variables in all elements of an Indexed
+    Block at once, e.g. from properties calculated for all elements with
+    NumPy arrays.
+
+    Args:
+        blk : an Indexed Block
+        values : a dict keyed by variable name. Values are sequences with an
+                entry for each element of blk, in the order of blk.keys(), or
+                for indexed variables dicts of such sequences keyed by
+                variable index.
+
+    Returns:
+        The number of values which were not set, because the variable is
+        fixed or the value is not a finite number. Variables which do not
+        exist in an element of blk are skipped.
+    """
+    skipped = 0
+    for n, k in enumerate(blk.keys()):
+        b = blk[k]
+        for name, val in values.items():
+            v = b.component(name)
+            if v is None:
+                continue
+            if isinstance(val, dict):
+                items = [(v[i], vi[n]) for i, vi in val.items()]
+            else:
+                items = [(v, val[n])]
+            for var, x in items:
+                if var.fixed or not math.isfinite(x):
+                    skipped += 1
+                else:
+                    var.value = float(x)
+    return skipped
+
+
 def initialize_by_time_element(fs, time, **kwargs):
     """
     Function to initialize Flowsheet fs element-by-element along 
@@ -0,0 +1,507 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Adaptive refinement of the mesh of a spatial domain.
+
+Spatial domains are usually discretized with uniform finite elements, so the
+whole length has to be as fine as the steepest part of the profiles, e.g. a
+front near an inlet. ``AdaptiveMeshRefinement`` solves a model on a coarse
+mesh, estimates the discretization error of each element from the solved
+profiles, and rebuilds the model on a mesh where only the elements with a
+large error are split (and neighbouring elements with a small error are
+merged). The solution on the old mesh is interpolated onto the new model as
+the initial guess, and this is repeated until the estimated error of every
+element is below the tolerance.
+
+Models are rebuilt through a user function taking the points of the mesh. For
+models built on ControlVolume1DBlocks, the points are passed through the
+``length_domain_set`` configuration argument of the unit model, with
+``finite_elements`` set to the number of points minus one, so that the
+transformation uses the given points instead of adding uniform ones.
+
+Only the finite elements of the domain are refined. For domains discretized
+by collocation, the profiles are taken at all the points of the domain and
+the error of each element is estimated from the polynomial through its
+points, so that the estimate has the order of the collocation scheme.
+"""
+from bisect import bisect_right
+from collections import OrderedDict
+import time
+
+import numpy as np
+
+from pyomo.environ import Var, value
+
+from idaes.core.util.model_statistics import (number_variables,
+                                              number_total_constraints)
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+
+
+def _element_bounds(x, elements):
+    # Indices of the bounds of the elements in the points
+    if elements is None:
+        return np.arange(len(x))
+    e = np.asarray(elements, dtype=float)
+    bounds = np.abs(x[None, :] - e[:, None]).argmin(axis=1)
+    if (len(e) < 2 or not np.allclose(x[bounds], e) or
+            np.any(np.diff(bounds) <= 0)):
+        raise ValueError("The bounds of the elements must be sorted "
+                         "points of the profiles.")
+    return bounds
+
+
+def error_order(points, elements=None):
+    """
+    Return the order of the error estimates of element_errors, i.e. the
+    power of the length of the elements the estimates are proportional to.
+    This is the smallest number of intervals between the points of an
+    element, or 2 for elements without points inside them.
+
+    Args:
+        points: sorted points of the profiles
+        elements: sorted bounds of the elements, see element_errors
+
+    Returns:
+        order of the error estimates
+    """
+    x = np.asarray(points, dtype=float)
+    return max(2, int(np.min(np.diff(_element_bounds(x, elements)))))
+
+
+def element_errors(points, profiles, elements=None):
+    """
+    Estimate the discretization error of each element of a mesh from the
+    profiles of a solved model. Profiles are scaled by their largest
+    absolute value, and the largest error over the profiles is returned.
+
+    If elements is None, each point is the bound of an element and the
+    error is estimated as the local truncation error of a first order
+    difference, h**2*|y''|/2, with the second derivative y'' estimated from
+    the differences of the profile.
+
+    If elements is given, points also contains points inside the elements
+    (e.g. collocation points). The error of an element with m intervals
+    between its points is estimated as h**m*|y[x0, ..., xm]|, where
+    y[x0, ..., xm] is the divided difference of the profile over the points
+    of the element, i.e. the leading coefficient of the polynomial through
+    them, which approximates the m-th derivative divided by m!. This is the
+    error of the polynomial through all but the last point of the element,
+    which matches the order of the collocation scheme. For m = 2, it is the
+    same as the estimate for elements without points inside them.
+
+    Args:
+        points: sorted points of the profiles
+        profiles: array of profiles, one row per profile and one column per
+            point
+        elements: sorted bounds of the elements (n + 1 values for n
+            elements), which must be points. If None, each point is the
+            bound of an element.
+
+    Returns:
+        array of the estimated error of each element
+    """
+    x = np.asarray(points, dtype=float)
+    y = np.atleast_2d(np.asarray(profiles, dtype=float))
+    if len(x) < 3:
+        raise ValueError("At least two elements are needed to estimate the "
+                         "discretization error.")
+    if y.shape[1] != len(x):
+        raise ValueError("Profiles must have one value per point.")
+    scale = np.max(np.abs(y), axis=1)
+    scale[scale == 0] = 1.0
+    y = y/scale[:, None]
+    bounds = _element_bounds(x, elements)
+    h = np.diff(x[bounds])
+    intervals = np.diff(bounds)
+    errors = np.zeros(len(h))
+    single = intervals == 1
+    if np.any(single):
+        # Second derivative at interior points, each element takes the
+        # largest value at its ends
+        dx = np.diff(x)
+        slope = np.diff(y, axis=1)/dx
+        curv = np.zeros_like(y)
+        curv[:, 1:-1] = (np.abs(np.diff(slope, axis=1)) /
+                         (0.5*(dx[:-1] + dx[1:])))
+        curv = curv.max(axis=0)
+        ends = np.maximum(curv[bounds[:-1]], curv[bounds[1:]])
+        errors[single] = 0.5*h[single]**2*ends[single]
+    for i in np.nonzero(~single)[0]:
+        a, b = bounds[i], bounds[i + 1]
+        xe = x[a:b + 1]
+        # Weights of the divided difference over the points of the element
+        w = 1.0/np.prod(xe[:, None] - xe[None, :] + np.eye(len(xe)), axis=1)
+        errors[i] = h[i]**intervals[i]*np.max(np.abs(y[:, a:b + 1].dot(w)))
+    return errors
+
+
+def refine_points(points, errors, tol, max_split=8, coarsen=True, order=2):
+    """
+    Create a new mesh from the estimated errors of the elements of a mesh.
+    As the error of an element is proportional to its length to the power
+    order, elements with an error above the tolerance are split in
+    ceil((2*error/tol)**(1/order)) equal elements, up to max_split, so that
+    the new elements are estimated to have half of the tolerance. If coarsen
+    is True, pairs of neighbouring elements which are not split are merged
+    if the error of the merged element is estimated to be below a quarter of
+    the tolerance.
+
+    Args:
+        points: sorted points of the mesh
+        errors: estimated error of each element
+        tol: error tolerance
+        max_split: largest number of elements an element is split into
+        coarsen: if True, merge elements with a small error
+        order: order of the error estimates, see error_order
+
+    Returns:
+        list of the points of the new mesh
+    """
+    x = np.asarray(points, dtype=float)
+    errors = np.asarray(errors, dtype=float)
+    h = np.diff(x)
+    n = len(h)
+    split = np.where(errors > tol, np.ceil((2*errors/tol)**(1.0/order)), 1)
+    split = np.clip(split, 1, max_split).astype(int)
+    new = [float(x[0])]
+    i = 0
+    while i < n:
+        if (coarsen and i + 1 < n and split[i] == 1 and split[i + 1] == 1 and
+                max(errors[i]/h[i]**order, errors[i + 1]/h[i + 1]**order) *
+                (h[i] + h[i + 1])**order < 0.25*tol):
+            new.append(float(x[i + 2]))
+            i += 2
+            continue
+        new.extend(float(p) for p in
+                   np.linspace(x[i], x[i + 1], split[i] + 1)[1:-1])
+        new.append(float(x[i + 1]))
+        i += 1
+    return new
+
+
+def uniform_elements(points, errors, tol, order=2):
+    """
+    Estimate the number of uniform elements needed for the error of every
+    element to be below a tolerance, from the estimated errors of the
+    elements of a (non-uniform) mesh.
+
+    Args:
+        points: sorted points of the mesh
+        errors: estimated error of each element
+        tol: error tolerance
+        order: order of the error estimates, see error_order
+
+    Returns:
+        number of uniform elements
+    """
+    x = np.asarray(points, dtype=float)
+    k = np.max(np.asarray(errors, dtype=float)/np.diff(x)**order)
+    if k == 0:
+        return 2
+    return max(2, int(np.ceil((x[-1] - x[0])/(tol/k)**(1.0/order))))
+
+
+def _domain_positions(component, domain, cache):
+    # Positions of a domain in the flattened indices of a component
+    try:
+        return cache[id(component)]
+    except KeyError:
+        pass
+    positions = []
+    if component.is_indexed():
+        pos = 0
+        for s in component.index_set().subsets():
+            if s is domain:
+                positions.append(pos)
+            pos += s.dimen if s.dimen is not None else 1
+    cache[id(component)] = positions
+    return positions
+
+
+def domain_profiles(domain, components):
+    """
+    Get the profiles of a set of components along a domain.
+
+    Args:
+        domain: ContinuousSet of the profiles
+        components: list of Vars, Expressions or Params indexed by the domain
+            (and possibly other sets)
+
+    Returns:
+        (points, profiles), the sorted points of the domain (including
+        collocation points) and an array with one row for each index of the
+        components other than the domain
+    """
+    points = sorted(domain)
+    cols = {x: i for i, x in enumerate(points)}
+    rows = OrderedDict()
+    cache = {}
+    for comp in components:
+        pos = _domain_positions(comp, domain, cache)
+        if len(pos) != 1:
+            raise ValueError("{} must be indexed once by {}."
+                             .format(comp.name, domain.name))
+        p = pos[0]
+        for idx, c in comp.items():
+            idx = idx if isinstance(idx, tuple) else (idx,)
+            key = (comp.name, idx[:p] + idx[p + 1:])
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = np.zeros(len(points))
+            row[cols[idx[p]]] = value(c, exception=False) or 0.0
+    return points, np.array(list(rows.values()))
+
+
+def control_volume_profiles(control_volume):
+    """
+    Get the profiles of the state variables of the property blocks of a
+    ControlVolume1DBlock along its length domain.
+
+    Args:
+        control_volume: ControlVolume1DBlock
+
+    Returns:
+        (points, profiles), the sorted points of the length domain
+        (including collocation points) and an array with one row for each
+        time point and state variable
+    """
+    points = sorted(control_volume.length_domain)
+    cols = {x: i for i, x in enumerate(points)}
+    rows = OrderedDict()
+    for (t, x), sb in control_volume.properties.items():
+        for name, v in sb.define_state_vars().items():
+            for k, vd in v.items():
+                key = (t, name, k)
+                row = rows.get(key)
+                if row is None:
+                    row = rows[key] = np.zeros(len(points))
+                row[cols[x]] = vd.value or 0.0
+    return points, np.array(list(rows.values()))
+
+
+def _interpolated(source, chain, domain, source_points, cache):
+    # Find the data objects of source matching a chain of (name, component,
+    # index) from the root of the target model, with interpolation weights
+    # for the indices along the domain.
+    found = [(source, 1.0)]
+    for name, comp, idx in chain:
+        pos = _domain_positions(comp, domain, cache)
+        new = []
+        for blk, w in found:
+            scomp = blk.component(name)
+            if scomp is None:
+                return []
+            if not pos:
+                if idx in scomp:
+                    new.append((scomp[idx], w))
+                continue
+            indices = [(list(idx if isinstance(idx, tuple) else (idx,)), w)]
+            for p in pos:
+                expanded = []
+                for i, wi in indices:
+                    j = bisect_right(source_points, i[p]) - 1
+                    j = min(max(j, 0), len(source_points) - 2)
+                    x0, x1 = source_points[j], source_points[j + 1]
+                    a = (i[p] - x0)/(x1 - x0)
+                    for xs, ws in ((x0, 1 - a), (x1, a)):
+                        if ws != 0:
+                            expanded.append((i[:p] + [xs] + i[p + 1:],
+                                             wi*ws))
+                indices = expanded
+            for i, wi in indices:
+                i = tuple(i) if len(i) > 1 else i[0]
+                if i in scomp:
+                    new.append((scomp[i], wi))
+        found = new
+    return found
+
+
+def transfer_solution(source, target, source_domain, target_domain):
+    """
+    Initialize the unfixed variables of a model from the solution of the
+    same model built on a different mesh. Values along the domain are
+    linearly interpolated between the points of the source mesh, variables
+    are matched by name.
+
+    Args:
+        source: solved model
+        target: model to initialize
+        source_domain: ContinuousSet of the source model
+        target_domain: ContinuousSet of the target model, corresponding to
+            source_domain
+
+    Returns:
+        number of variables initialized
+    """
+    source_points = sorted(source_domain)
+    cache = {}
+    chains = {}
+    count = 0
+    for v in target.component_data_objects(Var, descend_into=True):
+        if v.fixed:
+            continue
+        chain = []
+        obj = v
+        while obj is not target:
+            comp = obj.parent_component()
+            chain.append((comp.local_name, comp, obj.index()))
+            obj = comp.parent_block()
+            if obj is None:
+                break
+        chain.reverse()
+        found = _interpolated(source, chain, target_domain, source_points,
+                              cache)
+        found = [(s, w) for s, w in found if s.value is not None]
+        total = sum(w for s, w in found)
+        if found and total > 0:
+            v.set_value(sum(w*s.value for s, w in found)/total)
+            count += 1
+    return count
+
+
+class AdaptiveMeshRefinement(object):
+    """
+    Solve a model on successively refined meshes of a spatial domain until
+    the estimated discretization error of every element is below a
+    tolerance.
+
+    Args:
+        build_model: function(points) returning a model discretized with the
+            given sorted points of the domain (including its bounds) as the
+            bounds of its finite elements, and initialized
+        domain: function(model) returning the ContinuousSet refined
+        profiles: function(model) returning the profiles used to estimate
+            the error, e.g. from domain_profiles or control_volume_profiles
+        solve_function: function(model) solving the model and returning True
+            if it converged
+        tol: tolerance on the estimated error of each element, relative to
+            the largest value of each profile
+        max_split: largest number of elements an element is split into in
+            one refinement
+        coarsen: if True, neighbouring elements with a small error are merged
+        transfer: if True, each model is initialized from the solution on
+            the previous mesh after it is built
+    """
+
+    def __init__(self, build_model, domain, profiles, solve_function,
+                 tol=1e-3, max_split=8, coarsen=True, transfer=True):
+        self.build_model = build_model
+        self.domain = domain
+        self.profiles = profiles
+        self.solve_function = solve_function
+        self.tol = tol
+        self.max_split = max_split
+        self.coarsen = coarsen
+        self.transfer = transfer
+        self.model = None
+        self.points = None
+        self.errors = None
+        self.order = 2
+
+    def _build_and_solve(self, points, source=None):
+        res = OrderedDict()
+        res['elements'] = len(points) - 1
+        start = time.perf_counter()
+        m = self.build_model(points)
+        if source is not None:
+            transfer_solution(source, m, self.domain(source), self.domain(m))
+        res['build_time'] = time.perf_counter() - start
+        res['variables'] = number_variables(m)
+        res['constraints'] = number_total_constraints(m)
+        start = time.perf_counter()
+        res['solved'] = bool(self.solve_function(m))
+        res['solve_time'] = time.perf_counter() - start
+        x, y = self.profiles(m)
+        elements = sorted(self.domain(m).get_finite_elements())
+        errors = element_errors(x, y, elements)
+        res['max_error'] = float(np.max(errors))
+        self.order = error_order(x, elements)
+        return m, elements, errors, res
+
+    def run(self, points=None, finite_elements=4, max_iter=10,
+            max_elements=None):
+        """
+        Refine the mesh until the estimated error of every element is below
+        the tolerance.
+
+        Args:
+            points: points of the initial mesh, if None a uniform mesh on
+                [0, 1] is used
+            finite_elements: number of elements of the uniform initial mesh
+            max_iter: largest number of meshes solved
+            max_elements: if given, refinement stops before a mesh with more
+                elements would be built
+
+        Returns:
+            list of an OrderedDict of results for each mesh, with entries
+            iteration, elements, build_time, variables, constraints, solved,
+            solve_time and max_error. The model, finite element bounds,
+            errors and order of the error estimates (see error_order) of the
+            last mesh are kept in the model, points, errors and order
+            attributes.
+        """
+        if points is None:
+            points = list(np.linspace(0, 1, finite_elements + 1))
+        results = []
+        source = None
+        for it in range(max_iter):
+            m, x, errors, res = self._build_and_solve(
+                points, source if self.transfer else None)
+            res['iteration'] = it
+            res.move_to_end('iteration', last=False)
+            results.append(res)
+            self.model, self.points, self.errors = m, x, errors
+            if not res['solved']:
+                _log.warning("Model with {} elements failed to converge, "
+                             "stopping mesh refinement."
+                             .format(res['elements']))
+                break
+            _log.info("Mesh refinement iteration {}: {} elements, maximum "
+                      "estimated error {:.3g}.".format(
+                          it, res['elements'], res['max_error']))
+            if res['max_error'] <= self.tol:
+                break
+            points = refine_points(x, errors, self.tol,
+                                   max_split=self.max_split,
+                                   coarsen=self.coarsen, order=self.order)
+            if max_elements is not None and len(points) - 1 > max_elements:
+                _log.warning("Mesh refinement stopped at {} elements, the "
+                             "next mesh has more than {} elements."
+                             .format(res['elements'], max_elements))
+                break
+            source = m
+        else:
+            _log.warning("Mesh refinement did not reach the tolerance in {} "
+                         "iterations.".format(max_iter))
+        return results
+
+    def compare_uniform(self):
+        """
+        Build and solve the model on the uniform mesh estimated to reach the
+        same tolerance as the last mesh of run, for comparison.
+
+        Returns:
+            OrderedDict of results for the uniform mesh, with the same entries
+            as run
+        """
+        if self.model is None:
+            raise ValueError("The adaptive mesh has not been solved, call "
+                             "run first.")
+        nfe = uniform_elements(self.points, self.errors, self.tol,
+                               order=self.order)
+        x0, x1 = self.points[0], self.points[-1]
+        _, _, _, res = self._build_and_solve(
+            list(np.linspace(x0, x1, nfe + 1)))
+        return res
@@ -14,6 +14,13 @@
 """
 This module contains utility functions to generate phase equilibrium data and
 plots.
+
+Data can be generated one point at a time (the default for ``Txy_data()``), or
+in batches, where one indexed state block is built with a point for every
+composition and condition. The points of a batch are initialized together and
+solved together in chunks, which avoids writing and solving a separate problem
+for every point. Batches are used for T-x-y envelopes at several pressures
+(``Txy_envelopes()``) and for P-x-y data (``Pxy_data()``).
 """
 
 __author__ = "Alejandro Garciadiego"
@@ -26,7 +33,6 @@ from pyomo.environ import (ConcreteModel,
                            Constraint,
                            Expression,
                            units as pyunits)
-import idaes.logger as idaeslog
 from pyomo.opt import TerminationCondition, SolverStatus
 
 import idaes.logger as idaeslog
@@ -35,6 +41,8 @@ import idaes.logger as idaeslog
 import matplotlib.pyplot as plt
 import numpy as np
 
+_log = idaeslog.getLogger(__name__)
+
 def Txy_diagram(
     model, component_1, component_2, pressure, num_points = 20, temperature = 298.15,  figure_name = None,
     print_legend = True, include_pressure = False, print_level=idaeslog.NOTSET,
@@ -73,13 +81,16 @@ def Txy_diagram(
     build_txy_diagrams(Txy_data_to_plot, figure_name, print_legend, include_pressure)
 
 def Txy_data(model, component_1, component_2, pressure, num_points = 20, temperature = 298.15,
-            print_level=idaeslog.NOTSET, solver_op={'tol': 1e-6}):
+            print_level=idaeslog.NOTSET, solver_op={'tol': 1e-6}, batch=False, chunk_size=None):
     """
     Function to generate T-x-y data. The function builds a state block and extracts
     bubble and dew temperatures at P pressure for N number of compositions.
     As N is increased increase the time of the calculation will increase and
     create a smoother looking plot.
 
+    If batch is True, the compositions are calculated as a batch with
+    Txy_envelopes(), which is much faster for large N.
+
     Args:
         component_1: Component 1
         component_2: Component 2
@@ -90,11 +101,20 @@ def Txy_data(model, component_1, component_2, pressure, num_points = 20, tempera
         bubble and dew temperatures for  component 1 and component 2
         print_level: printing level from initialization
         solver_op: solver options
+        batch: If True, build one state block for all the compositions and
+        solve them together
+        chunk_size: Number of compositions solved together in batch mode, all
+        if None
 
     Returns:
         (Class): A class containing the T-x-y data
 
     """
+    if batch:
+        return Txy_envelopes(model, component_1, component_2, [pressure],
+                             num_points=num_points, temperature=temperature,
+                             print_level=print_level, solver_op=solver_op,
+                             chunk_size=chunk_size)[0]
 
     components = list(model.params.component_list)
     components_used = [component_1, component_2]
@@ -179,6 +199,216 @@ def Txy_data(model, component_1, component_2, pressure, num_points = 20, tempera
     # Return the data class with all the information of the calculations
     return TD
 
+def Txy_envelopes(model, component_1, component_2, pressures, num_points=20, temperature=298.15,
+                  print_level=idaeslog.NOTSET, solver_op={'tol': 1e-6}, chunk_size=None):
+    """
+    Function to generate T-x-y data at several pressures in one batch. One
+    state block is built with a point for every composition and pressure, all
+    the points are initialized together, and then solved together in chunks of
+    chunk_size points. If a chunk fails to solve, its points are solved one at
+    a time, starting from the solution of the neighbouring composition.
+
+    Args:
+        model: Model with intialized Property package which contains data to
+        calculate bubble and dew temperatures for component 1 and component 2
+        component_1: Component 1
+        component_2: Component 2
+        pressures: List of pressures at which the bubble and dew temperatures
+        will be calculated
+        num_points: Number of data point to be calculated at each pressure
+        temperature: Temperature at which to initialize state block
+        print_level: printing level from initialization
+        solver_op: solver options
+        chunk_size: Number of points solved together, all if None
+
+    Returns:
+        (list): A TXYDataClass with the T-x-y data for each pressure
+    """
+    x_d = _composition_points(model, component_1, component_2, num_points)
+    conditions = [(temperature, p) for p in pressures]
+    points = _build_batch(model, component_1, component_2, x_d, conditions,
+                          print_level, solver_op)
+    converged = _solve_batch(model, points, chunk_size)
+
+    Punit = pyunits.get_units(model.props[0].pressure)
+    Tunit = pyunits.get_units(model.props[0].temperature)
+
+    results = []
+    for k, pressure in enumerate(pressures):
+        TD = TXYDataClass(component_1, component_2, Punit, Tunit, pressure)
+        for n, (kn, i) in enumerate(points):
+            if kn != k or not converged[n]:
+                continue
+            bubble, dew = _bubble_dew(model.props[n], "temperature", "t")
+            if bubble is not None:
+                TD.TBubb.append(bubble)
+            if dew is not None:
+                TD.TDew.append(dew)
+            TD.x.append(x_d[i])
+        results.append(TD)
+    return results
+
+
+def Pxy_data(model, component_1, component_2, temperature, num_points=20, pressure=101325,
+             print_level=idaeslog.NOTSET, solver_op={'tol': 1e-6}, chunk_size=None):
+    """
+    Function to generate P-x-y data. The function builds one state block with a
+    point for every composition and extracts the bubble and dew pressures at
+    temperature T, solving the points as a batch (see Txy_envelopes()).
+
+    Args:
+        model: Model with intialized Property package which contains data to
+        calculate bubble and dew pressures for component 1 and component 2
+        component_1: Component 1
+        component_2: Component 2
+        temperature: Temperature at which the bubble and dew pressures will be
+        calculated
+        num_points: Number of data point to be calculated
+        pressure: Pressure at which to initialize state block
+        print_level: printing level from initialization
+        solver_op: solver options
+        chunk_size: Number of points solved together, all if None
+
+    Returns:
+        (Class): A class containing the P-x-y data
+    """
+    x_d = _composition_points(model, component_1, component_2, num_points)
+    points = _build_batch(model, component_1, component_2, x_d,
+                          [(temperature, pressure)], print_level, solver_op,
+                          properties=("pressure_bubble", "pressure_dew"))
+    converged = _solve_batch(model, points, chunk_size)
+
+    PD = PXYDataClass(component_1, component_2,
+                      pyunits.get_units(model.props[0].pressure),
+                      pyunits.get_units(model.props[0].temperature),
+                      temperature)
+    for n, (k, i) in enumerate(points):
+        if not converged[n]:
+            continue
+        bubble, dew = _bubble_dew(model.props[n], "pressure", "p")
+        if bubble is not None:
+            PD.PBubb.append(bubble)
+        if dew is not None:
+            PD.PDew.append(dew)
+        PD.x.append(x_d[i])
+    return PD
+
+
+def _composition_points(model, component_1, component_2, num_points):
+    # Mole fractions of component 1, from close to 1 to close to 0. The other
+    # components (other than component 2) are fixed at 1e-5.
+    n_other = len([j for j in model.params.component_list
+                   if j not in (component_1, component_2)])
+    x = 0.99
+    return np.linspace(x, 1 - x - 1e-5*n_other, num_points)
+
+
+def _build_batch(model, component_1, component_2, x_d, conditions, print_level,
+                 solver_op, properties=()):
+    """
+    Build model.props with a point for each combination of condition
+    (temperature, pressure) and composition in x_d, and initialize all the
+    points together. Any properties in properties are constructed before the
+    initialization, so that they are initialized too.
+
+    Returns:
+        list of (condition index, composition index) for each point
+    """
+    if hasattr(model, "props"):
+        model.del_component(model.props)
+    points = [(k, i) for k in range(len(conditions)) for i in range(len(x_d))]
+    model.props = model.params.build_state_block(
+        range(len(points)), default={"defined_state": True})
+
+    others = [j for j in model.params.component_list
+              if j not in (component_1, component_2)]
+    xs = 1e-5*len(others)
+    for n, (k, i) in enumerate(points):
+        b = model.props[n]
+        b.mole_frac_comp[component_1].fix(x_d[i])
+        b.mole_frac_comp[component_2].fix(1 - x_d[i] - xs)
+        for j in others:
+            b.mole_frac_comp[j].fix(1e-5)
+        b.flow_mol.fix(1)
+        b.temperature.fix(conditions[k][0])
+        b.pressure.fix(conditions[k][1])
+        for prop in properties:
+            # built on demand; not all components have bubble and dew points
+            hasattr(b, prop)
+
+    model.props.initialize(optarg=solver_op, outlvl=print_level)
+    return points
+
+
+def _solve_batch(model, points, chunk_size):
+    """
+    Solve the points of model.props in chunks of chunk_size points, with the
+    points outside the chunk deactivated. The points of a chunk that fails are
+    solved one at a time, warm started from the previous converged point at
+    the same condition.
+
+    Returns:
+        list of bool, True for each point that solved to an optimal solution
+    """
+    solver = SolverFactory('ipopt')
+    blocks = [model.props[n] for n in range(len(points))]
+    if chunk_size is None or chunk_size < 1:
+        chunk_size = len(blocks)
+    converged = [False]*len(blocks)
+
+    def _solve(active):
+        for n, b in enumerate(blocks):
+            if n in active:
+                b.activate()
+            else:
+                b.deactivate()
+        status = solver.solve(model, tee=False)
+        return (status.solver.status == SolverStatus.ok and
+                status.solver.termination_condition ==
+                TerminationCondition.optimal)
+
+    try:
+        for start in range(0, len(blocks), chunk_size):
+            chunk = range(start, min(start + chunk_size, len(blocks)))
+            if _solve(chunk):
+                for n in chunk:
+                    converged[n] = True
+                _log.info(f"Points {chunk[0] + 1}-{chunk[-1] + 1}: Optimal.")
+                continue
+            for n in chunk:
+                prev = n - 1
+                if prev >= 0 and converged[prev] and \
+                        points[prev][0] == points[n][0]:
+                    _copy_values(blocks[prev], blocks[n])
+                converged[n] = _solve([n])
+                _log.info(f"Point {n + 1}: "
+                          f"{'Optimal' if converged[n] else 'No Result'}.")
+    finally:
+        for b in blocks:
+            b.activate()
+    return converged
+
+
+def _copy_values(source, dest):
+    # Copy the values of the unfixed variables of one point to another, the
+    # points have the same structure
+    for v_src, v_dst in zip(source.component_data_objects(Var),
+                            dest.component_data_objects(Var)):
+        if not v_dst.fixed:
+            v_dst.value = v_src.value
+
+
+def _bubble_dew(b, prop, short):
+    # Bubble and dew values of prop ("temperature" or "pressure") at a point,
+    # None if the point has no bubble or dew point
+    bubble = dew = None
+    if hasattr(b, f"_mole_frac_{short}bub"):
+        bubble = value(getattr(b, f"{prop}_bubble")['Vap', 'Liq'])
+    if hasattr(b, f"_mole_frac_{short}dew"):
+        dew = value(getattr(b, f"{prop}_dew")['Vap', 'Liq'])
+    return bubble, dew
+
+
 # Author: Alejandro Garciadiego
 class TXYDataClass:
     """
@@ -244,6 +474,35 @@ class TXYDataClass:
         """
         self.x = data_list_3
 
+class PXYDataClass:
+    """
+    Write P-x-y data into a class. The class can be obtained by running
+    Pxy_data() or by assigining values to the class.
+    """
+    def __init__(self, component_1, component_2, Punits, Tunits, temperature):
+        """
+        Args:
+            component_1: Component 1
+            component_2: Component 2
+            Punits: Units of pressure
+            Tunits: Units of temperature
+            temperature: Temperature at which the P-x-y data was evaluated
+
+        Returns:
+            (Class): A class containing the P-x-y data
+        """
+        self.Component_1 = component_1
+        self.Component_2 = component_2
+
+        self.Punits = Punits
+        self.Tunits = Tunits
+
+        self.T = temperature
+
+        self.PBubb = []
+        self.PDew = []
+        self.x = []
+
 # Author: Alejandro Garciadiego
 def build_txy_diagrams(txy_data, figure_name=None, print_legend=True, include_pressure=False):
     """
@@ -0,0 +1,219 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Solver service for initialization routines.
+
+Initialization routines solve many small problems, and with a solver
+executable every solve writes an NL file, starts a process and reads a SOL
+file, which for small problems takes much longer than the solve itself. If
+``idaes.cfg.initialization_solver.in_process`` is True, the solver objects
+returned by ``get_initialization_solver`` solve small square systems of
+equations in-process, one block of their block triangular decomposition at
+a time with Newton's method. Everything else, and any problem the Newton
+iterations fail on, is passed to the solver executable. In-process solves
+use an absolute tolerance on the unscaled residuals and ignore the options
+of the executable, so they are off by default. Executable solver objects
+are created once and shared.
+
+The service is configured through ``idaes.cfg.initialization_solver`` and
+records the number of calls and the time spent on each path, see
+``get_solver_service().statistics``.
+"""
+import time
+
+from pyomo.environ import SolverFactory
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+
+import idaes
+import idaes.logger as idaeslog
+from idaes.core.util.block_solver import SquareSystem, solve_system
+
+_log = idaeslog.getLogger(__name__)
+
+# Solver options used when no solver is specified, as in get_default_solver
+DEFAULT_SOLVER = 'ipopt'
+DEFAULT_OPTIONS = {'tol': 1e-6, 'linear_solver': 'ma27'}
+
+
+class InitializationSolverService(object):
+    """
+    Shared state of the initialization solvers: the executable solver
+    objects and the call statistics.
+
+    ``statistics`` is a dict with an entry for each path, 'in_process' and
+    'executable', of the number of calls, the total wall time and, for the
+    executable, the total time of the solver process. The time of a failed
+    in-process attempt is counted in 'in_process_failed'.
+    """
+
+    def __init__(self):
+        self._executables = {}
+        self.reset_statistics()
+
+    def reset_statistics(self):
+        """Reset the call statistics."""
+        self.statistics = {
+            'in_process': {'calls': 0, 'time': 0.0},
+            'in_process_failed': {'calls': 0, 'time': 0.0},
+            'executable': {'calls': 0, 'time': 0.0, 'process_time': 0.0},
+        }
+
+    def get_executable(self, solver):
+        """Return the shared solver object of a solver executable."""
+        try:
+            return self._executables[solver]
+        except KeyError:
+            opt = SolverFactory(solver)
+            self._executables[solver] = opt
+            return opt
+
+    def report(self):
+        """Return a summary of the call statistics as a string."""
+        lines = []
+        for path, s in self.statistics.items():
+            per_call = s['time']/s['calls'] if s['calls'] else 0.0
+            line = '{:18s} {:6d} calls {:10.4f} s {:10.3e} s/call'.format(
+                path, s['calls'], s['time'], per_call)
+            if 'process_time' in s and s['calls']:
+                line += ' ({:.3e} s/call outside the solver process)'.format(
+                    (s['time'] - s['process_time'])/s['calls'])
+            lines.append(line)
+        return '\n'.join(lines)
+
+    def _record(self, path, start, process_time=None):
+        s = self.statistics[path]
+        s['calls'] += 1
+        s['time'] += time.perf_counter() - start
+        if process_time is not None:
+            s['process_time'] += process_time
+
+    def solve_in_process(self, blk, tee=False):
+        """
+        Try to solve a block in-process. Returns a SolverResults object, or
+        None if the block is not a small square system or the Newton
+        iterations fail.
+        """
+        cfg = idaes.cfg.initialization_solver
+        if not cfg.in_process or \
+                not hasattr(blk, 'component_data_objects'):
+            return None
+        start = time.perf_counter()
+        system = SquareSystem.from_block(blk, cfg.max_in_process_size)
+        if system is None:
+            return None
+        # the Python values, as get_values() turns None into nan
+        x0 = [v.value for v in system.variables]
+        try:
+            blocks, iters, _, failed = solve_system(
+                system, tol=cfg.tolerance, max_iter=cfg.max_iter, tee=tee)
+        except Exception as err:
+            # e.g. structurally singular systems or expressions that cannot
+            # be differentiated by Pyomo
+            _log.debug('In-process solve of {} not possible: {}'
+                       .format(blk.name, err))
+            blocks, iters, failed = [], 0, system
+        if failed is not None:
+            # Variables without a value are never changed, as the Newton
+            # iterations of their block do not start
+            for v, val in zip(system.variables, x0):
+                if val is not None:
+                    v.set_value(val)
+            self._record('in_process_failed', start)
+            _log.debug('In-process solve of {} failed after {} iterations'
+                       .format(blk.name, iters))
+            return None
+        self._record('in_process', start)
+        results = SolverResults()
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.optimal
+        results.solver.message = (
+            'In-process Newton solve of {} blocks converged in {} iterations'
+            .format(len(blocks), iters))
+        results.problem.number_of_variables = len(system.variables)
+        results.problem.number_of_constraints = len(system.constraints)
+        return results
+
+    def solve(self, blk, solver, options, tee=False, **kwds):
+        """
+        Solve a block in-process if possible, else with the solver
+        executable.
+        """
+        results = self.solve_in_process(blk, tee=tee)
+        if results is not None:
+            return results
+        opt = self.get_executable(solver)
+        start = time.perf_counter()
+        results = opt.solve(blk, tee=tee, options=options, **kwds)
+        self._record('executable', start,
+                     getattr(opt, '_last_solve_time', None))
+        return results
+
+
+_service = InitializationSolverService()
+
+
+def get_solver_service():
+    """Return the initialization solver service."""
+    return _service
+
+
+class InitializationSolver(object):
+    """
+    Solver object for initialization routines, which can be used in place of
+    a Pyomo solver object with a ``solve`` method. Small square problems are
+    solved in-process, others with the executable of the given solver.
+
+    Args:
+        solver: name of the solver executable (default = 'ipopt')
+        options: dict of options for the solver executable
+    """
+
+    def __init__(self, solver=None, options=None):
+        if solver is None:
+            solver = DEFAULT_SOLVER
+            if options is None:
+                options = dict(DEFAULT_OPTIONS)
+        self.name = solver
+        self.options = {} if options is None else options
+
+    def available(self, exception_flag=True):
+        """Return True if the solver executable is available."""
+        return _service.get_executable(self.name).available(
+            exception_flag=exception_flag)
+
+    def solve(self, blk, tee=False, **kwds):
+        """
+        Solve a block. Keyword arguments other than tee are passed to the
+        solver executable.
+
+        Returns:
+            SolverResults
+        """
+        return _service.solve(blk, self.name, dict(self.options or {}),
+                              tee=tee, **kwds)
+
+
+def get_initialization_solver(solver=None, options=None):
+    """
+    Return a solver object for an initialization routine.
+
+    Args:
+        solver: name of the solver executable used for problems not solved
+            in-process. If None, Ipopt is used with the options of
+            get_default_solver.
+        options: dict of options for the solver executable
+
+    Returns:
+        InitializationSolver
+    """
+    return InitializationSolver(solver, options)
@@ -0,0 +1,382 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Parameter sweeps with warm-started solves.
+
+Solving every point of a sweep from the same initial state means many solves
+start far from their solution. ``ParameterSweep`` orders the points along a
+short path through the parameter space (nearest neighbour or Hilbert curve)
+and starts each solve from the nearest converged solution found so far,
+including the constraint and bound multipliers if the solver returns them.
+The path can be split into contiguous segments solved by different MPI
+processes, and the iterations of each solve can be compared with a solve
+from the initial state.
+"""
+from collections import OrderedDict
+import time
+
+import numpy as np
+
+from pyomo.environ import Constraint, Suffix, Var, value
+from pyomo.core.base.var import _VarData
+
+from idaes.core.util.convergence import mpi_utils as mpiu
+from idaes.core.util.convergence.convergence_base import _run_ipopt_with_stats
+import idaes.logger as idaeslog
+
+_log = idaeslog.getLogger(__name__)
+
+# Ipopt options for a solve started from a primal-dual solution
+WARM_START_OPTIONS = {
+    'warm_start_init_point': 'yes',
+    'warm_start_bound_push': 1e-8,
+    'warm_start_mult_bound_push': 1e-8,
+    'mu_init': 1e-6,
+}
+
+# Suffixes used to pass multipliers to and from Ipopt
+_DUAL_SUFFIXES = (('dual', Suffix.IMPORT_EXPORT),
+                  ('ipopt_zL_out', Suffix.IMPORT),
+                  ('ipopt_zU_out', Suffix.IMPORT),
+                  ('ipopt_zL_in', Suffix.EXPORT),
+                  ('ipopt_zU_in', Suffix.EXPORT))
+
+
+def _scaled(points, reference=None):
+    # Scale each parameter by its range so all contribute to distances
+    points = np.asarray(points, dtype=float)
+    allp = points if reference is None else np.vstack((points, reference))
+    lo = allp.min(axis=0)
+    span = allp.max(axis=0) - lo
+    span[span == 0] = 1.0
+    return (points - lo)/span, lo, span
+
+
+def _hilbert_index(coords, bits):
+    # Index along the Hilbert curve of points with integer coordinates in
+    # [0, 2**bits), using Skilling's transpose algorithm.
+    x = [int(c) for c in coords]
+    n = len(x)
+    m = 1 << (bits - 1)
+    q = m
+    while q > 1:
+        p = q - 1
+        for i in range(n):
+            if x[i] & q:
+                x[0] ^= p
+            else:
+                t = (x[0] ^ x[i]) & p
+                x[0] ^= t
+                x[i] ^= t
+        q >>= 1
+    for i in range(1, n):
+        x[i] ^= x[i - 1]
+    t = 0
+    q = m
+    while q > 1:
+        if x[n - 1] & q:
+            t ^= q - 1
+        q >>= 1
+    for i in range(n):
+        x[i] ^= t
+    index = 0
+    for b in range(bits - 1, -1, -1):
+        for i in range(n):
+            index = (index << 1) | ((x[i] >> b) & 1)
+    return index
+
+
+def order_points(points, method='nearest', start=None, bits=10):
+    """
+    Return an order in which to solve the points of a sweep.
+
+    Args:
+        points: array of points, one row per point
+        method: 'nearest' to go to the nearest unvisited point at each step,
+            'hilbert' to follow a Hilbert space-filling curve or 'given' to
+            keep the order of the points
+        start: parameter values the path should start near, e.g. those of
+            the initialized model. If None, the path starts at the first
+            point.
+        bits: bits per parameter of the grid used for 'hilbert'
+
+    Returns:
+        list of point indices
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 1:
+        points = points.reshape(-1, 1)
+    n = points.shape[0]
+    if method == 'given' or n < 2:
+        return list(range(n))
+    ref = None if start is None else np.asarray(start, dtype=float).reshape(
+        1, -1)
+    scaled, lo, span = _scaled(points, ref)
+    if method == 'nearest':
+        unvisited = np.ones(n, dtype=bool)
+        if start is None:
+            current = 0
+        else:
+            s = (ref[0] - lo)/span
+            current = int(np.argmin(np.sum((scaled - s)**2, axis=1)))
+        order = [current]
+        unvisited[current] = False
+        for _ in range(n - 1):
+            d = np.sum((scaled - scaled[current])**2, axis=1)
+            d[~unvisited] = np.inf
+            current = int(np.argmin(d))
+            order.append(current)
+            unvisited[current] = False
+        return order
+    elif method == 'hilbert':
+        grid = np.minimum(np.floor(scaled*(1 << bits)), (1 << bits) - 1)
+        keys = [_hilbert_index(g, bits) for g in grid]
+        order = sorted(range(n), key=lambda i: keys[i])
+        if start is not None:
+            # Walk the curve from the end nearer the start point
+            s = (ref[0] - lo)/span
+            if np.sum((scaled[order[-1]] - s)**2) < \
+                    np.sum((scaled[order[0]] - s)**2):
+                order.reverse()
+        return order
+    raise ValueError('Unrecognised ordering method {}.'.format(method))
+
+
+class SolutionCache(object):
+    """
+    Converged solutions of a sweep keyed by their parameter vectors. Each
+    entry holds the values of the sweep's variables and, if available, the
+    constraint and bound multipliers.
+
+    Args:
+        scale: parameter scale factors used for distances (default = 1)
+    """
+
+    def __init__(self, scale=None):
+        self.scale = None if scale is None else np.asarray(scale, dtype=float)
+        self._solutions = OrderedDict()
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def add(self, point, solution):
+        """Store a solution for a parameter vector."""
+        self._solutions[tuple(float(p) for p in point)] = solution
+
+    def get(self, point):
+        """Return the solution for a parameter vector, or None."""
+        return self._solutions.get(tuple(float(p) for p in point), None)
+
+    def nearest(self, point):
+        """
+        Return the (parameter vector, solution) of the cached solution
+        nearest to a point, or None if the cache is empty.
+        """
+        if not self._solutions:
+            return None
+        keys = list(self._solutions.keys())
+        d = np.asarray(keys, dtype=float) - np.asarray(point, dtype=float)
+        if self.scale is not None:
+            d = d/self.scale
+        k = keys[int(np.argmin(np.sum(d**2, axis=1)))]
+        return k, self._solutions[k]
+
+
+def ipopt_solve_function(model, solver, warm_start):
+    """
+    Default solve function of a sweep, which solves a model with Ipopt and
+    returns whether it converged and the number of iterations.
+    """
+    saved = dict(solver.options)
+    if warm_start:
+        solver.options.update(WARM_START_OPTIONS)
+    try:
+        _, solved, iters, _ = _run_ipopt_with_stats(model, solver)
+    finally:
+        solver.options = saved
+    return solved, iters
+
+
+class ParameterSweep(object):
+    """
+    Solve a model at a set of parameter values, warm-starting each solve
+    from the nearest converged solution.
+
+    Args:
+        model: model to solve, initialized at its current parameter values
+        parameters: list of fixed Var or mutable Param data objects swept
+        solver: solver object passed to solve_function
+        solve_function: function(model, solver, warm_start) that solves the
+            model and returns (converged, iterations). warm_start is True if
+            multipliers from a previous solution have been loaded. Defaults
+            to ipopt_solve_function.
+        order: ordering method of the points, see order_points
+        duals: if True, multipliers are stored and loaded through the
+            Ipopt suffixes of the model, which are created if missing
+    """
+
+    def __init__(self, model, parameters, solver=None, solve_function=None,
+                 order='nearest', duals=True):
+        self.model = model
+        self.parameters = list(parameters)
+        for p in self.parameters:
+            if isinstance(p, _VarData):
+                if not p.fixed:
+                    raise ValueError('Sweep parameter {} must be fixed.'
+                                     .format(p.name))
+            elif p.is_constant():
+                raise ValueError('Sweep parameter {} must be a fixed Var or a '
+                                 'mutable Param.'.format(p.name))
+        self.solver = solver
+        self.solve_function = ipopt_solve_function \
+            if solve_function is None else solve_function
+        self.order = order
+        self.duals = duals
+        self.variables = [v for v in model.component_data_objects(
+            Var, descend_into=True) if not v.fixed]
+        self.constraints = list(model.component_data_objects(
+            Constraint, active=True, descend_into=True))
+        if duals:
+            for name, direction in _DUAL_SUFFIXES:
+                if model.component(name) is None:
+                    model.add_component(name, Suffix(direction=direction))
+        self.initial_point = [value(p) for p in self.parameters]
+        self.initial_state = self._get_solution(duals=False)
+        self.cache = None
+
+    def _set_parameters(self, point):
+        for p, v in zip(self.parameters, point):
+            p.set_value(float(v))
+
+    def _get_solution(self, duals=True):
+        sol = {'primal': [v.value for v in self.variables]}
+        if duals and self.duals:
+            m = self.model
+            sol['dual'] = [m.dual.get(c, None) for c in self.constraints]
+            sol['zL'] = [m.ipopt_zL_out.get(v, None) for v in self.variables]
+            sol['zU'] = [m.ipopt_zU_out.get(v, None) for v in self.variables]
+        return sol
+
+    def _load_solution(self, sol):
+        # Returns True if multipliers were loaded
+        for v, x in zip(self.variables, sol['primal']):
+            v.set_value(x)
+        if not self.duals:
+            return False
+        m = self.model
+        for s in (m.dual, m.ipopt_zL_in, m.ipopt_zU_in):
+            s.clear()
+        if 'dual' not in sol:
+            return False
+        loaded = False
+        for c, y in zip(self.constraints, sol['dual']):
+            if y is not None:
+                m.dual[c] = y
+                loaded = True
+        for v, zl, zu in zip(self.variables, sol['zL'], sol['zU']):
+            if zl is not None:
+                m.ipopt_zL_in[v] = zl
+            if zu is not None:
+                m.ipopt_zU_in[v] = zu
+        return loaded
+
+    def _solve(self, point, warm):
+        self._set_parameters(point)
+        if warm:
+            near = self.cache.nearest(point)
+        else:
+            near = None
+        if near is None:
+            self._load_solution(self.initial_state)
+            warm_start = False
+        else:
+            warm_start = self._load_solution(near[1])
+        start = time.perf_counter()
+        solved, iters = self.solve_function(self.model, self.solver,
+                                            warm_start)
+        return solved, iters, time.perf_counter() - start
+
+    def run(self, points, compare_cold=False):
+        """
+        Solve the model at each point of a sweep.
+
+        With MPI, the ordered path is split into contiguous segments, one for
+        each process, and the results of all processes are gathered on the
+        root process (other processes return None).
+
+        Args:
+            points: array of parameter values, one row per point, in the
+                order of the sweep's parameters
+            compare_cold: if True, each point is also solved from the
+                initial state to measure the iterations saved
+
+        Returns:
+            list of an OrderedDict of results for each point, in the order
+            the points were given, with entries index, point, solved, iters,
+            time, distance (to the point the solve was started from) and,
+            if compare_cold, cold_iters
+        """
+        points = np.asarray(points, dtype=float)
+        if points.ndim == 1:
+            points = points.reshape(-1, 1)
+        if points.shape[1] != len(self.parameters):
+            raise ValueError('Points must have one value per parameter.')
+        order = order_points(points, self.order, start=self.initial_point)
+        _, _, span = _scaled(points, np.asarray([self.initial_point]))
+        self.cache = SolutionCache(scale=span)
+
+        task_mgr = mpiu.ParallelTaskManager(len(order))
+        local_order = task_mgr.global_to_local_data(order)
+        results = []
+        for i in local_order:
+            p = points[i]
+            res = OrderedDict()
+            res['index'] = i
+            res['point'] = list(p)
+            if compare_cold:
+                _, res['cold_iters'], _ = self._solve(p, warm=False)
+            near = self.cache.nearest(p)
+            ref = self.initial_point if near is None else near[0]
+            res['distance'] = float(np.sqrt(np.sum(
+                ((p - np.asarray(ref))/span)**2)))
+            res['solved'], res['iters'], res['time'] = self._solve(p, True)
+            if res['solved']:
+                self.cache.add(p, self._get_solution())
+            else:
+                _log.warning('Sweep point {} failed to converge.'.format(i))
+            results.append(res)
+
+        results = task_mgr.gather_global_data(results)
+        if results is None:
+            return None
+        return sorted(results, key=lambda r: r['index'])
+
+
+def sweep_statistics(results):
+    """
+    Summarise the results of ParameterSweep.run.
+
+    Returns:
+        dict with the number of points and of converged points, the total
+        iterations and, if the sweep compared cold starts, the total cold
+        start iterations and the fraction of iterations saved
+    """
+    stats = OrderedDict()
+    stats['points'] = len(results)
+    stats['solved'] = sum(1 for r in results if r['solved'])
+    stats['iters'] = sum(r['iters'] for r in results)
+    if results and 'cold_iters' in results[0]:
+        cold = sum(r['cold_iters'] for r in results)
+        stats['cold_iters'] = cold
+        stats['iters_saved'] = (cold - stats['iters'])/cold if cold else 0.0
+    return stats
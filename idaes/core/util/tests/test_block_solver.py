@@ -0,0 +1,182 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for the block triangular decomposition and Newton solver.
+"""
+import logging
+
+import pytest
+
+from pyomo.environ import (ConcreteModel,
+                           Constraint,
+                           RangeSet,
+                           TerminationCondition,
+                           Var,
+                           exp,
+                           value)
+from pyomo.opt import SolverResults
+
+from idaes.core.util.block_solver import (block_triangularize,
+                                          maximum_matching,
+                                          pynumero_available,
+                                          solve_strongly_connected_components,
+                                          SquareSystem,
+                                          tarjan_scc)
+
+
+def _model():
+    # x[1] is given by c1, x[2] and x[3] by c2 and c3 together and x[4] by c4
+    m = ConcreteModel()
+    m.x = Var([1, 2, 3, 4], initialize=1)
+    m.p = Var(initialize=2)
+    m.p.fix()
+    m.c4 = Constraint(expr=m.x[4] == m.x[2] + m.x[3])
+    m.c2 = Constraint(expr=m.x[2] + m.x[3]**2 == m.x[1] + 4)
+    m.c1 = Constraint(expr=exp(m.x[1]) == m.p)
+    m.c3 = Constraint(expr=m.x[2] == m.x[3])
+    return m
+
+
+@pytest.mark.unit
+def test_maximum_matching():
+    # The greedy matching of constraint 0 to variable 0 has to be undone
+    assert maximum_matching([[0, 1], [0]], 2) == [1, 0]
+    assert maximum_matching([[0, 1, 2], [0], [1]], 3) == [2, 0, 1]
+    # Structurally singular
+    assert maximum_matching([[0], [0]], 2)[1] is None
+
+
+@pytest.mark.unit
+def test_tarjan_scc():
+    # 0 -> 1 -> 2 -> 1, 3 -> 0
+    comps = tarjan_scc([[1], [2], [1], [0]])
+    assert [sorted(c) for c in comps] == [[1, 2], [0], [3]]
+
+
+@pytest.mark.unit
+def test_block_triangularize():
+    m = _model()
+    system = SquareSystem.from_block(m)
+    blocks = block_triangularize(system)
+    names = [sorted(system.constraints[i].local_name for i in con_idx)
+             for con_idx, var_idx in blocks]
+    assert names == [["c1"], ["c2", "c3"], ["c4"]]
+    for con_idx, var_idx in blocks:
+        assert len(con_idx) == len(var_idx)
+
+
+@pytest.mark.unit
+def test_block_triangularize_singular():
+    m = ConcreteModel()
+    m.x = Var([1, 2, 3], initialize=1)
+    m.c1 = Constraint(expr=m.x[1] == 1)
+    m.c2 = Constraint(expr=m.x[1]**2 == 1)
+    m.c3 = Constraint(expr=m.x[2] + m.x[3] == 1)
+    system = SquareSystem.from_block(m)
+    assert len(system.variables) == 3
+    with pytest.raises(ValueError, match="structurally singular"):
+        block_triangularize(system)
+    m.c4 = Constraint(expr=m.x[2] >= 0)
+    assert SquareSystem.from_block(m) is None
+
+
+@pytest.mark.unit
+def test_solve():
+    m = _model()
+    res = solve_strongly_connected_components(m)
+    assert res.solver.termination_condition == TerminationCondition.optimal
+    assert value(m.x[1]) == pytest.approx(0.6931471805599453)
+    for c in (m.c1, m.c2, m.c3, m.c4):
+        assert value(c.body) == pytest.approx(value(c.upper), abs=1e-8)
+
+
+@pytest.mark.unit
+def test_solve_tee(caplog):
+    # the iteration log is written to the solve logger, which does not
+    # propagate to the handler of caplog
+    log = logging.getLogger("idaes.solve.core.util.block_solver")
+    log.addHandler(caplog.handler)
+    try:
+        solve_strongly_connected_components(_model(), tee=True)
+    finally:
+        log.removeHandler(caplog.handler)
+    assert "Block of 1 variables" in caplog.text
+
+
+@pytest.mark.unit
+def test_solve_chain():
+    m = ConcreteModel()
+    m.s = RangeSet(500)
+    m.x = Var(m.s, initialize=1, bounds=(0, None))
+    m.c = Constraint(m.s, rule=lambda b, i: b.x[i]**2 == (
+        2 if i == 1 else b.x[i - 1] + 1))
+    res = solve_strongly_connected_components(m)
+    assert res.solver.termination_condition == TerminationCondition.optimal
+    assert value(m.x[500]) == pytest.approx((1 + 5**0.5)/2)
+
+
+class _Solver(object):
+    # Sets x[2] to 5 and records the fixed variables
+    def solve(self, blk):
+        cons = list(blk.component_data_objects(Constraint, active=True))
+        self.fixed = [v.fixed for v in self.m.x.values()]
+        self.n_cons = len(cons)
+        self.m.x[2].value = 5
+        res = SolverResults()
+        res.solver.termination_condition = TerminationCondition.optimal
+        return res
+
+
+@pytest.mark.unit
+def test_solve_fallback():
+    m = ConcreteModel()
+    m.x = Var([1, 2], initialize=1)
+    m.c1 = Constraint(expr=m.x[1] == 3)
+    # c2 has no real solution, so the Newton iterations fail
+    m.c2 = Constraint(expr=m.x[2]**2 == m.x[1] - 4)
+
+    res = solve_strongly_connected_components(m)
+    assert res.solver.termination_condition == TerminationCondition.other
+    assert value(m.x[2]) == 1
+
+    solver = _Solver()
+    solver.m = m
+    m.x[2].value = 1
+    res = solve_strongly_connected_components(m, solver=solver)
+    assert res.solver.termination_condition == TerminationCondition.optimal
+    assert solver.n_cons == 1
+    assert solver.fixed == [True, False]
+    assert not m.x[1].fixed
+    assert value(m.x[2]) == 5
+
+
+@pytest.mark.unit
+def test_solve_errors():
+    m = _model()
+    m.c3.deactivate()
+    with pytest.raises(ValueError):
+        solve_strongly_connected_components(m)
+    m.c3.activate()
+    with pytest.raises(ValueError):
+        solve_strongly_connected_components(m, jacobian="foo")
+
+
+@pytest.mark.skipif(not pynumero_available(),
+                    reason="PyNumero ASL interface not available")
+@pytest.mark.component
+def test_solve_pynumero():
+    m = _model()
+    res = solve_strongly_connected_components(m, jacobian="pynumero")
+    assert res.solver.termination_condition == TerminationCondition.optimal
+    for c in (m.c1, m.c2, m.c3, m.c4):
+        assert value(c.body) == pytest.approx(value(c.upper), abs=1e-8)
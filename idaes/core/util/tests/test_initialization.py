@@ -40,6 +40,7 @@ from idaes.core.util.exceptions import ConfigurationError
 from idaes.core.util.initialization import (fix_state_vars,
                                             revert_state_vars,
                                             propagate_state,
+                                            set_indexed_block_values,
                                             solve_indexed_blocks,
                                             initialize_by_time_element)
 
@@ -792,6 +793,31 @@ def test_solve_indexed_block_error():
         solve_indexed_blocks(solver=None, blocks=[1, 2, 3])
 
 
+@pytest.mark.unit
+def test_set_indexed_block_values():
+    m = ConcreteModel()
+    m.s = Set(initialize=[1, 2, 3])
+
+    def block_rule(b, x):
+        b.v = Var(initialize=1.0)
+        b.w = Var(["a", "b"], initialize=1.0)
+        if x != 2:
+            b.u = Var(initialize=1.0)
+    m.b = Block(m.s, rule=block_rule)
+    m.b[2].w["a"].fix()
+
+    skipped = set_indexed_block_values(m.b, {"v": [2.0, 3.0, float("nan")],
+                                             "w": {"a": [4.0, 5.0, 6.0]},
+                                             "u": [7.0, 8.0, 9.0]})
+
+    assert skipped == 2
+    assert [m.b[i].v.value for i in m.s] == [2.0, 3.0, 1.0]
+    assert [m.b[i].w["a"].value for i in m.s] == [4.0, 1.0, 6.0]
+    assert [m.b[i].w["b"].value for i in m.s] == [1.0, 1.0, 1.0]
+    assert m.b[1].u.value == 7.0
+    assert m.b[3].u.value == 9.0
+
+
 @pytest.mark.integration
 @pytest.mark.skipif(solver is None, reason="Solver not available")
 def test_initialize_by_time_element():
@@ -0,0 +1,248 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for adaptive mesh refinement.
+"""
+import numpy as np
+import pytest
+
+from pyomo.environ import (Block,
+                           ConcreteModel,
+                           Constraint,
+                           Set,
+                           TransformationFactory,
+                           Var,
+                           value)
+from pyomo.dae import ContinuousSet, DerivativeVar
+
+from idaes.core.util.block_solver import SquareSystem, newton_solve
+from idaes.core.util.mesh_refinement import (AdaptiveMeshRefinement,
+                                             control_volume_profiles,
+                                             domain_profiles,
+                                             element_errors,
+                                             error_order,
+                                             refine_points,
+                                             transfer_solution,
+                                             uniform_elements)
+
+
+@pytest.mark.unit
+def test_element_errors():
+    x = np.linspace(0, 1, 5)
+    # Linear profiles have no error
+    assert element_errors(x, [2*x + 1]) == pytest.approx(0, abs=1e-12)
+    # y'' = 2 everywhere, scaled by max(y) = 1
+    err = element_errors(x, [x**2, 3*x])
+    assert err == pytest.approx(np.full(4, 0.5*0.25**2*2))
+    with pytest.raises(ValueError):
+        element_errors([0, 1], [[0, 1]])
+    with pytest.raises(ValueError):
+        element_errors(x, [[0, 1]])
+    # Elements with points inside them
+    x = np.linspace(0, 1, 9)
+    err = element_errors(x, [x**2], elements=x[::2])
+    assert err == pytest.approx(np.full(4, 0.5*0.25**2*2))
+    assert element_errors(x, [x**2], elements=x) == \
+        pytest.approx(element_errors(x, [x**2]))
+    with pytest.raises(ValueError):
+        element_errors(x, [x**2], elements=[0, 0.3, 1])
+    # Elements with three intervals, the estimate is of third order: zero
+    # for quadratic profiles and h**3*y'''/6 for cubic ones
+    x = np.linspace(0, 1, 13)
+    assert element_errors(x, [x**2], elements=x[::3]) == \
+        pytest.approx(0, abs=1e-12)
+    err = element_errors(x, [x**3], elements=x[::3])
+    assert err == pytest.approx(np.full(4, 0.25**3))
+    assert error_order(x, x[::3]) == 3
+    assert error_order(x) == error_order(x, x[::2]) == 2
+
+
+@pytest.mark.unit
+def test_refine_points():
+    x = [0, 0.25, 0.5, 0.75, 1]
+    new = refine_points(x, [0.04, 0.002, 0, 0], tol=0.01)
+    assert new == pytest.approx([0, 1/12, 1/6, 0.25, 0.5, 1])
+    new = refine_points(x, [0.04, 0.002, 0, 0], tol=0.01, coarsen=False)
+    assert new == pytest.approx([0, 1/12, 1/6, 0.25, 0.5, 0.75, 1])
+    new = refine_points(x, [1, 0, 0, 0], tol=0.01, max_split=4,
+                        coarsen=False)
+    assert len(new) == 8
+    assert uniform_elements(x, [0.04, 0.002, 0, 0], tol=0.01) == 8
+    assert uniform_elements(x, [0, 0, 0, 0], tol=0.01) == 2
+    # Higher order errors decrease faster with the length of the elements
+    new = refine_points(x, [0.04, 0.002, 0, 0], tol=0.01, order=3)
+    assert new == pytest.approx([0, 0.125, 0.25, 0.5, 1])
+    assert uniform_elements(x, [0.04, 0.002, 0, 0], tol=0.01, order=3) == 7
+
+
+def _model(points):
+    # Steep decay near the inlet, dy/dx = -k*y
+    m = ConcreteModel()
+    m.x = ContinuousSet(bounds=(0, 1), initialize=points)
+    m.j = Set(initialize=["a", "b"])
+    m.k = {"a": 30, "b": 2}
+    m.y = Var(m.x, m.j, initialize=1)
+    m.dy = DerivativeVar(m.y, wrt=m.x, initialize=0)
+    m.ode = Constraint(m.x, m.j, rule=lambda m, x, j: (
+        Constraint.Skip if x == 0 else m.dy[x, j] == -m.k[j]*m.y[x, j]))
+    m.y[0, :].fix(1)
+    # Not used by backward differences
+    m.dy[0, :].fix(0)
+    TransformationFactory("dae.finite_difference").apply_to(
+        m, nfe=len(points) - 1, wrt=m.x, scheme="BACKWARD")
+    return m
+
+
+def _collocation_model(points, ncp=3):
+    m = ConcreteModel()
+    m.x = ContinuousSet(bounds=(0, 1), initialize=points)
+    m.y = Var(m.x, initialize=1)
+    m.dy = DerivativeVar(m.y, wrt=m.x, initialize=0)
+    m.ode = Constraint(m.x, rule=lambda m, x: (
+        Constraint.Skip if x == 0 else m.dy[x] == -30*m.y[x]))
+    m.y[0].fix(1)
+    m.dy[0].fix(0)
+    TransformationFactory("dae.collocation").apply_to(
+        m, nfe=len(points) - 1, ncp=ncp, wrt=m.x)
+    return m
+
+
+def _solve(m):
+    return newton_solve(SquareSystem.from_block(m), tol=1e-10)[0]
+
+
+@pytest.mark.unit
+def test_domain_profiles():
+    m = _model([0, 0.5, 1])
+    m.y[1, "a"].value = 2
+    x, y = domain_profiles(m.x, [m.y])
+    assert x == [0, 0.5, 1]
+    assert y.tolist() == [[1, 1, 2], [1, 1, 1]]
+    with pytest.raises(ValueError):
+        domain_profiles(m.x, [m.j])
+
+
+@pytest.mark.unit
+def test_transfer_solution():
+    src = _model([0, 0.5, 1])
+    for x in src.x:
+        for j in src.j:
+            src.y[x, j].value = 1 - x
+            src.dy[x, j].value = 2*x
+    tgt = _model([0, 0.25, 0.5, 0.75, 1])
+    n = transfer_solution(src, tgt, src.x, tgt.x)
+    # y and dy at x = 0 are fixed
+    assert n == 2*4 + 2*4
+    assert value(tgt.y[0.25, "a"]) == pytest.approx(0.75)
+    assert value(tgt.dy[0.75, "b"]) == pytest.approx(1.5)
+    assert value(tgt.y[0, "a"]) == 1
+
+    # Blocks indexed by the domain
+    src.b = Block(src.x)
+    tgt.b = Block(tgt.x)
+    for x in src.x:
+        src.b[x].z = Var(initialize=10*x)
+    for x in tgt.x:
+        tgt.b[x].z = Var()
+    transfer_solution(src, tgt, src.x, tgt.x)
+    assert value(tgt.b[0.75].z) == pytest.approx(7.5)
+
+
+@pytest.mark.unit
+def test_adaptive_refinement():
+    amr = AdaptiveMeshRefinement(
+        _model, lambda m: m.x, lambda m: domain_profiles(m.x, [m.y]), _solve,
+        tol=1e-2)
+    results = amr.run(finite_elements=4)
+    last = results[-1]
+    assert last["solved"]
+    assert last["max_error"] <= 1e-2
+    assert [r["iteration"] for r in results] == list(range(len(results)))
+    assert last["elements"] == len(amr.points) - 1
+    h = np.diff(amr.points)
+    # The mesh is finer near the inlet
+    assert h[0] < h[-1]/5
+
+    uniform = amr.compare_uniform()
+    assert uniform["solved"]
+    assert uniform["elements"] > 2*last["elements"]
+    assert uniform["variables"] > 2*last["variables"]
+    assert uniform["max_error"] <= 1e-2
+
+    amr = AdaptiveMeshRefinement(
+        _model, lambda m: m.x, lambda m: domain_profiles(m.x, [m.y]), _solve,
+        tol=1e-2)
+    with pytest.raises(ValueError):
+        amr.compare_uniform()
+    results = amr.run(finite_elements=4, max_elements=20)
+    assert results[-1]["max_error"] > 1e-2
+    assert results[-1]["elements"] <= 20
+
+
+@pytest.mark.unit
+def test_adaptive_refinement_collocation():
+    amr = AdaptiveMeshRefinement(
+        _collocation_model, lambda m: m.x,
+        lambda m: domain_profiles(m.x, [m.y]), _solve, tol=1e-2)
+    results = amr.run(finite_elements=4)
+    assert results[-1]["solved"]
+    assert results[-1]["max_error"] <= 1e-2
+    # Only the finite elements are refined, not the collocation points
+    assert amr.points == sorted(amr.model.x.get_finite_elements())
+    assert len(amr.model.x) == 3*len(amr.errors) + 1
+    elements = [r["elements"] for r in results]
+    assert elements[-1] == len(amr.points) - 1
+    assert all(n1 <= 8*n0 for n0, n1 in zip(elements[:-1], elements[1:]))
+    # The error is estimated with the order of the collocation scheme, a
+    # second order estimate needs more than twice as many elements
+    assert amr.order == 3
+    assert elements[-1] < 20
+    assert max(abs(amr.model.y[x].value - np.exp(-30*x))
+               for x in amr.model.x) < 1e-2
+
+
+def _heat_exchanger(points):
+    from idaes.core import FlowsheetBlock
+    from idaes.generic_models.unit_models.heat_exchanger_1D import \
+        HeatExchanger1D
+    from idaes.generic_models.properties.activity_coeff_models.\
+        BTX_activity_coeff_VLE import BTXParameterBlock
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.properties = BTXParameterBlock(default={"valid_phase": "Liq"})
+    m.fs.unit = HeatExchanger1D(default={
+        "shell_side": {"property_package": m.fs.properties},
+        "tube_side": {"property_package": m.fs.properties},
+        "finite_elements": len(points) - 1,
+        "length_domain_set": points})
+    return m
+
+
+@pytest.mark.component
+def test_control_volume_profiles():
+    src = _heat_exchanger([0, 0.5, 1])
+    assert list(src.fs.unit.tube.length_domain) == [0, 0.5, 1]
+    for (t, x), sb in src.fs.unit.tube.properties.items():
+        sb.temperature.value = 300 + 100*x
+    x, y = control_volume_profiles(src.fs.unit.tube)
+    assert x == [0, 0.5, 1]
+    # flow_mol, mole_frac_comp (2), temperature and pressure
+    assert y.shape == (5, 3)
+    assert [300, 350, 400] in y.tolist()
+
+    tgt = _heat_exchanger([0, 0.1, 0.2, 0.5, 1])
+    assert list(tgt.fs.unit.tube.length_domain) == [0, 0.1, 0.2, 0.5, 1]
+    transfer_solution(src, tgt, src.fs.unit.tube.length_domain,
+                      tgt.fs.unit.tube.length_domain)
+    assert tgt.fs.unit.tube.properties[0, 0.2].temperature.value == \
+        pytest.approx(320)
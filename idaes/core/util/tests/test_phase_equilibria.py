@@ -44,7 +44,8 @@ from idaes.core import FlowsheetBlock
 from idaes.generic_models.properties.core.generic.generic_property import (
         GenericParameterBlock)
 
-from idaes.core.util.phase_equilibria import (TXYDataClass,Txy_data)
+from idaes.core.util.phase_equilibria import (TXYDataClass, Txy_data,
+                                              Txy_envelopes, Pxy_data)
 
 @pytest.mark.unit
 def test_Txy_dataclass():
@@ -284,3 +285,111 @@ def test_Txy_data_no_liq():
     assert TD.TBubb == []
     assert TD.TDew == [pytest.approx(126.9025, abs=1e-2), pytest.approx(172.1489, abs=1e-4), pytest.approx(184.2534, abs=1e-4)]
     assert TD.x == [pytest.approx(0.99, abs=1e-4), pytest.approx(0.5, abs=1e-4), pytest.approx(0.01, abs=1e-4)]
+
+
+def _benzene_toluene_model():
+    def component(mw, pc, tc, A, B, C):
+        return {"type": Component,
+                "pressure_sat_comp": NIST,
+                "phase_equilibrium_form": {("Vap", "Liq"): fugacity},
+                "parameter_data": {
+                    "mw": (mw, pyunits.kg/pyunits.mol),
+                    "pressure_crit": (pc, pyunits.Pa),
+                    "temperature_crit": (tc, pyunits.K),
+                    "pressure_sat_comp_coeff": {"A": (A, None),
+                                                "B": (B, pyunits.K),
+                                                "C": (C, pyunits.K)}}}
+    configuration = {
+        "components": {
+            'benzene': component(78.1136E-3, 48.9e5, 562.2,
+                                 4.72583, 1660.652, -1.461),
+            'toluene': component(92.1405E-3, 41e5, 591.8,
+                                 4.07827, 1343.943, -53.773)},
+        "phases":  {'Liq': {"type": LiquidPhase,
+                            "equation_of_state": Ideal},
+                    'Vap': {"type": VaporPhase,
+                            "equation_of_state": Ideal}},
+        "base_units": {"time": pyunits.s,
+                       "length": pyunits.m,
+                       "mass": pyunits.kg,
+                       "amount": pyunits.mol,
+                       "temperature": pyunits.K},
+        "state_definition": FTPx,
+        "state_bounds": {"flow_mol": (0, 100, 1000, pyunits.mol/pyunits.s),
+                         "temperature": (273.15, 300, 450, pyunits.K),
+                         "pressure": (5e4, 1e5, 1e6, pyunits.Pa)},
+        "pressure_ref": (1e5, pyunits.Pa),
+        "temperature_ref": (300, pyunits.K),
+        "phases_in_equilibrium": [("Vap", "Liq")],
+        "phase_equilibrium_state": {("Vap", "Liq"): smooth_VLE},
+        "bubble_dew_method": IdealBubbleDew}
+
+    model = ConcreteModel()
+    model.params = GenericParameterBlock(default=configuration)
+    return model
+
+
+@pytest.mark.component
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_Txy_data_batch(chunk_size):
+    model = _benzene_toluene_model()
+    TD = Txy_data(model, 'benzene', 'toluene', 101325, num_points=3,
+                  temperature=298.15, print_level=idaeslog.CRITICAL,
+                  batch=True, chunk_size=chunk_size)
+
+    # same results as one point at a time (see test_Txy_data)
+    assert TD.P == 101325
+    assert TD.TBubb == [pytest.approx(353.4853, abs=1e-4),
+                        pytest.approx(365.2127, abs=1e-4),
+                        pytest.approx(383.2909, abs=1e-4)]
+    assert TD.TDew == [pytest.approx(353.7978, abs=1e-2),
+                       pytest.approx(371.8702, abs=1e-4),
+                       pytest.approx(383.5685, abs=1e-4)]
+    assert TD.x == [pytest.approx(0.99, abs=1e-4),
+                    pytest.approx(0.5, abs=1e-4),
+                    pytest.approx(0.01, abs=1e-4)]
+
+
+@pytest.mark.component
+def test_Txy_envelopes():
+    model = _benzene_toluene_model()
+    envelopes = Txy_envelopes(model, 'benzene', 'toluene', [101325, 2e5],
+                              num_points=3, temperature=298.15,
+                              print_level=idaeslog.CRITICAL)
+
+    assert len(envelopes) == 2
+    assert envelopes[0].P == 101325
+    assert envelopes[0].TBubb == [pytest.approx(353.4853, abs=1e-4),
+                                  pytest.approx(365.2127, abs=1e-4),
+                                  pytest.approx(383.2909, abs=1e-4)]
+    assert envelopes[1].P == 2e5
+    assert len(envelopes[1].TBubb) == 3
+    # bubble and dew temperatures increase with pressure
+    for T1, T2 in zip(envelopes[0].TBubb, envelopes[1].TBubb):
+        assert T2 > T1
+    for T1, T2 in zip(envelopes[0].TDew, envelopes[1].TDew):
+        assert T2 > T1
+
+
+@pytest.mark.component
+def test_Pxy_data():
+    model = _benzene_toluene_model()
+    PD = Pxy_data(model, 'benzene', 'toluene', 368, num_points=3,
+                  print_level=idaeslog.CRITICAL)
+
+    assert PD.Component_1 == 'benzene'
+    assert PD.Component_2 == 'toluene'
+    assert PD.Punits == pyunits.kg / pyunits.m / pyunits.s ** 2
+    assert PD.T == 368
+    assert PD.x == [pytest.approx(0.99, abs=1e-4),
+                    pytest.approx(0.5, abs=1e-4),
+                    pytest.approx(0.01, abs=1e-4)]
+
+    # Ideal bubble and dew pressures from the Antoine equation
+    def psat(A, B, C, T=368):
+        return 1e5*10**(A - B/(T + C))
+    p_b = psat(4.72583, 1660.652, -1.461)
+    p_t = psat(4.07827, 1343.943, -53.773)
+    for x, Pbub, Pdew in zip(PD.x, PD.PBubb, PD.PDew):
+        assert Pbub == pytest.approx(x*p_b + (1 - x)*p_t, rel=1e-4)
+        assert Pdew == pytest.approx(1/(x/p_b + (1 - x)/p_t), rel=1e-4)
@@ -0,0 +1,213 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for the initialization solver service.
+"""
+import time
+
+import pytest
+
+from pyomo.environ import (ConcreteModel,
+                           Constraint,
+                           SolverFactory,
+                           TerminationCondition,
+                           Var,
+                           exp,
+                           value)
+from pyomo.opt import SolverResults
+
+import idaes
+from idaes.core.util.solver_service import (get_initialization_solver,
+                                            get_solver_service,
+                                            InitializationSolverService)
+
+
+class _RecordingSolver(object):
+    # Solver object that records the blocks passed to it
+    def __init__(self):
+        self.blocks = []
+
+    def solve(self, blk, tee=False, **kwds):
+        self.blocks.append((blk, kwds))
+        res = SolverResults()
+        res.solver.termination_condition = TerminationCondition.other
+        return res
+
+
+@pytest.fixture
+def service():
+    svc = get_solver_service()
+    svc.reset_statistics()
+    recorder = _RecordingSolver()
+    svc._executables["recorder"] = recorder
+    idaes.cfg.initialization_solver.in_process = True
+    yield svc, recorder
+    del svc._executables["recorder"]
+    svc.reset_statistics()
+    idaes.cfg.initialization_solver.in_process = False
+
+
+def _model():
+    m = ConcreteModel()
+    m.x = Var(initialize=1, bounds=(0, None))
+    m.y = Var(initialize=1)
+    m.c1 = Constraint(expr=m.x**2 + m.y == 4)
+    m.c2 = Constraint(expr=exp(m.y) == m.x)
+    return m
+
+
+@pytest.mark.unit
+def test_in_process(service):
+    svc, recorder = service
+    m = _model()
+    res = get_initialization_solver("recorder").solve(m)
+    assert res.solver.termination_condition == TerminationCondition.optimal
+    assert value(m.x**2 + m.y) == pytest.approx(4, abs=1e-8)
+    assert value(exp(m.y)) == pytest.approx(value(m.x), abs=1e-8)
+    assert recorder.blocks == []
+    assert svc.statistics["in_process"]["calls"] == 1
+    assert svc.statistics["executable"]["calls"] == 0
+    assert "in_process" in svc.report()
+
+
+@pytest.mark.unit
+def test_bounds(service):
+    m = ConcreteModel()
+    m.x = Var(initialize=0.1, bounds=(0, None))
+    m.c = Constraint(expr=m.x**2 == 4)
+    get_initialization_solver().solve(m)
+    assert value(m.x) == pytest.approx(2)
+
+
+@pytest.mark.unit
+def test_fallback_not_square(service):
+    svc, recorder = service
+    m = _model()
+    m.c2.deactivate()
+    opt = get_initialization_solver("recorder", options={"tol": 1e-4})
+    opt.solve(m, symbolic_solver_labels=True)
+    assert len(recorder.blocks) == 1
+    blk, kwds = recorder.blocks[0]
+    assert blk is m
+    assert kwds["options"] == {"tol": 1e-4}
+    assert kwds["symbolic_solver_labels"]
+    assert svc.statistics["executable"]["calls"] == 1
+
+
+@pytest.mark.unit
+def test_fallback_inequality(service):
+    svc, recorder = service
+    m = _model()
+    m.c3 = Constraint(expr=m.x <= 10)
+    get_initialization_solver("recorder").solve(m)
+    assert len(recorder.blocks) == 1
+
+
+@pytest.mark.unit
+def test_fallback_failed(service):
+    svc, recorder = service
+    m = ConcreteModel()
+    m.x = Var(initialize=1)
+    m.c = Constraint(expr=m.x**2 == -1)
+    get_initialization_solver("recorder").solve(m)
+    assert len(recorder.blocks) == 1
+    assert svc.statistics["in_process_failed"]["calls"] == 1
+    # values are restored before the executable is called
+    assert value(m.x) == 1
+
+
+@pytest.mark.unit
+def test_fallback_failed_restores_values(service):
+    svc, recorder = service
+    m = ConcreteModel()
+    m.x = Var(initialize=1)
+    m.y = Var()
+    m.c1 = Constraint(expr=m.x**2 == 4)
+    m.c2 = Constraint(expr=m.y**2 == -1 - m.x)
+    get_initialization_solver("recorder").solve(m)
+    assert len(recorder.blocks) == 1
+    # the solved block is reset and the variable without a value is not
+    # given a nan value, which the executable would start from
+    assert m.x.value == 1
+    assert m.y.value is None
+
+
+@pytest.mark.unit
+def test_fallback_size(service):
+    svc, recorder = service
+    m = ConcreteModel()
+    n = idaes.cfg.initialization_solver.max_in_process_size + 1
+    m.x = Var(range(n), initialize=1)
+    m.c = Constraint(range(n), rule=lambda b, i: b.x[i] == i)
+    get_initialization_solver("recorder").solve(m)
+    assert len(recorder.blocks) == 1
+
+
+@pytest.mark.unit
+def test_in_process_off(service):
+    svc, recorder = service
+    idaes.cfg.initialization_solver.in_process = False
+    get_initialization_solver("recorder").solve(_model())
+    assert len(recorder.blocks) == 1
+
+
+@pytest.mark.unit
+def test_in_process_default():
+    # in-process solves are opt-in
+    assert not idaes.cfg.initialization_solver.in_process
+    m = _model()
+    recorder = _RecordingSolver()
+    svc = InitializationSolverService()
+    svc._executables["recorder"] = recorder
+    svc.solve(m, "recorder", {"tol": 1e-4})
+    assert len(recorder.blocks) == 1
+    assert svc.statistics["in_process"]["calls"] == 0
+
+
+@pytest.mark.unit
+def test_default_options():
+    opt = get_initialization_solver()
+    assert opt.name == "ipopt"
+    assert opt.options == {"tol": 1e-6, "linear_solver": "ma27"}
+    assert get_initialization_solver("ipopt").options == {}
+    assert isinstance(InitializationSolverService().statistics, dict)
+
+
+@pytest.mark.skipif(not SolverFactory("ipopt").available(False),
+                    reason="Ipopt not available")
+@pytest.mark.component
+def test_compare_executable():
+    n = 20
+    m = _model()
+    svc = get_solver_service()
+    svc.reset_statistics()
+    idaes.cfg.initialization_solver.in_process = True
+    try:
+        start = time.perf_counter()
+        for i in range(n):
+            m.x.value = m.y.value = 1
+            get_initialization_solver().solve(m)
+        t_in_process = time.perf_counter() - start
+    finally:
+        idaes.cfg.initialization_solver.in_process = False
+    x = value(m.x)
+
+    start = time.perf_counter()
+    for i in range(n):
+        m.x.value = m.y.value = 1
+        get_initialization_solver().solve(m)
+    t_executable = time.perf_counter() - start
+    assert value(m.x) == pytest.approx(x, rel=1e-6)
+    assert svc.statistics["in_process"]["calls"] == n
+    assert svc.statistics["executable"]["calls"] == n
+    assert t_in_process < t_executable
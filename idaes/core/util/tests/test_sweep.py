@@ -0,0 +1,138 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for warm-started parameter sweeps.
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from pyomo.environ import (ConcreteModel,
+                           Constraint,
+                           Objective,
+                           Param,
+                           SolverFactory,
+                           Var,
+                           value)
+
+from idaes.core.util.block_solver import SquareSystem, newton_solve
+from idaes.core.util.sweep import (order_points,
+                                   ParameterSweep,
+                                   SolutionCache,
+                                   sweep_statistics)
+
+
+@pytest.mark.unit
+def test_order_nearest():
+    points = np.array([[0.0], [10.0], [1.0], [9.0], [5.0]])
+    assert order_points(points) == [0, 2, 4, 3, 1]
+    assert order_points(points, start=[11]) == [1, 3, 4, 2, 0]
+    assert order_points(points, "given") == [0, 1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        order_points(points, "foo")
+
+
+@pytest.mark.unit
+def test_order_hilbert():
+    points = np.array(list(itertools.product(range(4), range(4))),
+                      dtype=float)
+    order = order_points(points, "hilbert", bits=2)
+    assert sorted(order) == list(range(16))
+    # Consecutive points along the curve are neighbours on the grid
+    for i, j in zip(order[:-1], order[1:]):
+        assert np.sum(np.abs(points[i] - points[j])) == 1
+    assert order_points(points, "hilbert", start=[3, 0], bits=2)[0] == 12
+
+
+@pytest.mark.unit
+def test_solution_cache():
+    cache = SolutionCache(scale=[1, 100])
+    assert cache.nearest([0, 0]) is None
+    cache.add([0, 0], "a")
+    cache.add([1, 0], "b")
+    assert len(cache) == 2
+    assert cache.get([1, 0]) == "b"
+    assert cache.get([2, 0]) is None
+    assert cache.nearest([0.9, 0]) == ((1.0, 0.0), "b")
+    # The second parameter is scaled down
+    assert cache.nearest([0.2, 50])[1] == "a"
+
+
+def _model():
+    m = ConcreteModel()
+    m.p = Var(initialize=0)
+    m.p.fix()
+    m.q = Param(initialize=1, mutable=True)
+    m.x = Var(initialize=0)
+    m.c = Constraint(expr=m.x**3 + m.q*m.x == m.p)
+    return m
+
+
+def _newton(model, solver, warm_start):
+    return newton_solve(SquareSystem.from_block(model), tol=1e-10)
+
+
+@pytest.mark.unit
+def test_sweep():
+    m = _model()
+    sweep = ParameterSweep(m, [m.p, m.q], solve_function=_newton,
+                           duals=False)
+    rng = np.random.RandomState(42)
+    points = np.column_stack((rng.uniform(0, 100, 40), rng.uniform(1, 2, 40)))
+    results = sweep.run(points, compare_cold=True)
+    assert [r["index"] for r in results] == list(range(40))
+    for r in results:
+        assert r["solved"]
+    stats = sweep_statistics(results)
+    assert stats["points"] == stats["solved"] == 40
+    assert stats["iters"] < stats["cold_iters"]
+    assert stats["iters_saved"] > 0.2
+    assert len(sweep.cache) == 40
+    x = sweep.cache.get(points[0])["primal"][0]
+    p, q = points[0]
+    assert x**3 + q*x == pytest.approx(p)
+
+
+@pytest.mark.unit
+def test_sweep_parameter_errors():
+    m = _model()
+    m.r = Param(initialize=1)
+    with pytest.raises(ValueError):
+        ParameterSweep(m, [m.x], solve_function=_newton)
+    with pytest.raises(ValueError):
+        ParameterSweep(m, [m.r], solve_function=_newton)
+    sweep = ParameterSweep(m, [m.p], solve_function=_newton)
+    with pytest.raises(ValueError):
+        sweep.run(np.zeros((3, 2)))
+    # Suffixes for the multipliers are added
+    assert m.component("dual") is not None
+    assert m.component("ipopt_zL_in") is not None
+
+
+@pytest.mark.skipif(not SolverFactory("ipopt").available(False),
+                    reason="Ipopt not available")
+@pytest.mark.component
+def test_sweep_ipopt():
+    m = ConcreteModel()
+    m.p = Var(initialize=1)
+    m.p.fix()
+    m.x = Var([1, 2], initialize=1, bounds=(0, None))
+    m.c = Constraint(expr=m.x[1] + m.x[2] == m.p)
+    m.obj = Objective(expr=(m.x[1] - 1)**2 + m.x[2]**4)
+    sweep = ParameterSweep(m, [m.p], solver=SolverFactory("ipopt"))
+    results = sweep.run(np.linspace(1, 5, 10), compare_cold=True)
+    stats = sweep_statistics(results)
+    assert stats["solved"] == 10
+    assert stats["iters"] <= stats["cold_iters"]
+    assert value(m.x[1] + m.x[2]) == pytest.approx(value(m.p))
@@ -14,9 +14,12 @@
 Search through the code and index static information in the DMF.
 """
 # stdlib
+import ast
+import concurrent.futures
 import glob
 import importlib
 import inspect
+import json
 import logging
 import os
 import pprint
@@ -179,6 +182,222 @@ class ModuleClassWalker(Walker):
                             self._history.append(fullname)
 
 
+def _class_names(expr):
+    """Names (not dotted paths) used in a base class expression."""
+    names = set()
+    for node in ast.walk(expr):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+    return sorted(names)
+
+
+def _string_arg(call):
+    """First positional argument of a call, if it is a string literal."""
+    if not isinstance(call, ast.Call) or not call.args:
+        return None
+    arg = call.args[0]
+    value = getattr(arg, "value", getattr(arg, "s", None))
+    return value if isinstance(value, str) else None
+
+
+def parse_classes(path):
+    """Find the module-level classes in a Python source file, without
+    importing it.
+
+    Classes created by a decorator called with the name of the new class
+    as first argument, such as
+    :func:`idaes.core.process_block.declare_process_block_class`, are also
+    returned, with the decorated class as their base.
+
+    Args:
+        path (str): Path to the source file.
+
+    Returns:
+        list: Pairs of class name and list of the names of its base classes,
+              or None if the file cannot be parsed.
+    """
+    try:
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (SyntaxError, ValueError, OSError):
+        return None
+    classes, body = [], list(tree.body)
+    while body:
+        node = body.pop(0)
+        if isinstance(node, ast.ClassDef):
+            bases = set()
+            for base in node.bases:
+                bases.update(_class_names(base))
+            classes.append((node.name, sorted(bases)))
+            for deco in node.decorator_list:
+                declared = _string_arg(deco)
+                if declared:
+                    classes.append((declared, [node.name]))
+        elif not isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+        ):
+            # look inside module-level if/try/with blocks
+            for field in ("body", "orelse", "finalbody", "handlers"):
+                body.extend(
+                    n for n in getattr(node, field, []) if isinstance(n, ast.AST)
+                )
+    return classes
+
+
+class StaticModuleClassWalker(ModuleClassWalker):
+    """Walk modules like :class:`ModuleClassWalker`, but find the candidate
+    classes by parsing the source files instead of importing them.
+
+    Only the modules that define a class matching `class_expr`, or a
+    class that may derive from `parent_class`, are imported. The classes
+    found there are then filtered in the same way as in the parent class.
+    The parsed source files are cached by path, modification time and
+    size, in memory and optionally in a JSON file, so walking an unchanged
+    tree again does not re-parse anything.
+
+    Example usage::
+
+        walker = StaticModuleClassWalker(from_pkg=idaes,
+                                         class_expr='_PropertyParameter.*')
+
+        walker.walk(PrintMetadataVisitor())
+
+    """
+
+    #: Cache shared by all walkers in this process, by file path
+    _cache = {}
+
+    def __init__(self, workers=None, cache_file=None, **kwargs):
+        """Constructor.
+
+        Args:
+            workers (int): Number of processes used to parse the source
+                           files. If None, use the number of CPUs. If 1, parse
+                           the files in this process.
+            cache_file (str): If given, path of a JSON file in which the
+                              parsed classes are saved between runs.
+            kwargs: Keyword arguments for :class:`ModuleClassWalker`.
+        """
+        super(StaticModuleClassWalker, self).__init__(**kwargs)
+        self._workers = workers or os.cpu_count() or 1
+        self._cache_file = cache_file
+        #: Number of files parsed during the last walk
+        self.num_parsed = 0
+        #: Modules imported during the last walk
+        self.imported_modules = []
+
+    def walk(self, visitor):
+        self._load_cache()
+        files = list(self._python_files())
+        classes = self._parse_files(files)
+        self._save_cache()
+        modules = self._candidate_modules(files, classes)
+        self._visit_subclasses(modules, visitor.visit)
+
+    def _module_name(self, path):
+        module_path = os.path.splitext(path[len(self._root) + 1:])[0]
+        return self._pkg + "." + module_path.replace(os.path.sep, ".")
+
+    def _parse_files(self, files):
+        result, todo = {}, []
+        for path in files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = [st.st_mtime, st.st_size]
+            entry = self._cache.get(path)
+            if entry is not None and entry[0] == key:
+                result[path] = entry[1]
+            else:
+                todo.append((path, key))
+        self.num_parsed = len(todo)
+        _log.debug("parsing {} of {} files".format(len(todo), len(files)))
+        paths = [path for path, _ in todo]
+        if self._workers > 1 and len(todo) > 1:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._workers
+            ) as pool:
+                parsed = list(pool.map(parse_classes, paths, chunksize=16))
+        else:
+            parsed = [parse_classes(path) for path in paths]
+        for (path, key), classes in zip(todo, parsed):
+            self._cache[path] = (key, classes)
+            result[path] = classes
+        return result
+
+    def _candidate_modules(self, files, classes):
+        # Names of all classes that may derive from the parent class: the
+        # subclasses already loaded plus, transitively, those in the tree
+        parent_names = set()
+        if self._parent is not None and not self._expr:
+            stack = [self._parent]
+            while stack:
+                c = stack.pop()
+                if c.__name__ not in parent_names:
+                    parent_names.add(c.__name__)
+                    stack.extend(c.__subclasses__())
+            bases = [b for path in files for b in (classes.get(path) or [])]
+            changed = True
+            while changed:
+                changed = False
+                for name, base_names in bases:
+                    if name not in parent_names and parent_names.intersection(
+                        base_names
+                    ):
+                        parent_names.add(name)
+                        changed = True
+        modules = []
+        for path in files:
+            found = classes.get(path)
+            if found is None:
+                # not parseable, so let the import report the problem
+                modules.append(self._module_name(path))
+                continue
+            for name, _ in found:
+                # same selection as in ModuleClassWalker._visit_subclasses
+                if self._expr:
+                    match = self._expr.match(name)
+                elif self._parent:
+                    match = name in parent_names
+                else:
+                    match = True
+                if match:
+                    modules.append(self._module_name(path))
+                    break
+        self.imported_modules = modules
+        return modules
+
+    def _load_cache(self):
+        if not self._cache_file or not os.path.exists(self._cache_file):
+            return
+        try:
+            with open(self._cache_file) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as err:
+            _log.warning(
+                "Ignoring unreadable cache file {}: {}".format(self._cache_file, err)
+            )
+            return
+        for path, (key, classes) in data.items():
+            if path not in self._cache:
+                self._cache[path] = (
+                    key,
+                    None if classes is None else [tuple(c) for c in classes],
+                )
+
+    def _save_cache(self):
+        if not self._cache_file or not self.num_parsed:
+            return
+        try:
+            with open(self._cache_file, "w") as f:
+                json.dump(self._cache, f)
+        except OSError as err:
+            _log.warning("Cannot write cache file {}: {}".format(self._cache_file, err))
+
+
 class Visitor(object):
     """Interface for the 'visitor' class passed to Walker subclasses'
     `walk()` method.
@@ -32,7 +32,7 @@ import yaml
 
 # local
 from . import errors
-from .resource import Resource
+from .resource import Resource, RR_ID
 from . import resourcedb
 from . import workspace
 from .util import mkdir_p, yaml_load
@@ -706,18 +706,20 @@ class DMF(workspace.Workspace, HasTraits):
 
     def remove(self, identifier=None, filter_dict=None, update_relations=True):
         """Remove one or more resources, from its identifier or a filter.
-        Unless told otherwise, this method will scan the DB and remove
-        all relations that involve this resource.
+        Unless told otherwise, this method will also remove all relations
+        that involve this resource. The data files copied into the DMF for
+        the removed resources are deleted.
 
         Args:
             identifier (str): Identifier for a resource.
             filter_dict (dict): Filter to use instead of identifier
-            update_relations (bool): If True (the default), scan the DB and
-                remove all relations that involve this identifier.
+            update_relations (bool): If True (the default), remove all
+                relations that involve this identifier. Only the resources
+                with such relations are read and written, using an index
+                of the relations kept by the resource DB.
         """
         if not any((identifier, filter_dict)):
             return None
-        id_list, rid_list = None, None
         if identifier:
             # sanity check identifier type
             if not hasattr(identifier, "lower"):
@@ -725,45 +727,60 @@ class DMF(workspace.Workspace, HasTraits):
                     f"identifier argument is not a string. type={type(identifier)}"
                 )
             identifier = str(identifier)
-            id_one = self.fetch_one(identifier, id_only=True)
-            id_list = None if id_one is None else [id_one]
-            rid_list = [identifier]
+            rsrc = self.fetch_one(identifier)
+            rsrc_list = [] if rsrc is None else [rsrc]
         else:
-            id_list = list(self.find(filter_dict=filter_dict, id_only=True))
-            if id_list:
-                rid_list = []
-                for i in id_list:
-                    rsrc = self._db.get(i)
-                    rid_list.append(rsrc.id)
-        if not id_list:
+            rsrc_list = list(self.find(filter_dict=filter_dict))
+        if not rsrc_list:
             _log.info(
                 "Cannot remove resource-id={} filter={}: Not found".format(
                     identifier, filter_dict
                 )
             )
             return
-        # TODO: Delete all associated data files!!
+        id_list = [rsrc.v["doc_id"] for rsrc in rsrc_list]
+        rid_list = {rsrc.id for rsrc in rsrc_list}
         self._db.delete(idlist=id_list, internal_ids=True)
+        for rsrc in rsrc_list:
+            self._remove_datafiles(rsrc)
         # delete any added during this session
-        for rsrc_id in id_list:
-            if rsrc_id in self._resources:
-                del self._resources[rsrc_id]
+        for rsrc_id in rid_list:
+            self._resources.pop(rsrc_id, None)
         # If requested, remove deleted resources from all the relations
         # where it was a subject or object
         if update_relations:
-            # look at all resources in DB
-            for rsrc in self.find():
-                # for each one figure out which relations to keep
-                keep = []
-                for rel in rsrc.v["relations"]:
-                    # if none of the removed resource ids are present, keep it
-                    if rel["identifier"] not in rid_list:
-                        keep.append(rel)
-                # if we didn't keep all the relations, update the resource
-                if len(keep) < len(rsrc.v["relations"]):
-                    rsrc.v["relations"] = keep
-                    # save back to DMF
-                    self.update(rsrc)
+            self._db.remove_relations(rid_list)
+            # also in resources added during this session, so that a later
+            # update() does not put the relations back
+            for rsrc in self._resources.values():
+                rsrc.v["relations"] = [
+                    rel
+                    for rel in rsrc.v["relations"]
+                    if rel[RR_ID] not in rid_list
+                ]
+
+    def _remove_datafiles(self, rsrc):
+        """Delete the data files that were copied into the DMF for a resource,
+        and their directory if it is in the DMF and is left empty.
+        """
+        ddir = rsrc.v.get("datafiles_dir", None)
+        if not ddir:
+            return
+        for datafile in rsrc.v.get("datafiles", []):
+            if not datafile.get("is_copy", False):
+                continue
+            path = os.path.join(ddir, datafile["path"])
+            _log.debug(f"remove datafile '{path}'")
+            try:
+                os.unlink(path)
+            except OSError as err:
+                _log.warning(f"Cannot remove datafile '{path}': {err}")
+        dmf_dir = os.path.abspath(self._datafile_path)
+        if os.path.dirname(os.path.abspath(ddir)) == dmf_dir:
+            try:
+                os.rmdir(ddir)
+            except OSError:
+                pass  # not empty, or already gone
 
     def update(
         self,
@@ -65,9 +65,11 @@ def index_property_metadata(
         default_version (str): Default version to use for modules
                     with no explicit version.
         kwargs: Other keyword arguments passed to
-                      :class:`codesearch.ModuleClassWalker`.
+                      :class:`codesearch.StaticModuleClassWalker`.
     Returns:
-        codesearch.ModuleClassWalker: Class that walked through the modules.
+        codesearch.StaticModuleClassWalker: Class that walked through the
+            modules. Only the modules that define candidate classes, found
+            by parsing the source files, are imported.
             You can call `.get_indexed_classes()` to see the list of classes
             walked, or `.walk()` to walk the modules again.
     Raises:
@@ -75,7 +77,7 @@ def index_property_metadata(
         walk/visit each found class, so any exception raised by the constructor
         or `DMFVisitor.visit_metadata()`.
     """
-    wlk = codesearch.ModuleClassWalker(
+    wlk = codesearch.StaticModuleClassWalker(
         from_pkg=pkg,
         class_expr=expr,
         parent_class=idaes.core.property_meta.HasPropertyClassMetadata,
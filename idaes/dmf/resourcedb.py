@@ -16,6 +16,7 @@ Resource database.
 # system
 from datetime import datetime
 import logging
+import os
 import re
 
 # third party
@@ -24,7 +25,7 @@ from tinydb import TinyDB, Query
 # local
 from . import errors
 from .resource import Resource
-from .resource import Triple, triple_from_resource_relations
+from .resource import Triple, triple_from_resource_relations, RR_ID
 
 __author__ = 'Dan Gunter <dkgunter@lbl.gov>'
 
@@ -50,6 +51,12 @@ class ResourceDB(object):
         """
         self._db = None
         self._gr = None
+        self._dbfile = None
+        # reverse index of relations, built on first use: identifier of a
+        # resource -> doc_ids of the resources with relations to it, and
+        # doc_id -> identifiers in its relations
+        self._rel_in, self._rel_out = None, None
+        self._rel_stamp = None
 
         if connection is not None:
             self._db = connection
@@ -58,6 +65,7 @@ class ResourceDB(object):
                 db = TinyDB(dbfile)
             except IOError:
                 raise errors.FileError('Cannot open resource DB "{}"'.format(dbfile))
+            self._dbfile = dbfile
             # turn off caching, otherwise update() does not work properly
             self._db = db.table('resources', cache_size=0)
 
@@ -349,7 +357,11 @@ class ResourceDB(object):
         if self._db.contains(qry.id_ == resource.id):
             raise errors.DuplicateResourceError("put", resource.id)
         # add resource
-        self._db.insert(resource.v)
+        current = self._relation_index_is_current()
+        doc_id = self._db.insert(resource.v)
+        if current:
+            self._index_relations(doc_id, resource.v.get("relations", []))
+        self._relation_index_written(current)
 
     def delete(self, id_=None, idlist=None, filter_dict=None, internal_ids=False):
         """Delete one or more resources with given identifiers.
@@ -365,9 +377,10 @@ class ResourceDB(object):
         Returns:
             (list[str]) Identifiers
         """
+        current = self._relation_index_is_current()
         if internal_ids:
             doc_ids = idlist if idlist else [id_]
-            self._db.remove(doc_ids=doc_ids)
+            removed = self._db.remove(doc_ids=doc_ids)
         else:
             ID = Resource.ID_FIELD
             if filter_dict:
@@ -378,7 +391,11 @@ class ResourceDB(object):
                 cond = self._create_filter_expr({ID: [idlist]})
             else:
                 return
-            self._db.remove(cond=cond)
+            removed = self._db.remove(cond=cond)
+        if current:
+            for doc_id in removed:
+                self._index_relations(doc_id, [])
+        self._relation_index_written(current)
 
     def update(self, id_, new_dict):
         """Update the identified resource with new values.
@@ -411,4 +428,98 @@ class ResourceDB(object):
             elif old.v[k] != v:
                 changed[k] = v
         _log.debug(f"update resource {id_} with new values: {changed}")
+        current = self._relation_index_is_current()
         self._db.update(changed, self._create_filter_expr(id_cond))
+        if current and "relations" in changed:
+            self._index_relations(old.v["doc_id"], changed["relations"])
+        self._relation_index_written(current)
+
+    def referencing(self, identifiers):
+        """Find the resources with relations to any of the given resources.
+
+        This uses an index of the relations, so it does not scan the DB.
+
+        Args:
+            identifiers (Iterable[str]): Resource identifiers
+        Returns:
+            (list[int]) Internal identifiers of the referencing resources
+        """
+        index = self._relation_index()
+        doc_ids = set()
+        for id_ in identifiers:
+            doc_ids.update(index.get(id_, ()))
+        return sorted(doc_ids)
+
+    def remove_relations(self, identifiers):
+        """Remove all relations to the given resources from the other
+        resources in the DB. Only the resources that have such relations
+        are modified, all in one write.
+
+        Args:
+            identifiers (Iterable[str]): Resource identifiers
+        Returns:
+            (list[int]) Internal identifiers of the modified resources
+        """
+        ids = set(identifiers)
+        doc_ids = self.referencing(ids)
+        if not doc_ids:
+            return []
+
+        def drop_relations(doc):
+            doc["relations"] = [
+                rel for rel in doc["relations"] if rel[RR_ID] not in ids
+            ]
+
+        self._db.update(drop_relations, doc_ids=doc_ids)
+        for doc_id in doc_ids:
+            self._index_relations(
+                doc_id, [{RR_ID: id_} for id_ in self._rel_out[doc_id] - ids]
+            )
+        self._relation_index_written(True)
+        return doc_ids
+
+    def _relation_index(self):
+        """Get the reverse index of relations, (re-)building it if it was
+        never built or if the DB file was changed by someone else.
+        """
+        if not self._relation_index_is_current():
+            _log.debug("build relation index")
+            self._rel_in, self._rel_out = {}, {}
+            for doc in self._db.all():
+                self._index_relations(doc.doc_id, doc.get("relations", []))
+            self._rel_stamp = self._file_stamp()
+        return self._rel_in
+
+    def _index_relations(self, doc_id, relations):
+        """Set the relations of one resource in the index."""
+        for id_ in self._rel_out.pop(doc_id, ()):
+            referers = self._rel_in[id_]
+            referers.discard(doc_id)
+            if not referers:
+                del self._rel_in[id_]
+        targets = {rel[RR_ID] for rel in relations}
+        if targets:
+            self._rel_out[doc_id] = targets
+            for id_ in targets:
+                self._rel_in.setdefault(id_, set()).add(doc_id)
+
+    def _relation_index_is_current(self):
+        return self._rel_in is not None and self._rel_stamp == self._file_stamp()
+
+    def _relation_index_written(self, current):
+        """Record a write to the DB. If the index was current before the
+        write, it has been updated, otherwise it is discarded.
+        """
+        if current:
+            self._rel_stamp = self._file_stamp()
+        else:
+            self._rel_in, self._rel_out = None, None
+
+    def _file_stamp(self):
+        if self._dbfile is None:
+            return None
+        try:
+            st = os.stat(self._dbfile)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
@@ -319,3 +319,86 @@ def test__get_modules(tmpd):
         assert mod in expect_modules
         expect_modules.remove(mod)
     assert not expect_modules
+
+
+# Static (AST-based) walker
+
+
+@pytest.mark.unit
+def test_parse_classes(tmpd):
+    path = os.path.join(tmpd, "mod.py")
+    with open(path, "w") as f:
+        f.write(
+            "import base\n"
+            "class A(base.Base, object):\n"
+            "    class Inner(object):\n"
+            "        pass\n"
+            "@declare_process_block_class('B')\n"
+            "class BData(A):\n"
+            "    pass\n"
+            "try:\n"
+            "    class C(A):\n"
+            "        pass\n"
+            "except ImportError:\n"
+            "    pass\n"
+            "def f():\n"
+            "    class D(A):\n"
+            "        pass\n"
+        )
+    assert codesearch.parse_classes(path) == [
+        ("A", ["Base", "base", "object"]),
+        ("BData", ["A"]),
+        ("B", ["BData"]),
+        ("C", ["A"]),
+    ]
+    with open(path, "w") as f:
+        f.write("This is a bad module.\n")
+    assert codesearch.parse_classes(path) is None
+
+
+@pytest.mark.unit
+def test_static_walker():
+    walker = codesearch.StaticModuleClassWalker(
+        from_pkg=idaes, workers=1, **walker_args_noex
+    )
+    _visit(walker)
+    assert "idaes.dmf.codesearch" in walker.imported_modules
+    # Only modules defining possible subclasses are imported
+    assert len(walker.imported_modules) < 10
+    walker = codesearch.StaticModuleClassWalker(
+        from_pkg=idaes, workers=2, **walker_args
+    )
+    _visit(walker)
+    assert walker.num_parsed == 0
+
+
+@pytest.mark.unit
+def test_static_walker_cache(dummy_package, tmpd):
+    cache_file = os.path.join(tmpd, "cache.json")
+    sub = os.path.join(dummy_package, "submodule.py")
+    with open(sub, "w") as f:
+        f.write("from .goodmodule import IndexMe\nclass Sub(IndexMe):\n    pass\n")
+    w = codesearch.StaticModuleClassWalker(
+        from_path=dummy_package, workers=1, cache_file=cache_file
+    )
+    w.walk(DummyVisitor())
+    assert w.num_parsed == 3
+    # the bad module cannot be parsed, so it is imported and skipped
+    assert len(w.imported_modules) == 3
+    assert os.path.exists(cache_file)
+    # A new walker, with an empty memory cache, re-uses the cache file
+    codesearch.StaticModuleClassWalker._cache.clear()
+    w = codesearch.StaticModuleClassWalker(
+        from_path=dummy_package, workers=1, cache_file=cache_file
+    )
+    w.walk(DummyVisitor())
+    assert w.num_parsed == 0
+    # Modified files are parsed again
+    with open(sub, "w") as f:
+        f.write("class Other(object):\n    pass\n")
+    os.utime(sub, (0, 0))
+    w.walk(DummyVisitor())
+    assert w.num_parsed == 1
+    assert codesearch.StaticModuleClassWalker._cache[sub][1] == [
+        ("Other", ["object"])
+    ]
@@ -394,6 +394,54 @@ def test_dmf_remove():
         assert dmf.count() == n
 
 
+@pytest.mark.unit
+def test_dmf_remove_relations():
+    tmp_dir = Path(scratch_dir) / "dmf_remove_relations"
+    dmf = DMF(path=tmp_dir, create=True)
+    a, b, c, d = [resource.Resource(value={"desc": x}) for x in "abcd"]
+    resource.create_relation(a, resource.Predicates.uses, b)
+    resource.create_relation(c, resource.Predicates.uses, b)
+    resource.create_relation(c, resource.Predicates.uses, d)
+    for r in (a, b, c, d):
+        dmf.add(r)
+    assert dmf._db.referencing([b.id]) == sorted(
+        dmf.fetch_one(r.id).v["doc_id"] for r in (a, c)
+    )
+    dmf.remove(identifier=b.id)
+    assert dmf.fetch_one(a.id).v["relations"] == []
+    assert len(dmf.fetch_one(c.id).v["relations"]) == 1
+    # session objects are updated too
+    assert c.v["relations"] == dmf.fetch_one(c.id).v["relations"]
+    # A relation added through another instance is found
+    dmf2 = DMF(path=tmp_dir)
+    e = resource.Resource(value={"desc": "e"})
+    resource.create_relation(e, resource.Predicates.uses, d)
+    dmf2.add(e)
+    dmf2.update(d, sync_relations=False)
+    dmf.remove(identifier=d.id)
+    assert dmf.fetch_one(e.id).v["relations"] == []
+    assert dmf.fetch_one(c.id).v["relations"] == []
+    assert dmf._db.referencing([b.id, d.id]) == []
+
+
+@pytest.mark.unit
+def test_dmf_remove_datafiles(tmp_path):
+    tmp_dir = Path(scratch_dir) / "dmf_remove_datafiles"
+    dmf = DMF(path=tmp_dir, create=True)
+    datafile = tmp_path / "data.txt"
+    datafile.write_text("hello")
+    r = resource.Resource(value={"desc": "has data"})
+    r.v["datafiles"].append({"path": str(datafile), "do_copy": True})
+    dmf.add(r)
+    copy = Path(r.v["datafiles_dir"]) / "data.txt"
+    assert copy.exists()
+    dmf.remove(identifier=r.id)
+    assert not copy.exists()
+    assert not copy.parent.exists()
+    # the original file was not a copy, so it is kept
+    assert datafile.exists()
+
+
 @pytest.mark.unit
 def test_dmf_remove_filter():
     tmp_dir = Path(scratch_dir) / "dmf_remove_filter"
@@ -44,7 +44,10 @@ from idaes.gas_solid_contactors.properties.methane_iron_OC_reduction. \
 
 
 # -----------------------------------------------------------------------------
-def main():
+def build_model():
+    """
+    Build the BFB flowsheet and fix its design and operating variables.
+    """
 
     # ---------------------------------------------------------------------
     # Build model
@@ -105,11 +108,13 @@ def main():
     m.fs.BFB.solid_inlet.mass_frac_comp[0, "Fe3O4"].fix(1e-9)
     m.fs.BFB.solid_inlet.mass_frac_comp[0, "Al2O3"].fix(0.55)
 
-    # ---------------------------------------------------------------------
-    # Initialize reactor
+    return m
 
-    t_start = time.time()  # Run start time
 
+def initialize_model(m, outlvl=idaeslog.INFO):
+    """
+    Initialize the BFB, using the inlet conditions as state arguments.
+    """
     # State arguments for initializing property state blocks
     # Bubble and gas_emulsion temperatures are initialized at solid
     # temperature because thermal mass of solid >> thermal mass of gas
@@ -131,10 +136,21 @@ def main():
                     'Fe3O4': blk.solid_inlet.mass_frac_comp[0, 'Fe3O4'].value,
                     'Al2O3': blk.solid_inlet.mass_frac_comp[0, 'Al2O3'].value}}
 
-    m.fs.BFB.initialize(outlvl=idaeslog.INFO,
+    m.fs.BFB.initialize(outlvl=outlvl,
                         gas_phase_state_args=gas_phase_state_args,
                         solid_phase_state_args=solid_phase_state_args)
 
+
+def main():
+    m = build_model()
+
+    # ---------------------------------------------------------------------
+    # Initialize reactor
+
+    t_start = time.time()  # Run start time
+
+    initialize_model(m)
+
     t_initialize = time.time()  # Initialization time
 
     # ---------------------------------------------------------------------
@@ -22,6 +22,7 @@ Liquids, Mcgraw-Hill, New York, 2001.
 https://webbook.nist.gov/chemistry/ (accessed March 10, 2018).
 
 """
+import numpy as np
 
 # Import Pyomo libraries
 from pyomo.environ import (Constraint,
@@ -30,8 +31,6 @@ from pyomo.environ import (Constraint,
                            Reals,
                            value,
                            Var)
-from pyomo.util.calc_var_value import calculate_variable_from_constraint
-from pyomo.opt import SolverFactory
 
 # Import IDAES cores
 from idaes.core import (declare_process_block_class,
@@ -43,12 +42,14 @@ from idaes.core import (declare_process_block_class,
                         VaporPhase)
 from idaes.core.util.initialization import (fix_state_vars,
                                             revert_state_vars,
+                                            set_indexed_block_values,
                                             solve_indexed_blocks)
 from idaes.core.util.misc import add_object_reference
 from idaes.core.util.model_statistics import (
     degrees_of_freedom,
     number_unfixed_variables_in_activated_equalities)
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 # Some more information about this module
 __author__ = "Chinedu Okoli"
@@ -230,6 +231,107 @@ class PhysicalParameterData(PhysicalParameterBlock):
                                'holdup': 'mol'})
 
 
+# Constraints satisfied by the values of _calculate_properties
+_CALCULATED_CONSTRAINTS = frozenset([
+    "mw_eqn",
+    "ideal_gas",
+    "comp_conc_eqn",
+    "dens_mass_basis",
+    "visc_d_constraint",
+    "diffusion_comp_constraint",
+    "therm_cond_constraint",
+    "cp_shomate_eqn",
+    "mixture_heat_capacity_eqn",
+    "cp_mass_basis",
+    "enthalpy_shomate_eqn",
+    "mixture_enthalpy_eqn"])
+
+
+def _calculate_properties(blk):
+    """
+    Calculate the properties of all elements of an indexed state block from
+    their state variables, with NumPy arrays over the elements.
+
+    Returns:
+        dict of property values for set_indexed_block_values
+    """
+    sb = [blk[k] for k in blk.keys()]
+    params = sb[0]._params
+    comps = list(params.component_list)
+
+    T = np.array([b.temperature.value for b in sb], dtype=float)
+    P = np.array([b.pressure.value for b in sb], dtype=float)
+    y = np.array([[b.mole_frac_comp[j].value for j in comps] for b in sb],
+                 dtype=float)
+    mw_comp = np.array([value(params.mw_comp[j]) for j in comps])
+    cp_param = np.array([[value(params.cp_param[j, i]) for j in comps]
+                         for i in range(1, 9)])
+    visc_d_param = np.array([[value(params.visc_d_param[j, i])
+                              for j in comps] for i in range(1, 5)])
+    therm_cond_param = np.array([[value(params.therm_cond_param[j, i])
+                                  for j in comps] for i in range(1, 5)])
+    diff_vol = np.array([value(params.diff_vol_param[j]) for j in comps])
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        mw = y.dot(mw_comp)
+        dens_mol = P/(value(params.gas_const)*T*1e-2)
+        Tc = T[:, None]
+
+        # Pure component viscosities and thermal conductivities, with a
+        # column for each component
+        visc_d_comp = visc_d_param[0]*Tc**visc_d_param[1] \
+            / ((1 + visc_d_param[2]/Tc) + visc_d_param[3]/Tc**2)
+        therm_cond_comp = therm_cond_param[0]*Tc**therm_cond_param[1] \
+            / ((1 + therm_cond_param[2]/Tc) + therm_cond_param[3]/Tc**2)
+
+        # mw_ratio[i, j] = mw_comp[j]/mw_comp[i]
+        mw_ratio = mw_comp[None, :]/mw_comp[:, None]
+        visc_d = np.sum(y*visc_d_comp/y.dot(mw_ratio.T**0.5), axis=1)
+
+        # A_bin[n, i, j] for element n
+        A_bin = (1 + (therm_cond_comp[:, None, :]
+                      / therm_cond_comp[:, :, None])**0.5
+                 * mw_ratio**0.25)**2 / (8*(1 + mw_ratio))**0.5
+        therm_cond = 1e-3*np.sum(
+            y*therm_cond_comp/np.einsum("nj,nij->ni", y, A_bin**0.5), axis=1)
+
+        # Binary diffusion coefficients D_bin[n, i, j] for element n
+        mw_kg = 1e3*mw_comp
+        D_bin = 1.43e-3*T[:, None, None]**1.75 \
+            * ((mw_kg[:, None] + mw_kg[None, :])
+               / (2*mw_kg[:, None]*mw_kg[None, :]))**0.5 \
+            / (P[:, None, None]
+               * (diff_vol[:, None]**(1/3) + diff_vol[None, :]**(1/3))**2)
+        off_diag = 1 - np.eye(len(comps))
+        diffusion_comp = (1 - y)/np.einsum(
+            "nj,nij->ni", y, off_diag/D_bin)
+
+        tau = Tc*1e-3
+        cp_mol_comp = 1e-3*(cp_param[0] + cp_param[1]*tau
+                            + cp_param[2]*tau**2 + cp_param[3]*tau**3
+                            + cp_param[4]/tau**2)
+        enth_mol_comp = cp_param[0]*tau + cp_param[1]*tau**2/2 \
+            + cp_param[2]*tau**3/3 + cp_param[3]*tau**4/4 \
+            - cp_param[4]/tau + cp_param[5] - cp_param[7]
+        cp_mol = np.sum(y*cp_mol_comp, axis=1)
+
+    def by_comp(a):
+        return {j: a[:, i] for i, j in enumerate(comps)}
+
+    return {"mw": mw,
+            "dens_mol": dens_mol,
+            "dens_mol_comp": by_comp(dens_mol[:, None]*y),
+            "dens_mass": mw*dens_mol,
+            "visc_d": visc_d,
+            "therm_cond": therm_cond,
+            "diffusion_comp": by_comp(diffusion_comp),
+            "cp_mol_comp": by_comp(cp_mol_comp),
+            "cp_mol": cp_mol,
+            "cp_mass": cp_mol/mw,
+            "enth_mol_comp": by_comp(enth_mol_comp),
+            "enth_mol": np.sum(y*enth_mol_comp, axis=1)}
+
+
 class _GasPhaseThermoStateBlock(StateBlock):
     """
     This Class contains methods which should be applied to Property Blocks as a
@@ -290,86 +392,31 @@ class _GasPhaseThermoStateBlock(StateBlock):
                                     "initialization.")
 
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # ---------------------------------------------------------------------
-        # Initialise values
-        for k in blk.keys():
+        # Initialise values, calculating the properties of all elements at
+        # once since they are explicit in the state variables
+        skipped = set_indexed_block_values(blk, _calculate_properties(blk))
+
+        # Solve property block if non-empty and it has constraints which are
+        # not satisfied by the calculated values
+        res = ""
+        if skipped > 0 or any(
+                c.local_name not in _CALCULATED_CONSTRAINTS
+                for k in blk.keys()
+                for c in blk[k].component_objects(
+                    Constraint, active=True, descend_into=False)):
+            free_vars = 0
+            for k in blk.keys():
+                free_vars += number_unfixed_variables_in_activated_equalities(
+                    blk[k])
 
-            if hasattr(blk[k], "mw_eqn"):
-                calculate_variable_from_constraint(
-                            blk[k].mw,
-                            blk[k].mw_eqn)
-
-            if hasattr(blk[k], "ideal_gas"):
-                calculate_variable_from_constraint(
-                            blk[k].dens_mol,
-                            blk[k].ideal_gas)
-
-            if hasattr(blk[k], "dens_mass_basis"):
-                calculate_variable_from_constraint(
-                            blk[k].dens_mass,
-                            blk[k].dens_mass_basis)
-
-            if hasattr(blk[k], "mixture_heat_capacity_eqn"):
-                calculate_variable_from_constraint(
-                            blk[k].cp_mol,
-                            blk[k].mixture_heat_capacity_eqn)
-
-            if hasattr(blk[k], "cp_mass_basis"):
-                calculate_variable_from_constraint(
-                            blk[k].cp_mass,
-                            blk[k].cp_mass_basis)
-
-            if hasattr(blk[k], "visc_d_constraint"):
-                calculate_variable_from_constraint(
-                            blk[k].visc_d,
-                            blk[k].visc_d_constraint)
-
-            if hasattr(blk[k], "therm_cond_constraint"):
-                calculate_variable_from_constraint(
-                            blk[k].therm_cond,
-                            blk[k].therm_cond_constraint)
-
-            if hasattr(blk[k], "mixture_enthalpy_eqn"):
-                calculate_variable_from_constraint(
-                            blk[k].enth_mol,
-                            blk[k].mixture_enthalpy_eqn)
-
-            for j in blk[k]._params.component_list:
-
-                if hasattr(blk[k], "comp_conc_eqn"):
-                    calculate_variable_from_constraint(
-                                blk[k].dens_mol_comp[j],
-                                blk[k].comp_conc_eqn[j])
-
-                if hasattr(blk[k], "diffusion_comp_constraint"):
-                    calculate_variable_from_constraint(
-                                blk[k].diffusion_comp[j],
-                                blk[k].diffusion_comp_constraint[j])
-
-                if hasattr(blk[k], "cp_shomate_eqn"):
-                    calculate_variable_from_constraint(
-                        blk[k].cp_mol_comp[j],
-                        blk[k].cp_shomate_eqn[j])
-
-                if hasattr(blk[k], "enthalpy_shomate_eqn"):
-                    calculate_variable_from_constraint(
-                            blk[k].enth_mol_comp[j],
-                            blk[k].enthalpy_shomate_eqn[j])
-
-        # Solve property block if non-empty
-        free_vars = 0
-        for k in blk.keys():
-            free_vars += number_unfixed_variables_in_activated_equalities(
-                blk[k])
+            if free_vars > 0:
+                with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
+                    res = solve_indexed_blocks(opt, [blk], tee=slc.tee)
 
-        if free_vars > 0:
-            with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
-                res = solve_indexed_blocks(opt, [blk], tee=slc.tee)
-        else:
-            res = ""
         init_log.info_high("Initialization complete {}.".format(
             idaeslog.condition(res))
         )
@@ -22,6 +22,7 @@ oxygen carriers in chemical-looping combustion,
 Chem. Eng. Sci. 62 (2007) 533–549.
 
 """
+import numpy as np
 
 # Import Pyomo libraries
 from pyomo.environ import (Constraint,
@@ -32,8 +33,6 @@ from pyomo.environ import (Constraint,
                            Set,
                            value,
                            Var)
-from pyomo.util.calc_var_value import calculate_variable_from_constraint
-from pyomo.opt import SolverFactory
 from pyomo.common.config import ConfigBlock, ConfigValue, In
 
 
@@ -49,6 +48,7 @@ from idaes.core import (declare_process_block_class,
 from idaes.core.util.misc import add_object_reference
 from idaes.core.util.initialization import (fix_state_vars,
                                             revert_state_vars,
+                                            set_indexed_block_values,
                                             solve_indexed_blocks)
 from idaes.core.util.model_statistics import (
     number_unfixed_variables_in_activated_equalities)
@@ -56,6 +56,7 @@ from idaes.core.util.config import (is_state_block,
                                     is_physical_parameter_block,
                                     is_reaction_parameter_block)
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 # Some more information about this module
 __author__ = "Chinedu Okoli"
@@ -214,6 +215,74 @@ class ReactionParameterData(ReactionParameterBlock):
                                'energy': 'kJ'})
 
 
+# Constraints satisfied by the values of _calculate_reaction_properties
+_CALCULATED_CONSTRAINTS = frozenset([
+    "rate_constant_eqn",
+    "OC_conv_eqn",
+    "OC_conv_temp_eqn",
+    "gen_rate_expression"])
+
+
+def _calculate_reaction_properties(blk):
+    """
+    Calculate the reaction properties of all elements of an indexed reaction
+    block from the state variables and properties of the associated state
+    blocks, with NumPy arrays over the elements.
+
+    Returns:
+        dict of property values for set_indexed_block_values
+    """
+    rb = [blk[k] for k in blk.keys()]
+    params = rb[0]._params
+    stoich = params.rate_reaction_stoichiometry
+    sol_mw = rb[0].solid_state_ref._params.mw_comp
+
+    T = np.array([b.solid_state_ref.temperature.value for b in rb],
+                 dtype=float)
+    porosity = np.array([b.solid_state_ref.particle_porosity.value
+                         for b in rb], dtype=float)
+    dens_skeletal = np.array([b.solid_state_ref.dens_mass_skeletal.value
+                              for b in rb], dtype=float)
+    w_Fe2O3 = np.array([b.solid_state_ref.mass_frac_comp["Fe2O3"].value
+                        for b in rb], dtype=float)
+    w_Fe3O4 = np.array([b.solid_state_ref.mass_frac_comp["Fe3O4"].value
+                        for b in rb], dtype=float)
+    c_CH4 = np.array([b.gas_state_ref.dens_mol_comp["CH4"].value
+                      for b in rb], dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        OC_conv = w_Fe3O4/(
+            w_Fe3O4 + value(sol_mw["Fe3O4"]/sol_mw["Fe2O3"])
+            * (stoich["R1", "Sol", "Fe3O4"]/-stoich["R1", "Sol", "Fe2O3"])
+            * w_Fe2O3)
+        OC_conv_temp = ((1 - OC_conv)**2)**(1/3)
+
+        k_rxn = {}
+        reaction_rate = {}
+        for r in params.rate_reaction_idx:
+            if r == "R1":
+                k_rxn[r] = value(params.k0_rxn[r])*np.exp(
+                    -value(params.energy_activation[r])
+                    / (value(params.gas_const)*T))
+                k = k_rxn[r]
+            else:
+                k = np.array([b.k_rxn[r].value for b in rb], dtype=float)
+            reaction_rate[r] = value(params._scale_factor_rxn)*(
+                w_Fe2O3*(1 - porosity)*dens_skeletal
+                * value(params.a_vol/sol_mw["Fe2O3"])
+                * 3*value(params.rxn_stoich_coeff[r])*k
+                * ((c_CH4**2 + value(params.eps)**2)**0.5)
+                ** value(params.rxn_order[r])
+                * OC_conv_temp
+                / value(params.dens_mol_sol*params.grain_radius)
+                / -stoich["R1", "Sol", "Fe2O3"])
+
+    return {"OC_conv": OC_conv,
+            "OC_conv_temp": OC_conv_temp,
+            "k_rxn": k_rxn,
+            "reaction_rate": reaction_rate}
+
+
 class _ReactionBlock(ReactionBlockBase):
     """
     This Class contains methods which should be applied to Reaction Blocks as a
@@ -275,43 +344,31 @@ class _ReactionBlock(ReactionBlockBase):
                         blk[k].solid_state_ref.dens_mass_skeletal.value)
 
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
-        # Initialise values
-        for k in blk.keys():
-            if hasattr(blk[k], "OC_conv_eqn"):
-                calculate_variable_from_constraint(
-                            blk[k].OC_conv,
-                            blk[k].OC_conv_eqn)
-
-            if hasattr(blk[k], "OC_conv_temp_eqn"):
-                calculate_variable_from_constraint(
-                            blk[k].OC_conv_temp,
-                            blk[k].OC_conv_temp_eqn)
-
-            for j in blk[k]._params.rate_reaction_idx:
-                if hasattr(blk[k], "rate_constant_eqn"):
-                    calculate_variable_from_constraint(
-                                blk[k].k_rxn[j],
-                                blk[k].rate_constant_eqn[j])
-
-                if hasattr(blk[k], "gen_rate_expression"):
-                    calculate_variable_from_constraint(
-                            blk[k].reaction_rate[j],
-                            blk[k].gen_rate_expression[j])
-
-        # Solve property block if non-empty
-        free_vars = 0
-        for k in blk.keys():
-            free_vars += number_unfixed_variables_in_activated_equalities(
-                blk[k])
-
-        if free_vars > 0:
-            with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
-                res = solve_indexed_blocks(opt, [blk], tee=slc.tee)
-        else:
-            res = ""
+        # Initialise values, calculating the reaction properties of all
+        # elements at once since they are explicit in the state variables
+        skipped = set_indexed_block_values(
+            blk, _calculate_reaction_properties(blk))
+
+        # Solve property block if non-empty and it has constraints which are
+        # not satisfied by the calculated values
+        res = ""
+        if skipped > 0 or any(
+                c.local_name not in _CALCULATED_CONSTRAINTS
+                for k in blk.keys()
+                for c in blk[k].component_objects(
+                    Constraint, active=True, descend_into=False)):
+            free_vars = 0
+            for k in blk.keys():
+                free_vars += number_unfixed_variables_in_activated_equalities(
+                    blk[k])
+
+            if free_vars > 0:
+                with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
+                    res = solve_indexed_blocks(opt, [blk], tee=slc.tee)
+
         init_log.info_high("reactions initialization complete {}.".format(
             idaeslog.condition(res))
                         )
@@ -20,6 +20,7 @@ National Institute of Standards and Technology, NIST Chemistry WebBook,
 https://webbook.nist.gov/chemistry/ (accessed March 10, 2018).
 
 """
+import numpy as np
 
 # Import Pyomo libraries
 from pyomo.environ import (Constraint,
@@ -27,8 +28,6 @@ from pyomo.environ import (Constraint,
                            Reals,
                            value,
                            Var)
-from pyomo.util.calc_var_value import calculate_variable_from_constraint
-from pyomo.opt import SolverFactory
 
 # Import IDAES cores
 from idaes.core import (declare_process_block_class,
@@ -40,12 +39,14 @@ from idaes.core import (declare_process_block_class,
                         SolidPhase)
 from idaes.core.util.initialization import (fix_state_vars,
                                             revert_state_vars,
+                                            set_indexed_block_values,
                                             solve_indexed_blocks)
 from idaes.core.util.misc import add_object_reference
 from idaes.core.util.model_statistics import (
     degrees_of_freedom,
     number_unfixed_variables_in_activated_equalities)
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 # Some more information about this module
 __author__ = "Chinedu Okoli"
@@ -207,6 +208,60 @@ class PhysicalParameterData(PhysicalParameterBlock):
                                'holdup': 'kg'})
 
 
+# Constraints satisfied by the values of _calculate_properties
+_CALCULATED_CONSTRAINTS = frozenset([
+    "density_skeletal_constraint",
+    "density_particle_constraint",
+    "cp_shomate_eqn",
+    "mixture_heat_capacity_eqn",
+    "enthalpy_shomate_eqn",
+    "mixture_enthalpy_eqn"])
+
+
+def _calculate_properties(blk):
+    """
+    Calculate the properties of all elements of an indexed state block from
+    their state variables, with NumPy arrays over the elements.
+
+    Returns:
+        dict of property values for set_indexed_block_values
+    """
+    sb = [blk[k] for k in blk.keys()]
+    params = sb[0]._params
+    comps = list(params.component_list)
+
+    T = np.array([b.temperature.value for b in sb], dtype=float)
+    porosity = np.array([b.particle_porosity.value for b in sb], dtype=float)
+    w = np.array([[b.mass_frac_comp[j].value for j in comps] for b in sb],
+                 dtype=float)
+    mw_comp = np.array([value(params.mw_comp[j]) for j in comps])
+    dens_comp = np.array([value(params.dens_mass_comp_skeletal[j])
+                          for j in comps])
+    cp_param = np.array([[value(params.cp_param[j, i]) for j in comps]
+                         for i in range(1, 9)])
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        dens_mass_skeletal = 1/w.dot(1/dens_comp)
+
+        tau = T[:, None]*1e-3
+        cp_mol_comp = 1e-3*(cp_param[0] + cp_param[1]*tau
+                            + cp_param[2]*tau**2 + cp_param[3]*tau**3
+                            + cp_param[4]/tau**2)
+        enth_mol_comp = cp_param[0]*tau + cp_param[1]*tau**2/2 \
+            + cp_param[2]*tau**3/3 + cp_param[3]*tau**4/4 \
+            - cp_param[4]/tau + cp_param[5] - cp_param[7]
+
+    def by_comp(a):
+        return {j: a[:, i] for i, j in enumerate(comps)}
+
+    return {"dens_mass_skeletal": dens_mass_skeletal,
+            "dens_mass_particle": (1 - porosity)*dens_mass_skeletal,
+            "cp_mol_comp": by_comp(cp_mol_comp),
+            "cp_mass": (cp_mol_comp*w/mw_comp).sum(axis=1),
+            "enth_mol_comp": by_comp(enth_mol_comp),
+            "enth_mass": (enth_mol_comp*w/mw_comp).sum(axis=1)}
+
+
 class _SolidPhaseThermoStateBlock(StateBlock):
     """
     This Class contains methods which should be applied to Property Blocks as a
@@ -267,50 +322,31 @@ class _SolidPhaseThermoStateBlock(StateBlock):
                                     "initialization.")
 
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # ---------------------------------------------------------------------
-        # Initialise values
-        for k in blk.keys():
-            if hasattr(blk[k], "density_skeletal_constraint"):
-                calculate_variable_from_constraint(
-                            blk[k].dens_mass_skeletal,
-                            blk[k].density_skeletal_constraint)
-
-            if hasattr(blk[k], "mixture_heat_capacity_eqn"):
-                calculate_variable_from_constraint(
-                            blk[k].cp_mass,
-                            blk[k].mixture_heat_capacity_eqn)
-
-            if hasattr(blk[k], "mixture_enthalpy_eqn"):
-                calculate_variable_from_constraint(
-                            blk[k].enth_mass,
-                            blk[k].mixture_enthalpy_eqn)
-
-            for j in blk[k]._params.component_list:
-
-                if hasattr(blk[k], "cp_shomate_eqn"):
-                    calculate_variable_from_constraint(blk[k].cp_mol_comp[j],
-                                                       blk[k].cp_shomate_eqn[j]
-                                                       )
-
-                if hasattr(blk[k], "enthalpy_shomate_eqn"):
-                    calculate_variable_from_constraint(
-                            blk[k].enth_mol_comp[j],
-                            blk[k].enthalpy_shomate_eqn[j])
-
-        # Solve property block if non-empty
-        free_vars = 0
-        for k in blk.keys():
-            free_vars += number_unfixed_variables_in_activated_equalities(
-                blk[k])
+        # Initialise values, calculating the properties of all elements at
+        # once since they are explicit in the state variables
+        skipped = set_indexed_block_values(blk, _calculate_properties(blk))
+
+        # Solve property block if non-empty and it has constraints which are
+        # not satisfied by the calculated values
+        res = ""
+        if skipped > 0 or any(
+                c.local_name not in _CALCULATED_CONSTRAINTS
+                for k in blk.keys()
+                for c in blk[k].component_objects(
+                    Constraint, active=True, descend_into=False)):
+            free_vars = 0
+            for k in blk.keys():
+                free_vars += number_unfixed_variables_in_activated_equalities(
+                    blk[k])
+
+            if free_vars > 0:
+                with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
+                    res = solve_indexed_blocks(opt, [blk], tee=slc.tee)
 
-        if free_vars > 0:
-            with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
-                res = solve_indexed_blocks(opt, [blk], tee=slc.tee)
-        else:
-            res = ""
         init_log.info_high("Initialization complete {}.".format(
                             idaeslog.condition(res))
                            )
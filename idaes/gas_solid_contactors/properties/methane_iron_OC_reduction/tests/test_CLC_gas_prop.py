@@ -21,7 +21,9 @@ from pyomo.environ import (ConcreteModel, Var)
 
 from idaes.core import FlowsheetBlock
 
-from idaes.core.util.model_statistics import degrees_of_freedom
+from idaes.core.util.model_statistics import (degrees_of_freedom,
+                                              number_large_residuals)
+from idaes.core.util.solver_service import get_solver_service
 
 from idaes.core.util.testing import initialization_tester
 from idaes.core.util import get_default_solver
@@ -78,3 +80,35 @@ def test_setInputs_state_block(gas_prop):
 def test_initialize(gas_prop):
     initialization_tester(
             gas_prop)
+
+
+@pytest.mark.unit
+def test_initialize_explicit():
+    # All properties are explicit in the state variables, so no solve is
+    # needed during initialization
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.properties = GasPhaseThermoParameterBlock()
+    m.fs.unit = m.fs.properties.build_state_block(
+        [1, 2, 3], default={"parameters": m.fs.properties,
+                            "defined_state": True})
+
+    for i, T, P, y in [(1, 450, 1.6, (0.4772, 0.0646, 0.4582)),
+                       (2, 1200, 2.0, (0.02499, 0.00001, 0.975)),
+                       (3, 800, 1.1, (0.6, 0.4, 0))]:
+        m.fs.unit[i].flow_mol.fix(1)
+        m.fs.unit[i].temperature.fix(T)
+        m.fs.unit[i].pressure.fix(P)
+        for j, yj in zip(["CO2", "H2O", "CH4"], y):
+            m.fs.unit[i].mole_frac_comp[j].fix(yj)
+        for p in ["mw", "dens_mol", "dens_mol_comp", "dens_mass", "visc_d",
+                  "diffusion_comp", "therm_cond", "cp_mol_comp", "cp_mol",
+                  "cp_mass", "enth_mol_comp", "enth_mol"]:
+            getattr(m.fs.unit[i], p)
+
+    get_solver_service().reset_statistics()
+    m.fs.unit.initialize()
+    for s in get_solver_service().statistics.values():
+        assert s["calls"] == 0
+    for i in m.fs.unit:
+        assert number_large_residuals(m.fs.unit[i], tol=1e-8) == 0
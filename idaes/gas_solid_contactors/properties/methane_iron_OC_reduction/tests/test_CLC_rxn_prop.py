@@ -22,7 +22,9 @@ from pyomo.environ import (ConcreteModel,
 
 from idaes.core import FlowsheetBlock
 
-from idaes.core.util.model_statistics import degrees_of_freedom
+from idaes.core.util.model_statistics import (degrees_of_freedom,
+                                              number_large_residuals)
+from idaes.core.util.solver_service import get_solver_service
 
 from idaes.core.util.testing import initialization_tester
 from idaes.core.util import get_default_solver
@@ -98,3 +100,48 @@ def test_setInputs_reaction_block(rxn_prop):
 def test_initialize(rxn_prop):
     initialization_tester(
             rxn_prop)
+
+
+@pytest.mark.unit
+def test_initialize_explicit():
+    # All reaction properties are explicit in the state of the solid and gas,
+    # so no solve is needed during initialization
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.solid_properties = SolidPhaseThermoParameterBlock()
+    m.fs.solid_state_block = m.fs.solid_properties.build_state_block(
+        [1, 2], default={"parameters": m.fs.solid_properties,
+                         "defined_state": True})
+    m.fs.gas_properties = GasPhaseThermoParameterBlock()
+    m.fs.gas_state_block = m.fs.gas_properties.build_state_block(
+        [1, 2], default={"parameters": m.fs.gas_properties,
+                         "defined_state": True})
+    m.fs.reactions = HeteroReactionParameterBlock(
+                default={"solid_property_package": m.fs.solid_properties,
+                         "gas_property_package": m.fs.gas_properties})
+    m.fs.unit = m.fs.reactions.reaction_block_class(
+            [1, 2], default={"parameters": m.fs.reactions,
+                             "solid_state_block": m.fs.solid_state_block,
+                             "gas_state_block": m.fs.gas_state_block,
+                             "has_equilibrium": False})
+
+    for i, T, w, c in [(1, 1183.15, (0.45, 1e-9, 0.55), 10),
+                       (2, 1000, (0.2, 0.25, 0.55), 0)]:
+        m.fs.gas_state_block[i].dens_mol.fix(10)
+        m.fs.gas_state_block[i].dens_mol_comp.fix(c)
+        m.fs.solid_state_block[i].temperature.fix(T)
+        m.fs.solid_state_block[i].particle_porosity.fix(0.27)
+        for j, wj in zip(["Fe2O3", "Fe3O4", "Al2O3"], w):
+            m.fs.solid_state_block[i].mass_frac_comp[j].fix(wj)
+        m.fs.solid_state_block[i].dens_mass_skeletal.fix(4000)
+        for p in ["k_rxn", "OC_conv", "OC_conv_temp", "reaction_rate"]:
+            getattr(m.fs.unit[i], p)
+
+    get_solver_service().reset_statistics()
+    m.fs.unit.initialize()
+    for s in get_solver_service().statistics.values():
+        assert s["calls"] == 0
+    for i in m.fs.unit:
+        assert number_large_residuals(m.fs.unit[i], tol=1e-8) == 0
+    assert m.fs.unit[1].OC_conv.value == pytest.approx(0, abs=1e-8)
+    assert m.fs.unit[2].reaction_rate["R1"].value > 0
@@ -22,7 +22,9 @@ from pyomo.environ import (ConcreteModel,
 
 from idaes.core import FlowsheetBlock
 
-from idaes.core.util.model_statistics import degrees_of_freedom
+from idaes.core.util.model_statistics import (degrees_of_freedom,
+                                              number_large_residuals)
+from idaes.core.util.solver_service import get_solver_service
 
 from idaes.core.util.testing import initialization_tester
 from idaes.core.util import get_default_solver
@@ -77,3 +79,33 @@ def test_setInputs_state_block(solid_prop):
 def test_initialize(solid_prop):
     initialization_tester(
             solid_prop)
+
+
+@pytest.mark.unit
+def test_initialize_explicit():
+    # All properties are explicit in the state variables, so no solve is
+    # needed during initialization
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.properties = SolidPhaseThermoParameterBlock()
+    m.fs.unit = m.fs.properties.build_state_block(
+        [1, 2], default={"parameters": m.fs.properties,
+                         "defined_state": True})
+
+    for i, T, w in [(1, 1183.15, (0.45, 1e-9, 0.55)),
+                    (2, 1000, (0.2, 0.25, 0.55))]:
+        m.fs.unit[i].flow_mass.fix(1)
+        m.fs.unit[i].particle_porosity.fix(0.27)
+        m.fs.unit[i].temperature.fix(T)
+        for j, wj in zip(["Fe2O3", "Fe3O4", "Al2O3"], w):
+            m.fs.unit[i].mass_frac_comp[j].fix(wj)
+        for p in ["dens_mass_skeletal", "dens_mass_particle", "cp_mol_comp",
+                  "cp_mass", "enth_mol_comp", "enth_mass"]:
+            getattr(m.fs.unit[i], p)
+
+    get_solver_service().reset_statistics()
+    m.fs.unit.initialize()
+    for s in get_solver_service().statistics.values():
+        assert s["calls"] == 0
+    for i in m.fs.unit:
+        assert number_large_residuals(m.fs.unit[i], tol=1e-8) == 0
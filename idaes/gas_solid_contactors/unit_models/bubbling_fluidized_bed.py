@@ -32,7 +32,7 @@ Solid superficial velocity is constant throughout the bed
 import matplotlib.pyplot as plt
 
 # Import Pyomo libraries
-from pyomo.environ import (SolverFactory, Var, Param, Reals,
+from pyomo.environ import (Var, Param, Reals,
                            TerminationCondition, Constraint,
                            TransformationFactory, sqrt, value)
 from pyomo.common.config import ConfigBlock, ConfigValue, In
@@ -54,6 +54,7 @@ from idaes.core.control_volume1d import DistributedVars
 from idaes.core.util.constants import Constants as constants
 from idaes.core.util.math import smooth_min, smooth_max
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 __author__ = "Chinedu Okoli"
 
@@ -1544,7 +1545,7 @@ see reaction package for documentation.}"""))
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # ---------------------------------------------------------------------
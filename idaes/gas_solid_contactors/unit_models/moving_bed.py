@@ -36,7 +36,7 @@ from __future__ import division
 import matplotlib.pyplot as plt
 
 # Import Pyomo libraries
-from pyomo.environ import (SolverFactory, Var, Param, Reals, value,
+from pyomo.environ import (Var, Param, Reals, value,
                            TransformationFactory, Constraint,
                            TerminationCondition)
 from pyomo.common.config import ConfigBlock, ConfigValue, In
@@ -60,6 +60,7 @@ from idaes.core.control_volume1d import DistributedVars
 from idaes.core.util.constants import Constants as constants
 from idaes.core.util.math import smooth_abs
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 __author__ = "Chinedu Okoli", "Anca Ostace"
 
@@ -824,7 +825,7 @@ see reaction package for documentation.}"""))
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # ---------------------------------------------------------------------
@@ -43,7 +43,7 @@ References:
 
 # Import Pyomo libraries
 from pyomo.environ import Constraint, log, NonNegativeReals, value, Var, exp,\
-    Expression, Param, sqrt, SolverFactory, units as pyunits
+    Expression, Param, sqrt, units as pyunits
 from pyomo.common.config import ConfigValue, In
 
 # Import IDAES cores
@@ -63,6 +63,7 @@ from idaes.core.util.exceptions import ConfigurationError
 from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.core.util.constants import Constants as const
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 # Some more inforation about this module
@@ -297,7 +298,7 @@ class _ActivityCoeffStateBlock(StateBlock):
         else:
             sopt = optarg
 
-        opt = SolverFactory("ipopt")
+        opt = get_initialization_solver()
         opt.options = sopt
 
         # ---------------------------------------------------------------------
@@ -23,7 +23,6 @@ from pyomo.environ import (Block,
                            Expression,
                            Set,
                            Param,
-                           SolverFactory,
                            value,
                            Var,
                            units as pyunits)
@@ -53,6 +52,7 @@ from idaes.generic_models.properties.core.generic.utility import (
     get_method, GenericPropertyPackageError)
 from idaes.generic_models.properties.core.phase_equil.bubble_dew import \
     LogBubbleDew
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 # Set up logger
@@ -970,7 +970,7 @@ class _GenericStateBlock(StateBlock):
         else:
             sopt = optarg
 
-        opt = SolverFactory('ipopt')
+        opt = get_initialization_solver()
         opt.options = sopt
 
         # ---------------------------------------------------------------------
@@ -1122,22 +1122,20 @@ class _GenericStateBlock(StateBlock):
 
                     blk[k].pressure_bubble[pp].value = value(
                             sum(blk[k].mole_frac_comp[j] *
-                                blk[k].params.config.pressure_sat_comp
-                                      .pressure_sat_comp(
-                                              blk[k],
-                                              j,
-                                              blk[k].temperature*T_units)
+                                get_method(blk[k], "pressure_sat_comp", j)(
+                                           blk[k],
+                                           blk[k].params.get_component(j),
+                                           blk[k].temperature)
                                 for j in valid_comps))
 
                     for j in valid_comps:
                         blk[k]._mole_frac_pbub[pp, j].value = value(
                             blk[k].mole_frac_comp[j] *
-                            blk[k].params.config.pressure_sat_comp
-                                  .pressure_sat_comp(
-                                          blk[k],
-                                          j,
-                                          blk[k].temperature*T_units) /
-                            blk[k].pressure_bubble)
+                            get_method(blk[k], "pressure_sat_comp", j)(
+                                       blk[k],
+                                       blk[k].params.get_component(j),
+                                       blk[k].temperature) /
+                            blk[k].pressure_bubble[pp])
 
             # Dew pressure initialization
             if hasattr(blk[k], "_mole_frac_pdew"):
@@ -1148,21 +1146,20 @@ class _GenericStateBlock(StateBlock):
                         continue
 
                     blk[k].pressure_dew[pp].value = value(
-                            sum(1/(blk[k].mole_frac_comp[j] /
-                                   blk[k].params.config.pressure_sat_comp
-                                   .pressure_sat_comp(
-                                           blk[k],
-                                           j,
-                                           blk[k].temperature*T_units))
-                                for j in valid_comps))
+                            1/sum(blk[k].mole_frac_comp[j] /
+                                  get_method(blk[k], "pressure_sat_comp", j)(
+                                             blk[k],
+                                             blk[k].params.get_component(j),
+                                             blk[k].temperature)
+                                  for j in valid_comps))
 
                     for j in valid_comps:
                         blk[k]._mole_frac_pdew[pp, j].value = value(
-                            blk[k].mole_frac_comp[j]*blk[k].pressure_bubble /
-                            blk[k].params.config.pressure_sat_comp
-                            .pressure_sat_comp(blk[k],
-                                               j,
-                                               blk[k].temperature*T_units))
+                            blk[k].mole_frac_comp[j]*blk[k].pressure_dew[pp] /
+                            get_method(blk[k], "pressure_sat_comp", j)(
+                                       blk[k],
+                                       blk[k].params.get_component(j),
+                                       blk[k].temperature))
 
             # Solve bubble and dew point constraints
             for c in blk[k].component_objects(Constraint):
@@ -35,7 +35,6 @@ from pyomo.environ import (Constraint,
                            ExternalFunction,
                            log,
                            NonNegativeReals,
-                           SolverFactory,
                            sqrt,
                            Param,
                            PositiveReals,
@@ -65,6 +64,7 @@ from idaes import bin_directory
 from idaes.core.util.constants import Constants as const
 import idaes.logger as idaeslog
 import idaes.core.util.scaling as iscale
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 # Set up logger
@@ -277,7 +277,7 @@ class _CubicStateBlock(StateBlock):
         else:
             sopt = optarg
 
-        opt = SolverFactory('ipopt')
+        opt = get_initialization_solver()
         opt.options = sopt
 
         # ---------------------------------------------------------------------
@@ -41,7 +41,7 @@ from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.core.util.config import is_physical_parameter_block
 from idaes.core.util.exceptions import PropertyPackageError, \
     ConfigurationError, PropertyNotSupportedError
-from idaes.core.util import get_default_solver
+from idaes.core.util.solver_service import get_initialization_solver
 
 _log = idaeslog.getLogger(__name__)
 
@@ -713,7 +713,7 @@ see property package for documentation.}"""))
         if solver is None:
             init_log.warning("Solver not provided. Default solver(ipopt) "
                              " being used for initialization.")
-            solver = get_default_solver()
+            solver = get_initialization_solver()
 
         if state_args is None:
             state_args = {}
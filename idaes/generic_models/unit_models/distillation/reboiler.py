@@ -40,8 +40,8 @@ from idaes.core import (ControlVolume0DBlock,
 from idaes.core.util.config import is_physical_parameter_block
 from idaes.core.util.exceptions import PropertyPackageError, \
     PropertyNotSupportedError, ConfigurationError
-from idaes.core.util import get_default_solver
 from idaes.core.util.model_statistics import degrees_of_freedom
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 _log = idaeslog.getIdaesLogger(__name__)
@@ -569,7 +569,7 @@ see property package for documentation.}"""))
         if solver is None:
             init_log.warning("Solver not provided. Default solver(ipopt) "
                              " being used for initialization.")
-            solver = get_default_solver()
+            solver = get_initialization_solver()
 
         # Initialize the inlet and outlet state blocks. Calling the state
         # blocks initialize methods directly so that custom set of state args
@@ -35,7 +35,7 @@ from idaes.core import (declare_process_block_class,
                         useDefault)
 from idaes.core.util.exceptions import ConfigurationError
 from idaes.core.util.config import is_physical_parameter_block
-from idaes.core.util import get_default_solver
+from idaes.core.util.solver_service import get_initialization_solver
 
 _log = idaeslog.getLogger(__name__)
 
@@ -374,7 +374,7 @@ see property package for documentation.}"""))
         if solver is None:
             init_log.warning("Solver not provided. Default solver(ipopt) "
                              "being used for initialization.")
-            solver = get_default_solver()
+            solver = get_initialization_solver()
 
         feed_flags = self.feed_tray.initialize()
 
@@ -24,7 +24,6 @@ from pyomo.environ import (
     log,
     Reference,
     PositiveReals,
-    SolverFactory,
     ExternalFunction,
     Block,
     units as pyunits
@@ -49,6 +48,7 @@ import idaes.core.util.unit_costing as costing
 from idaes.core.util.misc import add_object_reference
 from idaes.core.util import scaling as iscale
 from idaes.core.util.exceptions import ConfigurationError
+from idaes.core.util.solver_service import get_initialization_solver
 
 _log = idaeslog.getLogger(__name__)
 
@@ -469,7 +469,7 @@ class HeatExchangerData(UnitModelBlockData):
         hot_side = getattr(self, self.config.hot_side_name)
         cold_side = getattr(self, self.config.cold_side_name)
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
         flags1 = hot_side.initialize(
             outlvl=outlvl, optarg=optarg, solver=solver, state_args=state_args_1
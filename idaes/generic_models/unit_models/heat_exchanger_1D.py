@@ -20,7 +20,6 @@ from enum import Enum
 
 # Import Pyomo libraries
 from pyomo.environ import (
-    SolverFactory,
     Var,
     Constraint,
     value,
@@ -40,7 +39,7 @@ from idaes.core import (
     useDefault,
 )
 from idaes.generic_models.unit_models.heat_exchanger import HeatExchangerFlowPattern
-from idaes.core.util.config import is_physical_parameter_block
+from idaes.core.util.config import is_physical_parameter_block, list_of_floats
 from idaes.core.util.misc import add_object_reference
 from idaes.core.util.exceptions import ConfigurationError
 from idaes.core.util.tables import create_stream_table_dataframe
@@ -48,6 +47,7 @@ from idaes.core.util.constants import Constants as c
 from idaes.core.util import scaling as iscale
 
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 __author__ = "Jaffer Ghouse"
@@ -245,6 +245,18 @@ domain (default=20)""",
 discretizing length domain (default=3)""",
         ),
     )
+    CONFIG.declare(
+        "length_domain_set",
+        ConfigValue(
+            default=[0.0, 1.0],
+            domain=list_of_floats,
+            description="List of points to use to initialize length domain",
+            doc="""A list of values to be used when constructing the length
+domains of the shell and tube sides. Points must lie between 0.0 and 1.0, a
+list with more than finite_elements + 1 points gives a non-uniform
+discretization (default=[0.0, 1.0])""",
+        ),
+    )
     CONFIG.declare(
         "flow_type",
         ConfigValue(
@@ -412,8 +424,14 @@ thickness of the tube""",
             }
         )
 
-        self.shell.add_geometry(flow_direction=set_direction_shell)
-        self.tube.add_geometry(flow_direction=set_direction_tube)
+        self.shell.add_geometry(
+            flow_direction=set_direction_shell,
+            length_domain_set=self.config.length_domain_set,
+        )
+        self.tube.add_geometry(
+            flow_direction=set_direction_tube,
+            length_domain_set=self.config.length_domain_set,
+        )
 
         self.shell.add_state_blocks(
             information_flow=set_direction_shell,
@@ -630,7 +648,7 @@ thickness of the tube""",
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # ---------------------------------------------------------------------
@@ -21,7 +21,6 @@ from pyomo.environ import (
     PositiveReals,
     Reals,
     RangeSet,
-    SolverFactory,
     Var,
 )
 from pyomo.common.config import ConfigBlock, ConfigValue, In
@@ -48,6 +47,7 @@ from idaes.core.util.tables import create_stream_table_dataframe
 import idaes.core.util.scaling as iscale
 
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 __author__ = "Andrew Lee"
 
@@ -840,7 +840,7 @@ objects linked to all inlet states and the mixed state,
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # Initialize inlet state blocks
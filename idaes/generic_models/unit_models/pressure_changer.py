@@ -19,7 +19,7 @@ Standard IDAES pressure changer model.
 from enum import Enum
 
 # Import Pyomo libraries
-from pyomo.environ import SolverFactory, value, Var, Block, Expression,\
+from pyomo.environ import value, Var, Block, Expression,\
     Constraint, Reference
 from pyomo.common.config import ConfigBlock, ConfigValue, In
 
@@ -37,6 +37,7 @@ from idaes.core.util.config import is_physical_parameter_block
 import idaes.logger as idaeslog
 import idaes.core.util.unit_costing as costing
 from idaes.core.util import scaling as iscale
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 __author__ = "Emmanuel Ogbe, Andrew Lee"
@@ -638,7 +639,7 @@ see property package for documentation.}""",
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         cv = blk.control_volume
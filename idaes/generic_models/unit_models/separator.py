@@ -24,7 +24,6 @@ from pyomo.environ import (
     Reals,
     Reference,
     Set,
-    SolverFactory,
     Var,
     value,
 )
@@ -52,6 +51,7 @@ from idaes.core.util.tables import create_stream_table_dataframe
 from idaes.core.util.misc import VarLikeExpression
 from idaes.core.util.model_statistics import degrees_of_freedom
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 __author__ = "Andrew Lee"
 
@@ -1352,7 +1352,7 @@ objects linked the mixed state and all outlet states,
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # Initialize mixed state block
@@ -77,7 +77,7 @@ def test_config():
             "tube_side": {"property_package": m.fs.properties}})
 
     # Check unit config arguments
-    assert len(m.fs.unit.config) == 8
+    assert len(m.fs.unit.config) == 9
     assert isinstance(m.fs.unit.config.shell_side, ConfigBlock)
     assert isinstance(m.fs.unit.config.tube_side, ConfigBlock)
     assert m.fs.unit.config.flow_type == HeatExchangerFlowPattern.cocurrent
@@ -85,6 +85,7 @@ def test_config():
         WallConductionType.zero_dimensional
     assert m.fs.unit.config.finite_elements == 20
     assert m.fs.unit.config.collocation_points == 5
+    assert m.fs.unit.config.length_domain_set == [0.0, 1.0]
 
     # Check shell side config arguments
     assert len(m.fs.unit.config.shell_side) == 11
@@ -15,7 +15,6 @@ Generic template for a translator block.
 """
 # Import Pyomo libraries
 from pyomo.common.config import ConfigBlock, ConfigValue, In
-from pyomo.environ import SolverFactory
 
 # Import IDAES cores
 from idaes.core import declare_process_block_class, UnitModelBlockData
@@ -23,6 +22,7 @@ from idaes.core.util.config import is_physical_parameter_block
 from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.core.util.exceptions import ConfigurationError
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 __author__ = "Andrew Lee"
 
@@ -222,7 +222,7 @@ see property package for documentation.}""",
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
 
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
         # ---------------------------------------------------------------------
         # Initialize state block
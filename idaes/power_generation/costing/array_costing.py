@@ -0,0 +1,271 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+
+"""
+Array based power plant costing library
+Evaluates the same costing equations as power_plant_costing.py with numpy
+arrays instead of Pyomo blocks, so that many candidate designs can be costed
+at once (i.e. for techno-economic screening). No Pyomo model is built.
+
+The costing dictionaries are converted once per technology and CCS option
+into arrays indexed by cost account (AccountTable). Scaled parameters may be
+scalars or arrays of any shape; costs are returned with an additional last
+axis over the selected cost accounts.
+
+methods:
+* get_PP_costing_arrays() to cost power plant accounts
+* get_sCO2_unit_cost_arrays() to cost sCO2 equipment
+* get_ASU_cost_arrays() to cost air separation units
+
+All costs are in $MM, as in the Pyomo formulation.
+"""
+__author__ = "Costing Team (A. Noring and M. Zamarripa)"
+__version__ = "1.0.0"
+
+import numpy as np
+
+from idaes.power_generation.costing.costing_dictionaries import \
+    BB_costing_exponents, BB_costing_params, sCO2_costing_params
+from idaes.power_generation.costing.power_plant_costing import \
+    PC_preloaded_accounts, IGCC_preloaded_accounts, NGCC_preloaded_accounts, \
+    AUSC_preloaded_accounts, ASU_costing_params
+
+# CE index of the reference costs in each library
+PP_reference_CE_index = 671.1  # 2018
+sCO2_reference_CE_index = 567.5  # 2017
+ASU_reference_CE_index = 566.2  # Nov 2008
+
+# account tables already built, keyed by (tech, ccs)
+_account_tables = {}
+
+
+class AccountTable(object):
+    '''
+    Costing parameters of all accounts of one technology and CCS option,
+    stored as arrays indexed by account position. Reference parameters given
+    as text in the dictionaries (i.e. accounts scaled on the sum of other
+    accounts) are stored as nan.
+
+    Args:
+    * tech: int 1-7 representing the technology (see get_PP_costing)
+    * ccs: 'A' or 'B' representing no CCS or CCS
+    '''
+    def __init__(self, tech, ccs='B'):
+        self.tech = tech
+        self.ccs = ccs
+        params = BB_costing_params[str(tech)][ccs]
+        exponents = BB_costing_exponents[str(tech)]
+
+        self.accounts = list(params.keys())
+        self.index = {a: i for i, a in enumerate(self.accounts)}
+        self.account_names = [exponents[a]['Account Name']
+                              for a in self.accounts]
+        self.process_params = [exponents[a]['Process Parameter']
+                               for a in self.accounts]
+        self.units = [params[a]['Units'] for a in self.accounts]
+
+        def _array(d, key):
+            return np.array([_float(d[a][key]) for a in self.accounts])
+
+        self.exp = _array(exponents, 'Exponent')
+        self.ref_cost = _array(params, 'BEC')
+        self.ref_param = _array(params, 'RP Value')
+        self.eng_fee = _array(params, 'Eng Fee')
+        self.process_conting = _array(params, 'Process Contingency')
+        self.project_conting = _array(params, 'Project Contingency')
+        # ratio of total plant cost to bare erected cost
+        self.tpc_factor = ((1 + self.eng_fee + self.process_conting) *
+                           (1 + self.project_conting))
+
+    def indices(self, cost_accounts):
+        '''
+        Return the array positions of a list of cost accounts
+        '''
+        try:
+            return np.array([self.index[a] for a in cost_accounts],
+                            dtype=int)
+        except KeyError as err:
+            raise KeyError('Account {} is not available for technology {} '
+                           'with CCS option {}'.format(err.args[0], self.tech,
+                                                       self.ccs))
+
+
+def _float(val):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def get_account_table(tech, ccs='B'):
+    '''
+    Return the AccountTable for a technology and CCS option, building it the
+    first time it is requested.
+    '''
+    key = (int(tech), ccs)
+    if key not in _account_tables:
+        _account_tables[key] = AccountTable(*key)
+    return _account_tables[key]
+
+
+def _preloaded_accounts(cost_accounts, tech):
+    if tech in [1, 2]:
+        preloaded = PC_preloaded_accounts
+    elif tech in [3, 4, 5]:
+        preloaded = IGCC_preloaded_accounts
+    elif tech == 6:
+        preloaded = NGCC_preloaded_accounts
+    elif tech == 7:
+        preloaded = AUSC_preloaded_accounts
+    else:
+        raise AttributeError("{} technology not supported".format(tech))
+    return preloaded[cost_accounts]
+
+
+# -----------------------------------------------------------------------------
+# Power Plant Costing Library
+# -----------------------------------------------------------------------------
+def get_PP_costing_arrays(cost_accounts, scaled_param, units, tech, ccs='B',
+                          CE_index=PP_reference_CE_index):
+    '''
+    Array version of get_PP_costing
+
+    Scaling approach uses one main equation:
+        SC = RC*(SP/RP)^Exp
+    for each account, the total plant cost is computed from the bare erected
+    cost using the engineering fee, process and project contingencies.
+
+    Args:
+    * cost_accounts: A list of accounts (or the name of a preloaded group of
+    accounts), they should all use the same reference parameter
+    * scaled_param: scalar or array of process parameter values
+    * units: the units of the scaled_param, used for verification
+    * tech: int 1-7 representing the technology (see get_PP_costing)
+    * ccs: 'A' or 'B' representing no CCS or CCS
+    * CE_index: CE index of the year to report costs in, default 2018
+
+    Returns:
+    dict with keys
+    * accounts: list of cost accounts, order of the last axis of the arrays
+    * bare_erected_cost: array of shape scaled_param.shape + (n_accounts,)
+    * total_plant_cost: array of shape scaled_param.shape + (n_accounts,)
+    * bare_erected_cost_sum: array of shape scaled_param.shape
+    * total_plant_cost_sum: array of shape scaled_param.shape
+    '''
+    if type(cost_accounts) == str:
+        cost_accounts = _preloaded_accounts(cost_accounts, tech)
+    cost_accounts = list(cost_accounts)
+
+    table = get_account_table(tech, ccs)
+    idx = table.indices(cost_accounts)
+
+    # check that all accounts use the same process parameter
+    if len(set(table.process_params[i] for i in idx)) > 1:
+        raise ValueError("{} cost accounts selected do not use "
+                         " the same process parameter".format(cost_accounts))
+
+    # check that the user passed the correct units
+    ref_units = table.units[idx[0]]
+    if units != ref_units:
+        raise ValueError('Account %s uses units of %s. '
+                         'Units of %s were passed.'
+                         % (cost_accounts[0], ref_units, units))
+
+    sp = np.asarray(scaled_param, dtype=float)[..., np.newaxis]
+    bec = ((CE_index/PP_reference_CE_index)*table.ref_cost[idx] *
+           (sp/table.ref_param[idx])**table.exp[idx])*1e-3
+    tpc = bec*table.tpc_factor[idx]
+
+    return {'accounts': cost_accounts,
+            'bare_erected_cost': bec,
+            'total_plant_cost': tpc,
+            'bare_erected_cost_sum': bec.sum(axis=-1),
+            'total_plant_cost_sum': tpc.sum(axis=-1)}
+
+
+# -----------------------------------------------------------------------------
+# Supercritical CO2 Costing Library
+# -----------------------------------------------------------------------------
+def get_sCO2_unit_cost_arrays(equipment, scaled_param, temp_C=None, n_equip=1,
+                              CE_index=sCO2_reference_CE_index):
+    '''
+    Array version of get_sCO2_unit_cost
+
+    Args:
+    * equipment: the name of the sCO2 equipment to cost
+    * scaled_param: scalar or array of scaling parameter values (in
+    appropriate units) for the selected equipment
+    * temp_C: scalar or array of maximum equipment temperatures, required for
+    equipment that uses a temperature correction factor
+    * n_equip: the number of pieces of equipment to cost
+    * CE_index: CE index of the year to report costs in, default 2017
+
+    Returns:
+    dict of equipment_cost, bare_erected_cost and total_plant_cost arrays,
+    broadcast from scaled_param, temp_C and n_equip
+    '''
+    param_dict = sCO2_costing_params[equipment]
+
+    if equipment in ['Axial turbine', 'Radial turbine', 'Coal-fired heater',
+                     'Natural gas-fired heater', 'Recuperator']:
+        if temp_C is None:
+            raise ValueError('Temperature argument is '
+                             'required to cost %s equipment' % equipment)
+        t = np.asarray(temp_C, dtype=float)
+        temp_factor = np.where(t < 550,
+                               1e-6*t + 1,
+                               1 + param_dict['c']*(t - 550)
+                               + param_dict['d']*(t - 550)**2)
+    else:
+        temp_factor = 1
+
+    n = np.asarray(n_equip, dtype=float)
+    sp = np.asarray(scaled_param, dtype=float)/n
+    equipment_cost = ((CE_index/sCO2_reference_CE_index)*n*param_dict['a'] *
+                      sp**param_dict['b']*temp_factor)*1e-6
+    bare_erected_cost = equipment_cost*(1 + param_dict['Material Cost'] +
+                                        param_dict['Labor Cost'])
+    # engineering fee and contingencies are not yet included for sCO2 units
+    total_plant_cost = np.array(bare_erected_cost, copy=True)
+
+    return {'equipment_cost': equipment_cost,
+            'bare_erected_cost': bare_erected_cost,
+            'total_plant_cost': total_plant_cost}
+
+
+# -----------------------------------------------------------------------------
+# Air Separation Unit Costing Library
+# -----------------------------------------------------------------------------
+def get_ASU_cost_arrays(scaled_param, CE_index=567.5):
+    '''
+    Array version of get_ASU_cost
+
+    Args:
+    * scaled_param: scalar or array of O2 flowrates in TPD
+    * CE_index: CE index of the year to report costs in, default 2017
+
+    Returns:
+    dict of bare_erected_cost and total_plant_cost arrays
+    '''
+    params = ASU_costing_params
+    sp = np.asarray(scaled_param, dtype=float)
+    bare_erected_cost = ((CE_index/ASU_reference_CE_index) *
+                         params['Reference Cost'] *
+                         (sp/params['Reference Parameter'])**params['Exponent']
+                         )*1e-3
+    total_plant_cost = bare_erected_cost*(1 + params['Eng Fee'] +
+                                          params['Process'] +
+                                          params['Project'])
+
+    return {'bare_erected_cost': bare_erected_cost,
+            'total_plant_cost': total_plant_cost}
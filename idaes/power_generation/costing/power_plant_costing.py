@@ -43,6 +43,58 @@ from pyomo.util.calc_var_value import calculate_variable_from_constraint
 # -----------------------------------------------------------------------------
 # Power Plant Costing Library
 # -----------------------------------------------------------------------------
+# preloaded accounts
+PC_preloaded_accounts = {'Coal Handling': ['1.1', '1.2',
+                                           '1.3', '1.4', '1.9a'],
+                         'Sorbent Handling': ['1.5', '1.6',
+                                              '1.7', '1.8', '1.9b'],
+                         'Coal Feed': ['2.1', '2.2', '2.9a'],
+                         'Sorbent Feed': ['2.5', '2.6', '2.9b'],
+                         'Feedwater System': ['3.1', '3.3'],
+                         'PC Boiler': ['4.9'],
+                         'Steam Turbine': ['8.1'],
+                         'Condenser': ['8.3'],
+                         'Cooling Tower': ['9.1'],
+                         'Circulating Water System': ['9.2', '9.3',
+                                                      '9.4', '9.6', '9.7'],
+                         'Ash Handling': ['10.6', '10.7', '10.9']}
+
+IGCC_preloaded_accounts = {'Coal Handling': ['1.1', '1.2',
+                                             '1.3', '1.4', '1.9'],
+                           'Coal Feed': ['2.1', '2.2',
+                                         '2.3', '2.4', '2.9'],
+                           'Feedwater System': ['3.1', '3.3'],
+                           'Gasifier': ['4.1'],
+                           'Syngas Cooler': ['4.2'],
+                           'ASU': ['4.3a'],
+                           'ASU Oxidant Compression': ['4.3b'],
+                           'Combustion Turbine': ['6.1', '6.3'],
+                           'Syngas Expander': ['6.2'],
+                           'HRSG': ['7.1', '7.2'],
+                           'Steam Turbine': ['8.1'],
+                           'Condenser': ['8.3'],
+                           'Cooling Tower': ['9.1'],
+                           'Circulating Water System': ['9.2', '9.3',
+                                                        '9.4', '9.6',
+                                                        '9.7'],
+                           'Slag Handling': ['10.1', '10.2',
+                                             '10.3', '10.6',
+                                             '10.7', '10.8',
+                                             '10.9']}
+
+NGCC_preloaded_accounts = {'Feedwater System': ['3.1', '3.3'],
+                           'Combustion Turbine': ['6.1', '6.3'],
+                           'HRSG': ['7.1', '7.2'],
+                           'Steam Turbine': ['8.1'],
+                           'Condenser': ['8.3'],
+                           'Cooling Tower': ['9.1'],
+                           'Circulating Water System': ['9.2', '9.3',
+                                                        '9.4', '9.6',
+                                                        '9.7']}
+
+AUSC_preloaded_accounts = {'PC Boiler': ['4.9'],
+                           'Steam Turbine': ['8.1'],
+                           'Steam Piping': ['8.4']}
 
 
 def get_PP_costing(self, cost_accounts,
@@ -122,59 +174,6 @@ def get_PP_costing(self, cost_accounts,
 
     CE_index = fs.costing.CE_index
 
-    # define preloaded accounts
-    PC_preloaded_accounts = {'Coal Handling': ['1.1', '1.2',
-                                               '1.3', '1.4', '1.9a'],
-                             'Sorbent Handling': ['1.5', '1.6',
-                                                  '1.7', '1.8', '1.9b'],
-                             'Coal Feed': ['2.1', '2.2', '2.9a'],
-                             'Sorbent Feed': ['2.5', '2.6', '2.9b'],
-                             'Feedwater System': ['3.1', '3.3'],
-                             'PC Boiler': ['4.9'],
-                             'Steam Turbine': ['8.1'],
-                             'Condenser': ['8.3'],
-                             'Cooling Tower': ['9.1'],
-                             'Circulating Water System': ['9.2', '9.3',
-                                                          '9.4', '9.6', '9.7'],
-                             'Ash Handling': ['10.6', '10.7', '10.9']}
-
-    IGCC_preloaded_accounts = {'Coal Handling': ['1.1', '1.2',
-                                                 '1.3', '1.4', '1.9'],
-                               'Coal Feed': ['2.1', '2.2',
-                                             '2.3', '2.4', '2.9'],
-                               'Feedwater System': ['3.1', '3.3'],
-                               'Gasifier': ['4.1'],
-                               'Syngas Cooler': ['4.2'],
-                               'ASU': ['4.3a'],
-                               'ASU Oxidant Compression': ['4.3b'],
-                               'Combustion Turbine': ['6.1', '6.3'],
-                               'Syngas Expander': ['6.2'],
-                               'HRSG': ['7.1', '7.2'],
-                               'Steam Turbine': ['8.1'],
-                               'Condenser': ['8.3'],
-                               'Cooling Tower': ['9.1'],
-                               'Circulating Water System': ['9.2', '9.3',
-                                                            '9.4', '9.6',
-                                                            '9.7'],
-                               'Slag Handling': ['10.1', '10.2',
-                                                 '10.3', '10.6',
-                                                 '10.7', '10.8',
-                                                 '10.9']}
-
-    NGCC_preloaded_accounts = {'Feedwater System': ['3.1', '3.3'],
-                               'Combustion Turbine': ['6.1', '6.3'],
-                               'HRSG': ['7.1', '7.2'],
-                               'Steam Turbine': ['8.1'],
-                               'Condenser': ['8.3'],
-                               'Cooling Tower': ['9.1'],
-                               'Circulating Water System': ['9.2', '9.3',
-                                                            '9.4', '9.6',
-                                                            '9.7']}
-
-    AUSC_preloaded_accounts = {'PC Boiler': ['4.9'],
-                               'Steam Turbine': ['8.1'],
-                               'Steam Piping': ['8.4']}
-
     # preloaded account handling
     if type(cost_accounts) == str:
         if tech in [1, 2]:
@@ -498,15 +497,19 @@ def get_sCO2_unit_cost(self, equipment, scaled_param, temp_C=None, n_equip=1):
 # -----------------------------------------------------------------------------
 # Air Separation Unit Costing Library
 # -----------------------------------------------------------------------------
+# reference values for the ASU, cost in 2008 dollars
+ASU_costing_params = {'Reference Cost': 3.26e6,
+                      'Reference Parameter': 13078,
+                      'Exponent': 0.7,
+                      'Eng Fee': 0.097,
+                      'Process': 0,
+                      'Project': 0.110}
+
+
 def get_ASU_cost(self, scaled_param):
     # scaled parameter is O2 flowrate in TPD
 
-    params = {'Reference Cost': 3.26e6,
-              'Reference Parameter': 13078,
-              'Exponent': 0.7,
-              'Eng Fee': 0.097,
-              'Process': 0,
-              'Project': 0.110}
+    params = ASU_costing_params
 
     # check to see if a costing block already exists
     if hasattr(self, 'costing'):
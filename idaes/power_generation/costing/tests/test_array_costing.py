@@ -0,0 +1,151 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests that the array costing library matches the Pyomo costing blocks
+"""
+import numpy as np
+import pytest
+
+import pyomo.environ as pyo
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+from idaes.core import FlowsheetBlock
+from idaes.power_generation.costing.power_plant_costing import \
+    (get_sCO2_unit_cost,
+     get_PP_costing,
+     get_ASU_cost,
+     costing_initialization)
+from idaes.power_generation.costing.array_costing import \
+    (get_PP_costing_arrays,
+     get_sCO2_unit_cost_arrays,
+     get_ASU_cost_arrays,
+     get_account_table)
+
+
+def _flowsheet(year):
+    m = pyo.ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.get_costing(year=year)
+    return m
+
+
+@pytest.mark.unit
+def test_account_table_cached():
+    table = get_account_table(2, 'B')
+    assert get_account_table(2, 'B') is table
+    i = table.index['1.1']
+    assert table.exp[i] == 0.62
+    # accounts scaled on the sum of other accounts have no reference value
+    assert np.isnan(table.ref_param[table.index['13.1']])
+    with pytest.raises(KeyError):
+        table.indices(['99.9'])
+
+
+@pytest.mark.component
+@pytest.mark.parametrize("accounts,param,units,tech,ccs", [
+    (['1.1', '1.2', '1.3', '1.4', '2.1', '2.2', '4.11', '4.15', '4.16'],
+     [5000.0, 7238.95, 9000.0], 'tpd', 2, 'B'),
+    ('Steam Turbine', [300000.0, 450000.0], 'kW', 1, 'A'),
+    ('Combustion Turbine', [200000.0, 300000.0], 'lb/hr', 6, 'B')])
+def test_PP_costing_matches_pyomo(accounts, param, units, tech, ccs):
+    res = get_PP_costing_arrays(accounts, param, units, tech, ccs=ccs,
+                                CE_index=680)
+    assert res['bare_erected_cost'].shape == (len(param),
+                                              len(res['accounts']))
+    for j, p in enumerate(param):
+        m = _flowsheet('2019')
+        m.fs.unit = pyo.Block()
+        m.fs.unit.param = pyo.Var(initialize=p)
+        m.fs.unit.param.fix()
+        get_PP_costing(m.fs.unit, accounts, m.fs.unit.param, units, tech,
+                       ccs=ccs)
+        costing_initialization(m.fs)
+        c = m.fs.unit.costing
+        for k, a in enumerate(res['accounts']):
+            assert res['bare_erected_cost'][j, k] == pytest.approx(
+                pyo.value(c.bare_erected_cost[a]), rel=1e-12)
+            assert res['total_plant_cost'][j, k] == pytest.approx(
+                pyo.value(c.total_plant_cost[a]), rel=1e-12)
+        assert res['total_plant_cost_sum'][j] == pytest.approx(
+            pyo.value(c.total_plant_cost_sum), rel=1e-12)
+
+
+@pytest.mark.unit
+def test_PP_costing_errors():
+    with pytest.raises(ValueError):
+        get_PP_costing_arrays(['1.1'], 1000.0, 'kW', 2)
+    with pytest.raises(ValueError):
+        get_PP_costing_arrays(['1.1', '8.1'], 1000.0, 'tpd', 2)
+
+
+@pytest.mark.component
+@pytest.mark.parametrize("equipment,param,temp,n_equip", [
+    ('Axial turbine', [100.0, 300.0], [500.0, 700.0], 1),
+    ('Recuperator', [5.0e6, 5.0e7], [450.0, 600.0], 2),
+    ('IG centrifugal compressor', [20.0, 60.0], None, 3)])
+def test_sCO2_costing_matches_pyomo(equipment, param, temp, n_equip):
+    res = get_sCO2_unit_cost_arrays(equipment, param, temp_C=temp,
+                                    n_equip=n_equip)
+    for j, p in enumerate(param):
+        m = _flowsheet('2017')
+        m.fs.unit = pyo.Block()
+        get_sCO2_unit_cost(m.fs.unit, equipment, p,
+                           temp_C=None if temp is None else temp[j],
+                           n_equip=n_equip)
+        c = m.fs.unit.costing
+        # costing_initialization skips the temperature factor of
+        # recuperators, so the variables are calculated here
+        if temp is not None:
+            calculate_variable_from_constraint(c.temperature, c.temp_eq)
+            calculate_variable_from_constraint(c.temp_factor,
+                                               c.temp_correction_eq)
+        for key in ['scaled_param', 'equipment_cost', 'bare_erected_cost',
+                    'total_plant_cost']:
+            calculate_variable_from_constraint(getattr(c, key),
+                                               getattr(c, key + '_eq'))
+        for key in ['equipment_cost', 'bare_erected_cost',
+                    'total_plant_cost']:
+            assert res[key][j] == pytest.approx(
+                pyo.value(getattr(c, key)), rel=1e-9)
+
+
+@pytest.mark.unit
+def test_sCO2_costing_requires_temperature():
+    with pytest.raises(ValueError):
+        get_sCO2_unit_cost_arrays('Axial turbine', 100.0)
+
+
+@pytest.mark.component
+def test_ASU_costing_matches_pyomo():
+    param = np.array([5000.0, 13078.0, 20000.0])
+    res = get_ASU_cost_arrays(param)
+    for j, p in enumerate(param):
+        m = _flowsheet('2017')
+        m.fs.asu = pyo.Block()
+        m.fs.asu.O2_flow = pyo.Var(initialize=p)
+        m.fs.asu.O2_flow.fix()
+        get_ASU_cost(m.fs.asu, m.fs.asu.O2_flow)
+        costing_initialization(m.fs)
+        c = m.fs.asu.costing
+        assert res['bare_erected_cost'][j] == pytest.approx(
+            pyo.value(c.bare_erected_cost), rel=1e-12)
+        assert res['total_plant_cost'][j] == pytest.approx(
+            pyo.value(c.total_plant_cost), rel=1e-12)
+
+
+@pytest.mark.unit
+def test_PP_costing_array_shapes():
+    param = np.linspace(5000.0, 9000.0, 100000).reshape(1000, 100)
+    res = get_PP_costing_arrays(['1.1', '1.2', '1.3'], param, 'tpd', 1)
+    assert res['bare_erected_cost'].shape == (1000, 100, 3)
+    assert res['total_plant_cost_sum'].shape == (1000, 100)
+    assert np.all(np.diff(res['total_plant_cost_sum'].ravel()) > 0)
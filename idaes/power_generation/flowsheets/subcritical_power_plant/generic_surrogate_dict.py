@@ -1,3 +1,9 @@
+"""
+Boiler fire-side surrogate models for the subcritical boiler, written as
+Python expression strings. The flowsheet uses the equivalent
+coefficient/basis tables in generic_surrogate_tables.json; this dictionary is
+kept for reference and for models that still pass strings to BoilerFireside.
+"""
 data_dic = {
         1: '(74904.4 * b.wall_temperature_waterwall[t, 1] \
             +11301.8 * b.wall_temperature_waterwall[t, 2] \
@@ -13,6 +13,7 @@
 """
 Dynamic sub-flowsheet for a subcritical 300MWe boiler system
 """
+import os
 
 # Import Pyomo libraries
 import pyomo.environ as pyo
@@ -47,8 +48,10 @@ from idaes.power_generation.unit_models import (
     SteamHeater
     )
 
-# Import boiler fire-side surrogate model as dictionary
-from idaes.power_generation.flowsheets.subcritical_power_plant.generic_surrogate_dict import data_dic
+# Import boiler fire-side surrogate models as coefficient/basis tables
+from pyomo.common.fileutils import this_file_dir
+from idaes.power_generation.unit_models.boiler_fireside_surrogate import \
+    load_surrogate_tables
 import idaes.core.util.scaling as iscale
 from idaes.core.util.dyn_utils import copy_values_at_time,\
     copy_non_time_indexed_values
@@ -57,6 +60,11 @@ import matplotlib.pyplot as plt
 
 __author__ = "Boiler Subsystem Team (J. Ma, M. Zamarripa)"
 
+# Surrogate coefficient/basis tables (the same models as in
+# generic_surrogate_dict.py)
+data_dic = load_surrogate_tables(
+    os.path.join(this_file_dir(), "generic_surrogate_tables.json"))
+
 
 def add_unit_models(m):
     """
@@ -20,7 +20,6 @@ Main assumptions:
 # Import Pyomo libraries
 from pyomo.environ import (Constraint, Param, PositiveReals, Reals, value, log,
                            sqrt, Var, Expression, units as pyunits)
-from pyomo.opt import SolverFactory
 
 # Import IDAES cores
 from idaes.core import (
@@ -41,6 +40,7 @@ import idaes.core.util.scaling as iscale
 
 # Import Python libraries
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 # Some more inforation about this module
@@ -378,7 +378,7 @@ class _FlueGasStateBlock(StateBlock):
         solve_log = idaeslog.getSolveLogger(
             self.name,outlvl, tag="properties")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         if state_vars_fixed is False:
@@ -77,14 +77,18 @@ from idaes.core import (declare_process_block_class,
 from idaes.core.util.model_statistics import degrees_of_freedom
 
 from idaes.core.util.config import is_physical_parameter_block
+from idaes.core.util.exceptions import ConfigurationError
 import idaes.logger as idaeslog
 
 
 # Additional import for the unit operation
-from pyomo.environ import SolverFactory, Var, Param, exp, log,\
+from pyomo.environ import Var, Param, exp, log,\
     RangeSet, Constraint
 import idaes.core.util.scaling as iscale
 from idaes.core.util.constants import Constants as const
+from idaes.core.util.solver_service import get_initialization_solver
+from idaes.power_generation.unit_models.boiler_fireside_surrogate import (
+    SurrogateTable, input_getter)
 
 __author__ = "Boiler Team (J. Ma, M. Zamarripa)"
 __version__ = "1.0.0"
@@ -173,7 +177,10 @@ ratio, PA to coal ratio, and lower stoichiometric ratio,
         description="surrogate model dictionary",
         doc="""user must provide surrogate models or values for heat duty,
 **default** - False.
-**Valid values:** """))
+**Valid values:** a dict with one entry per water wall zone plus 'pl',
+'roof', 'flyash' and 'NOx'. Entries are either SurrogateTable objects
+(see boiler_fireside_surrogate.load_surrogate_tables) or strings with
+a Python expression in terms of b and t."""))
 
     def build(self):
         super(BoilerFiresideData, self).build()
@@ -221,6 +228,30 @@ ratio, PA to coal ratio, and lower stoichiometric ratio,
                             'of surrogate models and water wall zones'
                             'and/or platen sh and/or boiler roof')
 
+        # Surrogates given as strings are converted to coefficient/basis
+        # tables where possible, so they don't have to be parsed for every
+        # time point. Strings that are not linear in ALAMO-type basis
+        # functions are still evaluated as Python expressions.
+        surrogates = {}
+        for k, surr in data_dict.items():
+            if isinstance(surr, str):
+                try:
+                    surr = SurrogateTable.from_string(surr)
+                except (ConfigurationError, SyntaxError):
+                    pass
+            surrogates[k] = surr
+        # Inputs and basis expressions shared by all surrogates at a time
+        # point
+        basis_cache = {}
+
+        def surrogate(b, t, k):
+            surr = surrogates[k]
+            if isinstance(surr, SurrogateTable):
+                if t not in basis_cache:
+                    basis_cache[t] = (input_getter(b, t), {})
+                return surr.expression(*basis_cache[t])
+            return eval(surr)
+
         # Surrogate model predictions
         # Constraints for heat duty in boiler water wall zones
         @self.Constraint(self.flowsheet().config.time, self.zones,
@@ -228,7 +259,7 @@ ratio, PA to coal ratio, and lower stoichiometric ratio,
                          " to water wall zones")
         def eq_surr_waterwall_heat(b, t, z):
             return b.waterwall_heat[t, z] * b.fcorrection_heat_ww[t] ==\
-                eval(data_dict[z])
+                surrogate(b, t, z)
 
         if self.config.has_platen_superheater is True:
             @self.Constraint(self.flowsheet().config.time,
@@ -236,7 +267,7 @@ ratio, PA to coal ratio, and lower stoichiometric ratio,
                              " to platen superheater")
             def eq_surr_platen_heat(b, t):
                 return b.platen_heat[t] * b.fcorrection_heat_platen[t]\
-                    == eval(data_dict['pl'])
+                    == surrogate(b, t, 'pl')
 
         if self.config.has_roof_superheater is True:
             @self.Constraint(self.flowsheet().config.time,
@@ -244,14 +275,14 @@ ratio, PA to coal ratio, and lower stoichiometric ratio,
                              " the roof and backpass heater")
             def eq_surr_roof_heat(b, t):
                 return b.roof_heat[t] * b.fcorrection_heat_ww[t] == \
-                    eval(data_dict['roof'])
+                    surrogate(b, t, 'roof')
 
         # Constraints for unburned carbon
         @self.Constraint(self.flowsheet().config.time,
                          doc="Surrogate model for"
                          " mass fraction of unburned carbon")
         def eq_surr_ln_ubc(b, t):
-            return b.ubc_in_flyash[t] == eval(data_dict['flyash'])
+            return b.ubc_in_flyash[t] == surrogate(b, t, 'flyash')
 
         # Constraints for NOx in mol fraction, surrogate model in PPM,
         # converted to mass fraction
@@ -259,7 +290,7 @@ ratio, PA to coal ratio, and lower stoichiometric ratio,
                          doc="NOx in mol fraction"
                              "surrogate model must be in PPM")
         def eq_surr_nox(b, t):
-            return b.frac_mol_NOx_fluegas[t]*1e6 == eval(data_dict['NOx'])
+            return b.frac_mol_NOx_fluegas[t]*1e6 == surrogate(b, t, 'NOx')
         #                    # 1e6 conversion factor from PPM to mol fract
 
     def _make_params(self):
@@ -947,7 +978,7 @@ ratio, PA to coal ratio, and lower stoichiometric ratio,
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # ---------------------------------------------------------------------
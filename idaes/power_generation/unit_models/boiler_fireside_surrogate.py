@@ -0,0 +1,355 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Coefficient/basis tables for the boiler fire-side surrogate models.
+
+ALAMO surrogates are linear combinations of simple basis functions of the
+model inputs (x, log(x), exp(x), x**n, (x*y)**n, ...). Historically these
+were handed to the fire-side model as Python source strings and evaluated
+with ``eval`` for every time point. A :class:`SurrogateTable` stores the same
+model as data: a list of coefficients and a list of :class:`BasisTerm`
+entries. Expressions are then built directly from the table, with every
+distinct basis function constructed once per time point and shared between
+all surrogates that use it.
+
+Input names are relative to the fire-side block, e.g.
+``"wall_temperature_waterwall[3]"`` refers to
+``b.wall_temperature_waterwall[t, 3]`` and
+``"secondary_air_inlet.temperature"`` to
+``b.secondary_air_inlet.temperature[t]``.
+"""
+import ast
+import json
+from collections import namedtuple
+
+from pyomo.environ import exp, log
+from pyomo.core.expr.numeric_expr import (
+    MonomialTermExpression, ProductExpression, SumExpression)
+
+from idaes.core.util.exceptions import ConfigurationError
+
+__author__ = "Boiler Team (J. Ma, M. Zamarripa)"
+
+
+# Supported basis functions, keyed by the name used in the tables
+_FUNCTIONS = {"": None, "log": log, "exp": exp}
+
+BasisTerm = namedtuple("BasisTerm", ["function", "inputs", "power"])
+BasisTerm.__doc__ = """
+Basis function ``function(prod(inputs))**power`` of a surrogate model.
+
+``function`` is one of ``""`` (identity), ``"log"`` or ``"exp"``, ``inputs``
+is a tuple of input names (empty for the constant term) and ``power`` is a
+numeric exponent.
+"""
+
+
+class SurrogateTable(object):
+    """
+    Surrogate model stored as coefficients of basis functions.
+
+    The surrogate evaluates to ``transform(sum(c_i*basis_i))`` where
+    ``transform`` is either ``None`` or ``"exp"`` (used for the unburned
+    carbon surrogate).
+
+    Args:
+        coefficients: sequence of floats, one per basis term
+        basis: sequence of BasisTerm (or equivalent 3-tuples)
+        transform: None or name of a function applied to the sum
+    """
+    def __init__(self, coefficients, basis, transform=None):
+        self.coefficients = tuple(float(c) for c in coefficients)
+        self.basis = tuple(BasisTerm(f, tuple(i), p) for f, i, p in basis)
+        if len(self.coefficients) != len(self.basis):
+            raise ConfigurationError(
+                "Surrogate table needs one coefficient per basis term, got "
+                "{} coefficients and {} basis terms.".format(
+                    len(self.coefficients), len(self.basis)))
+        for term in self.basis:
+            if term.function not in _FUNCTIONS:
+                raise ConfigurationError(
+                    "Unsupported surrogate basis function {}.".format(
+                        term.function))
+        if transform not in (None, "exp"):
+            raise ConfigurationError(
+                "Unsupported surrogate transform {}.".format(transform))
+        self.transform = transform
+
+    @property
+    def inputs(self):
+        """Set of input names used by the surrogate."""
+        return set(i for term in self.basis for i in term.inputs)
+
+    def expression(self, get_input, basis_cache=None):
+        """
+        Build a Pyomo expression for the surrogate.
+
+        Args:
+            get_input: callable returning the Pyomo component data for an
+                input name
+            basis_cache: optional dict used to share basis expressions
+                between surrogates built for the same time point
+
+        Returns:
+            Pyomo expression
+        """
+        if basis_cache is None:
+            basis_cache = {}
+        # The expression nodes are created directly rather than through
+        # operator overloading, which is several times faster for
+        # surrogates with hundreds of terms. The result is the same tree.
+        terms = []
+        for c, term in zip(self.coefficients, self.basis):
+            if not term.inputs:
+                terms.append(c)
+                continue
+            try:
+                b = basis_cache[term]
+            except KeyError:
+                b = basis_cache[term] = _basis_expression(term, get_input)
+            if b.is_variable_type():
+                terms.append(MonomialTermExpression((c, b)))
+            else:
+                terms.append(ProductExpression((c, b)))
+        if len(terms) == 1:
+            expr = terms[0]
+        else:
+            expr = SumExpression(terms)
+        if self.transform == "exp":
+            expr = exp(expr)
+        return expr
+
+    def to_dict(self):
+        """Return a JSON-serializable representation of the table."""
+        return {"transform": self.transform,
+                "terms": [[c, t.function, t.power, list(t.inputs)]
+                          for c, t in zip(self.coefficients, self.basis)]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a table from the output of :meth:`to_dict`."""
+        coefficients = [t[0] for t in data["terms"]]
+        basis = [(t[1], t[3], t[2]) for t in data["terms"]]
+        return cls(coefficients, basis, transform=data.get("transform"))
+
+    @classmethod
+    def from_string(cls, expr_string):
+        """
+        Create a table from a surrogate written as a Python expression string
+        in the form used by the legacy surrogate dictionaries, e.g.
+        ``"(1.2 * b.SR[t] - 3.4 * log(b.wall_temperature_waterwall[t, 1]))"``.
+        """
+        node = ast.parse(" ".join(expr_string.split()), mode="eval").body
+        transform = None
+        if isinstance(node, ast.Call) and _call_name(node) == "exp" and \
+                _is_sum(node.args[0]):
+            transform = "exp"
+            node = node.args[0]
+        coefficients = []
+        basis = []
+        for sign, term in _flatten_sum(node, 1.0):
+            c, b = _parse_term(term)
+            coefficients.append(sign * c)
+            basis.append(b)
+        return cls(coefficients, basis, transform=transform)
+
+
+def load_surrogate_tables(path):
+    """
+    Load a surrogate dictionary for the fire-side model from a JSON file.
+
+    Keys that are integers (water wall zones) are converted back to int.
+
+    Args:
+        path: JSON file written by :func:`save_surrogate_tables`
+
+    Returns:
+        dict of SurrogateTable
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    return {_key(k): SurrogateTable.from_dict(v) for k, v in data.items()}
+
+
+def save_surrogate_tables(tables, path):
+    """
+    Write a dictionary of SurrogateTable objects to a JSON file, with one
+    coefficient/basis term per line.
+
+    Args:
+        tables: dict of SurrogateTable keyed by surrogate name
+        path: file to write
+    """
+    lines = ["{"]
+    for n, (k, table) in enumerate(tables.items()):
+        d = table.to_dict()
+        lines.append('  "{}": {{'.format(k))
+        lines.append('    "transform": {},'.format(json.dumps(d["transform"])))
+        lines.append('    "terms": [')
+        lines.append(",\n".join(
+            "      " + json.dumps(t) for t in d["terms"]))
+        lines.append("    ]")
+        lines.append("  }" + ("," if n < len(tables) - 1 else ""))
+    lines.append("}")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def input_getter(blk, t):
+    """
+    Return a callable mapping surrogate input names to the component data of
+    ``blk`` at time ``t``.
+    """
+    found = {}
+
+    def get_input(name):
+        try:
+            return found[name]
+        except KeyError:
+            pass
+        path, _, index = name.partition("[")
+        comp = blk
+        for attr in path.split("."):
+            comp = getattr(comp, attr)
+        if index:
+            comp = comp[(t,) + tuple(
+                int(i) for i in index.rstrip("]").split(","))]
+        else:
+            comp = comp[t]
+        found[name] = comp
+        return comp
+    return get_input
+
+
+def _key(k):
+    return int(k) if k.isdigit() else k
+
+
+def _basis_expression(term, get_input):
+    expr = get_input(term.inputs[0])
+    for i in term.inputs[1:]:
+        expr = expr * get_input(i)
+    f = _FUNCTIONS[term.function]
+    if f is not None:
+        expr = f(expr)
+    if term.power != 1:
+        expr = expr**term.power
+    return expr
+
+
+def _number(node):
+    # ast.Num was merged into ast.Constant in newer Pythons
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        v = _number(node.operand)
+        return None if v is None else -v
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+        return _number(node.operand)
+    v = getattr(node, "n", getattr(node, "value", None))
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return float(v)
+    return None
+
+
+def _call_name(node):
+    return node.func.id if isinstance(node.func, ast.Name) else None
+
+
+def _is_sum(node):
+    return isinstance(node, ast.BinOp) and isinstance(
+        node.op, (ast.Add, ast.Sub))
+
+
+def _flatten_sum(node, sign):
+    if _is_sum(node):
+        for x in _flatten_sum(node.left, sign):
+            yield x
+        s = sign if isinstance(node.op, ast.Add) else -sign
+        for x in _flatten_sum(node.right, s):
+            yield x
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) \
+            and _number(node) is None:
+        for x in _flatten_sum(node.operand, -sign):
+            yield x
+    else:
+        yield sign, node
+
+
+def _factors(node):
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+        return _factors(node.left) + _factors(node.right)
+    return [node]
+
+
+def _parse_term(node):
+    c = 1.0
+    rest = []
+    for f in _factors(node):
+        v = _number(f)
+        if v is None:
+            rest.append(f)
+        else:
+            c *= v
+    if not rest:
+        return c, BasisTerm("", (), 1)
+    if len(rest) == 1:
+        return c, _parse_basis(rest[0])
+    return c, BasisTerm("", tuple(_parse_input(f) for f in rest), 1)
+
+
+def _parse_basis(node):
+    power = 1
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+        power = _number(node.right)
+        if power is None:
+            raise ConfigurationError(
+                "Surrogate exponents must be numeric constants.")
+        if power == int(power):
+            power = int(power)
+        node = node.left
+    function = ""
+    if isinstance(node, ast.Call):
+        function = _call_name(node)
+        if function not in ("log", "exp") or len(node.args) != 1:
+            raise ConfigurationError(
+                "Unsupported surrogate basis function {}.".format(function))
+        node = node.args[0]
+    return BasisTerm(
+        function, tuple(_parse_input(f) for f in _factors(node)), power)
+
+
+def _parse_input(node):
+    # b.<path>[t] or b.<path>[t, i]
+    if not isinstance(node, ast.Subscript):
+        raise ConfigurationError(
+            "Could not convert surrogate term {} to a basis function."
+            .format(ast.dump(node)))
+    index = node.slice
+    if isinstance(index, ast.Index):
+        index = index.value
+    index = index.elts if isinstance(index, ast.Tuple) else [index]
+    path = []
+    comp = node.value
+    while isinstance(comp, ast.Attribute):
+        path.insert(0, comp.attr)
+        comp = comp.value
+    others = [_number(i) for i in index[1:]]
+    if not (isinstance(comp, ast.Name) and comp.id == "b" and path and
+            isinstance(index[0], ast.Name) and index[0].id == "t" and
+            all(i is not None and i == int(i) for i in others)):
+        raise ConfigurationError(
+            "Surrogate inputs must be of the form b.<name>[t, ...] with "
+            "integer indices.")
+    name = ".".join(path)
+    if others:
+        name += "[{}]".format(",".join(str(int(i)) for i in others))
+    return name
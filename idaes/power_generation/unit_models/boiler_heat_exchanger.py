@@ -40,7 +40,7 @@ from enum import Enum
 # Import Pyomo libraries
 from pyomo.common.config import ConfigBlock, ConfigValue, In
 # Additional import for the unit operation
-from pyomo.environ import SolverFactory, value, Var, Param, exp, sqrt,\
+from pyomo.environ import value, Var, Param, exp, sqrt,\
     log, PositiveReals, NonNegativeReals, units as pyunits
 from pyomo.opt import TerminationCondition
 
@@ -58,6 +58,7 @@ from idaes.core.util.misc import add_object_reference
 from idaes.core.util.constants import Constants as c
 
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 __author__ = "Boiler subsystem team (J Ma, M Zamarripa)"
@@ -1162,7 +1163,7 @@ constructed,
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # ---------------------------------------------------------------------
@@ -21,7 +21,7 @@ Created August 27, 2020
 """
 # Import Pyomo libraries
 from pyomo.environ import (
-    SolverFactory, value, Var, Reference, units as pyunits)
+    value, Var, Reference, units as pyunits)
 from pyomo.common.config import ConfigBlock, ConfigValue, In
 
 # Import IDAES cores
@@ -41,6 +41,7 @@ import idaes.core.util.scaling as iscale
 from idaes.core.util.constants import Constants as const
 import idaes.logger as idaeslog
 from idaes.core.util.exceptions import ConfigurationError
+from idaes.core.util.solver_service import get_initialization_solver
 
 __author__ = "Boiler Subsystem Team (J. Ma, M. Zamarripa)"
 __version__ = "2.0.0"
@@ -334,7 +335,7 @@ see property package for documentation.}"""))
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         init_log.info_low("Starting initialization...")
@@ -65,7 +65,7 @@ import idaes.logger as idaeslog
 from idaes.core.util.config import is_physical_parameter_block
 from idaes.generic_models.unit_models import Mixer
 # Additional import for the unit operation
-from pyomo.environ import SolverFactory, Var, asin, cos
+from pyomo.environ import Var, asin, cos
 from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.core.util.initialization import fix_state_vars, revert_state_vars
 from pyomo.network import Port
@@ -76,6 +76,7 @@ from idaes.power_generation.unit_models.helm.phase_separator import \
     HelmPhaseSeparator
 from idaes.power_generation.unit_models.helm.mixer import HelmMixer
 from idaes.core.util.constants import Constants as const
+from idaes.core.util.solver_service import get_initialization_solver
 __author__ = "Boiler Subsystem Team (J. Ma, M. Zamarripa)"
 __version__ = "2.0.0"
 
@@ -445,7 +446,7 @@ see property package for documentation.}"""))
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         init_log.info_low("Starting initialization...")
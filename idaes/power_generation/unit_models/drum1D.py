@@ -67,8 +67,7 @@ from pyomo.dae import ContinuousSet, DerivativeVar
 from pyomo.common.config import ConfigBlock, ConfigValue, In
 from idaes.core.util.config import is_physical_parameter_block
 # Additional import for the unit operation
-from pyomo.environ import (SolverFactory,
-                           value,
+from pyomo.environ import (value,
                            Var,
                            Param,
                            Reference,
@@ -92,6 +91,7 @@ from idaes.power_generation.unit_models.helm import (
     HelmMixer,
     MomentumMixingType)
 from idaes.core.util.constants import Constants as const
+from idaes.core.util.solver_service import get_initialization_solver
 
 __author__ = "Boiler Subsystem Team (J. Ma, M. Zamarripa)"
 __version__ = "2.0.0"
@@ -1046,7 +1046,7 @@ discretizing length domain (default=3)"""))
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         init_log.info_low("Starting Initialization...")
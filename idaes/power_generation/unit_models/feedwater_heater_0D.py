@@ -28,7 +28,7 @@ are two models included here.
 __author__ = "John Eslick"
 
 from pyomo.common.config import ConfigValue, In, ConfigBlock
-from pyomo.environ import SolverFactory, TransformationFactory, Var, value
+from pyomo.environ import TransformationFactory, Var, value
 from pyomo.network import Arc
 
 from idaes.core import (
@@ -44,6 +44,7 @@ from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.core import useDefault
 from idaes.core.util.config import is_physical_parameter_block
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 _log = idaeslog.getLogger(__name__)
 
@@ -197,7 +198,7 @@ class FWHCondensing0DData(HeatExchangerData):
         self.extraction_rate_constraint.activate()
         self.inlet_1.flow_mol.unfix()
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
@@ -365,7 +366,7 @@ class FWH0DData(UnitModelBlockData):
             _set_port(self.cooling.inlet_1, self.condense.outlet_1)
             self.cooling.initialize(*args, **kwargs)
         # Solve all together
-        opt = SolverFactory(kwargs.get("solver", "ipopt"))
+        opt = get_initialization_solver(kwargs.get("solver", "ipopt"))
         opt.options = kwargs.get("oparg", {})
         assert degrees_of_freedom(self) == 0
         with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
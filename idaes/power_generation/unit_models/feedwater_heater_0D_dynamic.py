@@ -28,7 +28,6 @@ are two models included here.
 __author__ = "John Eslick, Jinliang Ma"
 from pyomo.common.config import ConfigValue, In, ConfigBlock
 from pyomo.environ import (
-    SolverFactory,
     TransformationFactory,
     Var,
     value,
@@ -54,6 +53,7 @@ from idaes.core.util.constants import Constants as const
 import idaes.core.util.scaling as iscale
 from idaes.power_generation.unit_models.helm import HelmMixer as Mixer
 from idaes.core.util import copy_port_values as _set_port
+from idaes.core.util.solver_service import get_initialization_solver
 
 _log = idaeslog.getLogger(__name__)
 
@@ -225,7 +225,7 @@ class FWHCondensing0DData(CondenserData):
         self.shell_volume_eqn.activate()
         self.pressure_change_total_eqn.activate()
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
@@ -411,7 +411,7 @@ class FWH0DDynamicData(UnitModelBlockData):
             _set_port(self.cooling.inlet_1, self.condense.outlet_1)
             self.cooling.initialize(*args, **kwargs)
         # Solve all together
-        opt = SolverFactory(kwargs.get("solver", "ipopt"))
+        opt = get_initialization_solver(kwargs.get("solver", "ipopt"))
         opt.options = kwargs.get("oparg", {})
 
         assert degrees_of_freedom(self) == 0
@@ -30,10 +30,11 @@ from idaes.core.util.config import is_physical_parameter_block
 import idaes.core.util.scaling as iscale
 
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 # Additional import for the unit operation
-from pyomo.environ import SolverFactory, Var, Reference
+from pyomo.environ import Var, Reference
 
 __author__ = "Boiler Subsystem Team (J. Ma, M. Zamarripa)"
 __version__ = "1.0.0"
@@ -497,7 +498,7 @@ exchanger (default = 'counter-current' - counter-current flow arrangement"""))
         '''
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # ---------------------------------------------------------------------
@@ -30,6 +30,7 @@ from idaes.generic_models.unit_models.heater import (
 import idaes.core.util.unit_costing as costing
 import idaes.core.util.scaling as iscale
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 def _make_heat_exchanger_config(config):
@@ -347,7 +348,7 @@ class HelmNtuCondenserData(UnitModelBlockData):
         sp = StoreSpec.value_isfixed_isactive(only_fixed=True)
         istate = to_json(self, return_dict=True, wts=sp)
 
-        opt = pyo.SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         flags1 = hot_side.initialize(
@@ -19,7 +19,6 @@ from pyomo.environ import (
     PositiveReals,
     Reals,
     RangeSet,
-    SolverFactory,
     Var,
     value
 )
@@ -49,6 +48,7 @@ from idaes.core.util import from_json, to_json, StoreSpec
 import idaes.core.util.scaling as iscale
 
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 __author__ = "John Eslick"
@@ -414,7 +414,7 @@ between flow and pressure driven simulations.}""",
         solve_log = idaeslog.getSolveLogger(self.name, outlvl, tag="unit")
 
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # This shouldn't require too much initializtion, just fixing inlets
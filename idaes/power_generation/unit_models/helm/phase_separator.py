@@ -27,8 +27,9 @@ from idaes.core import (declare_process_block_class,
 from idaes.core.util.config import is_physical_parameter_block
 import idaes.core.util.scaling as iscale
 import idaes.logger as idaeslog
-from pyomo.environ import SolverFactory, value
+from pyomo.environ import value
 from idaes.core.util.initialization import fix_state_vars, revert_state_vars
+from idaes.core.util.solver_service import get_initialization_solver
 
 __author__ = "Boiler Subsystem Team (J. Ma, M. Zamarripa, A. Lee)"
 
@@ -158,7 +159,7 @@ see property package for documentation.}"""))
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         init_log.info_low("Starting initialization...")
@@ -22,7 +22,7 @@ This model is psuedo-steady-state when used in dynamic mode.
 
 from pandas import DataFrame
 
-from pyomo.environ import Constraint, Set, SolverFactory, Var, value
+from pyomo.environ import Constraint, Set, Var, value
 from pyomo.network import Port
 from pyomo.common.config import ConfigBlock, ConfigValue, In
 
@@ -38,6 +38,7 @@ from idaes.core.util import from_json, to_json, StoreSpec
 import idaes.logger as idaeslog
 from idaes.core.util.model_statistics import degrees_of_freedom
 import idaes.core.util.scaling as iscale
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 __author__ = "John Eslick"
@@ -280,7 +281,7 @@ from 1 to num_outlets).}""",
         init_log = idaeslog.getInitLogger(self.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(self.name, outlvl, tag="unit")
         # Set solver options
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         # sp is what to save to make sure state after init is same as the start
@@ -21,6 +21,7 @@ from idaes.generic_models.properties.helmholtz.helmholtz import (
 )
 import idaes.logger as idaeslog
 import idaes.core.util.scaling as iscale
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 _log = idaeslog.getLogger(__name__)
@@ -174,7 +175,7 @@ class HelmIsentropicTurbineData(BalanceBlockData):
         init_log = idaeslog.getInitLogger(self.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(self.name, outlvl, tag="unit")
         # Set solver options
-        solver = pyo.SolverFactory(solver)
+        solver = get_initialization_solver(solver)
         solver.options = optarg
         # Store original specification so initialization doesn't change the model
         # This will only resore the values of varaibles that were originally fixed
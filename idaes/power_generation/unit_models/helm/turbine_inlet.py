@@ -19,13 +19,14 @@ Liese, (2014). "Modeling of a Steam Turbine Including Partial Arc Admission
 """
 __Author__ = "John Eslick"
 
-from pyomo.environ import Var, Param, sqrt, value, SolverFactory, units as pyunits
+from pyomo.environ import Var, Param, sqrt, value, units as pyunits
 from idaes.core import declare_process_block_class
 from idaes.power_generation.unit_models.helm.turbine import HelmIsentropicTurbineData
 from idaes.core.util import from_json, to_json, StoreSpec
 from idaes.core.util.model_statistics import degrees_of_freedom
 import idaes.logger as idaeslog
 import idaes.core.util.scaling as iscale
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 _log = idaeslog.getLogger(__name__)
@@ -188,7 +189,7 @@ class HelmTurbineInletStageData(HelmIsentropicTurbineData):
                     )/Pin
                 )
 
-        slvr = SolverFactory(solver)
+        slvr = get_initialization_solver(solver)
         slvr.options = optarg
         with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
             res = slvr.solve(self, tee=slc.tee)
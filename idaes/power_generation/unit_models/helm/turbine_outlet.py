@@ -20,7 +20,7 @@ Liese, (2014). "Modeling of a Steam Turbine Including Partial Arc Admission
 __Author__ = "John Eslick"
 
 from pyomo.common.config import In
-from pyomo.environ import Var, sqrt, SolverFactory, value, Param, units as pyunits
+from pyomo.environ import Var, sqrt, value, Param, units as pyunits
 from idaes.power_generation.unit_models.helm.turbine import HelmIsentropicTurbineData
 from idaes.core import declare_process_block_class
 from idaes.core.util import from_json, to_json, StoreSpec
@@ -28,6 +28,7 @@ from idaes.core.util.model_statistics import degrees_of_freedom
 import idaes.core.util.scaling as iscale
 
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 _log = idaeslog.getLogger(__name__)
 
@@ -182,7 +183,7 @@ class HelmTurbineOutletStageData(HelmIsentropicTurbineData):
 
         self.stodola_equation.activate()
         self.efficiency_correlation.activate()
-        slvr = SolverFactory(solver)
+        slvr = get_initialization_solver(solver)
         slvr.options = optarg
 
         with idaeslog.solver_log(solve_log, idaeslog.DEBUG) as slc:
@@ -22,7 +22,7 @@ and roof superheater, model main equations:
 """
 # Import Pyomo libraries
 from pyomo.common.config import ConfigBlock, ConfigValue, In
-from pyomo.environ import SolverFactory, value, Var, \
+from pyomo.environ import value, Var, \
     Param, asin, cos, Reference
 from pyomo.core.expr.current import Expr_if
 from pyomo.dae import DerivativeVar
@@ -39,6 +39,7 @@ from idaes.core.util.config import is_physical_parameter_block
 import idaes.logger as idaeslog
 import idaes.core.util.scaling as iscale
 from idaes.core.util.constants import Constants as const
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 __author__ = "Boiler Subsystem Team (J. Ma, M. Zamarripa)"
@@ -641,7 +642,7 @@ see property package for documentation.}"""))
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         flags = blk.control_volume.initialize(
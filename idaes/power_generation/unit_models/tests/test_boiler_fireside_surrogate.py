@@ -0,0 +1,203 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for the coefficient/basis tables of the boiler fire-side surrogates
+"""
+import os
+import random
+
+import pytest
+import pyomo.environ as pyo
+from pyomo.environ import exp, log  # noqa: F401 used by eval of surrogates
+from pyomo.common.fileutils import this_file_dir
+from pyomo.core.expr.calculus.derivatives import differentiate, Modes
+
+from idaes.core import FlowsheetBlock
+from idaes.core.util.exceptions import ConfigurationError
+from idaes.power_generation.properties import FlueGasParameterBlock
+from idaes.power_generation.unit_models.boiler_fireside import BoilerFireside
+from idaes.power_generation.unit_models.boiler_fireside_surrogate import (
+    BasisTerm,
+    SurrogateTable,
+    input_getter,
+    load_surrogate_tables,
+    save_surrogate_tables)
+from idaes.power_generation.flowsheets.subcritical_power_plant.\
+    generic_surrogate_dict import data_dic
+
+table_file = os.path.join(
+    this_file_dir(), "..", "..", "flowsheets", "subcritical_power_plant",
+    "generic_surrogate_tables.json")
+
+# Ranges of surrogate inputs used to sample parity points
+input_ranges = {"wall_temperature_waterwall": (600, 800),
+                "wall_temperature_platen": (700, 900),
+                "wall_temperature_roof": (600, 800),
+                "flowrate_coal_raw": (30, 60),
+                "mf_H2O_coal_raw": (0.1, 0.3),
+                "SR": (1.1, 1.3),
+                "SR_lf": (0.9, 1.2),
+                "ratio_PA2coal": (1.5, 2.5)}
+
+
+@pytest.fixture(scope="module")
+def inputs():
+    """A block with the surrogate inputs of the fire-side model"""
+    m = pyo.ConcreteModel()
+    m.b = b = pyo.Block()
+    b.zones = pyo.RangeSet(12)
+    b.wall_temperature_waterwall = pyo.Var([0], b.zones)
+    for v in ("wall_temperature_platen", "wall_temperature_roof",
+              "flowrate_coal_raw", "mf_H2O_coal_raw", "SR", "SR_lf",
+              "ratio_PA2coal"):
+        setattr(b, v, pyo.Var([0]))
+    b.secondary_air_inlet = pyo.Block()
+    b.secondary_air_inlet.temperature = pyo.Var([0])
+    return b
+
+
+def _sample(b, rng):
+    for name, (lo, hi) in input_ranges.items():
+        for v in getattr(b, name).values():
+            v.value = rng.uniform(lo, hi)
+    b.secondary_air_inlet.temperature[0].value = rng.uniform(500, 650)
+
+
+@pytest.mark.unit
+def test_from_string():
+    table = SurrogateTable.from_string(
+        "(1.5 * b.SR[t] \
+          -2 * log(b.wall_temperature_waterwall[t, 3]) \
+          +3e-2 * b.SR[t]*b.secondary_air_inlet.temperature[t] \
+          -4 * (b.SR[t]*b.SR_lf[t])**2 \
+          +5 * exp(b.SR_lf[t]) \
+          -6 * b.SR[t]**3 \
+          +7)")
+    assert table.transform is None
+    assert table.coefficients == (1.5, -2, 3e-2, -4, 5, -6, 7)
+    assert table.basis == (
+        BasisTerm("", ("SR",), 1),
+        BasisTerm("log", ("wall_temperature_waterwall[3]",), 1),
+        BasisTerm("", ("SR", "secondary_air_inlet.temperature"), 1),
+        BasisTerm("", ("SR", "SR_lf"), 2),
+        BasisTerm("exp", ("SR_lf",), 1),
+        BasisTerm("", ("SR",), 3),
+        BasisTerm("", (), 1))
+    assert table.inputs == {"SR", "SR_lf", "wall_temperature_waterwall[3]",
+                            "secondary_air_inlet.temperature"}
+
+    table = SurrogateTable.from_string(
+        "(exp(-1 * b.SR[t] + 2 * b.SR_lf[t]))")
+    assert table.transform == "exp"
+    assert table.coefficients == (-1, 2)
+
+    assert SurrogateTable.from_string("140").coefficients == (140,)
+
+
+@pytest.mark.unit
+def test_from_string_unsupported():
+    with pytest.raises(ConfigurationError):
+        SurrogateTable.from_string("sqrt(b.SR[t])")
+    with pytest.raises(ConfigurationError):
+        SurrogateTable.from_string("2 * b.SR[t]**b.SR_lf[t]")
+    with pytest.raises(ConfigurationError):
+        SurrogateTable.from_string("2 * (1 + b.SR[t])")
+    with pytest.raises(ConfigurationError):
+        SurrogateTable.from_string("2 * m.SR[t]")
+    with pytest.raises(ConfigurationError):
+        SurrogateTable([1, 2], [("", ("SR",), 1)])
+    with pytest.raises(ConfigurationError):
+        SurrogateTable([1], [("sin", ("SR",), 1)])
+
+
+@pytest.mark.unit
+def test_save_load(tmpdir):
+    tables = {k: SurrogateTable.from_string(v) for k, v in data_dic.items()}
+    path = os.path.join(str(tmpdir), "tables.json")
+    save_surrogate_tables(tables, path)
+    loaded = load_surrogate_tables(path)
+    assert list(loaded) == list(tables)
+    for k, table in tables.items():
+        assert loaded[k].coefficients == table.coefficients
+        assert loaded[k].basis == table.basis
+        assert loaded[k].transform == table.transform
+
+
+@pytest.mark.unit
+def test_generic_tables_match_dictionary():
+    tables = load_surrogate_tables(table_file)
+    assert list(tables) == list(data_dic)
+    for k, table in tables.items():
+        legacy = SurrogateTable.from_string(data_dic[k])
+        assert table.coefficients == legacy.coefficients
+        assert table.basis == legacy.basis
+        assert table.transform == legacy.transform
+
+
+@pytest.mark.unit
+def test_generic_tables_parity(inputs):
+    """Values and derivatives of the tables match the expression strings"""
+    b = inputs
+    t = 0
+    tables = load_surrogate_tables(table_file)
+    get_input = input_getter(b, t)
+    cache = {}
+    rng = random.Random(42)
+    for k, table in tables.items():
+        new = table.expression(get_input, cache)
+        old = eval(data_dic[k])
+        wrt = [get_input(i) for i in sorted(table.inputs)]
+        for _ in range(5):
+            _sample(b, rng)
+            assert pyo.value(new) == pytest.approx(pyo.value(old), rel=1e-10)
+            dnew = differentiate(new, wrt_list=wrt, mode=Modes.reverse_numeric)
+            dold = differentiate(old, wrt_list=wrt, mode=Modes.reverse_numeric)
+            scale = max(abs(d) for d in dold)
+            for d1, d2 in zip(dnew, dold):
+                assert d1 == pytest.approx(d2, rel=1e-8, abs=1e-10*scale)
+
+
+def _residual(c):
+    return pyo.value(c.body) - pyo.value(c.upper)
+
+
+@pytest.mark.unit
+def test_fireside_build_with_tables():
+    m = pyo.ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.prop_fluegas = FlueGasParameterBlock()
+    surrogates = load_surrogate_tables(table_file)
+    # strings that can't be written as tables are still evaluated
+    surrogates["NOx"] = "140*(1 + 0.1*(b.SR[t] - b.SR_lf[t]))"
+    m.fs.unit = BoilerFireside(
+        default={"dynamic": False,
+                 "property_package": m.fs.prop_fluegas,
+                 "calculate_PA_SA_flows": False,
+                 "number_of_zones": 12,
+                 "has_platen_superheater": True,
+                 "has_roof_superheater": True,
+                 "surrogate_dictionary": surrogates})
+    unit = m.fs.unit
+    _sample(unit, random.Random(7))
+    get_input = input_getter(unit, 0)
+    for z in unit.zones:
+        assert _residual(unit.eq_surr_waterwall_heat[0, z]) == \
+            pytest.approx(pyo.value(
+                unit.waterwall_heat[0, z] * unit.fcorrection_heat_ww[0]
+                - surrogates[z].expression(get_input)), rel=1e-12)
+    assert _residual(unit.eq_surr_ln_ubc[0]) == pytest.approx(pyo.value(
+        unit.ubc_in_flyash[0]
+        - surrogates["flyash"].expression(get_input)), rel=1e-12)
+    assert _residual(unit.eq_surr_nox[0]) == pytest.approx(pyo.value(
+        unit.frac_mol_NOx_fluegas[0]*1e6
+        - 140*(1 + 0.1*(unit.SR[0] - unit.SR_lf[0]))), rel=1e-12)
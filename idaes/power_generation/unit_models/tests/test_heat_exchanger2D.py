@@ -22,6 +22,7 @@ phase transitions (if user requires phase transitions, they need a general
 model)
 Created on Nov 25th, 2020 by Boiler Team (J. Ma, M. Zamarripa)
 """
+import numpy as np
 import pytest
 # Import Pyomo libraries
 import pyomo.environ as pyo
@@ -35,7 +36,8 @@ from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.generic_models.properties import iapws95
 from idaes.power_generation.properties import FlueGasParameterBlock
 from idaes.power_generation.unit_models.boiler_heat_exchanger_2D import \
-    HeatExchangerCrossFlow2D_Header
+    HeatExchangerCrossFlow2D_Header, _lobatto_points, \
+    _radial_collocation_matrices
 from idaes.core.util.testing import initialization_tester
 from idaes.core.util import get_default_solver
 # -----------------------------------------------------------------------------
@@ -114,12 +116,75 @@ def test_basic_build(build_unit):
     m = build_unit
     assert degrees_of_freedom(m) == 11
     # Check unit config arguments
-    assert len(m.fs.unit.config) == 19
+    assert len(m.fs.unit.config) == 21
     assert m.fs.unit.config.shell_side.has_pressure_change
     assert m.fs.unit.config.tube_side.has_pressure_change
     assert m.fs.unit.tube.config.property_package is m.fs.prop_water
 
 
+@pytest.mark.unit
+def test_radial_collocation_matrices():
+    points = _lobatto_points(3)
+    assert points[0] == 0 and points[-1] == 1
+    assert points[2] == pytest.approx(0.5)
+    r = np.array([1.75 + 0.35*z for z in points])
+    D, Q = _radial_collocation_matrices(r)
+    # Exact for polynomials up to the number of nodes less one
+    T = 3 + 2*r - r**2 + 0.5*r**4
+    assert D.dot(T) == pytest.approx(2 - 2*r + 2*r**3)
+    assert D.dot(D).dot(T) == pytest.approx(-2 + 6*r**2)
+
+    def integral(x):
+        return 1.5*x**2 + 2/3*x**3 - x**4/4 + x**6/12
+    assert Q.dot(T) == pytest.approx(integral(r) - integral(r[0]))
+
+
+@pytest.mark.unit
+def test_build_collocation():
+    m = pyo.ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.prop_water = iapws95.Iapws95ParameterBlock()
+    m.fs.prop_fluegas = FlueGasParameterBlock()
+    m.fs.unit = HeatExchangerCrossFlow2D_Header(default={
+                               "tube_side": {"property_package":
+                                             m.fs.prop_water,
+                                             "has_pressure_change": True},
+                               "shell_side": {"property_package":
+                                              m.fs.prop_fluegas,
+                                              "has_pressure_change": True},
+                               "finite_elements": 5,
+                               "flow_type": "counter_current",
+                               "tube_arrangement": "in-line",
+                               "tube_side_water_phase": "Vap",
+                               "has_radiation": True,
+                               "radial_wall_model": "collocation",
+                               "radial_collocation_points": 3,
+                               "tube_inner_diameter": 0.035,
+                               "tube_thickness": 0.0035,
+                               "has_header": True,
+                               "header_radial_elements": 5,
+                               "header_inner_diameter": 0.3,
+                               "header_wall_thickness": 0.03})
+    unit = m.fs.unit
+    assert len(unit.r) == 5
+    assert unit.r.first() == pytest.approx(1.75)
+    assert unit.r.last() == pytest.approx(2.1)
+    assert isinstance(unit.dTdr, pyo.Expression)
+    assert not hasattr(unit, "extra_at_inner_wall_eqn")
+    assert not hasattr(unit, "extra_at_outer_wall_eqn")
+    # Same degrees of freedom as the finite difference model
+    assert degrees_of_freedom(m) == 25
+
+    # Mean temperature of a linear profile across the wall
+    for t in m.fs.time:
+        for x in unit.tube.length_domain:
+            for r in unit.r:
+                unit.tube_wall_temperature[t, x, r].value = 700 + 20*r
+    ri, ro = 1.75, 2.1
+    mean = 700 + 20*2/3*(ro**3 - ri**3)/(ro**2 - ri**2)
+    assert pyo.value(unit.mean_temperature[0, 0]) == pytest.approx(mean)
+
+
 @pytest.mark.skipif(not iapws95.iapws95_available(),
                     reason="IAPWS not available")
 @pytest.mark.skipif(solver is None, reason="Solver not available")
@@ -38,10 +38,11 @@ from idaes.core.util.config import is_physical_parameter_block
 from idaes.core.util.constants import Constants as const
 import idaes.core.util.scaling as iscale
 import idaes.logger as idaeslog
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 # Additional import for the unit operation
-from pyomo.environ import SolverFactory, value, Var, Reference
+from pyomo.environ import value, Var, Reference
 
 __author__ = "Boiler Subsystem Team (J. Ma, M. Zamarripa)"
 __version__ = "2.0.0"
@@ -366,7 +367,7 @@ mixed phase not supported'''))
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         flags = blk.control_volume.initialize(
@@ -23,7 +23,7 @@ main equations:
 
 """
 # Import Pyomo libraries
-from pyomo.environ import SolverFactory, value, Var, Param, \
+from pyomo.environ import value, Var, Param, \
     asin, cos, sqrt, log10, PositiveReals, Reference, units as pyunits
 from pyomo.dae import DerivativeVar
 from pyomo.common.config import ConfigBlock, ConfigValue, In
@@ -45,6 +45,7 @@ import idaes.logger as idaeslog
 
 # Additional import for the unit operation
 from idaes.core.util.constants import Constants as const
+from idaes.core.util.solver_service import get_initialization_solver
 
 
 __author__ = "Boiler Subsystem Team (J. Ma, M. Zamarripa)"
@@ -979,7 +980,7 @@ constructed,
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
-        opt = SolverFactory(solver)
+        opt = get_initialization_solver(solver)
         opt.options = optarg
 
         flags = blk.control_volume.initialize(outlvl=outlvl+1,
@@ -7,7 +7,8 @@ __all__ = ['alamo', 'doalamo', 'getlabels', 'makelabs', 'addCustomFunctions',
            'almpywriter', 'almcvwriter', 'wrapwriter',
            'almplot', 'mapminmax', 'remapminmax', 
            'data', 'debug', 'deletefile', 'movefile', 'catfile', 
-           'copyfile', 'has_alamo', 'allcard', 'almlsq',
+           'copyfile', 'has_alamo', 'runalamo', 'workspace', 'loadmodule',
+           'alamo_map', 'alamo_outputs', 'alamo_folds', 'allcard', 'almlsq',
            'almlsqjac', 'almfeatmat',
            'ackley', 'branin', 'sixcamel', 'col']
 
@@ -24,7 +25,9 @@ from .mapminmax import mapminmax
 from .remapminmax import remapminmax
 from .shared import data, debug, initialize
 from .almplot import almplot
-from .multos import deletefile, movefile, catfile, copyfile, has_alamo
+from .multos import deletefile, movefile, catfile, copyfile, has_alamo, \
+    runalamo, workspace, loadmodule
+from .almparallel import alamo_map, alamo_outputs, alamo_folds
 from .examples import sixcamel, ackley, branin
 
 # Initializes all values to be used in the .alm file
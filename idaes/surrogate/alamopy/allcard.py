@@ -11,15 +11,18 @@
 # at the URL "https://github.com/IDAES/idaes-pse".
 ##############################################################################
 
-from importlib import reload
-cvalsim = None  # could cause problems
+import os
+
+from idaes.surrogate.alamopy.multos import loadmodule, workspace
+
+# file containing the generated model with free coefficients, f(X, B)
+_cvfile = "cvalsim.py"
 
 
 def allcard(xdata, zdata, xval, zval, **kwargs):
     # enumerate all model cardinalities via ccmiqp and 
     # use validation/cross-validaiton to determine 
     from idaes.surrogate import alamopy
-    from alamopy.writethis import writethis
     import numpy as np
     import math
     # import sympy
@@ -42,10 +45,11 @@ def allcard(xdata, zdata, xval, zval, **kwargs):
                   'monomialpower', 'multi2power', 'multi3power', 'ratiopower'])
     et = list(['multi2power', 'multi3power', 'ratiopower'])
     # datacc = {}
-    ins = list(['cvfold'])
-    for opt in ins:
-        if (opt in kwargs.keys()):
-            cvfold = kwargs['cvfold']
+    cvfold = kwargs.get('cvfold', 'loo')
+    for opt in ['sigma', 'xlabels', 'zlabels', 'almname', 'xmax', 'xmin']:
+        kwargs.setdefault(opt, None)
+    kwargs.setdefault('expandoutput', False)
+    kwargs.setdefault('savescratch', False)
     ntrans = 0
     ndata = np.shape(xdata)[0]
     ninputs = np.shape(xdata)[1]
@@ -67,6 +71,7 @@ def allcard(xdata, zdata, xval, zval, **kwargs):
     startt = time.time()
     oldres = {}
     oldp = ()
+    oldsrc = None
     ntrans = min(ntrans, 1000)
 
     # split training and validationd ata before looping through cc
@@ -79,7 +84,7 @@ def allcard(xdata, zdata, xval, zval, **kwargs):
             temp = [x for x in range(ndata) if x != i]
             tlist.append(np.asarray(temp))
     else:
-        temp = range(ndata)
+        temp = list(range(ndata))
         shuffle(temp)
         # tlist = np.asarray(temp)
         if (cvfold == 'valset'):
@@ -89,7 +94,7 @@ def allcard(xdata, zdata, xval, zval, **kwargs):
             vlist = np.array_split(np.asarray(temp), int(cvfold))
             tlist = [1] * int(cvfold)
             for v in range(len(vlist)):
-                tlist[v] = range(ndata)
+                tlist[v] = list(range(ndata))
                 for this in vlist[v]:
                     tlist[v].remove(this)
 
@@ -101,68 +106,44 @@ def allcard(xdata, zdata, xval, zval, **kwargs):
         #     pass
 
         # res = alamopy.doalamo(xdata,zdata,kwargs.values())
+        fitopts = dict(linfcns=kwargs['linfcns'],
+                       expfcns=kwargs['expfcns'],
+                       logfcns=kwargs['logfcns'],
+                       sinfcns=kwargs['sinfcns'],
+                       cosfcns=kwargs['cosfcns'],
+                       monomialpower=kwargs['monomialpower'],
+                       multi2power=kwargs['multi2power'],
+                       multi3power=kwargs['multi3power'],
+                       ratiopower=kwargs['ratiopower'],
+                       sigma=kwargs['sigma'],
+                       xlabels=kwargs['xlabels'],
+                       zlabels=kwargs['zlabels'],
+                       modeler=6, convpen=0, maxterms=ccon,
+                       almname=kwargs['almname'],
+                       expandoutput=kwargs['expandoutput'],
+                       xmax=kwargs['xmax'], xmin=kwargs['xmin'],
+                       savescratch=kwargs['savescratch'])
         if (cvfold != 'valset'):
-            res = alamopy.doalamo(xdata, zdata, xval=xval, zval=zval,  
-                                  linfcns=kwargs['linfcns'],  
-                                  expfcns=kwargs['expfcns'],  
-                                  logfcns=kwargs['logfcns'],  
-                                  sinfcns=kwargs['sinfcns'],  
-                                  cosfcns=kwargs['cosfcns'], 
-                                  monomialpower=kwargs['monomialpower'], 
-                                  multi2power=kwargs['multi2power'],  
-                                  multi3power=kwargs['multi3power'], 
-                                  ratiopower=kwargs['ratiopower'], 
-                                  sigma=kwargs['sigma'], 
-                                  xlabels=kwargs['xlabels'], 
-                                  zlabels=kwargs['zlabels'], 
-                                  modeler=6, convpen=0, maxterms=ccon, 
-                                  almname=kwargs['almname'], 
-                                  expandoutput=kwargs['expandoutput'], 
-                                  xmax=kwargs['xmax'], xmin=kwargs['xmin'], 
-                                  savescratch=kwargs['savescratch'])
+            res, cvsim, almsim, almsrc, zname = _fitcard(
+                xdata, zdata, xval, zval, fitopts)
         else:
-            res = alamopy.doalamo(xdata[tlist, :], zdata[tlist], 
-                                  xval=xdata[vlist, :], zval=zdata[vlist], 
-                                  linfcns=kwargs['linfcns'], 
-                                  expfcns=kwargs['expfcns'], 
-                                  logfcns=kwargs['logfcns'], 
-                                  sinfcns=kwargs['sinfcns'], 
-                                  cosfcns=kwargs['cosfcns'], 
-                                  monomialpower=kwargs['monomialpower'], 
-                                  multi2power=kwargs['multi2power'], 
-                                  multi3power=kwargs['multi3power'], 
-                                  ratiopower=kwargs['ratiopower'], 
-                                  sigma=kwargs['sigma'], 
-                                  xlabels=kwargs['xlabels'], 
-                                  zlabels=kwargs['zlabels'], 
-                                  modeler=6, convpen=0, maxterms=ccon, 
-                                  almname=kwargs['almname'], 
-                                  expandoutput=kwargs['expandoutput'], 
-                                  xmax=kwargs['xmax'], xmin=kwargs['xmin'],
-                                  savescratch=kwargs['savescratch'])
-        for fn in ['cvalsim.py', 'cvalsim.pyc', 'almsim.py', 'almsim.pyc']:
-            try:
-                os.remove(fn)
-            except Exception:
-                pass
-        os.system('cp ' + kwargs['almname'].split('.')[0] + 'cv.py cvalsim.py')
-        os.system('cp ' + kwargs['almname'].split('.')[0] + 'alm.py almsim.py')
+            res, cvsim, almsim, almsrc, zname = _fitcard(
+                xdata[tlist, :], zdata[tlist], xdata[vlist, :], zdata[vlist],
+                fitopts)
 
         if (ccon == 1):
             if (ndata < 10):  # not enough data to do cross validation
-                writethis('Not enough data to facilitate cross validation')
+                sys.stdout.write('Not enough data to facilitate cross validation\n')
                 endt = time.time()
                 res['totaltime'] = endt - startt
                 return res
 
-        # import cvalsim
-        import almsim
-        xalm = alamopy.almfeatmat(xdata, ccon)
+        xalm = alamopy.almfeatmat(xdata, ccon, sim=cvsim)
         # Lets do the cross validatione error
         mseval = 0.0
         rmse = {}
         if (cvfold == 'valset'):
-            resid = np.sum((zdata[vlist] - almsim.f(xdata[vlist, :]))**2)
+            resid = np.sum((zdata[vlist] - almsim.f(*np.transpose(xdata[vlist, :])))**2)
             mseval = resid / float(len(vlist))
             params = 'ALM params used for valset'
             rmse = {}
@@ -203,13 +184,15 @@ def allcard(xdata, zdata, xval, zval, **kwargs):
                                  + str(ccon - 1) + '\n')
                 sys.stdout.write('    optimal coefficients are : ' 
                                  + str(oldp) + '\n')
-                os.remove(kwargs['almname'].split('.')[0] + 'alm.py')
-                os.system('cp ' + 'oldalmsim.sv ' + kwargs['almname'].split('.')[0] 
-                          + 'alm.py')
+                # leave the python model of the selected size behind
+                with open(zname, 'w') as f:
+                    f.write(oldsrc)
                 endt = time.time()
                 oldres['totaltime'] = endt - startt
                 return oldres
             elif (ccon == ntrans):
+                with open(zname, 'w') as f:
+                    f.write(almsrc)
                 endt = time.time()
                 sys.stdout.write('optimal model size is :' + str(ccon) + '\n')
                 res['totaltime'] = endt - startt
@@ -223,34 +206,44 @@ def allcard(xdata, zdata, xval, zval, **kwargs):
             oldres = res
             oldp = params
         # keep track of alm model of old iteratoin
-        try:
-            os.remove('oldalmsim.sv')
-        except Exception:
-            pass
-        os.system('mv almsim.py oldalmsim.sv')
+        oldsrc = almsrc
 
 
-def almlsq(params, *X):
-    # return lsq objective
-    # import numpy as np
-    try:
-        reload(cvalsim)
-    except Exception:
-        # import cvalsim
-        from cvalsim import f as sim
+def _fitcard(xdata, zdata, xval, zval, fitopts):
+    # Fit one cardinality in its own workspace. The generated models are
+    # loaded from there without being imported into sys.modules
+    from idaes.surrogate import alamopy
+
+    with workspace() as wpath:
+        res = alamopy.doalamo(xdata, zdata, xval=xval, zval=zval,
+                              cvfun=True, workspace=wpath, **fitopts)
+        cvname = alamopy.data['stropts']['almname'].split('.')[0] + 'cv.py'
+        zname = alamopy.data['labs']['savezlabels'][0] + '.py'
+        cvsim = loadmodule(os.path.join(wpath, cvname)).f
+        almsim = loadmodule(os.path.join(wpath, zname))
+        with open(os.path.join(wpath, zname)) as f:
+            almsrc = f.read()
+    return res, cvsim, almsim, almsrc, zname
 
-    xdata, zdata = X[0]    
+
+def _cvsim(sim):
+    # model with free coefficients, by default read from cvalsim.py
+    if sim is None:
+        sim = loadmodule(os.path.join(os.getcwd(), _cvfile)).f
+    return sim
+
+
+def almlsq(params, *X, sim=None):
+    # return lsq objective
+    sim = _cvsim(sim)
+    xdata, zdata = X[0]
     return sum((zdata - sim(xdata, params))**2)
 
 
-def almlsqjac(params, *X):
-    try:
-        reload(cvalsim)
-    except Exception:
-        # import cvalsim
-        from cvalsim import f as sim
+def almlsqjac(params, *X, sim=None):
     import numpy as np
 
+    sim = _cvsim(sim)
     xdata, zdata = X[0]
     rp = np.ones(len(params))
     for i in range(len(params)):
@@ -261,19 +254,17 @@ def almlsqjac(params, *X):
     # return np.dot(params,np.matmul(np.transpose(xdata),xdata))+np.matmul(zdata,xdata)
 
 
-def almfeatmat(X, nparams):
+def almfeatmat(X, nparams, sim=None):
+    # columns of the feature matrix are the model evaluated with one unit
+    # coefficient, generated models index inputs along the first axis
     import numpy as np
-    try:
-        reload(cvalsim)
-    except Exception:
-        # import cvalsim
-        from cvalsim import f as sim
 
+    sim = _cvsim(sim)
     dims = np.shape(X)
     fm = np.ones([dims[0], nparams])
     dparams = [0.0 for x in range(nparams)]
     for i in range(nparams):
         dparams[i] = 1.0
-        fm[:, i] = sim(X, dparams)
+        fm[:, i] = sim(np.transpose(X), dparams)
         dparams[i] = 0.0
     return fm
@@ -0,0 +1,139 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Run several ALAMO fits concurrently in worker processes.
+
+Each fit runs in its own process and its own temporary workspace, so fits
+neither share alamopy's option dictionaries nor the files ALAMO writes.
+"""
+import multiprocessing
+
+import numpy as np
+
+
+def _fitjob(job):
+    """
+    Run one fit in a worker process. Lambdified models cannot be pickled,
+    they are rebuilt from the model strings by the parent process.
+    """
+    from idaes.surrogate import alamopy
+
+    xdata, zdata, kwargs = job
+    kwargs = dict(kwargs)
+    kwargs["workspace"] = True
+    res = alamopy.alamo(xdata, zdata, **kwargs)
+    res = dict(res)
+    res.pop("f(model)", None)
+    return res, list(alamopy.data["labs"]["savexlabels"])
+
+
+def _rebuild(res, xlabels):
+    """
+    Recreate the callable models 'f(model)' from the model strings
+    """
+    from sympy.parsing.sympy_parser import parse_expr
+    from sympy import symbols, lambdify
+
+    def _f(model):
+        return lambdify(
+            [symbols(xlabels)],
+            parse_expr(model.split("=")[1].replace("^", "**")),
+            "numpy",
+        )
+
+    model = res.get("model", None)
+    if isinstance(model, dict):
+        res["f(model)"] = {k: _f(m) for k, m in model.items()}
+    elif model is not None:
+        res["f(model)"] = _f(model)
+    return res
+
+
+def alamo_map(jobs, nprocs=None):
+    """
+    Run independent ALAMO fits concurrently
+
+    Args:
+        jobs: list of (xdata, zdata, kwargs) tuples, kwargs are the keyword
+              arguments for alamo()
+        nprocs: number of worker processes, defaults to the number of CPUs
+
+    Returns:
+        list: alamo() results for each job, in order
+    """
+    # every fit gets a fresh worker so alamopy's module level options do not
+    # carry over from one fit to the next
+    with multiprocessing.Pool(processes=nprocs, maxtasksperchild=1) as pool:
+        out = pool.map(_fitjob, jobs, chunksize=1)
+    return [_rebuild(res, xlabels) for res, xlabels in out]
+
+
+def alamo_outputs(xdata, zdata, nprocs=None, **kwargs):
+    """
+    Fit a separate ALAMO model for each output concurrently
+
+    Args:
+        xdata: (numpy.array or list[real]) input data
+        zdata: (numpy.array or list[real]) output data, one column per output
+        nprocs: number of worker processes, defaults to the number of CPUs
+        kwargs: keyword arguments for alamo(), applied to every output
+
+    Returns:
+        dict: alamo() results keyed by output label
+    """
+    zdata = np.asarray(zdata)
+    if zdata.ndim == 1:
+        zdata = np.reshape(zdata, (len(zdata), 1))
+    zlabels = kwargs.pop("zlabels", None)
+    if zlabels is None:
+        zlabels = ["z" + str(i + 1) for i in range(zdata.shape[1])]
+    jobs = []
+    for i, lab in enumerate(zlabels):
+        jkwargs = dict(kwargs, zlabels=[lab])
+        if kwargs.get("zval", None) is not None:
+            jkwargs["zval"] = np.reshape(np.asarray(kwargs["zval"])[:, i], (-1, 1))
+        jobs.append((xdata, zdata[:, [i]], jkwargs))
+    return dict(zip(zlabels, alamo_map(jobs, nprocs=nprocs)))
+
+
+def alamo_folds(xdata, zdata, nfolds, nprocs=None, **kwargs):
+    """
+    Cross-validate an ALAMO model by fitting the folds concurrently
+
+    The data are split into nfolds contiguous folds, each fold is used once as
+    validation data for a model trained on the remaining data.
+
+    Args:
+        xdata: (numpy.array or list[real]) input data
+        zdata: (numpy.array or list[real]) output data
+        nfolds: number of folds
+        nprocs: number of worker processes, defaults to the number of CPUs
+        kwargs: keyword arguments for alamo()
+
+    Returns:
+        list: alamo() results for each fold, validation metrics are
+        reported under 'ssrval', 'R2val', 'rmseval' and 'madpval'
+    """
+    xdata = np.asarray(xdata)
+    zdata = np.asarray(zdata)
+    if nfolds > len(xdata):
+        raise ValueError(
+            "Number of cross validation folds exceeds the number of data "
+            "points %i" % len(xdata)
+        )
+    jobs = []
+    for fold in np.array_split(np.arange(len(xdata)), nfolds):
+        train = np.setdiff1d(np.arange(len(xdata)), fold)
+        jkwargs = dict(kwargs, xval=xdata[fold], zval=zdata[fold])
+        jobs.append((xdata[train], zdata[train], jkwargs))
+    return alamo_map(jobs, nprocs=nprocs)
@@ -10,10 +10,11 @@
 # license information, respectively. Both files are also available online
 # at the URL "https://github.com/IDAES/idaes-pse".
 ##############################################################################
+import os
 import re
 
 
-def almpywriter(data, debug):
+def almpywriter(data, debug, wdir=""):
     """
     This function writes the file
     - <almname>alm.py
@@ -22,12 +23,13 @@ def almpywriter(data, debug):
     """
     if data['opts']['noutputs'] > 1 or debug['expandoutput']:
         for output_name, mod_res in data['results']['model'].items():
-            almpywriter_help(data, mod_res, output_name)
+            almpywriter_help(data, mod_res, output_name, wdir)
     else:
-        almpywriter_help(data, data['results']['model'], data['labs']['savezlabels'][0])
+        almpywriter_help(data, data['results']['model'],
+                         data['labs']['savezlabels'][0], wdir)
 
 
-def almpywriter_help(data, mod_res, output_name):
+def almpywriter_help(data, mod_res, output_name, wdir=""):
     """
     This function writes the file
     - <almname>alm.py
@@ -44,7 +46,7 @@ def almpywriter_help(data, mod_res, output_name):
             model = model.replace(tok, 'np.' + tok)
     model = model.replace('^', '**')
 
-    with open(output_name + '.py', 'w') as r:
+    with open(os.path.join(wdir, output_name + '.py'), 'w') as r:
         r.write('import numpy as np\n')
         r.write('def f(*X):\n')
         i = 0
@@ -54,21 +56,22 @@ def almpywriter_help(data, mod_res, output_name):
         r.write('    return ' + model + '\n')
 
 
-def almcvwriter(data):
+def almcvwriter(data, wdir=""):
     """
     This function writes the file
     - <almname>alm.py
     y=<fname>.f(X)
     handle the multiple output
     """
-    if data['opts']['noutputs'] > 1:
+    if data['opts']['noutputs'] > 1 or isinstance(data['results']['model'], dict):
         for output_name, mod_res in data['results']['model'].items():
-            almcvwriter_help(data, mod_res, output_name)
+            almcvwriter_help(data, mod_res, output_name, wdir)
     else:
-        almcvwriter_help(data, data['results']['model'], data['labs']['savezlabels'][0])
+        almcvwriter_help(data, data['results']['model'],
+                         data['labs']['savezlabels'][0], wdir)
 
 
-def almcvwriter_help(data, mod_res, output_name):
+def almcvwriter_help(data, mod_res, output_name, wdir=""):
     """
     This function writes the file
     - <almname>cv.py
@@ -92,7 +95,8 @@ def almcvwriter_help(data, mod_res, output_name):
         model = model.replace('b', 'B[' + str(tind) + ']', 1)
         tstr = tstr + ',B' + str(tind)
         tind = tind + 1
-    with open(data['stropts']['almname'].split('.')[0] + 'cv.py', 'w') as r:
+    cvname = data['stropts']['almname'].split('.')[0] + 'cv.py'
+    with open(os.path.join(wdir, cvname), 'w') as r:
         line = 'def f(X, B):\n'
         r.write(line)
         r.write('    import numpy as np\n')
@@ -103,17 +107,17 @@ def almcvwriter_help(data, mod_res, output_name):
         r.write('    return ' + model + '\n')
 
 
-def wrapwriter(sim):
+def wrapwriter(sim, wdir=""):
     """
     This subroutine writes a temporary python file that is used
-    to wrap python-based function that lack ALAMO's input/output.txt I/O
+    to wrap python-based function that lack ALAMO's input/output.txt I/O.
+    The file is written in the directory wdir, its name is returned.
     """
-    import os
     import inspect
 
     name = 'simwrapper'
     name = name + '.py'
-    with open(name, 'w') as r:
+    with open(os.path.join(wdir, name), 'w') as r:
         r.write("#!/usr/bin/python\n")
         r.write("def main():\n")
         r.write("    import " + inspect.getmodule(sim).__name__ + "\n")
@@ -142,5 +146,5 @@ def wrapwriter(sim):
         r.write("if __name__ == '__main__':\n")
         r.write("    main()\n")
 
-    os.chmod(name, 509)
+    os.chmod(os.path.join(wdir, name), 509)
     return name
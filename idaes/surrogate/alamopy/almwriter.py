@@ -11,12 +11,13 @@
 # at the URL "https://github.com/IDAES/idaes-pse".
 ##############################################################################
 
-from .multos import deletefile, movefile, catfile
+import os
+import shutil
 
 
-def almwriter(data, debug, vargs, kwargs):
+def almwriter(data, debug, vargs, kwargs, wdir=""):
     """
-    This function writes a .alm file for the given data
+    This function writes a .alm file for the given data in the directory wdir
     """
 
     xdata = vargs[0]
@@ -25,7 +26,8 @@ def almwriter(data, debug, vargs, kwargs):
         xvaldata = vargs[2]
         zvaldata = vargs[3]
 
-    with open(data['stropts']['almname'], 'w') as a:
+    almname = os.path.join(wdir, data['stropts']['almname'])
+    with open(almname, 'w') as a:
         for arg in data['opts'].keys():
             if arg == 'sigma' and data['opts'][arg] < 0 : 
                 continue
@@ -103,9 +105,7 @@ def almwriter(data, debug, vargs, kwargs):
                 temp = temp + '1 '
             a.write(temp)
 
-    # Append text file if specified
-    if ('almopt' in data['stropts'].keys()):
-        catfile('almtemp', str(data['stropts']['almname']),
-                str(data['stropts']['almopt']))
-        deletefile(str(data['stropts']['almname']))
-        movefile('almtemp ' + str(data['stropts']['almname']))
+        # Append text file if specified
+        if ('almopt' in data['stropts'].keys()):
+            with open(os.path.join(wdir, str(data['stropts']['almopt']))) as f:
+                shutil.copyfileobj(f, a)
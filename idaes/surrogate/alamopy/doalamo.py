@@ -17,10 +17,11 @@ import sys
 import collections
 import numpy as np
 import os
+import shutil
 
 from idaes.surrogate import alamopy
 from idaes.surrogate.alamopy import almerror
-from idaes.surrogate.alamopy.multos import deletefile, has_alamo
+from idaes.surrogate.alamopy.multos import deletefile, has_alamo, runalamo, workspace
 
 
 def doalamo(xdata, zdata, **kwargs):
@@ -68,6 +69,12 @@ def alamo(xdata, zdata, **kwargs):
                              direct access to the .alm (no current checks)
           -  loo           : leave one out evaluation
           -  lmo           : leave many out evaluation
+          -  workspace     : run ALAMO in a temporary directory (default True),
+                             only the files that are kept are copied back.
+                             A directory name runs ALAMO there instead and
+                             False runs it in the current directory. The
+                             working directory of the caller is not changed,
+                             concurrent fits run in separate processes.
 
     Returns:
         dict: An ALAMO model with the following keys
@@ -83,6 +90,58 @@ def alamo(xdata, zdata, **kwargs):
           -  'R2val'    : R2 on testing set if provided
 
     """
+    origin = os.getcwd()
+    wspace = kwargs.get("workspace", True)
+    if not wspace:
+        return _alamo(xdata, zdata, kwargs, "", origin)
+    if isinstance(wspace, str):
+        return _alamo(xdata, zdata, kwargs, wspace, origin)
+
+    status = {"ok": False}
+
+    def keep(path):
+        # copy back the files a run in the current directory would leave
+        if not (status["ok"] or alamopy.debug["savescratch"]):
+            return
+        skip = ["logscratch"]
+        if not alamopy.debug["saveopt"]:
+            skip.append(kwargs.get("almopt", None) or "almopt.txt")
+        for name in os.listdir(path):
+            if name not in skip and os.path.isfile(os.path.join(path, name)):
+                shutil.copy(os.path.join(path, name), os.path.join(origin, name))
+
+    with workspace(keep=keep) as wdir:
+        results = _alamo(xdata, zdata, kwargs, wdir, origin)
+        status["ok"] = True
+    return results
+
+
+def _alamo_env(origin, wdir):
+    """
+    Environment for the ALAMO process, python simulators written by
+    wrapwriter need to import modules from the calling directory
+    """
+    env = dict(os.environ)
+    paths = [origin, os.path.abspath(wdir)] + sys.path
+    if env.get("PYTHONPATH", None):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+def _alamo(xdata, zdata, kwargs, wdir, origin):
+    """
+    Run ALAMO, see alamo() for arguments
+
+    ALAMO runs with wdir as its working directory and all files are written
+    there, the working directory of the calling process is not changed.
+
+    Args:
+        kwargs: keyword arguments given to alamo()
+        wdir: directory for the .alm and result files, "" for the current one
+        origin: directory alamo() was called from, relative paths to user
+                files are resolved against it
+    """
     alamopy.initialize()
     data, debug = alamopy.data, alamopy.debug
 
@@ -95,11 +154,21 @@ def alamo(xdata, zdata, **kwargs):
     xdata, zdata, xvaldata, zvaldata = setupData(
         data, debug, xdata, zdata, vargs, kwargs
     )
-    manageArguments(xdata, zdata, data, debug, kwargs)
+    # ALAMO runs in wdir, user files are given relative to origin
+    kwargs = dict(kwargs)
+    sim = kwargs.get("simulator", None)
+    if isinstance(sim, str) and os.path.isfile(os.path.join(origin, sim)):
+        kwargs["simulator"] = os.path.abspath(os.path.join(origin, sim))
+    almloc = debug["almloc"]
+    if os.sep in almloc and not os.path.isabs(almloc):
+        almloc = os.path.abspath(os.path.join(origin, almloc))
+    env = _alamo_env(origin, wdir)
+
+    manageArguments(xdata, zdata, data, debug, kwargs, wdir)
 
     data["results"] = {}
 
-    writeCustomALAMOOptions(kwargs)  # New Custom Options MENGLE
+    writeCustomALAMOOptions(kwargs, wdir)  # New Custom Options MENGLE
 
     # Cross Validation
     if debug["loo"]:
@@ -120,20 +189,19 @@ def alamo(xdata, zdata, **kwargs):
             cvxdata = [x for y, x in enumerate(xdata) if y != i]
             cvzdata = [x for y, x in enumerate(zdata) if y != i]
             alamopy.almwriter(
-                data, debug, (cvxdata, cvzdata, [xdata[i][:]], [zdata[i][:]]), kwargs
+                data,
+                debug,
+                (cvxdata, cvzdata, [xdata[i][:]], [zdata[i][:]]),
+                kwargs,
+                wdir,
             )
 
             # Calling ALAMO
             if not debug["mock"]:
-                os.system(
-                    debug["almloc"]
-                    + " "
-                    + str(data["stropts"]["almname"])
-                    + " > logscratch"
-                )
+                runalamo(almloc, data["stropts"]["almname"], env=env, cwd=wdir)
 
             data["results"] = {}
-            readTraceFile([xdata[i][:], zdata[i][:]], data, debug)
+            readTraceFile([xdata[i][:], zdata[i][:]], data, debug, wdir)
 
             if debug["outkeys"] or debug["expandoutput"]:
                 for k in data["results"]["R2"].keys():
@@ -145,7 +213,7 @@ def alamo(xdata, zdata, **kwargs):
                         q2[k] = q2sub
             else:
                 q2.append(float(data["results"]["R2val"]))
-            cleanFiles(data, debug)
+            cleanFiles(data, debug, wdir=wdir)
 
         if debug["outkeys"] or debug["expandoutput"]:
             data["results"]["Q2"] = {}
@@ -217,21 +285,16 @@ def alamo(xdata, zdata, **kwargs):
             data["opts"]["ndata"] = len(cvxdata)
 
             alamopy.almwriter(
-                data, debug, (cvxdata, cvzdata, cvvalxdata, cvvalzdata), kwargs
+                data, debug, (cvxdata, cvzdata, cvvalxdata, cvvalzdata), kwargs, wdir
             )
 
             # Calling ALAMO
             if not debug["mock"]:
-                os.system(
-                    debug["almloc"]
-                    + " "
-                    + str(data["stropts"]["almname"])
-                    + " > logscratch"
-                )
+                runalamo(almloc, data["stropts"]["almname"], env=env, cwd=wdir)
 
             data["results"] = {}
             expandOutput(xdata, zdata, [cvvalxdata, cvvalzdata], data, debug)
-            readTraceFile([cvvalxdata, cvvalzdata], data, debug)
+            readTraceFile([cvvalxdata, cvvalzdata], data, debug, wdir)
 
             if debug["outkeys"] or debug["expandoutput"]:
                 for k in data["results"]["R2"].keys():
@@ -243,7 +306,7 @@ def alamo(xdata, zdata, **kwargs):
                     q2[k] = q2sub
             else:
                 q2.append(float(data["results"]["R2val"]))
-            cleanFiles(data, debug)
+            cleanFiles(data, debug, wdir=wdir)
 
         if debug["outkeys"] or debug["expandoutput"]:
             data["results"]["Q2"] = {}
@@ -265,36 +328,35 @@ def alamo(xdata, zdata, **kwargs):
 
     # Write alamo file
     if debug["validation"]:
-        alamopy.almwriter(data, debug, (xdata, zdata, xvaldata, zvaldata), kwargs)
+        alamopy.almwriter(
+            data, debug, (xdata, zdata, xvaldata, zvaldata), kwargs, wdir
+        )
     else:
-        alamopy.almwriter(data, debug, (xdata, zdata), kwargs)
+        alamopy.almwriter(data, debug, (xdata, zdata), kwargs, wdir)
 
     # Call alamo from the terminal
     if not debug["mock"]:
         if debug["showalm"]:
-            os.system(debug["almloc"] + " " + str(data["stropts"]["almname"]))
-        else:
-            os.system(
-                debug["almloc"]
-                + " "
-                + str(data["stropts"]["almname"])
-                + " > logscratch"
+            runalamo(
+                almloc, data["stropts"]["almname"], logfile=None, env=env, cwd=wdir
             )
+        else:
+            runalamo(almloc, data["stropts"]["almname"], env=env, cwd=wdir)
 
     # Check to see if additional data was sampled and add it
     if kwargs.get("simulator", None) is not None:
-        xdata, zdata = checkForSampledData(data, debug)
+        xdata, zdata = checkForSampledData(data, debug, wdir)
 
     # calculate additional statistics
     expandOutput(xdata, zdata, vargs, data, debug)
 
     # Open the trace file and pull appropriate results
-    readTraceFile(vargs, data, debug)
+    readTraceFile(vargs, data, debug, wdir)
 
     # write python file of regressed model
-    alamopy.almpywriter(data, debug)
+    alamopy.almpywriter(data, debug, wdir)
     if debug["cvfun"]:
-        alamopy.almcvwriter(data)
+        alamopy.almcvwriter(data, wdir)
 
     # add <>alm.py to results dict
     data["results"]["pymodel"] = data["stropts"]["almname"].split(".")[0] + "alm"
@@ -349,7 +411,7 @@ def alamo(xdata, zdata, **kwargs):
                     % (diff, Q2, R2)
                 )
 
-    cleanFiles(data, debug, pywrite=True, **kwargs)
+    cleanFiles(data, debug, pywrite=True, wdir=wdir, **kwargs)
 
     return data["results"]
 
@@ -689,7 +751,7 @@ def clearCustomFunctions():
     custom_fxn_list = []
 
 
-def writeCustomALAMOOptions(kwargs):
+def writeCustomALAMOOptions(kwargs, wdir=""):
     global custom_fxn_list, surface_constraint_list, extrapxmax, extrapxmin, \
         group_list, basis_constraint_list
     name = "almopt.txt"
@@ -697,7 +759,7 @@ def writeCustomALAMOOptions(kwargs):
     if kwargs.get('almopt', None)  is not None:
         name = kwargs["almopt"]
 
-    with open(name, "w") as r:
+    with open(os.path.join(wdir, name), "w") as r:
         if len(custom_fxn_list) > 0:
             r.write("\nNCUSTOMBAS %d\n" % len(custom_fxn_list))
             r.write("BEGIN_CUSTOMBAS\n")
@@ -736,7 +798,7 @@ def writeCustomALAMOOptions(kwargs):
 # Argument management
 
 
-def manageArguments(xdata, zdata, data, debug, kwargs):
+def manageArguments(xdata, zdata, data, debug, kwargs, wdir=""):
     """
     Parse additional input options
 
@@ -750,13 +812,15 @@ def manageArguments(xdata, zdata, data, debug, kwargs):
         data:  shared alamo data options
         debug: Additional options may be specified and will be applied
                 to the .alm
+        kwargs: keyword arguments
+        wdir: directory ALAMO runs in
     """
 
     parseKwargs(data, debug, kwargs)
 
     # Check to see if a simwrapper should be built
     if debug.get("simwrap", None) or kwargs.get("simulator", None) is not None:
-        buildSimWrapper(data, debug)
+        buildSimWrapper(data, debug, wdir)
 
     # Specific check to see if the labels of the response variables
     # should be used in the output dictionary
@@ -801,7 +865,7 @@ def parseKwargs(data, debug, kwargs):
                     almerror("p3")
 
 
-def buildSimWrapper(data, debug):
+def buildSimWrapper(data, debug, wdir=""):
     """
     Builds an executable simulator to sample for data 
 
@@ -809,6 +873,7 @@ def buildSimWrapper(data, debug):
         data: shared alamo data options
         debug: Additional options may be specified and will be applied
                 to the .alm
+        wdir: directory the simulator is written to
     """
 
     if not isinstance(data["stropts"]["simulator"], type("string")):
@@ -821,7 +886,9 @@ def buildSimWrapper(data, debug):
                 "OR must be a python function whose name"
                 "can be obtained via .__name__"
             )
-        data["stropts"]["simulator"] = alamopy.wrapwriter(data["stropts"]["simulator"])
+        data["stropts"]["simulator"] = alamopy.wrapwriter(
+            data["stropts"]["simulator"], wdir
+        )
         debug["simwrap"] = True
 
 
@@ -864,7 +931,7 @@ def constructXBounds(xdata, zdata, data, debug):
     data["set4"]["xmin"] = xmin
 
 
-def checkForSampledData(data, debug):
+def checkForSampledData(data, debug, wdir=""):
     """
     Check to see if data has been sampled and update ndata
 
@@ -872,10 +939,12 @@ def checkForSampledData(data, debug):
         data: shared alamo data options
         debug: Additional options may be specified 
                and will be applied to the .alm
+        wdir: directory ALAMO ran in
     """
 
-    lst_name = data["stropts"]["almname"].split(".")[0] + ".lst"
-    with open(lst_name) as infile, open("awkres", "w") as outfile:
+    lst_name = os.path.join(wdir, data["stropts"]["almname"].split(".")[0] + ".lst")
+    awkres = os.path.join(wdir, "awkres")
+    with open(lst_name) as infile, open(awkres, "w") as outfile:
         copy = False
         for line in infile:
             if "Errors on observed data points" in line.strip():
@@ -884,7 +953,7 @@ def checkForSampledData(data, debug):
                 copy = False
             elif copy:
                 outfile.write(line)
-    f = open("awkres")
+    f = open(awkres)
     lf = f.read()
     f.close()
     lf2 = lf.split("\n")
@@ -907,7 +976,7 @@ def checkForSampledData(data, debug):
             xdata[i][j] = float(lf3[j])
         for j in range(data["opts"]["noutputs"]):
             zdata[i][j] = float(lf3[data["opts"]["ninputs"] + j])
-    deletefile("awkres")
+    deletefile("awkres", wdir=wdir)
     return xdata, zdata
 
 
@@ -968,17 +1037,18 @@ def expandOutput(xdata, zdata, vargs, data, debug):
 # External File management
 
 
-def readTraceFile(vargs, data, debug):
+def readTraceFile(vargs, data, debug, wdir=""):
     """
     Read the alamo trace file to read in the model and metrics
 
     Args:
         data/debug: shared default options for .alm file
         vargs: Validation data
+        wdir: directory ALAMO ran in
     """
 
     trace_file = data["stropts"]["tracefname"]
-    trace_str = trace_file  # currentDirectory + "/" + trace_file
+    trace_str = os.path.join(wdir, trace_file)
     try:
         lf = open(trace_str).read()
     except (IOError, FileNotFoundError) as err:
@@ -986,7 +1056,7 @@ def readTraceFile(vargs, data, debug):
             _construct_mock(data)
             return
         else:
-            error_message = _diagnose_alamo_failure(trace_str, err)
+            error_message = _diagnose_alamo_failure(trace_str, err, wdir)
             raise almerror.AlamoError(error_message)
 
     try:
@@ -1139,39 +1209,41 @@ def readTraceFile(vargs, data, debug):
         ln = ln + 1
 
 
-def cleanFiles(data, debug, pywrite=False, **kwargs):
+def cleanFiles(data, debug, pywrite=False, wdir="", **kwargs):
     """
     Removes intermediate files
 
     Args:
         data/debug: shared default options for .alm file
         vargs: Validation data
+        wdir: directory ALAMO ran in
     """
 
     # Delete files
     if debug["mock"]:
         try:
-            deletefile("temp.alm")
+            deletefile("temp.alm", wdir=wdir)
             if pywrite:
                 for z in alamopy.data["zlabels"]:
-                    deletefile("%s.py" % z)
+                    deletefile("%s.py" % z, wdir=wdir)
             return
         except Exception:
             pass
 
     if not debug["savepyfcn"]:
         for z in alamopy.data["results"]["zlabels"]:
-            deletefile("%s.py" % z)
+            deletefile("%s.py" % z, wdir=wdir)
 
     if not debug["savescratch"]:
         deletefile(
             str(data["stropts"]["almname"])
             + " "
             + str(data["stropts"]["almname"]).split(".")[0]
-            + ".lst"
+            + ".lst",
+            wdir=wdir,
         )
     if not debug["savetrace"]:
-        deletefile(data["stropts"]["tracefname"])
+        deletefile(data["stropts"]["tracefname"], wdir=wdir)
     if not debug["saveopt"]:
         global custom_fxn_list, surface_constraint_list, extrapxmin, extrapxmax
         custom_fxn_list = []
@@ -1179,10 +1251,10 @@ def cleanFiles(data, debug, pywrite=False, **kwargs):
         extrapxmax = None
         extrapxmin = None
         if kwargs.get('almopt', None) is not None:
-            deletefile(kwargs["almopt"])
+            deletefile(kwargs["almopt"], wdir=wdir)
 
     if debug["simwrap"]:
-        deletefile("simwrapper.py")
+        deletefile("simwrapper.py", wdir=wdir)
 
 
 def _construct_mock(data):
@@ -1217,10 +1289,10 @@ def _construct_mock(data):
         data["results"]["madpval"] = 0
 
 
-def _diagnose_alamo_failure(trace_output, error):
+def _diagnose_alamo_failure(trace_output, error, wdir=""):
     error_message = None
     b_alamo = has_alamo()
-    lf_logscratch = open("logscratch").read()
+    lf_logscratch = open(os.path.join(wdir, "logscratch")).read()
     if not b_alamo:
         error_message = 'Alamo cannot be found. Please check Alamo is installed.'
     elif "termination code" in lf_logscratch:
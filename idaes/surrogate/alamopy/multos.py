@@ -13,66 +13,134 @@
 # These subroutines ensure compatibility across linux and windows operating systems
 
 
+import contextlib
+import glob
+import importlib.util
 import os
-import platform
+import shutil
 import subprocess
+import tempfile
 
 
-def deletefile(*fname):
+def _names(fname):
+    # Names may be given as separate arguments or space separated in one
+    for name in fname:
+        for n in str(name).split():
+            yield n
+
+
+def deletefile(*fname, wdir=None):
     """
-    Delete Files
+    Delete Files, in the directory wdir if given or else the current directory
     """
-    tos = platform.platform()
-    currentDirectory = os.getcwd()
-    if 'Windows' in tos:
-        for name in fname:
-            os.system("del %s/" % currentDirectory + name)
-    else:
-        for name in fname:
-            os.system("rm %s/" % currentDirectory + name)
+    root = glob.escape(os.getcwd() if wdir is None else wdir)
+    for name in _names(fname):
+        for path in glob.glob(os.path.join(root, name)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
 
 def movefile(*fname):
     """
     Moves files
     """
-    tos = platform.platform()
-    if 'Windows' in tos:
-        for name in fname:
-            os.system("move " + name)
-    else:
-        for name in fname:
-            os.system("mv " + name)
+    for name in fname:
+        src, dst = str(name).split()
+        shutil.move(src, dst)
 
 
 def copyfile(outf, inf):
     """
     Copies files
     """
-    tos = platform.platform()
-    if 'Windows' in tos:
-        os.system("copy " + inf + ' ' + outf)
-    else:
-        os.system("cp " + inf + ' ' + outf)
+    shutil.copyfile(inf, outf)
 
 
 def catfile(outf, *fname):
     """
     Concatenates files
     """
-    tos = platform.platform()
-    if 'Windows' in tos:
-        ostr = ''
-        for name in fname:
-            ostr += "echo " + name + ' >> ' + outf + ' & '
-        ostr = ostr[:-3]
-        os.system(ostr)
-    else:
-        ostr = 'cat '
+    with open(outf, "w") as out:
         for name in fname:
-            ostr += name + ' '
-        ostr += '> ' + outf
-        os.system(ostr)
+            with open(name) as f:
+                shutil.copyfileobj(f, out)
+
+
+def runalamo(almloc, almname, logfile="logscratch", env=None, cwd=None):
+    """
+    Run ALAMO on an .alm file
+
+    Args:
+        almloc: ALAMO executable
+        almname: name of the .alm file
+        logfile: file receiving ALAMO's output, or None to show it
+        env: environment for the ALAMO process
+        cwd: directory ALAMO runs in, the .alm and log file names are
+             relative to it. Defaults to the current directory.
+
+    Returns:
+        ALAMO return code
+    """
+    cmd = [almloc, str(almname)]
+    if logfile is None:
+        try:
+            return subprocess.run(cmd, env=env, cwd=cwd).returncode
+        except OSError as err:
+            print(err)
+            return 127
+    with open(os.path.join(cwd or "", logfile), "w") as log:
+        try:
+            return subprocess.run(
+                cmd, stdout=log, stderr=subprocess.STDOUT, env=env, cwd=cwd
+            ).returncode
+        except OSError as err:
+            # a missing executable is reported when the trace file is read
+            log.write(str(err) + "\n")
+            return 127
+
+
+@contextlib.contextmanager
+def workspace(keep=None):
+    """
+    Context manager creating a temporary directory for the enclosed code
+
+    The working directory is not changed, files are written to the yielded
+    path. The temporary directory is removed on exit.
+
+    Args:
+        keep: optional callable taking the workspace path, called on exit
+              (also when an exception is raised) to collect files to keep
+    """
+    path = tempfile.mkdtemp(prefix="alamopy_")
+    try:
+        yield path
+    finally:
+        try:
+            if keep is not None:
+                keep(path)
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def loadmodule(path, name=None):
+    """
+    Load a generated python file as a module without adding it to sys.modules
+
+    Args:
+        path: path to the python file
+        name: module name, defaults to the file name
+
+    Returns:
+        module
+    """
+    if name is None:
+        name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 
 def has_alamo():
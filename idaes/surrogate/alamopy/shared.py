@@ -58,7 +58,8 @@ data['pargs']['set4'] = list(['xmin', 'xmax', 'zmin', 'zmax'])
 debug['pargs'] = list(
     ['savescratch', 'savetrace', 'showalm', 'hardset', 'outkeys',
      'expandoutput', 'cvfun', 'almpath', 'gamspath',
-     'hardset', 'simwrap', 'loo', 'lmo', 'mock', 'saveopt', 'savegams', 'savepyfcn'])
+     'hardset', 'simwrap', 'loo', 'lmo', 'mock', 'saveopt', 'savegams', 'savepyfcn',
+     'workspace'])
 debug['savepyfcn'] = True
 debug['cvfun'] = False
 debug['savescratch'] = False
@@ -83,6 +84,7 @@ debug['lmo'] = -1
 debug['mock'] = False
 debug['saveopt'] = False  # MENGLE for custom constraints/functions
 debug['savegams'] = False
+debug['workspace'] = True  # run each fit in a temporary directory
 
 # Initialize trace and .alm names
 data['stropts']['tracefname'] = 'trace.trc'
@@ -132,7 +134,8 @@ def initialize():
     debug['pargs'] = list(
         ['savescratch', 'savetrace', 'showalm', 'hardset', 'outkeys',
          'expandoutput', 'cvfun', 'almpath', 'gamspath',
-         'hardset', 'simwrap', 'loo', 'lmo', 'mock', 'saveopt', 'savegams', 'savepyfcn'])
+         'hardset', 'simwrap', 'loo', 'lmo', 'mock', 'saveopt', 'savegams', 'savepyfcn',
+         'workspace'])
     debug['savepyfcn'] = True
     debug['cvfun'] = False
     debug['savescratch'] = False
@@ -157,6 +160,7 @@ def initialize():
     debug['mock'] = False
     debug['saveopt'] = False  # MENGLE for custom constraints/functions
     debug['savegams'] = False
+    debug['workspace'] = True  # run each fit in a temporary directory
 
     # Initialize trace and .alm names
     data['stropts']['tracefname'] = 'trace.trc'
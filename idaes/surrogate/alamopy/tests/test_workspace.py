@@ -0,0 +1,228 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for isolated ALAMO workspaces and concurrent fits, using a stub ALAMO
+executable that fits a linear model without a constant term.
+"""
+import copy
+import importlib
+import os
+import stat
+import sys
+
+import numpy as np
+import pytest
+
+from idaes.surrogate import alamopy
+
+_stub = '''#!{python}
+import sys
+import numpy as np
+from idaes.surrogate.alamopy.doalamo import readTraceFile  # noqa: F401
+
+header = (
+    "#filename, NINPUTS, NOUTPUTS, INITIALPOINTS, OUTPUT, SET, "
+    "INITIALIZER, SAMPLER, MODELER, BUILDER, GREEDYBUILD, "
+    "BACKSTEPPER, GREEDYBACK, REGULARIZER, SOLVEMIP, SSEOLR, SSE, "
+    "RMSE, R2, ModelSize, BIC, RIC, Cp, AICc, HQC, MSE, SSEp, MADp, "
+    "OLRTime, numOLRs, OLRoneCalls, OLRoneFails, OLRgsiCalls, OLRgsiFails, "
+    "OLRdgelCalls, OLRdgelFails, OLRclrCalls, OLRclrFails, OLRgmsCalls, "
+    "OLRgmsFails, CLRTime, numCLRs, MIPTime, NumMIPs, LassoTime, "
+    "Metric1Lasso, Metric2Lasso, LassoSuccess, LassoRed, nBasInitAct, "
+    "nBas, SimTime, SimData, TotData, NdataConv, OtherTime, NumIters, "
+    "IterConv, TimeConv, Step0Time, Step1Time, Step2Time, TotalTime, "
+    "AlamoStatus, AlamoVersion, Model"
+)
+almname = sys.argv[1]
+opts = {{}}
+blocks = {{"data": [], "valdata": []}}
+block = None
+for line in open(almname):
+    words = line.split()
+    if not words:
+        continue
+    if words[0] in ("begin_data", "begin_valdata"):
+        block = words[0][6:]
+    elif words[0] in ("end_data", "end_valdata"):
+        block = None
+    elif block is not None:
+        blocks[block].append([float(w) for w in words])
+    else:
+        opts[words[0]] = words[1:]
+nin = int(opts["ninputs"][0])
+nout = int(opts["noutputs"][0])
+nterms = min(nin, int(opts.get("maxterms", [nin])[0]))
+data = np.array(blocks["data"])
+X, Z = data[:, :nterms], data[:, nin:]
+coef = np.linalg.lstsq(X, Z, rcond=None)[0]
+keys = header.split(",")
+
+
+def row(i, x, z):
+    resid = z - x.dot(coef[:, i])
+    sse = float(np.sum(resid ** 2))
+    sst = float(np.sum((z - np.mean(z)) ** 2)) or 1.0
+    model = " " + opts["zlabels"][i] + " = " + " + ".join(
+        "%.10f * %s" % (coef[j, i], opts["xlabels"][j]) for j in range(nterms)
+    )
+    vals = dict.fromkeys(keys, " 0")
+    vals["#filename"] = almname
+    vals[" NINPUTS"] = " %d" % nin
+    vals[" SSE"] = " %g" % sse
+    vals[" RMSE"] = " %g" % np.sqrt(sse / len(z))
+    vals[" R2"] = " %g" % (1.0 - sse / sst)
+    vals[" ModelSize"] = " %d" % nterms
+    vals[" AlamoVersion"] = " stub"
+    vals[" Model"] = model
+    return ",".join(vals[k] for k in keys)
+
+
+with open(opts["tracefname"][0], "w") as trc:
+    trc.write(header + "\\n")
+    for i in range(nout):
+        trc.write(row(i, X, Z[:, i]) + "\\n")
+    if blocks["valdata"]:
+        val = np.array(blocks["valdata"])
+        for i in range(nout):
+            trc.write(row(i, val[:, :nterms], val[:, nin + i]) + "\\n")
+with open(almname.split(".")[0] + ".lst", "w") as lst:
+    lst.write("stub listing\\n")
+print("stub alamo done")
+'''
+
+
+@pytest.fixture
+def stub_alamo(tmpdir):
+    path = os.path.join(str(tmpdir), "stub_alamo")
+    with open(path, "w") as f:
+        f.write(_stub.format(python=sys.executable))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    # alamopy keeps options in module level dictionaries between calls
+    saved = copy.deepcopy(alamopy.debug), copy.deepcopy(alamopy.data)
+    alamopy.debug["almloc"] = path
+    workdir = tmpdir.mkdir("work")
+    with workdir.as_cwd():
+        yield str(workdir)
+    for d, old in zip([alamopy.debug, alamopy.data], saved):
+        d.clear()
+        d.update(old)
+
+
+def _data(ndata=12):
+    rng = np.random.RandomState(1)
+    x = rng.uniform(-1, 1, (ndata, 2))
+    z = np.column_stack([2.0 * x[:, 0] - x[:, 1], 0.5 * x[:, 0] + 3.0 * x[:, 1]])
+    return x, z
+
+
+@pytest.mark.unit
+def test_workspace_keeps_cwd(tmpdir):
+    with tmpdir.as_cwd():
+        with alamopy.workspace() as path:
+            assert os.getcwd() == str(tmpdir)
+            open(os.path.join(path, "scratch.txt"), "w").close()
+        assert os.getcwd() == str(tmpdir)
+        assert not os.path.exists(path)
+        assert os.listdir(str(tmpdir)) == []
+
+
+@pytest.mark.unit
+def test_loadmodule_does_not_import(tmpdir):
+    fname = os.path.join(str(tmpdir), "generated_model_xyz.py")
+    with open(fname, "w") as f:
+        f.write("def f(*X):\n    return 2 * X[0]\n")
+    mod = alamopy.loadmodule(fname)
+    assert mod.f(3.0) == 6.0
+    assert "generated_model_xyz" not in sys.modules
+
+
+@pytest.mark.unit
+def test_alamo_in_workspace(stub_alamo):
+    x, z = _data()
+    res = alamopy.alamo(x, z[:, 0], linfcns=1, expandoutput=True)
+    assert float(res["R2"]) == pytest.approx(1.0)
+    np.testing.assert_allclose(res["f(model)"]["z1"]([x[:, 0], x[:, 1]]), z[:, 0])
+    # only the python model is left behind in the calling directory
+    assert os.listdir(stub_alamo) == ["z1.py"]
+
+
+@pytest.mark.unit
+def test_alamo_runs_in_workspace_without_chdir(stub_alamo, monkeypatch):
+    # the package exports a function of the same name as the module
+    doalamo = importlib.import_module("idaes.surrogate.alamopy.doalamo")
+    calls = []
+
+    def runalamo(almloc, almname, **kwargs):
+        calls.append((os.getcwd(), kwargs["cwd"]))
+        return alamopy.runalamo(almloc, almname, **kwargs)
+
+    monkeypatch.setattr(doalamo, "runalamo", runalamo)
+    # a relative path to ALAMO is resolved without changing alamopy.debug
+    almloc = os.path.join(os.pardir, "stub_alamo")
+    alamopy.debug["almloc"] = almloc
+    x, z = _data()
+    alamopy.alamo(x, z[:, 0], linfcns=1, expandoutput=True)
+    assert len(calls) == 1
+    cwd, wdir = calls[0]
+    assert cwd == stub_alamo
+    assert os.path.dirname(wdir) != stub_alamo
+    assert os.getcwd() == stub_alamo
+    assert alamopy.debug["almloc"] == almloc
+
+
+@pytest.mark.unit
+def test_alamo_savescratch(stub_alamo):
+    x, z = _data()
+    alamopy.alamo(
+        x, z[:, 0], linfcns=1, expandoutput=True, savescratch=True, savetrace=True
+    )
+    files = os.listdir(stub_alamo)
+    assert "temp.alm" in files
+    assert "trace.trc" in files
+    assert "logscratch" not in files
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(sys.platform != "linux", reason="stub needs a posix shebang")
+def test_alamo_outputs_parallel(stub_alamo):
+    x, z = _data()
+    res = alamopy.alamo_outputs(
+        x, z, nprocs=2, linfcns=1, expandoutput=True, zlabels=["za", "zb"]
+    )
+    assert list(res.keys()) == ["za", "zb"]
+    for i, lab in enumerate(["za", "zb"]):
+        f = res[lab]["f(model)"][lab]
+        np.testing.assert_allclose(f([x[:, 0], x[:, 1]]), z[:, i])
+    assert sorted(os.listdir(stub_alamo)) == ["za.py", "zb.py"]
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(sys.platform != "linux", reason="stub needs a posix shebang")
+def test_alamo_folds_parallel(stub_alamo):
+    x, z = _data()
+    res = alamopy.alamo_folds(x, z[:, 0], 3, nprocs=3, linfcns=1, expandoutput=True)
+    assert len(res) == 3
+    for r in res:
+        assert float(r["R2val"]) == pytest.approx(1.0)
+
+
+@pytest.mark.unit
+def test_allcard_in_workspace(stub_alamo):
+    x, z = _data()
+    res = alamopy.allcard(
+        x, z[:, 0], None, None, linfcns=1, cvfold="loo", expandoutput=True
+    )
+    assert "totaltime" in res
+    assert "cvalsim" not in sys.modules
+    assert "z1" not in sys.modules
+    assert os.listdir(stub_alamo) == ["z1.py"]
@@ -0,0 +1,150 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Compact Pyomo expressions for kernel-based pysmo surrogates.
+
+The ``generate_expression`` methods of the RBF and kriging models build one
+term per training point, and each term recomputes the scaled distance of the
+inputs to its centre with a chain of Pyomo operators. For a model with m
+centres and n inputs the expression has O(m*n) nodes that are created one
+operator at a time, which makes large surrogates slow to build, write and
+differentiate.
+
+The weighted squared distance of the inputs x to centre i can be expanded as
+
+    sum_j t_j*(a_j*x_j + b_j - c_ij)**2 = q(x) + sum_j g_ij*x_j + k_i
+
+where q(x) = sum_j t_j*a_j**2*x_j**2 is the same for all centres. The functions
+in this module build each distance in one shot as a flat sum of O(n) terms
+with the coefficients computed in numpy. If a block is given, q(x) is added to
+it once as a variable with a defining constraint, so the kernel argument of
+every term is linear in the inputs and q.
+"""
+import numpy as np
+
+from pyomo.environ import Constraint, Var, exp
+from pyomo.core.expr.numeric_expr import (
+    SumExpression, MonomialTermExpression, ProductExpression, PowExpression)
+from pyomo.core.util import quicksum
+from pyomo.common.modeling import unique_component_name
+
+import idaes.logger as idaeslog
+from idaes.surrogate.pysmo.radial_basis_function import RadialBasisFunctions
+from idaes.surrogate.pysmo.kriging import KrigingModel
+
+_log = idaeslog.getLogger(__name__)
+
+# RBF basis functions of the squared distance that are smooth at the centres
+_COMPACT_BASES = ('gaussian', 'mq', 'imq')
+
+
+def _is_var_list(variable_list):
+    return all(getattr(v, 'is_variable_type', lambda: False)()
+               for v in variable_list)
+
+
+def _distance_terms(variable_list, x_min, x_max, centres, weights, block):
+    """
+    Return the squared weighted distances of the inputs to each centre as a
+    list of expressions, sharing the quadratic part.
+    """
+    x_min = np.asarray(x_min, dtype=float).reshape(-1)
+    scale = np.asarray(x_max, dtype=float).reshape(-1) - x_min
+    scale[scale == 0.0] = 1.0
+    a = 1.0/scale
+    b = -x_min/scale
+    t = np.asarray(weights, dtype=float).reshape(-1)
+    u = b[np.newaxis, :] - np.asarray(centres, dtype=float)
+    coefs = 2.0*t*a*u
+    consts = np.sum(t*u**2, axis=1)
+
+    quad_coefs = t*a**2
+    if block is not None:
+        name = unique_component_name(block, 'surrogate_sq_distance')
+        q = Var(initialize=0.0)
+        block.add_component(name, q)
+        block.add_component(name + '_eq', Constraint(expr=q == quicksum(
+            (float(c)*v**2 for c, v in zip(quad_coefs, variable_list)
+             if c != 0), linear=False)))
+        quad = lambda: [MonomialTermExpression((1.0, q))]
+    else:
+        # Expression nodes are not shared between terms, as some Pyomo
+        # tools (e.g. differentiate) assume the expression is a tree.
+        quad = lambda: [
+            ProductExpression((float(c), PowExpression((v, 2))))
+            for c, v in zip(quad_coefs, variable_list) if c != 0]
+    # The sums are created directly rather than one operator at a time.
+    # The NL writer does not accept LinearExpressions inside nonlinear
+    # expressions, so sums of monomial terms are used.
+    return [SumExpression(
+                [float(consts[i])] + quad() +
+                [MonomialTermExpression((float(c), v))
+                 for c, v in zip(coefs[i], variable_list) if c != 0])
+            for i in range(coefs.shape[0])]
+
+
+def generate_compact_expression(model, variable_list, block=None):
+    """
+    Return the Pyomo expression of a trained pysmo RBF or kriging model in a
+    compact form. The expression has the same value as the one returned by
+    the model's ``generate_expression`` method.
+
+    Models the compact form does not apply to (polynomial models, RBF models
+    with linear, cubic or spline bases, or inputs that are not variables) use
+    ``generate_expression``.
+
+    Args:
+        model: trained RadialBasisFunctions or KrigingModel
+        variable_list(list): input variables, in the order of the training
+            data columns
+        block: optional Pyomo block to which a variable for the shared
+            quadratic part of the distances and its defining constraint are
+            added
+
+    Returns:
+        Pyomo Expression
+    """
+    variable_list = list(variable_list)
+    if not _is_var_list(variable_list):
+        return model.generate_expression(variable_list)
+
+    if isinstance(model, KrigingModel) and model.optimal_p == 2:
+        dist = _distance_terms(
+            variable_list, model.x_data_min, model.x_data_max,
+            model.x_data_scaled, model.optimal_weights, block)
+        coefs = np.matmul(model.covariance_matrix_inverse,
+                          model.optimal_y_mu).reshape(-1)
+        return float(model.optimal_mean[0, 0]) + quicksum(
+            (float(w)*exp(-d) for w, d in zip(coefs, dist)), linear=False)
+
+    if isinstance(model, RadialBasisFunctions) and \
+            model.basis_function in _COMPACT_BASES:
+        dist = _distance_terms(
+            variable_list, model.x_data_min, model.x_data_max,
+            model.centres, np.ones(len(variable_list)), block)
+        s2 = float(model.sigma)**2
+        if model.basis_function == 'gaussian':
+            terms = (exp(-s2*d) for d in dist)
+        elif model.basis_function == 'mq':
+            terms = ((s2*d + 1)**0.5 for d in dist)
+        else:
+            terms = (1/(s2*d + 1)**0.5 for d in dist)
+        y_min = float(model.y_data_min[0])
+        y_range = float(model.y_data_max[0]) - y_min
+        return y_min + y_range*quicksum(
+            (float(w)*t for w, t in zip(model.weights.reshape(-1), terms)),
+            linear=False)
+
+    _log.debug('No compact expression for {}, using generate_expression'
+               .format(type(model).__name__))
+    return model.generate_expression(variable_list)
@@ -0,0 +1,256 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Batch training of pysmo surrogates for datasets with several outputs.
+
+Each output is trained with its own pysmo method (polynomial regression, radial
+basis functions or kriging) in a pool of worker processes. The input and
+output data are placed once in shared memory which the workers attach to when
+they start, so the dataset is not pickled for every output.
+"""
+from collections import OrderedDict
+import contextlib
+import ctypes
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from pyomo.environ import Param
+
+import idaes.logger as idaeslog
+from idaes.surrogate.pysmo.polynomial_regression import PolynomialRegression
+from idaes.surrogate.pysmo.radial_basis_function import RadialBasisFunctions
+from idaes.surrogate.pysmo.kriging import KrigingModel
+
+_log = idaeslog.getLogger(__name__)
+
+# Names accepted for each pysmo method in a method specification
+METHODS = {
+    'polynomial': PolynomialRegression,
+    'rbf': RadialBasisFunctions,
+    'kriging': KrigingModel,
+}
+
+# Shared data of a worker process, set by _init_worker
+_shared_data = None
+
+
+def _init_worker(raw, shape):
+    global _shared_data
+    _shared_data = np.frombuffer(raw, dtype=np.float64).reshape(shape)
+
+
+def _parse_method(spec):
+    # A spec is a method name or a (method name, keyword arguments) pair
+    if isinstance(spec, str):
+        name, kwargs = spec, {}
+    else:
+        name, kwargs = spec
+    name = name.lower()
+    if name not in METHODS:
+        raise ValueError(
+            'Unknown pysmo method "{}", must be one of {}.'.format(
+                name, ', '.join(METHODS)))
+    return name, dict(kwargs)
+
+
+def _fit(name, xy_data, kwargs, fname):
+    if name == 'polynomial':
+        model = PolynomialRegression(
+            xy_data, xy_data, fname=fname, overwrite=True, **kwargs)
+    else:
+        model = METHODS[name](xy_data, fname=fname, overwrite=True, **kwargs)
+    model.get_feature_vector()
+    model.training()
+    return model
+
+
+def _train_output(task):
+    # Train the surrogate of one output. The data is read from the shared
+    # array of the process and the trained model is returned to the parent.
+    column, n_inputs, labels, name, kwargs, fname, verbose = task
+    data = _shared_data
+    xy_data = pd.DataFrame(
+        np.column_stack((data[:, :n_inputs], data[:, column])),
+        columns=labels)
+    start = time.perf_counter()
+    if verbose:
+        model = _fit(name, xy_data, kwargs, fname)
+    else:
+        # The pysmo trainers report their progress with print
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = _fit(name, xy_data, kwargs, fname)
+    return model, time.perf_counter() - start
+
+
+class MultiOutputModel(object):
+    """
+    A set of trained pysmo surrogates sharing the same inputs, one for each
+    output, returned by ``train_multi_output``.
+
+    Attributes:
+        input_labels: list of input names
+        output_labels: list of output names
+        models: OrderedDict of the trained pysmo model of each output
+        training_times: OrderedDict of the training time (s) of each output
+    """
+
+    def __init__(self, input_labels, output_labels, models, training_times):
+        self.input_labels = list(input_labels)
+        self.output_labels = list(output_labels)
+        self.models = OrderedDict(zip(output_labels, models))
+        self.training_times = OrderedDict(zip(output_labels, training_times))
+
+    def get_feature_vector(self):
+        """
+        The ``get_feature_vector`` method generates the list of input features
+        from the input labels.
+
+        Returns:
+            Pyomo IndexedParam  : An indexed parameter list of the inputs
+        """
+        p = Param(self.input_labels, mutable=True, initialize=0)
+        p.index_set().construct()
+        p.construct()
+        self.feature_list = p
+        return p
+
+    def generate_expression(self, variable_list):
+        """
+        The ``generate_expression`` method returns the Pyomo expressions of all
+        outputs.
+
+        Args:
+            variable_list(list) : List of input variables, in the order of the
+                input labels
+
+        Returns:
+            OrderedDict : Pyomo expression of each output keyed by output label
+        """
+        return OrderedDict(
+            (label, model.generate_expression(variable_list))
+            for label, model in self.models.items())
+
+    def predict_output(self, x_data):
+        """
+        The ``predict_output`` method predicts all outputs for input data
+        x_data.
+
+        Args:
+            x_data(NumPy Array) : Designs for which the outputs are predicted
+
+        Returns:
+            NumPy Array : Predictions with one column per output
+        """
+        x_data = np.asarray(x_data, dtype=float)
+        return np.column_stack([
+            np.asarray(model.predict_output(x_data)).reshape(-1)
+            for model in self.models.values()])
+
+
+def train_multi_output(x_data, y_data, methods, n_workers=None,
+                       verbose=False):
+    """
+    Train a pysmo surrogate for each output of a dataset.
+
+    Args:
+        x_data(NumPy Array or Pandas Dataframe) : Input data, one column per
+            input
+        y_data(NumPy Array or Pandas Dataframe) : Output data, one column per
+            output
+        methods : method specification for all outputs, or a dict of method
+            specifications keyed by output label. A method specification is
+            the name of the method ('polynomial', 'rbf' or 'kriging') or a
+            tuple of the name and a dict of keyword arguments for the pysmo
+            class, e.g. ('polynomial', {'maximum_polynomial_order': 3}).
+        n_workers(int) : number of worker processes, defaults to the number
+            of CPUs. If 1, outputs are trained in this process.
+        verbose(bool) : if True, show the progress output of the pysmo
+            classes
+
+    Returns:
+        MultiOutputModel : the trained surrogates
+    """
+    if isinstance(x_data, pd.DataFrame):
+        input_labels = list(x_data.columns)
+    else:
+        x_data = np.asarray(x_data, dtype=float)
+        if x_data.ndim == 1:
+            x_data = x_data.reshape(-1, 1)
+        input_labels = list(range(x_data.shape[1]))
+    if isinstance(y_data, pd.DataFrame):
+        output_labels = list(y_data.columns)
+    else:
+        y_data = np.asarray(y_data, dtype=float)
+        if y_data.ndim == 1:
+            y_data = y_data.reshape(-1, 1)
+        output_labels = ['y{}'.format(i) for i in range(y_data.shape[1])]
+    x_data = np.asarray(x_data, dtype=float)
+    y_data = np.asarray(y_data, dtype=float)
+    if x_data.shape[0] != y_data.shape[0]:
+        raise ValueError('x_data and y_data must have the same number of rows.')
+    if len(set(input_labels).intersection(output_labels)) > 0:
+        raise ValueError('Input and output labels must be different.')
+
+    if isinstance(methods, dict):
+        missing = [o for o in output_labels if o not in methods]
+        if missing:
+            raise ValueError(
+                'No method given for outputs {}.'.format(missing))
+        specs = [_parse_method(methods[o]) for o in output_labels]
+    else:
+        specs = [_parse_method(methods)] * len(output_labels)
+
+    n_inputs = x_data.shape[1]
+    shape = (x_data.shape[0], n_inputs + y_data.shape[1])
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, len(output_labels)))
+
+    # Each trainer saves its results to a pickle file, these are kept apart
+    # in a temporary directory so the workers do not overwrite each other.
+    tmpdir = tempfile.mkdtemp(prefix='pysmo_')
+    tasks = [
+        (n_inputs + k, n_inputs, input_labels + [label], name, kwargs,
+         os.path.join(tmpdir, 'output_{}.pickle'.format(k)), verbose)
+        for k, (label, (name, kwargs)) in enumerate(
+            zip(output_labels, specs))]
+    _log.info('Training surrogates of {} outputs with {} worker(s)'.format(
+        len(tasks), n_workers))
+    start = time.perf_counter()
+    try:
+        raw = multiprocessing.RawArray(ctypes.c_double, shape[0]*shape[1])
+        data = np.frombuffer(raw, dtype=np.float64).reshape(shape)
+        data[:, :n_inputs] = x_data
+        data[:, n_inputs:] = y_data
+        if n_workers == 1:
+            _init_worker(raw, shape)
+            results = [_train_output(task) for task in tasks]
+        else:
+            with multiprocessing.Pool(n_workers, initializer=_init_worker,
+                                      initargs=(raw, shape)) as pool:
+                results = pool.map(_train_output, tasks, chunksize=1)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    _log.info('Trained surrogates of {} outputs in {:.3g} s'.format(
+        len(tasks), time.perf_counter() - start))
+
+    models, times = zip(*results)
+    for label, t in zip(output_labels, times):
+        _log.debug('Trained surrogate of {} in {:.3g} s'.format(label, t))
+    return MultiOutputModel(input_labels, output_labels, models, times)
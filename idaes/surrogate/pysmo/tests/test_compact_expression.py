@@ -0,0 +1,143 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+import contextlib
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from pyomo.environ import ConcreteModel, Var, Constraint, Objective, value
+from pyomo.core.expr.calculus.derivatives import differentiate
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
+
+from idaes.surrogate.pysmo.compact_expression import \
+    generate_compact_expression
+from idaes.surrogate.pysmo.radial_basis_function import RadialBasisFunctions
+from idaes.surrogate.pysmo.kriging import KrigingModel
+
+
+def _xy_data(n=5):
+    x1, x2 = np.meshgrid(np.linspace(0, 1, n), np.linspace(1, 3, n))
+    x1, x2 = x1.ravel(), x2.ravel()
+    return pd.DataFrame({'x1': x1, 'x2': x2,
+                         'y': np.sin(3*x1) + x2**2})
+
+
+def _train(cls, fname, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = cls(_xy_data(), fname=fname, overwrite=True, **kwargs)
+        model.get_feature_vector()
+        model.training()
+    return model
+
+
+def _model():
+    m = ConcreteModel()
+    m.x = Var(['x1', 'x2'], initialize=1.0)
+    return m
+
+
+@pytest.mark.component
+@pytest.mark.parametrize("cls,kwargs", [
+    (KrigingModel, {}),
+    (RadialBasisFunctions, {'basis_function': 'gaussian',
+                            'solution_method': 'algebraic'}),
+    (RadialBasisFunctions, {'basis_function': 'mq',
+                            'solution_method': 'algebraic'}),
+    (RadialBasisFunctions, {'basis_function': 'imq',
+                            'solution_method': 'algebraic'}),
+    (RadialBasisFunctions, {'basis_function': 'cubic',
+                            'solution_method': 'algebraic'})])
+@pytest.mark.parametrize("use_block", [False, True])
+def test_compact_expression_values(cls, kwargs, use_block, tmpdir):
+    surr = _train(cls, os.path.join(str(tmpdir), 'sol.pickle'), **kwargs)
+    m = _model()
+    expr = surr.generate_expression([m.x['x1'], m.x['x2']])
+    compact = generate_compact_expression(
+        surr, [m.x['x1'], m.x['x2']], block=m if use_block else None)
+    for x1, x2 in [(0.3, 2.2), (0.0, 1.0), (0.77, 2.9)]:
+        m.x['x1'].value = x1
+        m.x['x2'].value = x2
+        if use_block and hasattr(m, 'surrogate_sq_distance'):
+            calculate_variable_from_constraint(
+                m.surrogate_sq_distance, m.surrogate_sq_distance_eq)
+        assert value(compact) == pytest.approx(value(expr), rel=1e-8)
+        # The standard expression of RBF models has no derivative at the
+        # centres, (0, 1) is a centre
+        if use_block or (x1, x2) == (0.0, 1.0):
+            continue
+        for v in m.x.values():
+            assert value(differentiate(compact, wrt=v)) == \
+                pytest.approx(value(differentiate(expr, wrt=v)),
+                              rel=1e-6, abs=1e-8)
+
+
+@pytest.mark.unit
+def test_compact_expression_params(tmpdir):
+    surr = _train(KrigingModel, os.path.join(str(tmpdir), 'sol.pickle'))
+    p = surr.get_feature_vector()
+    # Params are not variables, so the standard expression is used
+    expr = generate_compact_expression(surr, [p['x1'], p['x2']])
+    assert value(expr) == pytest.approx(
+        surr.predict_output(np.array([[0.0, 0.0]]))[0, 0], rel=1e-6)
+
+
+def _large_rbf(n_centres, n_inputs=4):
+    rng = np.random.RandomState(42)
+    data = rng.rand(n_centres, n_inputs + 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        surr = RadialBasisFunctions(
+            data, basis_function='gaussian', solution_method='algebraic',
+            fname='unused.pickle')
+    # Set the results of training directly, training is not timed here
+    surr.weights = rng.randn(n_centres, 1)
+    surr.sigma = 2.0
+    surr.x_data_min = surr.data_min[:, :-1]
+    surr.x_data_max = surr.data_max[:, :-1]
+    surr.y_data_min = surr.data_min[:, -1]
+    surr.y_data_max = surr.data_max[:, -1]
+    return surr
+
+
+def _build_and_write(surr, compact, fname):
+    m = ConcreteModel()
+    m.x = Var(range(surr.centres.shape[1]), initialize=0.5, bounds=(0, 1))
+    start = time.perf_counter()
+    xs = [m.x[j] for j in m.x]
+    if compact:
+        expr = generate_compact_expression(surr, xs, block=m)
+    else:
+        expr = surr.generate_expression(xs)
+    m.obj = Objective(expr=expr)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    m.write(fname, io_options={'symbolic_solver_labels': False})
+    write = time.perf_counter() - start
+    return build, write, os.path.getsize(fname)
+
+
+@pytest.mark.benchmark
+@pytest.mark.integration
+def test_compact_expression_benchmark(tmpdir):
+    surr = _large_rbf(2000)
+    fname = os.path.join(str(tmpdir), 'rbf.nl')
+    b0, w0, s0 = _build_and_write(surr, False, fname)
+    b1, w1, s1 = _build_and_write(surr, True, fname)
+    print('\nRBF with 2000 centres: build {:.3f} s -> {:.3f} s, NL write '
+          '{:.3f} s -> {:.3f} s, NL size {} -> {} bytes'.format(
+              b0, b1, w0, w1, s0, s1))
+    assert b1 < b0
+    assert w1 < w0
+    assert s1 < s0
@@ -0,0 +1,91 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+import numpy as np
+import pandas as pd
+import pytest
+from pyomo.environ import ConcreteModel, Var, value
+
+from idaes.surrogate.pysmo.multi_output import (
+    train_multi_output, MultiOutputModel)
+from idaes.surrogate.pysmo.polynomial_regression import PolynomialRegression
+from idaes.surrogate.pysmo.radial_basis_function import RadialBasisFunctions
+from idaes.surrogate.pysmo.kriging import KrigingModel
+
+
+def _data():
+    x1, x2 = np.meshgrid(np.linspace(0, 1, 6), np.linspace(1, 2, 6))
+    x = pd.DataFrame({'x1': x1.ravel(), 'x2': x2.ravel()})
+    y = pd.DataFrame({
+        'quad': 1 + 2*x['x1'] + x['x2']**2,
+        'lin': 3*x['x1'] - x['x2'],
+        'exp': np.exp(-x['x1']*x['x2'])})
+    return x, y
+
+
+METHODS = {
+    'quad': ('polynomial', {'maximum_polynomial_order': 2,
+                            'solution_method': 'mle',
+                            'multinomials': 0}),
+    'lin': ('rbf', {'basis_function': 'linear',
+                    'solution_method': 'algebraic'}),
+    'exp': ('kriging', {'numerical_gradients': True}),
+}
+
+
+@pytest.mark.unit
+def test_method_errors():
+    x, y = _data()
+    with pytest.raises(ValueError):
+        train_multi_output(x, y, 'neural_net')
+    with pytest.raises(ValueError):
+        train_multi_output(x, y, {'quad': 'rbf'})
+    with pytest.raises(ValueError):
+        train_multi_output(x, y.iloc[:10], 'rbf')
+
+
+@pytest.mark.component
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_train_multi_output(n_workers, tmpdir):
+    x, y = _data()
+    with tmpdir.as_cwd():
+        res = train_multi_output(x, y, METHODS, n_workers=n_workers)
+        # trainers do not leave pickle files in the working directory
+        assert tmpdir.listdir() == []
+    assert isinstance(res, MultiOutputModel)
+    assert res.input_labels == ['x1', 'x2']
+    assert res.output_labels == ['quad', 'lin', 'exp']
+    assert isinstance(res.models['quad'], PolynomialRegression)
+    assert isinstance(res.models['lin'], RadialBasisFunctions)
+    assert isinstance(res.models['exp'], KrigingModel)
+    assert all(t > 0 for t in res.training_times.values())
+
+    x_test = np.array([[0.25, 1.5], [0.5, 1.2]])
+    pred = res.predict_output(x_test)
+    assert pred.shape == (2, 3)
+    for k, model in enumerate(res.models.values()):
+        np.testing.assert_allclose(
+            pred[:, k], model.predict_output(x_test).reshape(-1))
+    np.testing.assert_allclose(
+        pred[:, 0], 1 + 2*x_test[:, 0] + x_test[:, 1]**2, rtol=1e-6)
+
+    m = ConcreteModel()
+    m.x = Var(['x1', 'x2'])
+    exprs = res.generate_expression([m.x['x1'], m.x['x2']])
+    assert list(exprs.keys()) == ['quad', 'lin', 'exp']
+    m.x['x1'] = 0.25
+    m.x['x2'] = 1.5
+    for k, expr in enumerate(exprs.values()):
+        assert value(expr) == pytest.approx(pred[0, k], rel=1e-6)
+
+    p = res.get_feature_vector()
+    assert list(p.keys()) == ['x1', 'x2']
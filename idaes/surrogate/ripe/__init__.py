@@ -34,14 +34,15 @@ __all__ = ["ripemodel", "ems", "rspace", "sharedata", "debug",
 
 from .main import ripemodel, ripewrite, print_results     # noqa: F401
 from .shared import rspace, sharedata, debug    # noqa: F401
-from .atermconstruct import makeaterm, formatinputs, checkargs, normalizefeatures     # noqa: F401
+from .atermconstruct import makeaterm, evalmech, formatinputs, checkargs, normalizefeatures     # noqa: F401
 from .kinforms import lin, linjac, arr, arrjac, refarr, refarrjac   # noqa: F401
 from .mechs import powerlawp5, powerlaw2, powerlaw3, powerlaw4, \
                    avrami2, avrami3, avrami4, avrami5, randomnuc, \
                    ptompkins, jander, antijander, valensi, \
                    parabolic, gb3d, zlt, grain, \
                    getmechs, massactm                            # noqa: F401
-from .genpyomo import ripeomo                         # noqa: F401
+from .genpyomo import ripeomo, buildripeomo, solveripeomo   # noqa: F401
+from .selection import bicsweep, CardinalitySolver    # noqa: F401
 from .targets import doalamo, dopwalamo, gentargets, sstargets, dynamictargets   # noqa: F401
 from .confinv import confinv                          # noqa: F401
 from .emsampling import constructmodel, ems                       # noqa: F401
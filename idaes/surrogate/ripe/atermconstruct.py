@@ -44,31 +44,27 @@ def makeaterm(data, stoich, rxn_mechs, kwargs, ncons, mechlist, fixarray, shared
     nh = len(stoich)
     aterm = np.zeros([ndata, ns, nm, nh])
 
-    # This section of code loops thorugh the aterm array
-    # Callling s_mech in order to determine numerical values
+    # Mechanisms are evaluated once per mechanism/stoichiometry pair over
+    # all observations; the species dimension is the outer product with the
+    # stoichiometric coefficients
     # mechanisms can be specified with variable stoichiometry
-    for i1 in range(ndata):
-        # index i1 over observations
-        for i2 in range(ns):
-            # index i2 over species
-            i3 = 0
-            # index i3 over mechanisms
-            for tempi in range(len(rxn_mechs)):
-                mechline = rxn_mechs[tempi]
-                for mspec in mechline[1]:
-                    for h_ind in list(mechline[0]):
-                        # final index over stoichiometries
-                        if mspec == "massact" or mechline[2]:
-                            s_mech = mechs.mechperstoich(mspec, stoich[h_ind])
-                        else:
-                            s_mech = mspec
-                        if "T" in kwargs.keys():
-                            inv = np.hstack((fdata[i1, :], pc["T"][i1][0]))
-                        else:
-                            inv = fdata[i1, :]
-                        atemp = stoich[h_ind][i2] * s_mech(*inv)
-                        aterm[i1, i2, i3, h_ind] = atemp
-                    i3 += 1
+    inv = [fdata[:, i2] for i2 in range(ns)]
+    if "T" in kwargs.keys():
+        inv.append(np.array([pc["T"][i1][0] for i1 in range(ndata)], dtype=float))
+    i3 = 0
+    # index i3 over mechanisms
+    for tempi in range(len(rxn_mechs)):
+        mechline = rxn_mechs[tempi]
+        for mspec in mechline[1]:
+            for h_ind in list(mechline[0]):
+                # final index over stoichiometries
+                if mspec == "massact" or mechline[2]:
+                    s_mech = mechs.mechperstoich(mspec, stoich[h_ind])
+                else:
+                    s_mech = mspec
+                mvals = evalmech(s_mech, inv, ndata)
+                aterm[:, :, i3, h_ind] = np.outer(mvals, stoich[h_ind])
+            i3 += 1
 
     # Scale data if specified
     if sharedata["ascale"]:
@@ -79,6 +75,38 @@ def makeaterm(data, stoich, rxn_mechs, kwargs, ncons, mechlist, fixarray, shared
     return [aterm, fdata, pc, data, scales]
 
 
+def evalmech(s_mech, inv, ndata):
+    # This subroutine evaluates a mechanism over every observation
+    # Inputs:
+    # s_mech   - mechanism function taking the RIPE standard input form
+    # inv      - list of data columns [x_1,...,x_ns,(T)], each of length ndata
+    # ndata    - number of observations
+    # Outputs:
+    # mvals    - mechanism values, array of length ndata
+
+    # Mechanisms in mechs.py accept whole columns; user-specified mechanisms
+    # may not, so the vectorized result is checked against a scalar call on
+    # the first observation before it is used. Scalar-only mechanisms fail on
+    # arrays with a TypeError (e.g. math.log, float()) or a ValueError (e.g.
+    # the truth value of an array in an if statement); other errors are
+    # raised to the user
+    with np.errstate(all="ignore"):
+        try:
+            mvals = np.asarray(s_mech(*inv), dtype=float)
+        except (TypeError, ValueError):
+            mvals = None
+    if mvals is not None and mvals.ndim == 0:
+        mvals = np.full(ndata, float(mvals))
+    if mvals is not None and np.shape(mvals) == (ndata,):
+        first = float(s_mech(*[col[0] for col in inv]))
+        if np.allclose(mvals[0], first, equal_nan=True):
+            return mvals
+    # fall back to evaluating observation by observation
+    return np.array(
+        [s_mech(*[col[i1] for col in inv]) for i1 in range(ndata)], dtype=float
+    )
+
+
 def formatinputs(data, kwargs):
     # This subroutine formats inputs supplied to ripemodel()
     # Inputs:
@@ -276,15 +304,7 @@ def normalizefeatures(aterm, fixarray):
     for k in range(nm):
         for l in range(nh):  # L
             if fixarray[l, k] == 1:
-                maxval = np.max(
-                    [x for x in np.ndarray.flatten(aterm[:, :, k, l])]
-                )  # if x > 0.0])
-                minval = np.min(
-                    [x for x in np.ndarray.flatten(aterm[:, :, k, l])]
-                )  # if x > 0.0])
-                n_factor[k, l] = np.max([np.abs(maxval), np.abs(minval)])
-                for i in range(nd):
-                    for j in range(ns):
-                        aterm[i, j, k, l] = aterm[i, j, k, l] / n_factor[k, l]
+                n_factor[k, l] = np.max(np.abs(aterm[:, :, k, l]))
+                aterm[:, :, k, l] = aterm[:, :, k, l] / n_factor[k, l]
     scale_dict["nfactor"] = n_factor
     return aterm, scale_dict
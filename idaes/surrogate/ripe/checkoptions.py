@@ -60,6 +60,8 @@ def checkoptions(kwargs, sharedata, debug):
             sharedata[key] = kwargs[key]
         elif key == "expand_output":
             sharedata[key] = kwargs[key]
+        elif key == "nworkers" or key == "cachedir":
+            sharedata[key] = kwargs[key]
         elif key == "time" or key == "t":
             kwargs["t"] = kwargs[key]
         elif (
@@ -25,6 +25,24 @@ def ripeomo(problem_data, ptype, fixarray, cc_int, task, pc, sharedata):
     # Outputs:
     # riperes       - dioctionary containing parameter estimates
 
+    model = buildripeomo(problem_data, ptype, fixarray, cc_int, pc, sharedata)
+    return solveripeomo(model, ptype, cc_int, task, pc, sharedata)
+
+
+def buildripeomo(problem_data, ptype, fixarray, cc_int, pc, sharedata):
+    # This subroutine constructs the RIPE MINLP without solving it
+    # The cardinality bound is a mutable parameter so the same model can be
+    # re-solved for different cardinalities by solveripeomo()
+    # Inputs:
+    # problem_data  - process data from ripemodel()
+    # ptype         - problem type, 'arr' for arrhenious models
+    # fixarray      - array denoting valid stoichiometry/mechanism pairings
+    # cc_int        - initial maximum cardinality
+    # pc            - process condition array from ripemodel()
+    # sharedata     - shared data dctionary
+    # Outputs:
+    # model         - pyomo model of the RIPE MINLP
+
     aterm, target, sigma, bounds = problem_data
     # import re
     import pyomo.environ as pyo
@@ -51,7 +69,6 @@ def ripeomo(problem_data, ptype, fixarray, cc_int, task, pc, sharedata):
         kub = [kub] * r
 
     # Initialize models
-    opt = pyo.SolverFactory("baron")
     model = pyo.ConcreteModel()
 
     # Set i over observations
@@ -333,18 +350,18 @@ def ripeomo(problem_data, ptype, fixarray, cc_int, task, pc, sharedata):
         model.mechcon = pyo.Constraint(model.h, rule=onemech)
 
     # Cardinality constraint
+    model.cc = pyo.Param(initialize=cc_int, mutable=True)
+
     def ccon(model):
-        return sum(sum(model.y[r, h] for h in model.h) for r in model.r) == cc_int
+        return sum(sum(model.y[r, h] for h in model.h) for r in model.r) == model.cc
 
     # relax equality constraint
     def ccon_relax(model):
-        return sum(sum(model.y[r, h] for h in model.h) for r in model.r) <= cc_int
+        return sum(sum(model.y[r, h] for h in model.h) for r in model.r) <= model.cc
 
-    # hard cardinality vs soft for task 1 vs 0
-    if task == 0:
-        model.cardcon = pyo.Constraint(rule=ccon_relax)
-    else:
-        model.cardcon = pyo.Constraint(rule=ccon)
+    # hard cardinality vs soft is selected in solveripeomo()
+    model.cardcon = pyo.Constraint(rule=ccon)
+    model.cardcon_relax = pyo.Constraint(rule=ccon_relax)
 
     # Fix array is used to fix binary variables of reactions/mechanisms that should not be considered
     nst, nm = np.shape(fixarray)
@@ -354,6 +371,40 @@ def ripeomo(problem_data, ptype, fixarray, cc_int, task, pc, sharedata):
                 model.y[j + 1, i + 1] = 0
                 model.y[j + 1, i + 1].fixed = True
 
+    return model
+
+
+def solveripeomo(model, ptype, cc_int, task, pc, sharedata, opt=None):
+    # This subroutine solves a model from buildripeomo() for one cardinality
+    # Variable values left by a previous solve are used as the starting point
+    # Inputs:
+    # model         - pyomo model from buildripeomo()
+    # ptype         - problem type, 'arr' for arrhenious models
+    # cc_int        - maximum cardinality
+    # task          - 0 for presolve, 1 for RIPE call
+    # pc            - process condition array from ripemodel()
+    # sharedata     - shared data dctionary
+    # opt           - solver to use, baron is used by default
+    # Outputs:
+    # riperes       - dioctionary containing parameter estimates
+
+    import pyomo.environ as pyo
+    import numpy as np
+
+    gasc = sharedata["gasconst"]
+    n = len(model.i)
+    if opt is None:
+        opt = pyo.SolverFactory("baron")
+
+    # hard cardinality vs soft for task 1 vs 0
+    model.cc = cc_int
+    if task == 0:
+        model.cardcon.deactivate()
+        model.cardcon_relax.activate()
+    else:
+        model.cardcon.activate()
+        model.cardcon_relax.deactivate()
+
     # initialize results dictionary
     riperes = {}
 
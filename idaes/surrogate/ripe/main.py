@@ -170,46 +170,15 @@ def ripemodel(data, **kwargs):
             ccon_list = range(1, 1 + np.min([nh, ns, int(np.floor((n - 1) / 2))]))
         else:
             ccon_list = range(1, 1 + np.min([nh, ns, int(n - 1)]))
-        bic = []
-        # Overwriting results variable here
-        d_results = dict.fromkeys([0] + list(ccon_list)) 
-        sys.stdout.write(
-            "   ---- Calculating null values for model selection ----    \n"
-        )
-        # Getting sigma estimates from ~unbiased estimates
-        d_results[0] = ripe.genpyomo.ripeomo(
+        # The model is built once and re-solved for each cardinality
+        d_results, bic, ccon = ripe.selection.bicsweep(
             [aterm, targets, sigma, sharedata["bounds"]],
             ptype,
             fixarray,
-            0,
-            1,
+            ccon_list,
             pc,
             sharedata,
         )
-        bic.append(d_results[0]["OBJ"])
-        sys.stdout.write(" - Null model BIC = " + str(bic[-1]) + "\n")
-        for ccon in ccon_list:
-            sys.stdout.write(
-                " - Solving RIPE model with cardinality constraint = "
-                + str(ccon)
-                + " - \n"
-            )
-            d_results[ccon] = ripe.genpyomo.ripeomo(
-                [aterm, targets, sigma, sharedata["bounds"]],
-                ptype,
-                fixarray,
-                ccon,
-                1,
-                pc,
-                sharedata,
-            )
-            bic.append(float(d_results[ccon]["OBJ"]) + np.log(n * ns) * ccon)
-            sys.stdout.write(
-                " - " + str(ccon) + "-term model BIC = " + str(bic[-1]) + "\n"
-            )
-            if bic[-1] > bic[-2]:
-                ccon = ccon - 1
-                break
 
         results = d_results[ccon]
 
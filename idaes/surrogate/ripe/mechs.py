@@ -11,6 +11,10 @@
 # at the URL "https://github.com/IDAES/idaes-pse".
 ##############################################################################
 
+import functools
+import operator
+
+import numpy as np
 import pyomo.environ as pyo
 
 _all__ = [
@@ -46,6 +50,22 @@ _all__ = [
 # data is not a list of list but a continuous list
 # Additional options can be specified for user-specified mechanisms
 
+# Mechanisms are evaluated both on Pyomo components (in ems) and on whole
+# columns of process data (in makeaterm). Arithmetic and powers broadcast over
+# numpy arrays directly, transcendental functions dispatch through _log.
+
+
+def _log(x):
+    if isinstance(x, np.ndarray):
+        return np.log(x)
+    return pyo.log(x)
+
+
+def _massact(data, stoich):
+    # product of reactant concentrations raised to their stoichiometries
+    terms = [data[i] ** abs(stoich[i]) for i in range(len(stoich)) if stoich[i] < 0]
+    return functools.reduce(operator.mul, terms, 1.0)
+
 
 def powerlawp5(*data):
     pd = data[0]
@@ -69,22 +89,22 @@ def powerlaw4(*data):
 
 def avrami2(*data):
     pd = data[0]
-    return 2.0 * (1.0 - pd) * (-1 * pyo.log(1 - pd)) ** (2.0 - (1.0 / 2.0))
+    return 2.0 * (1.0 - pd) * (-1 * _log(1 - pd)) ** (2.0 - (1.0 / 2.0))
 
 
 def avrami3(*data):
     pd = data[0]
-    return 3.0 * (1.0 - pd) * (-1 * pyo.log(1 - pd)) ** (3.0 - (1.0 / 3.0))
+    return 3.0 * (1.0 - pd) * (-1 * _log(1 - pd)) ** (3.0 - (1.0 / 3.0))
 
 
 def avrami4(*data):
     pd = data[0]
-    return 4.0 * (1.0 - pd) * (-1 * pyo.log(1 - pd)) ** (4.0 - (1.0 / 4.0))
+    return 4.0 * (1.0 - pd) * (-1 * _log(1 - pd)) ** (4.0 - (1.0 / 4.0))
 
 
 def avrami5(*data):
     pd = data[0]
-    return 5.0 * (1.0 - pd) * (-1 * pyo.log(1 - pd)) ** (5.0 - (1.0 / 5.0))
+    return 5.0 * (1.0 - pd) * (-1 * _log(1 - pd)) ** (5.0 - (1.0 / 5.0))
 
 
 def randomnuc(*data):
@@ -113,7 +133,7 @@ def antijander(*data):
 
 def valensi(*data):
     pd = data[0]
-    return 1.0 / (-1.0 * pyo.log(1.0 - pd))
+    return 1.0 / (-1.0 * _log(1.0 - pd))
 
 
 def parabolic(*data):
@@ -148,32 +168,14 @@ def grain(*data):
 
 
 def massactm(data, def_stoich):
-    import numpy as np
-
-    ns = len(def_stoich)
-    pwr = []
-    x = []
-    for i in range(ns):
-        if def_stoich[i] < 0:
-            pwr.append(abs(def_stoich[i]))
-            x.append(data[i])
-    return np.product(np.power(x, pwr))
+    return _massact(data, def_stoich)
 
 
 def mechperstoich(mech, stoich):
-    import numpy as np
-
-    ns = len(stoich)
     # out_mechs = []
 
     def massact(*data):
-        pwr = []
-        x = []
-        for i in range(ns):
-            if stoich[i] < 0:
-                pwr.append(abs(stoich[i]))
-                x.append(data[i])
-        return np.product(np.power(x, pwr))
+        return _massact(data, stoich)
 
     def usr_f(*data):
         #        stoich = stoich
@@ -189,8 +191,6 @@ def mechperstoich(mech, stoich):
 
 # This subroutine analyzes inputs to construct kinetic mechanisms
 def getmechs(kwargs):
-    import numpy as np
-
     # Analyze mechanisms in call to ripe
     # determine which stoichiometries to apply each mechanism to
     inkeys = kwargs.keys()
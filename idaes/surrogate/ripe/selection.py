@@ -0,0 +1,344 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Cardinality sweep used by ripemodel() to select the number of reactions.
+
+The RIPE MINLP is built once and re-solved with a different cardinality bound,
+starting from the previous solution. Cardinalities can be evaluated in worker
+processes, each of which builds its own copy of the model once. Solutions are
+cached in memory (and optionally on disk) so that repeated calls with the same
+data and solver options are not re-solved, and calls with new data start from
+prior solutions. The in-memory caches keep the most recently used entries.
+"""
+from collections import deque, OrderedDict
+import concurrent.futures
+import copy
+import hashlib
+import os
+import pickle
+import sys
+
+import numpy as np
+import pyomo.environ as pyo
+
+from idaes.surrogate.ripe import genpyomo
+
+# largest number of entries kept in each in-memory cache
+CACHE_SIZE = 256
+# results keyed by problem data, solver options and cardinality
+_results_cache = OrderedDict()
+# variable values keyed by problem structure and cardinality
+_start_cache = OrderedDict()
+
+
+def _cacheget(cache, key):
+    # Get an entry of a cache, marking it as most recently used
+    value = cache.get(key, None)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _cacheput(cache, key, value):
+    # Add an entry to a cache, dropping the least recently used entries
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _digest(*items):
+    # Hash arrays and simple python objects into a cache key
+    h = hashlib.sha1()
+    for item in items:
+        if isinstance(item, dict):
+            item = sorted(
+                (str(k), _digest(v))
+                for k, v in item.items()
+                if k not in ["npc", "nobs"]
+            )
+        try:
+            arr = np.asarray(item, dtype=float)
+            h.update(str(arr.shape).encode())
+            h.update(arr.tobytes())
+        except (TypeError, ValueError):
+            h.update(repr(item).encode())
+    return h.hexdigest()
+
+
+def structurekey(problem_data, ptype, fixarray, pc):
+    # Key identifying the MINLP structure independent of the data values
+    aterm = problem_data[0]
+    return _digest(np.shape(aterm)[1:], ptype, fixarray, "Tref" in pc.keys())
+
+
+def datakey(problem_data, ptype, fixarray, pc, sharedata, solver="baron", options=None):
+    # Key identifying the MINLP structure, the data values and the solver
+    aterm, target, sigma, bounds = problem_data
+    opts = [sharedata[k] for k in ["maxmiptime", "deltaterm", "onemechper"]]
+    opts += [solver, sorted((str(k), repr(v)) for k, v in (options or {}).items())]
+    return _digest(
+        aterm,
+        target,
+        sigma,
+        bounds["k"],
+        bounds["e"],
+        ptype,
+        fixarray,
+        pc.get("T", []),
+        pc.get("Tref", 0.0),
+        opts,
+    )
+
+
+def clearcache():
+    # Remove all in-memory cached results and starting points
+    _results_cache.clear()
+    _start_cache.clear()
+
+
+def _cachefile(sharedata, key):
+    cachedir = sharedata.get("cachedir", None)
+    if cachedir is None:
+        return None
+    os.makedirs(cachedir, exist_ok=True)
+    return os.path.join(cachedir, "ripe_" + key + ".pkl")
+
+
+def _loadcache(sharedata, key):
+    # Cached results are copied so that callers can not modify the cache
+    value = _cacheget(_results_cache, key)
+    if value is not None:
+        return copy.deepcopy(value)
+    fname = _cachefile(sharedata, key)
+    if fname is not None and os.path.isfile(fname):
+        with open(fname, "rb") as f:
+            value = pickle.load(f)
+        _cacheput(_results_cache, key, value)
+        return copy.deepcopy(value)
+    return None
+
+
+def _storecache(sharedata, key, value):
+    _cacheput(_results_cache, key, copy.deepcopy(value))
+    fname = _cachefile(sharedata, key)
+    if fname is not None:
+        with open(fname, "wb") as f:
+            pickle.dump(value, f)
+
+
+def _getstart(model):
+    # Collect current values of the free decision variables
+    start = {}
+    for vname in ["k", "y", "E"]:
+        if hasattr(model, vname):
+            var = getattr(model, vname)
+            start[vname] = {i: var[i].value for i in var if not var[i].fixed}
+    return start
+
+
+def _setstart(model, start):
+    for vname, vals in start.items():
+        var = getattr(model, vname)
+        for i, val in vals.items():
+            if not var[i].fixed:
+                var[i].value = val
+
+
+class CardinalitySolver(object):
+    """
+    Solves the RIPE MINLP for a sequence of cardinalities, reusing one model.
+
+    Args:
+        problem_data: [aterm, targets, sigma, bounds] as passed to ripeomo()
+        ptype: problem type ('arr', 'iT' or 'simple')
+        fixarray: array denoting valid stoichiometry/mechanism pairings
+        pc: process condition dictionary from makeaterm()
+        sharedata: shared data dictionary
+        solver: name of the MINLP solver
+        options: dictionary of options of the MINLP solver
+    """
+
+    def __init__(
+        self, problem_data, ptype, fixarray, pc, sharedata, solver="baron", options=None
+    ):
+        self.problem_data = problem_data
+        self.ptype = ptype
+        self.fixarray = fixarray
+        self.pc = pc
+        self.sharedata = sharedata
+        self.solver = solver
+        self.options = dict(options or {})
+        self.skey = structurekey(problem_data, ptype, fixarray, pc)
+        self.dkey = datakey(
+            problem_data, ptype, fixarray, pc, sharedata, solver, self.options
+        )
+        self._model = None
+        self._opt = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = genpyomo.buildripeomo(
+                self.problem_data, self.ptype, self.fixarray, 0, self.pc, self.sharedata
+            )
+        return self._model
+
+    @property
+    def opt(self):
+        if self._opt is None:
+            self._opt = pyo.SolverFactory(self.solver)
+            self._opt.options.update(self.options)
+        return self._opt
+
+    def solve(self, ccon, task=1):
+        """
+        Solve for one cardinality, returning the ripeomo() results dictionary.
+        """
+        key = (self.dkey, ccon, task)
+        cached = _loadcache(self.sharedata, "_".join(str(k) for k in key))
+        if cached is not None:
+            return cached
+        model = self.model
+        # prefer the solution found for this cardinality with earlier data,
+        # otherwise start from whatever the previous solve left in the model
+        start = _cacheget(_start_cache, (self.skey, ccon, task))
+        if start is not None:
+            _setstart(model, start)
+        res = genpyomo.solveripeomo(
+            model, self.ptype, ccon, task, self.pc, self.sharedata, opt=self.opt
+        )
+        _cacheput(_start_cache, (self.skey, ccon, task), _getstart(model))
+        _storecache(self.sharedata, "_".join(str(k) for k in key), res)
+        return res
+
+
+# Solver owned by each worker process, created once by _initworker()
+_worker_solver = None
+
+
+def _initworker(problem_data, ptype, fixarray, pc, sharedata, solver, options, starts):
+    global _worker_solver
+    _start_cache.update(starts)
+    _worker_solver = CardinalitySolver(
+        problem_data, ptype, fixarray, pc, sharedata, solver, options
+    )
+
+
+def _solveworker(ccon):
+    res = _worker_solver.solve(ccon)
+    return res, _start_cache.get((_worker_solver.skey, ccon, 1), None)
+
+
+def bicsweep(
+    problem_data,
+    ptype,
+    fixarray,
+    ccon_list,
+    pc,
+    sharedata,
+    solver="baron",
+    options=None,
+):
+    # This subroutine selects the model cardinality using BIC
+    # Inputs:
+    # problem_data  - [aterm, targets, sigma, bounds]
+    # ptype         - problem type
+    # fixarray      - array denoting valid stoichiometry/mechanism pairings
+    # ccon_list     - increasing list of cardinalities to consider
+    # pc            - process condition dictionary
+    # sharedata     - shared data dictionary, sharedata['nworkers'] sets the
+    #                 number of worker processes used
+    # solver        - name of the MINLP solver
+    # options       - dictionary of options of the MINLP solver
+    # Outputs:
+    # d_results     - dictionary of ripeomo() results keyed by cardinality
+    # bic           - BIC values for the null model and each cardinality solved
+    # ccon          - selected cardinality
+
+    aterm = problem_data[0]
+    n, ns = np.shape(aterm)[:2]
+    nworkers = int(sharedata.get("nworkers", 1))
+    ccon_list = list(ccon_list)
+    csolver = CardinalitySolver(
+        problem_data, ptype, fixarray, pc, sharedata, solver, options
+    )
+
+    d_results = dict.fromkeys([0] + ccon_list)
+    sys.stdout.write("   ---- Calculating null values for model selection ----    \n")
+    d_results[0] = csolver.solve(0)
+    bic = [d_results[0]["OBJ"]]
+    sys.stdout.write(" - Null model BIC = " + str(bic[-1]) + "\n")
+
+    def _accept(ccon):
+        bic.append(float(d_results[ccon]["OBJ"]) + np.log(n * ns) * ccon)
+        sys.stdout.write(" - " + str(ccon) + "-term model BIC = " + str(bic[-1]) + "\n")
+        return bic[-1] > bic[-2]
+
+    if nworkers <= 1 or len(ccon_list) <= 1:
+        for ccon in ccon_list:
+            sys.stdout.write(
+                " - Solving RIPE model with cardinality constraint = "
+                + str(ccon)
+                + " - \n"
+            )
+            d_results[ccon] = csolver.solve(ccon)
+            if _accept(ccon):
+                return d_results, bic, ccon - 1
+        return d_results, bic, ccon_list[-1] if ccon_list else 0
+
+    # Parallel sweep: at most nworkers cardinalities are being solved at a time.
+    # Results are taken in order and a new cardinality is only submitted when
+    # one is accepted, so that little work is done past the BIC stopping point
+    starts = {k: v for k, v in _start_cache.items() if k[0] == csolver.skey}
+    todo = iter(ccon_list)
+    pending = deque()
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=nworkers,
+        initializer=_initworker,
+        initargs=(
+            problem_data, ptype, fixarray, pc, sharedata, solver, options, starts
+        ),
+    ) as pool:
+
+        def _submit():
+            ccon = next(todo, None)
+            if ccon is not None:
+                sys.stdout.write(
+                    " - Solving RIPE model with cardinality constraint = "
+                    + str(ccon)
+                    + " - \n"
+                )
+                pending.append((ccon, pool.submit(_solveworker, ccon)))
+
+        def _collect():
+            ccon, future = pending.popleft()
+            res, start = future.result()
+            _storecache(
+                sharedata, "_".join(str(k) for k in (csolver.dkey, ccon, 1)), res
+            )
+            if start is not None:
+                _cacheput(_start_cache, (csolver.skey, ccon, 1), start)
+            return ccon, res
+
+        for _ in range(nworkers):
+            _submit()
+        while pending:
+            ccon, d_results[ccon] = _collect()
+            if _accept(ccon):
+                # the cardinalities still being solved are only cached
+                while pending:
+                    _collect()
+                return d_results, bic, ccon - 1
+            _submit()
+    return d_results, bic, ccon_list[-1]
@@ -148,6 +148,8 @@ sharedata["kwargsin"] = [
     "temperature",
     "Temperature",
     "Temp",
+    "nworkers",
+    "cachedir",
 ]
 # Set paths here
 sharedata["minlp_path"] = "baron"
@@ -166,6 +168,9 @@ sharedata["zscale"] = False
 sharedata["ascale"] = False
 sharedata["onemechper"] = True
 sharedata["expand_output"] = False
+# options for the cardinality sweep in selection.py
+sharedata["nworkers"] = 1
+sharedata["cachedir"] = None
 
 # independent variables considered by atermconstruct
 sharedata["ivars"] = ["t", "T", "x0", "flow", "vol", "other"]
@@ -0,0 +1,141 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for activity matrix construction in RIPE.
+"""
+import numpy as np
+import pytest
+
+from idaes.surrogate.ripe import mechs
+from idaes.surrogate.ripe.atermconstruct import makeaterm, evalmech
+
+all_mechs = [
+    mechs.powerlawp5,
+    mechs.powerlaw2,
+    mechs.powerlaw3,
+    mechs.powerlaw4,
+    mechs.avrami2,
+    mechs.avrami3,
+    mechs.avrami4,
+    mechs.avrami5,
+    mechs.randomnuc,
+    mechs.ptompkins,
+    mechs.jander,
+    mechs.antijander,
+    mechs.valensi,
+    mechs.parabolic,
+    mechs.gb3d,
+    mechs.zlt,
+    mechs.grain,
+]
+
+
+def _loop_aterm(fdata, stoich, rxn_mechs, temps):
+    # Reference implementation: one mechanism call per scalar entry
+    ndata, ns = np.shape(fdata)
+    nm = sum(len(m[1]) for m in rxn_mechs)
+    aterm = np.zeros([ndata, ns, nm, len(stoich)])
+    for i1 in range(ndata):
+        for i2 in range(ns):
+            i3 = 0
+            for mechline in rxn_mechs:
+                for mspec in mechline[1]:
+                    for h_ind in list(mechline[0]):
+                        if mspec == "massact" or mechline[2]:
+                            s_mech = mechs.mechperstoich(mspec, stoich[h_ind])
+                        else:
+                            s_mech = mspec
+                        if temps is not None:
+                            inv = np.hstack((fdata[i1, :], temps[i1]))
+                        else:
+                            inv = fdata[i1, :]
+                        aterm[i1, i2, i3, h_ind] = stoich[h_ind][i2] * s_mech(*inv)
+                    i3 += 1
+    return aterm
+
+
+def _problem(ndata, with_t=False):
+    rng = np.random.RandomState(42)
+    data = rng.uniform(0.05, 0.95, size=(ndata, 3))
+    stoich = [[-1, 1, 0], [0, -1, 1], [-1, -1, 2]]
+    rxn_mechs = [[range(3), ["massact"] + all_mechs, False]]
+    kwargs = {}
+    if with_t:
+        kwargs["T"] = list(rng.uniform(300.0, 400.0, size=ndata))
+    return data, stoich, rxn_mechs, kwargs
+
+
+def _build(data, stoich, rxn_mechs, kwargs):
+    mechlist = rxn_mechs[0][1]
+    fixarray = np.ones([len(stoich), len(mechlist)])
+    return makeaterm(
+        data, stoich, rxn_mechs, kwargs, 0, mechlist, fixarray, {"ascale": False}
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("with_t", [False, True])
+def test_makeaterm_matches_loop(with_t):
+    data, stoich, rxn_mechs, kwargs = _problem(50, with_t=with_t)
+    aterm, fdata, pc, _, _ = _build(data, stoich, rxn_mechs, kwargs)
+    temps = [pc["T"][i][0] for i in range(50)] if with_t else None
+    expected = _loop_aterm(fdata, stoich, rxn_mechs, temps)
+    assert aterm.shape == (50, 3, len(rxn_mechs[0][1]), 3)
+    np.testing.assert_allclose(aterm, expected, rtol=1e-12)
+
+
+@pytest.mark.unit
+def test_evalmech_scalar_only_mechanism():
+    # user mechanisms that cannot take arrays are evaluated row by row
+    def scalar_mech(*data):
+        return float(data[0]) * 2.0
+
+    inv = [np.array([1.0, 2.0, 3.0]), np.array([0.0, 0.0, 0.0])]
+    np.testing.assert_allclose(evalmech(scalar_mech, inv, 3), [2.0, 4.0, 6.0])
+
+
+@pytest.mark.unit
+def test_evalmech_constant_mechanism():
+    massact = mechs.mechperstoich("massact", [1, 1])
+    inv = [np.array([1.0, 2.0]), np.array([3.0, 4.0])]
+    np.testing.assert_allclose(evalmech(massact, inv, 2), [1.0, 1.0])
+
+
+@pytest.mark.unit
+def test_evalmech_branching_mechanism():
+    # if statements on arrays raise ValueError, the mechanism is evaluated
+    # row by row
+    def branch_mech(*data):
+        return data[0] if data[0] > 1.5 else 0.0
+
+    inv = [np.array([1.0, 2.0, 3.0])]
+    np.testing.assert_allclose(evalmech(branch_mech, inv, 3), [0.0, 2.0, 3.0])
+
+
+@pytest.mark.unit
+def test_evalmech_error_in_mechanism():
+    # errors other than failed vectorization are not hidden
+    def bad_mech(*data):
+        return {}["k"]
+
+    inv = [np.array([1.0, 2.0])]
+    with pytest.raises(KeyError):
+        evalmech(bad_mech, inv, 2)
+
+
+@pytest.mark.integration
+def test_makeaterm_large():
+    data, stoich, rxn_mechs, kwargs = _problem(2000)
+    aterm, fdata, _, _, _ = _build(data, stoich, rxn_mechs, kwargs)
+    expected = _loop_aterm(fdata, stoich, rxn_mechs, None)
+    np.testing.assert_allclose(aterm, expected, rtol=1e-12)
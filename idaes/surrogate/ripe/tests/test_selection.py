@@ -0,0 +1,157 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for the RIPE cardinality sweep.
+"""
+import copy
+import sys
+
+import numpy as np
+import pytest
+import pyomo.environ as pyo
+
+from idaes.surrogate.ripe import genpyomo, selection
+from idaes.surrogate.ripe.shared import sharedata as default_sharedata
+
+# objective values by cardinality, BIC is minimized at two terms
+_objs = {0: 100.0, 1: 40.0, 2: 5.0, 3: 4.9, 4: 4.8}
+
+
+def _problem(n=10):
+    rng = np.random.RandomState(0)
+    aterm = rng.uniform(size=(n, 2, 2, 3))
+    targets = rng.uniform(size=(n, 2))
+    sigma = np.ones((n, 2))
+    sd = copy.deepcopy(default_sharedata)
+    return [aterm, targets, sigma, sd["bounds"]], np.ones([3, 2]), {}, sd
+
+
+@pytest.fixture
+def fake_solve(monkeypatch):
+    calls = []
+
+    def _solve(model, ptype, cc_int, task, pc, sharedata, opt=None):
+        calls.append((id(model), cc_int, task))
+        model.cc = cc_int
+        return {"OBJ": _objs[cc_int], "cc": cc_int}
+
+    selection.clearcache()
+    monkeypatch.setattr(genpyomo, "solveripeomo", _solve)
+    yield calls
+    selection.clearcache()
+
+
+@pytest.mark.unit
+def test_buildripeomo_mutable_cardinality():
+    problem_data, fixarray, pc, sd = _problem()
+    m = genpyomo.buildripeomo(problem_data, "simple", fixarray, 2, pc, sd)
+    assert pyo.value(m.cc) == 2
+    assert pyo.value(m.cardcon.upper) == 2
+    m.cc = 3
+    assert pyo.value(m.cardcon.upper) == 3
+    assert pyo.value(m.cardcon_relax.upper) == 3
+    assert m.cardcon_relax.lower is None
+
+
+@pytest.mark.unit
+def test_bicsweep_reuses_model(fake_solve):
+    problem_data, fixarray, pc, sd = _problem()
+    d_results, bic, ccon = selection.bicsweep(
+        problem_data, "simple", fixarray, range(1, 5), pc, sd
+    )
+    assert ccon == 2
+    assert len(bic) == 4
+    assert [c[1] for c in fake_solve] == [0, 1, 2, 3]
+    # a single model is built for the whole sweep
+    assert len(set(c[0] for c in fake_solve)) == 1
+    assert d_results[2]["cc"] == 2
+    assert d_results[4] is None
+
+
+@pytest.mark.unit
+def test_bicsweep_cache(fake_solve, tmpdir):
+    problem_data, fixarray, pc, sd = _problem()
+    sd["cachedir"] = str(tmpdir)
+    selection.bicsweep(problem_data, "simple", fixarray, range(1, 5), pc, sd)
+    assert len(fake_solve) == 4
+    # repeating the sweep with the same data is served from the cache
+    selection.bicsweep(problem_data, "simple", fixarray, range(1, 5), pc, sd)
+    assert len(fake_solve) == 4
+    # including on-disk results after the in-memory cache is cleared
+    selection.clearcache()
+    selection.bicsweep(problem_data, "simple", fixarray, range(1, 5), pc, sd)
+    assert len(fake_solve) == 4
+    # new data requires new solves
+    problem_data[1] = problem_data[1] * 2.0
+    selection.bicsweep(problem_data, "simple", fixarray, range(1, 5), pc, sd)
+    assert len(fake_solve) == 8
+
+
+@pytest.mark.unit
+def test_cache_copies_and_solver_key(fake_solve, monkeypatch):
+    problem_data, fixarray, pc, sd = _problem()
+    res = selection.CardinalitySolver(problem_data, "simple", fixarray, pc, sd).solve(2)
+    res["OBJ"] = -1.0
+    cached = selection.CardinalitySolver(problem_data, "simple", fixarray, pc, sd)
+    assert cached.solve(2)["OBJ"] == _objs[2]
+    cached.solve(2)["OBJ"] = -1.0
+    assert cached.solve(2)["OBJ"] == _objs[2]
+    assert len(fake_solve) == 1
+    # other solvers or solver options are solved again
+    selection.CardinalitySolver(
+        problem_data, "simple", fixarray, pc, sd, solver="couenne"
+    ).solve(2)
+    assert len(fake_solve) == 2
+    selection.CardinalitySolver(
+        problem_data, "simple", fixarray, pc, sd, options={"EpsA": 1e-6}
+    ).solve(2)
+    assert len(fake_solve) == 3
+    # the in-memory cache only keeps the most recent entries
+    monkeypatch.setattr(selection, "CACHE_SIZE", 2)
+    cached.solve(3)
+    assert len(selection._results_cache) == 2
+    cached.solve(2)
+    assert len(fake_solve) == 5
+
+
+@pytest.mark.unit
+def test_start_values_carry_to_new_data(monkeypatch):
+    problem_data, fixarray, pc, sd = _problem()
+    starts = []
+
+    def _solve(model, ptype, cc_int, task, pc, sharedata, opt=None):
+        starts.append(model.k[1, 1].value)
+        model.k[1, 1].value = 10.0 + cc_int
+        return {"OBJ": _objs[cc_int]}
+
+    selection.clearcache()
+    monkeypatch.setattr(genpyomo, "solveripeomo", _solve)
+    selection.CardinalitySolver(problem_data, "simple", fixarray, pc, sd).solve(2)
+    problem_data[1] = problem_data[1] * 2.0
+    selection.CardinalitySolver(problem_data, "simple", fixarray, pc, sd).solve(2)
+    assert starts == [None, 12.0]
+    selection.clearcache()
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(sys.platform != "linux", reason="patched solver needs fork")
+def test_bicsweep_parallel(fake_solve):
+    problem_data, fixarray, pc, sd = _problem()
+    sd["nworkers"] = 2
+    d_results, bic, ccon = selection.bicsweep(
+        problem_data, "simple", fixarray, range(1, 5), pc, sd
+    )
+    assert ccon == 2
+    assert d_results[3]["cc"] == 3
+    # results past the BIC stopping point are not used
+    assert d_results[4] is None
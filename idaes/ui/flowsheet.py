@@ -16,11 +16,14 @@ Flowsheet-related classes and functions used by the UI.
 # stdlib
 from collections import defaultdict
 import copy
+import hashlib
 import json
+import math
 import re
 from typing import Dict, List, Tuple
 
 # third-party
+import numpy as np
 import pandas as pd
 from pyomo.environ import Block, value
 from pyomo.network import Arc
@@ -114,6 +117,41 @@ def validate_flowsheet(fs: Dict) -> Tuple[bool, str]:
     return True, ""
 
 
+def flowsheet_structure_hash(flowsheet) -> str:
+    """Compute a hash of the structure of a flowsheet.
+
+    The hash covers the names and types of the blocks at the top level of the flowsheet and
+    the names and endpoints of its arcs, but not the values of any variables. It changes when
+    unit models or arcs are added, removed or reconnected, and is cheap to compute since
+    it does not descend into the unit models.
+
+    Args:
+        flowsheet: The flowsheet to hash
+
+    Returns:
+        Hex digest of the hash
+    """
+    h = hashlib.sha1()
+    for blk in flowsheet.component_objects(Block, descend_into=False):
+        keys = sorted(map(str, blk.keys())) if blk.is_indexed() else ""
+        h.update(f"B {blk.getname()} {type(blk).__name__} {keys}\n".encode("utf-8"))
+    for arc in flowsheet.component_objects(Arc, descend_into=False):
+        h.update(f"A {arc.getname()} {arc.source.name} {arc.dest.name}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _port_values(port) -> List:
+    # Values of all the variables and expressions of a (possibly indexed) port
+    values = []
+    for port_data in port.values():
+        for member in port_data.vars.values():
+            if member.is_indexed():
+                values.extend(value(v, exception=False) for v in member.values())
+            else:
+                values.append(value(member, exception=False))
+    return values
+
+
 class FlowsheetSerializer:
     """Serializes the flowsheet into one dict with two sections.
 
@@ -169,6 +207,10 @@ class FlowsheetSerializer:
         self._stream_table_df = None
         self._out_json = {"model": {}}
         self._serialized_contents = defaultdict(dict)
+        self._unit_fingerprints = {}  # {unit: values the serialized contents were computed from}
+        self._stream_display_vars = None  # {stream name: [(variable, index, component)]}
+        self._stream_values = {}  # {stream name: [values of the display variables]}
+        self._changed_streams = set()  # streams changed since the stream table was serialized
         self._used_ports = set()
         self._known_endpoints = set()
         self._unit_name_used_count = defaultdict(lambda: 0)
@@ -183,6 +225,46 @@ class FlowsheetSerializer:
     def as_dict(self):
         return self._out_json
 
+    def update_values(self) -> Dict:
+        """Update the serialized flowsheet with the current values in the model.
+
+        Only the stream table, stream labels and unit model contents are recomputed; the
+        unit models, arcs and layout are kept from the last serialization. This must
+        only be used while the structure of the flowsheet is unchanged, i.e. while
+        :func:`flowsheet_structure_hash` returns the same value.
+        The values of all streams and unit models are read, but only the labels, stream
+        table columns and unit contents of those whose values changed are reformatted.
+
+        Returns:
+            The updated flowsheet dict, as returned by :meth:`as_dict`
+        """
+        self._construct_stream_labels()
+        for unit in list(self._unit_fingerprints):
+            self._serialize_unit_contents(unit)
+        self._construct_model_json()
+        for cell in self._out_json["cells"]:
+            if cell["type"] == "standard.Link":
+                cell["labels"][0]["attrs"]["text"]["text"] = self.labels[cell["id"]]
+        return self._out_json
+
+    def values_fingerprint(self) -> str:
+        """Compute a hash of the current values the serialized flowsheet is computed from.
+
+        These are the values of the stream display variables, and of the performance contents and
+        ports of the unit models. Nothing is serialized, so this is much cheaper than
+        :meth:`update_values`, which returns the same value while the hash is unchanged. Like
+        :meth:`update_values`, it must only be used while the structure of the flowsheet is unchanged.
+
+        Returns:
+            Hex digest of the hash
+        """
+        h = hashlib.sha1()
+        for display_vars in self._stream_display_vars.values():
+            h.update(repr([value(v, exception=False) for _, _, v in display_vars]).encode("utf-8"))
+        for unit in self._unit_fingerprints:
+            h.update(repr(self._unit_fingerprint(unit)[0]).encode("utf-8"))
+        return h.hexdigest()
+
     def _ingest_flowsheet(self):
         # Stores information on the connectivity and components of the input flowsheet
         self._identify_arcs()
@@ -202,43 +284,118 @@ class FlowsheetSerializer:
         from idaes.core import UnitModelBlockData  # avoid circular import
 
         # Identify the unit models and ports and store them
-        for component in self.flowsheet.component_objects(Block, descend_into=True):
+        for component in self._unit_model_candidates(self.flowsheet):
             if isinstance(component, UnitModelBlockData):
                 self._add_unit_model_with_ports(component)
             else:
                 # some unit models are nested within Indexed blocks
-                component_object_op = getattr(component, "component_object", None)
-                if not callable(component_object_op):
-                    for item in component.parent_component().values():
-                        if isinstance(item, UnitModelBlockData):
-                            if any(
-                                (
-                                    item == arc.source.parent_block()
-                                    or item == arc.dest.parent_block()
-                                )
-                                for arc in self.arcs.values()
-                            ):
-                                self._add_unit_model_with_ports(item)
+                for item in component.values():
+                    if isinstance(item, UnitModelBlockData) and item in self._known_endpoints:
+                        self._add_unit_model_with_ports(item)
+
+    @classmethod
+    def _unit_model_candidates(cls, block):
+        # Same blocks, in the same order, as block.component_objects(Block, descend_into=True),
+        # except that property, state and reaction blocks are not descended into, since they
+        # never contain unit models and are by far the most numerous blocks in a flowsheet.
+        from idaes.core import (  # avoid circular import
+            StateBlockData, ReactionBlockDataBase, PhysicalParameterBlock, ReactionParameterBlock
+        )
+
+        components = list(block.component_objects(Block, descend_into=False))
+        yield from components
+        for component in components:
+            for data in component.values():
+                if not isinstance(
+                    data,
+                    (StateBlockData, ReactionBlockDataBase, PhysicalParameterBlock,
+                     ReactionParameterBlock),
+                ):
+                    yield from cls._unit_model_candidates(data)
 
     def _construct_stream_labels(self):
-        # Construct the stream labels
-        from idaes.core.util.tables import (
-            stream_states_dict,
-        )  # deferred to avoid circ. import
-
-        # We might have this information from generating self.serialized_components but I (Makayla) don't
-        # know how that connects to the stream names so this will be left alone for now
-        for stream_name, stream_value in stream_states_dict(self.arcs).items():
+        # Construct the labels of the streams whose values changed since the last call, and
+        # return the names of those streams
+        if self._stream_display_vars is None:
+            from idaes.core.util.tables import (
+                stream_states_dict,
+            )  # deferred to avoid circ. import
+
+            # We might have this information from generating self.serialized_components but I (Makayla) don't
+            # know how that connects to the stream names so this will be left alone for now
+            # The display variables only depend on the structure of the flowsheet, so they are
+            # looked up once and only their values are read on updates
+            self._stream_display_vars = {
+                stream_name: [
+                    (var, k, v)
+                    for var, var_value in stream_value.define_display_vars().items()
+                    for k, v in var_value.items()
+                ]
+                for stream_name, stream_value in stream_states_dict(self.arcs).items()
+            }
+        changed = set()
+        for stream_name, display_vars in self._stream_display_vars.items():
+            values = [value(v) for _, _, v in display_vars]
+            if self._stream_values.get(stream_name, None) == values:
+                continue  # values unchanged since the last update, keep the label
+            self._stream_values[stream_name] = values
+            changed.add(stream_name)
+            self._changed_streams.add(stream_name)
             label = ""
-            for var, var_value in stream_value.define_display_vars().items():
-                var = var.capitalize()
-
-                for k, v in var_value.items():
-                    if k is None:
-                        label += f"{var} {round(value(v), self._sig_figs)}\n"
-                    else:
-                        label += f"{var} {k} {round(value(v), self._sig_figs)}\n"
+            for (var, k, _), v in zip(display_vars, values):
+                var_label = var.capitalize()
+                if k is None:
+                    label += f"{var_label} {round(v, self._sig_figs)}\n"
+                else:
+                    label += f"{var_label} {k} {round(v, self._sig_figs)}\n"
             self.labels[stream_name] = label[:-2]
+        return changed
+
+    def _construct_stream_table(self):
+        # Serialize the stream table. After an update only the columns of the changed streams
+        # are replaced in the last serialized table.
+        table = self._out_json["model"].get("stream_table", None)
+        if table is not None:
+            columns = {c: j for j, c in enumerate(table["columns"])}
+            rows = {row[1]: i for i, row in enumerate(table["data"])}
+            for stream_name in self._changed_streams:
+                j = columns[stream_name]
+                for (var, k, _), v in zip(
+                    self._stream_display_vars[stream_name], self._stream_values[stream_name]
+                ):
+                    if v is not None and not math.isnan(v):
+                        # round as DataFrame.round does
+                        v = float(np.round(v, self._sig_figs))
+                    else:
+                        v = None
+                    table["data"][rows[var if k is None else f"{var} {k}"]][j] = v
+            self._changed_streams.clear()
+            return
+
+        stream_attributes = {
+            stream_name: {
+                (var if k is None else f"{var} {k}"): v
+                for (var, k, _), v in zip(display_vars, self._stream_values[stream_name])
+            }
+            for stream_name, display_vars in self._stream_display_vars.items()
+        }
+        # Change the index of the pandas dataframe to not be the variables
+        self._stream_table_df = (
+            pd.DataFrame.from_dict(stream_attributes, orient="columns")
+            .reset_index().rename(columns={"index": "Variable"})
+            .reset_index().rename(columns={"index": ""})
+            .round(self._sig_figs)
+        )
+
+        # Change NaNs to None for JSON
+        self._stream_table_df = self._stream_table_df.where((pd.notnull(self._stream_table_df)), None)
+
+        # Puts df in this format for easier parsing in the javascript table:
+        # {'index': ["('Liq', 'benzene')", "('Liq', 'toluene')", "('Liq', 'hydrogen')", "('Liq', 'methane')", "('Vap', 'benzene')", "('Vap', 'toluene')", "('Vap', 'hydrogen')", "('Vap', 'methane')", 'temperature', 'pressure'], 
+        # 'columns': ['s03', 's04', 's05', 's06', 's08', 's09', 's10'], 
+        # 'data': [[0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [298.15, 298.15, 298.15, 298.15, 298.15, 298.15, 298.15], [101325.0, 101325.0, 101325.0, 101325.0, 101325.0, 101325.0, 101325.0]]}
+        self._out_json["model"]["stream_table"] = self._stream_table_df.to_dict("split")
+        self._changed_streams.clear()
 
     def _map_edges(self):
         # Map the arcs to the ports to construct the edges
@@ -271,28 +428,7 @@ class FlowsheetSerializer:
             self._unit_name_used_count[unit_name] += 1
             for port in unit.component_objects(Port, descend_into=False):
                 self.ports[port] = unit
-            
-
-            performance_contents, stream_df = unit.serialize_contents()
-            if stream_df is not None and not stream_df.empty:
-                # If there is a stream dataframe then we need to reset the index so we can get the variable names
-                # and then rename the "index"
-                stream_df = stream_df.reset_index().rename(
-                    columns={"index": "Variable"}
-                )
-            self._serialized_contents[unit_name]["stream_contents"] = stream_df
-
-            performance_df = pd.DataFrame()
-            if performance_contents:
-                # If performance contents is not empty or None then stick it into a dataframe and convert the
-                # GeneralVars to actual values
-                performance_df = pd.DataFrame(
-                    performance_contents["vars"].items(), columns=["Variable", "Value"]
-                )
-                performance_df["Value"] = performance_df["Value"].map(
-                    lambda v: value(v)
-                )
-            self._serialized_contents[unit_name]["performance_contents"] = performance_df
+            self._serialize_unit_contents(unit)
 
         elif unit in self._known_endpoints:
             # Unit is a subcomponent AND it is connected to an Arc. Or maybe it's in an indexed block TODO CHECK
@@ -315,6 +451,56 @@ class FlowsheetSerializer:
             # The unit is neither top-level nor connected; do not display this unit, since it is a subcomponent.
             pass
 
+    def _serialize_unit_contents(self, unit):
+        from idaes.core.util.exceptions import ConfigurationError  # circular import at module level
+
+        # Serialize the performance contents and stream table of a top-level unit model, unless the
+        # values they are computed from are the same as when they were last serialized
+        fingerprint, performance_contents = self._unit_fingerprint(unit)
+        if self._unit_fingerprints.get(unit, None) == fingerprint:
+            return
+        self._unit_fingerprints[unit] = fingerprint
+
+        # Reuse the performance contents computed for the fingerprint, only the stream table is
+        # still needed (this is what unit.serialize_contents() would return)
+        unit_name = unit.getname()
+        try:
+            stream_df = unit._get_stream_table_contents(time_point=0)
+        except ConfigurationError as err:
+            _log.warning(f"Could not serialize stream table: {err}")
+            stream_df = pd.DataFrame()
+        if stream_df is not None and not stream_df.empty:
+            # If there is a stream dataframe then we need to reset the index so we can get the variable names
+            # and then rename the "index"
+            stream_df = stream_df.reset_index().rename(
+                columns={"index": "Variable"}
+            )
+        self._serialized_contents[unit_name]["stream_contents"] = stream_df
+
+        performance_df = pd.DataFrame()
+        if performance_contents:
+            # If performance contents is not empty or None then stick it into a dataframe and convert the
+            # GeneralVars to actual values
+            performance_df = pd.DataFrame(
+                performance_contents["vars"].items(), columns=["Variable", "Value"]
+            )
+            performance_df["Value"] = performance_df["Value"].map(
+                lambda v: value(v)
+            )
+        self._serialized_contents[unit_name]["performance_contents"] = performance_df
+        self._serialized_contents[unit_name]["json"] = None
+
+    @staticmethod
+    def _unit_fingerprint(unit):
+        # Values the serialized contents of a unit are computed from, and its performance contents
+        performance_contents = unit._get_performance_contents(time_point=0)
+        fingerprint = []
+        if performance_contents:
+            fingerprint.extend(value(v, exception=False) for v in performance_contents["vars"].values())
+        for port in unit.component_objects(Port, descend_into=False):
+            fingerprint.extend(_port_values(port))
+        return fingerprint, performance_contents
+
     def _get_unit_model_type(self, unit):
         # Get the unit models type
         return unit.base_class_module().split(".")[
@@ -382,26 +568,8 @@ class FlowsheetSerializer:
         self._construct_jointjs_json()
 
     def _construct_model_json(self):
-        from idaes.core.util.tables import create_stream_table_dataframe # deferred to avoid circular import
-
-        # Get the stream table and add it to the model json
-        # Change the index of the pandas dataframe to not be the variables
-        self._stream_table_df = (
-            create_stream_table_dataframe(self.arcs)
-                # Change the index of the pandas dataframe to not be the variables
-            .reset_index().rename(columns={"index": "Variable"})
-            .reset_index().rename(columns={"index": ""})
-            .round(self._sig_figs)
-        )
-        
-        # Change NaNs to None for JSON
-        self._stream_table_df = self._stream_table_df.where((pd.notnull(self._stream_table_df)), None)
-
-        # Puts df in this format for easier parsing in the javascript table:
-        # {'index': ["('Liq', 'benzene')", "('Liq', 'toluene')", "('Liq', 'hydrogen')", "('Liq', 'methane')", "('Vap', 'benzene')", "('Vap', 'toluene')", "('Vap', 'hydrogen')", "('Vap', 'methane')", 'temperature', 'pressure'], 
-        # 'columns': ['s03', 's04', 's05', 's06', 's08', 's09', 's10'], 
-        # 'data': [[0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], [298.15, 298.15, 298.15, 298.15, 298.15, 298.15, 298.15], [101325.0, 101325.0, 101325.0, 101325.0, 101325.0, 101325.0, 101325.0]]}
-        self._out_json["model"]["stream_table"] = self._stream_table_df.to_dict("split")
+        # Get the stream table built with the stream labels and add it to the model json
+        self._construct_stream_table()
 
         self._out_json["model"]["id"] = self.name
         self._out_json["model"]["unit_models"] = {}
@@ -417,11 +585,20 @@ class FlowsheetSerializer:
                 "image": "/images/icons/" + unit_icon.icon,
             }
             if unit_name in self._serialized_contents:
-                for pfx in "performance", "stream":
-                    content_type = pfx + "_contents"
-                    c = self._serialized_contents[unit_name][content_type].round(self._sig_figs).to_dict("index")
-                    # ensure that keys are strings (so it's valid JSON)
-                    unit_contents[content_type] = {str(k): v for k, v in c.items()}
+                contents = self._serialized_contents[unit_name]
+                if contents["json"] is None:
+                    # contents changed since they were last converted
+                    contents["json"] = {}
+                    for pfx in "performance", "stream":
+                        content_type = pfx + "_contents"
+                        df = contents[content_type]
+                        if df is None or df.empty:
+                            contents["json"][content_type] = {}
+                            continue
+                        c = df.round(self._sig_figs).to_dict("index")
+                        # ensure that keys are strings (so it's valid JSON)
+                        contents["json"][content_type] = {str(k): v for k, v in c.items()}
+                unit_contents.update(copy.deepcopy(contents["json"]))
 
             self._out_json["model"]["unit_models"][unit_name] = unit_contents
 
@@ -480,14 +657,11 @@ class FlowsheetSerializer:
             if hasattr(ports_dict["source"], "vap_outlet"):
                 # TODO Figure out how to denote different outlet types. Need to
                 # deal with multiple input/output offsets
-                for arc in list(self.arcs.values()):
-                    if (
-                        self.ports[arc.dest] == dest
-                        and arc.source == ports_dict["source"].vap_outlet
-                    ):
-                        source_anchor = "top"
-                    else:
-                        source_anchor = "bottom"
+                arc = self.arcs.get(name, None)
+                if arc is not None and arc.source is ports_dict["source"].vap_outlet:
+                    source_anchor = "top"
+                else:
+                    source_anchor = "bottom"
             else:
                 source_anchor = "out"
 
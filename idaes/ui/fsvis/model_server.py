@@ -17,18 +17,25 @@ The main class is `FlowsheetServer`, which is instantiated from the `visualize()
 """
 
 # stdlib
+import atexit
+import copy
+import hashlib
 import http.server
+import itertools
 import json
 from pathlib import Path
 import re
 import socket
+import socketserver
 import threading
-from typing import Dict, Union
+from typing import Dict, Optional, Tuple, Union
 from urllib.parse import urlparse
+import uuid
+import weakref
 
 # package
 from idaes import logger
-from ..flowsheet import FlowsheetDiff, FlowsheetSerializer
+from ..flowsheet import FlowsheetDiff, FlowsheetSerializer, flowsheet_structure_hash
 from . import persist
 
 _log = logger.getLogger(__name__)
@@ -38,6 +45,15 @@ _this_dir = Path(__file__).parent.absolute()
 _static_dir = _this_dir / "static"
 _template_dir = _this_dir / "templates"
 
+# Servers with possibly pending (delayed) saves, flushed at exit without keeping the servers alive
+_servers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_servers():
+    for server in list(_servers):
+        server.flush()
+
 
 class FlowsheetNotFound(Exception):
     def __init__(self, id_, location):
@@ -66,25 +82,47 @@ class ProcessingError(Exception):
     pass
 
 
-class FlowsheetServer(http.server.HTTPServer):
-    """A simple HTTP server that runs in its own thread.
+class FlowsheetServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """A simple HTTP server that runs in its own thread, and handles each request in a new thread.
 
     This server is used for *all* models for a given process, so every request needs to contain
     the ID of the model that should be used in that transaction.
 
     The only methods that the visualization function needs to call are the constructor, `start()` to
      start running the server, and `add_flowsheet()`, to a add a new flowsheet.
+
+    The serialized flowsheets are cached: while the structure of a flowsheet (see
+    :func:`flowsheet_structure_hash`) is unchanged, updates only recompute its values. The last saved
+    value of each flowsheet is also kept in memory, and saves of updated values are delayed by
+    `save_delay` seconds so that frequent updates, e.g. while polling a running dynamic simulation,
+    result in a single write to the datastore. Pending saves are flushed at exit.
     """
 
-    def __init__(self, port=None):
+    daemon_threads = True
+
+    def __init__(self, port=None, save_delay=1.0):
         """Create HTTP server
+
+        Args:
+            port: Port to listen on, if None find a free port
+            save_delay: Seconds to wait before saving an updated flowsheet to its datastore. If zero,
+                        save immediately.
         """
         self._port = port or find_free_port()
         _log.info(f"Starting HTTP server on localhost, port {self._port}")
         super().__init__(("127.0.0.1", self._port), FlowsheetServerHandler)
         self._dsm = persist.DataStoreManager()
         self._flowsheets = {}
+        self._serializers = {}  # {id: (structure hash, FlowsheetSerializer)}
+        self._saved = {}  # {id: last value loaded from or saved to the datastore}
+        self._saved_versions = {}  # {id: version of the saved value, changed when it is replaced}
+        self._version_counter = itertools.count()
+        self._etag_salt = uuid.uuid4().hex  # tags of other servers (or processes) never match
+        self._pending_saves = {}  # {id: threading.Timer}
+        self._save_delay = save_delay
+        self._lock = threading.RLock()
         self._thr = None
+        _servers.add(self)
 
     @property
     def port(self):
@@ -111,22 +149,34 @@ class FlowsheetServer(http.server.HTTPServer):
         """
         # replace all but 'unreserved' (RFC 3896) chars with a dash; remove duplicate dashes
         id_ = re.sub(r"-+", "-", re.sub(r"[^a-zA-Z0-9-._~]", "-", id_))
-        self._flowsheets[id_] = flowsheet
         store = persist.DataStore.create(save_as)
         _log.debug(f"Flowsheet '{id_}' storage is {store}")
-        self._dsm.add(id_, store)
-        # First try to update, so as not to overwrite saved value
-        try:
-            self.update_flowsheet(id_)
-        except FlowsheetNotFoundInDatastore:
-            _log.debug(f"No existing flowsheet found in {store}: saving new value")
-            # If not found in datastore, save new value
-            fs_dict = FlowsheetSerializer(flowsheet, id_).as_dict()
-            store.save(fs_dict)
-        else:
-            _log.debug(f"Existing flowsheet found in {store}: saving merged value")
+        with self._lock:
+            self._flush(id_)
+            self._flowsheets[id_] = flowsheet
+            self._serializers.pop(id_, None)
+            self._set_saved(id_, None)
+            self._dsm.add(id_, store)
+            # First try to update, so as not to overwrite saved value
+            try:
+                self._update_flowsheet(id_, save_delay=0)
+            except FlowsheetNotFoundInDatastore:
+                _log.debug(f"No existing flowsheet found in {store}: saving new value")
+                # If not found in datastore, save new value
+                fs_dict = self._serialize_flowsheet(id_, flowsheet)
+                store.save(fs_dict)
+                self._set_saved(id_, copy.deepcopy(fs_dict))
+            else:
+                _log.debug(f"Existing flowsheet found in {store}: saving merged value")
         return id_
 
+    def flush(self):
+        """Save all flowsheets with pending (delayed) saves now.
+        """
+        with self._lock:
+            for id_ in list(self._pending_saves):
+                self._flush(id_)
+
     # === Public methods called only by HTTP handler ===
 
     def save_flowsheet(self, id_, flowsheet: Union[Dict, str]):
@@ -135,15 +185,19 @@ class FlowsheetServer(http.server.HTTPServer):
         Raises:
             ProcessingError, if parsing of JSON failed (see :meth:`DataStoreManager.save()`)
         """
-        try:
-            self._dsm.save(id_, flowsheet)
-        except ValueError as err:
-            raise ProcessingError(str(err))
+        with self._lock:
+            self._cancel_save(id_)
+            try:
+                self._dsm.save(id_, flowsheet)
+            except ValueError as err:
+                raise ProcessingError(str(err))
+            # the saved value is reloaded, as it may have been passed as a string
+            self._set_saved(id_, None)
 
     def update_flowsheet(self, id_: str) -> Dict:
         """Update flowsheet.
 
-        The returned flowsheet is also saved to the datastore.
+        The returned flowsheet is also saved to the datastore, after the server's `save_delay`.
 
         Args:
             id_: Identifier of flowsheet to update.
@@ -156,6 +210,41 @@ class FlowsheetServer(http.server.HTTPServer):
             FlowsheetNotFound (subclass) if the flowsheet id is known, but it can't be retrieved
             ProcessingError for internal errors
         """
+        with self._lock:
+            return self._update_flowsheet(id_, save_delay=self._save_delay)
+
+    def get_flowsheet(self, id_: str, etags: str = "") -> Tuple[Optional[Dict], Optional[str]]:
+        """Update flowsheet, unless the client already has its current value.
+
+        The entity tag of the flowsheet is computed from its structure, the values in memory and
+        the version of its saved value, without serializing the flowsheet. If it is one of `etags`,
+        the flowsheet is neither serialized nor merged with the saved value.
+
+        Args:
+            id_: Identifier of flowsheet to update.
+            etags: Entity tags of the values the client has, e.g. an If-None-Match header
+
+        Returns:
+            (flowsheet, etag): flowsheet is None if its tag is in `etags`, and otherwise the value
+            returned by :meth:`update_flowsheet`. The tag is None if it could not be computed.
+
+        Raises:
+            Same as :meth:`update_flowsheet`
+        """
+        with self._lock:
+            # the values are read before serializing, so a tag never claims newer values than sent
+            values = self._values_hash(id_)
+            if values is not None:
+                etag = self._etag(id_, values)
+                if etag in etags:
+                    return None, etag
+            merged = self._update_flowsheet(id_, save_delay=self._save_delay)
+            # the update may have replaced the saved value, so the tag uses its new version
+            return merged, None if values is None else self._etag(id_, values)
+
+    # === Internal methods ===
+
+    def _update_flowsheet(self, id_: str, save_delay: float) -> Dict:
         # Get saved flowsheet from datastore
         try:
             saved = self._load_flowsheet(id_)
@@ -185,25 +274,87 @@ class FlowsheetServer(http.server.HTTPServer):
             _log.debug(
                 f"Stored flowsheet and model in memory differ by {num} item{pl}"
             )
-            self.save_flowsheet(id_, diff.merged())
+            merged = diff.merged(do_copy=True)
+            self._set_saved(id_, merged)
+            self._schedule_save(id_, save_delay)
         # Return [a copy of the] merged value
-        return diff.merged(do_copy=True)
-
-    # === Internal methods ===
+        return copy.deepcopy(merged)
 
     def _load_flowsheet(self, id_) -> Union[Dict, str]:
-        return self._dsm.load(id_)
+        # Use the value last loaded or saved, the datastore is only read the first time
+        if id_ not in self._saved:
+            self._saved[id_] = self._dsm.load(id_)
+        return self._saved[id_]
+
+    def _set_saved(self, id_, value):
+        # Replace the saved value, None to reload it from the datastore
+        if value is None:
+            self._saved.pop(id_, None)
+        else:
+            self._saved[id_] = value
+        self._saved_versions[id_] = next(self._version_counter)
+
+    def _values_hash(self, id_) -> Optional[str]:
+        # Hash of the structure and values of a flowsheet with a cached serializer, None otherwise
+        cached = self._serializers.get(id_, None)
+        if cached is None or id_ not in self._flowsheets or id_ not in self._saved:
+            return None
+        try:
+            structure = flowsheet_structure_hash(self._flowsheets[id_])
+            if structure != cached[0]:
+                return None
+            return f"{structure} {cached[1].values_fingerprint()}"
+        except (AttributeError, KeyError, ValueError):
+            return None  # reported when the flowsheet is serialized
+
+    def _etag(self, id_, values):
+        tag = f"{self._etag_salt} {id_} {self._saved_versions.get(id_, None)} {values}"
+        return f'"{hashlib.sha1(utf8_encode(tag)).hexdigest()}"'
+
+    def _schedule_save(self, id_, delay):
+        self._cancel_save(id_)
+        if delay <= 0:
+            self._save_now(id_)
+            return
+        timer = threading.Timer(delay, self._flush, args=(id_,))
+        timer.daemon = True
+        self._pending_saves[id_] = timer
+        timer.start()
+
+    def _cancel_save(self, id_):
+        timer = self._pending_saves.pop(id_, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _flush(self, id_):
+        with self._lock:
+            if self._pending_saves.pop(id_, None) is not None:
+                self._save_now(id_)
+
+    def _save_now(self, id_):
+        try:
+            self._dsm.save(id_, self._saved[id_])
+        except (KeyError, ValueError) as err:
+            _log.error(f"Cannot save flowsheet '{id_}': {err}")
 
     def _get_flowsheet_obj(self, id_):
         """Get a flowsheet with the given ID.
         """
         return self._flowsheets[id_]
 
-    @staticmethod
-    def _serialize_flowsheet(id_, flowsheet):
+    def _serialize_flowsheet(self, id_, flowsheet):
+        # Reuse the cached serializer if the flowsheet structure has not changed
         try:
-            result = FlowsheetSerializer(flowsheet, id_).as_dict()
+            structure = flowsheet_structure_hash(flowsheet)
+            cached = self._serializers.get(id_, None)
+            if cached is not None and cached[0] == structure:
+                result = cached[1].update_values()
+            else:
+                serializer = FlowsheetSerializer(flowsheet, id_)
+                self._serializers[id_] = (structure, serializer)
+                result = serializer.as_dict()
         except (AttributeError, KeyError) as err:
+            self._serializers.pop(id_, None)
             raise ValueError(f"Error serializing flowsheet: {err}")
         return result
 
@@ -271,7 +422,7 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
             None
         """
         try:
-            merged = self.server.update_flowsheet(id_)
+            merged, etag = self.server.get_flowsheet(id_, self.headers.get("If-None-Match", ""))
         except FlowsheetUnknown as err:
             # User error: user asked for a flowsheet by an unknown ID
             self.send_error(404, message=str(err))
@@ -280,8 +431,13 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
             # Internal error: flowsheet ID is found, but other things are missing
             self.send_error(500, message=str(err))
             return
-        # Return merged flowsheet
-        self._write_json(200, merged)
+        # Return merged flowsheet, or 'not modified' if the client already has it
+        if merged is None:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self._write_json(200, merged, etag=etag)
 
     # === PUT ===
 
@@ -311,13 +467,24 @@ class FlowsheetServerHandler(http.server.SimpleHTTPRequestHandler):
 
     # === Internal methods ===
 
-    def _write_json(self, code, data):
-        str_json = json.dumps(data)
-        value = utf8_encode(str_json)
+    def _write_json(self, code, data, etag=None):
+        """Write JSON response.
+
+        Args:
+            code: HTTP status code
+            data: Data to serialize as JSON, or already serialized and encoded bytes
+            etag: If given, value of the ETag header
+        """
+        if isinstance(data, bytes):
+            value = data
+        else:
+            value = utf8_encode(json.dumps(data))
         self.send_response(code)
         # self.send_header("Access-Control-Allow-Headers", "Content-Type")
         self.send_header("Content-type", "application/json")
         self.send_header("Content-length", str(len(value)))
+        if etag is not None:
+            self.send_header("ETag", etag)
         self.end_headers()
         self.wfile.write(value)
 
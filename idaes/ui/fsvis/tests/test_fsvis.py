@@ -21,12 +21,13 @@ import logging
 import pytest
 import requests
 
-from pyomo.environ import ConcreteModel, SolverFactory, Constraint, value
+from pyomo.environ import ConcreteModel, SolverFactory, Constraint, TransformationFactory, value
+from pyomo.network import Arc
 from idaes.core import FlowsheetBlock
 from idaes.generic_models.properties.activity_coeff_models.BTX_activity_coeff_VLE import (
     BTXParameterBlock,
 )
-from idaes.generic_models.unit_models import Flash
+from idaes.generic_models.unit_models import Flash, Heater
 from idaes.ui.fsvis import fsvis
 from idaes.ui.flowsheet import validate_flowsheet
 
@@ -130,3 +131,110 @@ def test_invoke(flash_model):
         "module": getattr(fsvis, "visualize"),
     }
     # TODO: check params
+
+
+@pytest.mark.integration
+def test_conditional_get(flash_model):
+    port = fsvis.visualize(flash_model.fs, "FlashETag", browser=False, save_as=None)
+    url = f"http://127.0.0.1:{port}/fs?id=FlashETag"
+    resp = requests.get(url)
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+    # unchanged flowsheet is not sent again
+    resp = requests.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+
+
+@pytest.mark.integration
+def test_update_values_and_delayed_save(tmp_path):
+    from idaes.ui.fsvis.model_server import FlowsheetServer
+
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.properties = BTXParameterBlock(
+        default={"valid_phase": ("Liq", "Vap"), "activity_coeff_model": "Ideal",
+                 "state_vars": "FTPz"})
+    m.fs.heater = Heater(default={"property_package": m.fs.properties})
+    m.fs.flash = Flash(default={"property_package": m.fs.properties})
+    m.fs.s01 = Arc(source=m.fs.heater.outlet, destination=m.fs.flash.inlet)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+
+    save_location = tmp_path / "delayed.json"
+    server = FlowsheetServer(save_delay=60)
+    server.add_flowsheet("Delayed", m.fs, save_location)
+    with open(save_location) as fp:
+        saved = json.load(fp)
+    cells = [c for c in saved["cells"] if c["id"] == "s01"]
+    cells[0]["vertices"] = [{"x": 1, "y": 2}]  # layout change made in the UI
+    server.save_flowsheet("Delayed", saved)
+
+    # value only change: layout is kept, label and contents are updated
+    m.fs.flash.inlet.temperature[0].value = 345.6
+    data = server.update_flowsheet("Delayed")
+    assert "Temperature 345.6" in data["model"]["arcs"]["s01"]["label"]
+    cells = [c for c in data["cells"] if c["id"] == "s01"]
+    assert cells[0]["vertices"] == [{"x": 1, "y": 2}]
+    assert "Temperature 345.6" in cells[0]["labels"][0]["attrs"]["text"]["text"]
+    # the serializer is reused while the structure is unchanged
+    serializer = server._serializers["Delayed"][1]
+    server.update_flowsheet("Delayed")
+    assert server._serializers["Delayed"][1] is serializer
+
+    # save is delayed until flushed
+    with open(save_location) as fp:
+        assert "Temperature 345.6" not in fp.read()
+    server.flush()
+    with open(save_location) as fp:
+        assert json.load(fp) == data
+
+    # structure change: flowsheet is serialized again
+    m.fs.del_component(m.fs.s01_expanded)
+    m.fs.del_component(m.fs.s01)
+    data = server.update_flowsheet("Delayed")
+    assert "s01" not in data["model"]["arcs"]
+    assert server._serializers["Delayed"][1] is not serializer
+    server.flush()
+    server.server_close()
+
+
+@pytest.mark.integration
+def test_etag_before_serialization(tmp_path):
+    import gc
+    import weakref
+    from idaes.ui.fsvis import model_server
+
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.properties = BTXParameterBlock(
+        default={"valid_phase": ("Liq", "Vap"), "activity_coeff_model": "Ideal",
+                 "state_vars": "FTPz"})
+    m.fs.heater = Heater(default={"property_package": m.fs.properties})
+    m.fs.flash = Flash(default={"property_package": m.fs.properties})
+    m.fs.s01 = Arc(source=m.fs.heater.outlet, destination=m.fs.flash.inlet)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+
+    server = model_server.FlowsheetServer(save_delay=0)
+    server.add_flowsheet("Tagged", m.fs, tmp_path / "tagged.json")
+    data, etag = server.get_flowsheet("Tagged")
+    assert data is not None and etag is not None
+    # an unchanged flowsheet is neither serialized nor merged again
+    serializer = server._serializers["Tagged"][1]
+    update_values = serializer.update_values
+    serializer.update_values = None
+    assert server.get_flowsheet("Tagged", etag) == (None, etag)
+    serializer.update_values = update_values
+    # changed values and saves from the UI change the tag
+    m.fs.flash.inlet.temperature[0].value = 345.6
+    data, new_etag = server.get_flowsheet("Tagged", etag)
+    assert "Temperature 345.6" in data["model"]["arcs"]["s01"]["label"]
+    assert data is not None and new_etag != etag
+    server.save_flowsheet("Tagged", data)
+    assert server.get_flowsheet("Tagged", new_etag)[0] is not None
+
+    # the exit hook does not keep the server alive
+    server.server_close()
+    ref = weakref.ref(server)
+    del server, serializer, update_values
+    gc.collect()
+    assert ref() is None
@@ -10,6 +10,7 @@
 # license information, respectively. Both files are also available online
 # at the URL "https://github.com/IDAES/idaes-pse".
 ##############################################################################
+from collections import defaultdict
 import copy
 import json
 from pathlib import Path
@@ -312,3 +313,136 @@ def _show_json(test=None, stored=None):
 def test_flowsheet_serializer_invalid():
     m = ConcreteModel()
     pytest.raises(ValueError, FlowsheetSerializer, m, "bad")
+
+
+@pytest.mark.benchmark
+@pytest.mark.integration
+def test_flowsheet_serializer_large():
+    """Serialize a chain of 500 heaters, which is large enough that the cost of
+    visiting the property blocks inside each unit model would show up.
+    """
+    import time
+    from idaes.core.util.testing import PhysicalParameterTestBlock
+
+    n = 500
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.properties = PhysicalParameterTestBlock()
+    for i in range(n):
+        m.fs.add_component(f"H{i}", Heater(default={"property_package": m.fs.properties}))
+    for i in range(n - 1):
+        m.fs.add_component(f"s{i}", Arc(source=getattr(m.fs, f"H{i}").outlet,
+                                        destination=getattr(m.fs, f"H{i + 1}").inlet))
+    TransformationFactory("network.expand_arcs").apply_to(m)
+
+    start = time.perf_counter()
+    test_dict = FlowsheetSerializer(m.fs, "large").as_dict()
+    elapsed = time.perf_counter() - start
+    print(f"Serialized {n} unit models in {elapsed:.2f} s")
+
+    model = test_dict["model"]
+    # the unconnected inlet and outlet at the ends of the chain are a feed and a product
+    assert len(model["unit_models"]) == n + 2
+    assert len(model["arcs"]) == n + 1
+    assert model["arcs"]["s0"]["source"] == "H0"
+    assert model["arcs"]["s0"]["dest"] == "H1"
+    assert model["arcs"]["s0"]["label"].startswith("Component_flow_phase ('p1', 'c1') 2")
+    assert model["stream_table"]["columns"][2:] == [f"s{i}" for i in range(n - 1)]
+    cell_ids = {cell["id"] for cell in test_dict["cells"]}
+    assert set(model["unit_models"]) <= cell_ids
+    assert set(model["arcs"]) <= cell_ids
+
+
+def _nested_flowsheet():
+    from pyomo.environ import Block
+    from idaes.core.util.testing import PhysicalParameterTestBlock
+
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.properties = PhysicalParameterTestBlock()
+    heater = lambda: Heater(default={"property_package": m.fs.properties})
+    m.fs.H0 = heater()
+    m.fs.H1 = heater()
+    # unit models in a plain sub-block and in a sub-flowsheet, one connected by an arc
+    # and the others not connected at all
+    m.fs.sub = Block()
+    m.fs.sub.connected = heater()
+    m.fs.sub.unconnected = heater()
+    m.fs.sub_fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.sub_fs.unconnected = heater()
+    m.fs.s0 = Arc(source=m.fs.H0.outlet, destination=m.fs.H1.inlet)
+    m.fs.s1 = Arc(source=m.fs.H1.outlet, destination=m.fs.sub.connected.inlet)
+    TransformationFactory("network.expand_arcs").apply_to(m)
+    return m
+
+
+class _DescendingSerializer(FlowsheetSerializer):
+    # The serializer as it was before it stopped descending into property blocks
+    def _identify_unit_models(self):
+        from pyomo.environ import Block
+        from idaes.core import UnitModelBlockData
+
+        for component in self.flowsheet.component_objects(Block, descend_into=True):
+            if isinstance(component, UnitModelBlockData):
+                self._add_unit_model_with_ports(component)
+            else:
+                for item in component.parent_component().values():
+                    if isinstance(item, UnitModelBlockData) and item in self._known_endpoints:
+                        self._add_unit_model_with_ports(item)
+
+
+@pytest.mark.unit
+def test_flowsheet_serializer_nested_units():
+    m = _nested_flowsheet()
+    serializer = FlowsheetSerializer(m.fs, "nested")
+    reference = _DescendingSerializer(m.fs, "nested")
+    assert list(serializer.unit_models.values()) == list(reference.unit_models.values())
+    assert serializer.ports == reference.ports
+    assert json.dumps(serializer.as_dict(), sort_keys=True) == \
+        json.dumps(reference.as_dict(), sort_keys=True)
+    # units nested in sub-blocks are only shown through the arcs connected to them
+    assert "unconnected" not in serializer.as_dict()["model"]["unit_models"]
+
+
+@pytest.mark.unit
+def test_flowsheet_serializer_update_values():
+    m = _nested_flowsheet()
+    serializer = FlowsheetSerializer(m.fs, "nested")
+    # the stream values are those of the destination of the arc
+    m.fs.H1.inlet.temperature[0].value = 345.6
+    updated = copy.deepcopy(serializer.update_values())
+    assert serializer._changed_streams == set()
+    # only the changed stream is reformatted
+    m.fs.sub.connected.inlet.pressure[0].value = 2.0
+    assert serializer._construct_stream_labels() == {"s1"}
+    m.fs.sub.connected.inlet.pressure[0].value = 1.2345678e5
+    assert serializer._construct_stream_labels() == {"s1"}
+    assert serializer._construct_stream_labels() == set()
+
+    fresh = FlowsheetSerializer(m.fs, "nested").as_dict()
+    assert json.dumps(serializer.update_values(), sort_keys=True) == \
+        json.dumps(fresh, sort_keys=True)
+    assert "Temperature 345.6" in updated["model"]["arcs"]["s0"]["label"]
+    assert "Pressure 123456.7" in serializer.as_dict()["model"]["arcs"]["s1"]["label"]
+
+
+@pytest.mark.unit
+def test_flowsheet_serializer_performance_contents_once(monkeypatch):
+    from idaes.generic_models.unit_models.heater import HeaterData
+
+    m = _nested_flowsheet()
+    calls = defaultdict(int)
+    get_contents = HeaterData._get_performance_contents
+
+    def counting(unit, time_point=0):
+        calls[unit.getname()] += 1
+        return get_contents(unit, time_point=time_point)
+
+    monkeypatch.setattr(HeaterData, "_get_performance_contents", counting)
+    serializer = FlowsheetSerializer(m.fs, "nested")
+    # computed once per unit for the fingerprint and reused for the contents
+    assert dict(calls) == {"H0": 1, "H1": 1}
+    assert not serializer._serialized_contents["H1"]["performance_contents"].empty
+    m.fs.H1.inlet.temperature[0].value = 345.6
+    serializer.update_values()
+    assert dict(calls) == {"H0": 2, "H1": 2}